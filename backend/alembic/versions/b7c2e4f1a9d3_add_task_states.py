@@ -0,0 +1,38 @@
+"""add_task_states
+
+Revision ID: b7c2e4f1a9d3
+Revises: a1a6a97ccb6b
+Create Date: 2026-10-17 10:12:31.482906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c2e4f1a9d3'
+down_revision: Union[str, Sequence[str], None] = 'a1a6a97ccb6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create task_states table for the SQL task state backend."""
+    op.create_table(
+        'task_states',
+        sa.Column('namespace', sa.String(32), primary_key=True),
+        sa.Column('task_id', sa.String(128), primary_key=True),
+        sa.Column('state', sa.JSON, nullable=False),
+        sa.Column('expires_at', sa.Float, nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_task_states_expires_at', 'task_states', ['expires_at'])
+
+
+def downgrade() -> None:
+    """Drop task_states table."""
+    op.drop_index('ix_task_states_expires_at', table_name='task_states')
+    op.drop_table('task_states')
@@ -0,0 +1,34 @@
+"""add_partial_content_status
+
+Revision ID: c3d8f2a6b1e4
+Revises: b7c2e4f1a9d3
+Create Date: 2026-10-17 14:05:12.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8f2a6b1e4'
+down_revision: Union[str, Sequence[str], None] = 'b7c2e4f1a9d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add 'partial' to contentstatus for progressively delivered content."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # ADD VALUE 不能在事务块中执行
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE contentstatus ADD VALUE IF NOT EXISTS 'partial' AFTER 'generating'")
+
+
+def downgrade() -> None:
+    """Mark leftover partial contents as failed.
+
+    PostgreSQL 不支持删除枚举值，'partial' 保留在类型中。
+    """
+    op.execute("UPDATE contents SET status = 'failed' WHERE status = 'partial'")
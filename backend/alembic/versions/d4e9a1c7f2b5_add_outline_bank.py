@@ -0,0 +1,41 @@
+"""add_outline_bank
+
+Revision ID: d4e9a1c7f2b5
+Revises: c3d8f2a6b1e4
+Create Date: 2026-10-17 18:40:27.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e9a1c7f2b5'
+down_revision: Union[str, Sequence[str], None] = 'c3d8f2a6b1e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create outline_bank table for pre-generated preset theme outlines."""
+    op.create_table(
+        'outline_bank',
+        sa.Column('id', sa.String(36), primary_key=True),
+        sa.Column('theme_id', sa.String(64), nullable=False),
+        sa.Column('age_bucket', sa.String(16), nullable=False),
+        sa.Column('style_key', sa.String(255), nullable=False),
+        sa.Column('outline', sa.JSON, nullable=False),
+        sa.Column('model', sa.String(100), nullable=False, server_default=''),
+        sa.Column('served_count', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_outline_bank_lookup', 'outline_bank', ['theme_id', 'age_bucket', 'style_key'])
+
+
+def downgrade() -> None:
+    """Drop outline_bank table."""
+    op.drop_index('ix_outline_bank_lookup', table_name='outline_bank')
+    op.drop_table('outline_bank')
@@ -0,0 +1,44 @@
+"""add_tts_cache
+
+Revision ID: e5f2b8c3d1a6
+Revises: d4e9a1c7f2b5
+Create Date: 2026-10-17 21:12:48.316402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f2b8c3d1a6'
+down_revision: Union[str, Sequence[str], None] = 'd4e9a1c7f2b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create tts_cache table for content-addressed TTS audio."""
+    op.create_table(
+        'tts_cache',
+        sa.Column('cache_key', sa.String(64), primary_key=True),
+        sa.Column('provider', sa.String(32), nullable=False),
+        sa.Column('model', sa.String(100), nullable=False, server_default=''),
+        sa.Column('voice_id', sa.String(100), nullable=False, server_default=''),
+        sa.Column('speed', sa.Float, nullable=False, server_default='1.0'),
+        sa.Column('text', sa.Text, nullable=False),
+        sa.Column('audio_url', sa.String(1000), nullable=False),
+        sa.Column('duration', sa.Float, nullable=False, server_default='0'),
+        sa.Column('hit_count', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_tts_cache_last_used_at', 'tts_cache', ['last_used_at'])
+
+
+def downgrade() -> None:
+    """Drop tts_cache table."""
+    op.drop_index('ix_tts_cache_last_used_at', table_name='tts_cache')
+    op.drop_table('tts_cache')
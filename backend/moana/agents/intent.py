@@ -1,6 +1,6 @@
 """Intent Agent - 理解家长自然语言输入."""
 from moana.agents.schemas import ParsedIntent
-from moana.services.llm import get_llm_service
+from moana.services.llm import get_llm_memo, get_llm_service
 
 
 class IntentAgent:
@@ -39,10 +39,19 @@ class IntentAgent:
             preferred_types=preferred_types,
         )
 
-        result = await self._llm.generate_structured(
-            prompt=prompt,
-            output_schema=self._get_output_schema(),
-            system_prompt=self._get_system_prompt(),
+        result = await get_llm_memo("intent").get_or_compute(
+            inputs={
+                "child_name": child_name,
+                "age_months": age_months,
+                "user_input": user_input,
+                "preferred_types": preferred_types,
+            },
+            model=getattr(self._llm, "model_name", ""),
+            compute=lambda: self._llm.generate_structured(
+                prompt=prompt,
+                output_schema=self._get_output_schema(),
+                system_prompt=self._get_system_prompt(),
+            ),
         )
 
         return ParsedIntent(
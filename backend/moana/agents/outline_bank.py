@@ -0,0 +1,378 @@
+# src/moana/agents/outline_bank.py
+"""Pre-generated outline bank for preset themes.
+
+预设模式下（THEME_REGISTRY 中的刷牙、洗手等主题）故事骨架只随孩子名字、
+年龄段和风格变化。离线任务为每个 主题 × 年龄段 × 美术风格 预生成若干份大纲，
+校验通过后存入 outline_bank 表（孩子名字为占位符）；请求时取一份替换名字
+（可选轻量 LLM 润色），大纲 LLM 调用不再位于关键路径。
+
+离线生成：
+    python -m moana.agents.outline_bank --per-key 3 --themes brush_teeth,wash_hands
+"""
+import asyncio
+import logging
+import random
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from moana.agents.schemas import PictureBookOutline
+from moana.agents.story import StoryAgent, StyleConfig
+from moana.models.outline_bank import OutlineBankEntry
+from moana.themes import THEME_REGISTRY, Theme, find_theme_by_keyword
+
+logger = logging.getLogger(__name__)
+
+# 离线生成时使用的孩子名字占位符（请求时替换为真实名字）
+PLACEHOLDER_NAME = "〔宝贝〕"
+
+# 年龄段: (最小月龄, 最大月龄(不含), 标签, 生成时使用的代表月龄)
+AGE_BUCKETS = (
+    (0, 24, "12-23", 18),
+    (24, 36, "24-35", 30),
+    (36, 10_000, "36-48", 42),
+)
+
+# 离线生成时使用的默认配角（请求指定了其他配角时不使用大纲库）
+DEFAULT_CHARACTERS = ["小兔子"]
+
+MIN_PAGES = 6
+MAX_PAGES = 10
+
+
+def age_bucket(age_months: int) -> str:
+    """月龄 -> 年龄段标签."""
+    for low, high, label, _ in AGE_BUCKETS:
+        if low <= age_months < high:
+            return label
+    return AGE_BUCKETS[-1][2]
+
+
+def resolve_theme(theme_topic: str) -> Optional[Theme]:
+    """按 id、名称或关键词查找预设主题."""
+    if theme_topic in THEME_REGISTRY:
+        return THEME_REGISTRY[theme_topic]
+    return find_theme_by_keyword(theme_topic)
+
+
+def style_key(style: StyleConfig) -> Optional[str]:
+    """风格签名；带故事/视觉增强参数的请求会改变故事本身，不使用大纲库."""
+    if style.story_enhancement or style.visual_enhancement:
+        return None
+    return "|".join([
+        style.art_style,
+        style.protagonist_animal,
+        style.protagonist_color,
+        style.protagonist_accessory,
+        style.color_palette,
+    ])
+
+
+def validate_outline(outline: PictureBookOutline) -> list[str]:
+    """校验离线生成的大纲，返回问题列表（为空表示通过）."""
+    problems = []
+    if not MIN_PAGES <= len(outline.pages) <= MAX_PAGES:
+        problems.append(f"page count {len(outline.pages)} not in [{MIN_PAGES}, {MAX_PAGES}]")
+    if [p.page_num for p in outline.pages] != list(range(1, len(outline.pages) + 1)):
+        problems.append("page numbers are not sequential from 1")
+    if PLACEHOLDER_NAME not in outline.title:
+        problems.append("title does not mention the child")
+    if not any(PLACEHOLDER_NAME in p.text for p in outline.pages):
+        problems.append("no page mentions the child")
+
+    interactions = 0
+    for page in outline.pages:
+        if not page.text.strip():
+            problems.append(f"page {page.page_num} has no text")
+        if not page.image_prompt.strip():
+            problems.append(f"page {page.page_num} has no image prompt")
+        elif PLACEHOLDER_NAME in page.image_prompt:
+            problems.append(f"page {page.page_num} image prompt contains the child's name")
+        if page.interaction is not None:
+            interactions += 1
+            options = [str(o) for o in page.interaction.options]
+            if str(page.interaction.correct_answer) not in options:
+                problems.append(f"page {page.page_num} answer is not among the options")
+    if interactions != outline.total_interactions:
+        problems.append(f"total_interactions {outline.total_interactions} != {interactions}")
+    return problems
+
+
+def _substitute(value: Any, child_name: str) -> Any:
+    if isinstance(value, str):
+        return value.replace(PLACEHOLDER_NAME, child_name)
+    if isinstance(value, list):
+        return [_substitute(v, child_name) for v in value]
+    if isinstance(value, dict):
+        return {k: _substitute(v, child_name) for k, v in value.items()}
+    return value
+
+
+def personalize(outline: dict[str, Any], child_name: str) -> PictureBookOutline:
+    """把占位符替换为孩子名字."""
+    return PictureBookOutline.model_validate(_substitute(outline, child_name))
+
+
+REFINE_PROMPT = """下面是一本为{age_months}个月大的孩子"{child_name}"准备的绘本大纲（JSON）。
+请在不改变情节、页数、互动问题和 image_prompt 的前提下，轻微润色每页文字，
+使称呼和用词更贴合孩子的名字与年龄。
+
+{outline_json}
+
+请输出完整的绘本结构。"""
+
+
+class OutlineBank:
+    """Stores and serves pre-generated preset theme outlines."""
+
+    def __init__(
+        self,
+        session_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+        story_agent: Optional[StoryAgent] = None,
+    ):
+        self._session_factory = session_factory
+        self._story_agent = story_agent
+
+    def _sessions(self) -> async_sessionmaker[AsyncSession]:
+        if self._session_factory is None:
+            from moana.database import get_session_factory
+
+            self._session_factory = get_session_factory()
+        return self._session_factory
+
+    @property
+    def story_agent(self) -> StoryAgent:
+        if self._story_agent is None:
+            self._story_agent = StoryAgent()
+        return self._story_agent
+
+    # ===== request time =====
+
+    async def draw(
+        self,
+        theme_topic: str,
+        age_months: int,
+        child_name: str,
+        style_config: StyleConfig,
+        favorite_characters: list[str] | None = None,
+        refine: bool = False,
+    ) -> Optional[PictureBookOutline]:
+        """取一份匹配的大纲并个性化；没有可用大纲时返回 None（调用方改为实时生成）."""
+        theme = resolve_theme(theme_topic)
+        key = style_key(style_config)
+        if theme is None or key is None:
+            return None
+        if favorite_characters and favorite_characters != DEFAULT_CHARACTERS:
+            return None
+
+        bucket = age_bucket(age_months)
+        async with self._sessions()() as db:
+            result = await db.execute(
+                select(OutlineBankEntry).where(
+                    OutlineBankEntry.theme_id == theme.id,
+                    OutlineBankEntry.age_bucket == bucket,
+                    OutlineBankEntry.style_key == key,
+                )
+            )
+            entries = list(result.scalars())
+            if not entries:
+                logger.info(f"[OutlineBank] miss {theme.id}:{bucket}:{key}")
+                return None
+            # 优先使用被取用次数最少的大纲，避免同一故事反复出现
+            fewest = min(e.served_count for e in entries)
+            entry = random.choice([e for e in entries if e.served_count == fewest])
+            await db.execute(
+                update(OutlineBankEntry)
+                .where(OutlineBankEntry.id == entry.id)
+                .values(served_count=OutlineBankEntry.served_count + 1)
+            )
+            await db.commit()
+
+        outline = personalize(entry.outline, child_name)
+        logger.info(f"[OutlineBank] hit {theme.id}:{bucket}:{key} -> {outline.title}")
+        if refine:
+            outline = await self._refine(outline, child_name, age_months)
+        return outline
+
+    async def _refine(
+        self,
+        outline: PictureBookOutline,
+        child_name: str,
+        age_months: int,
+    ) -> PictureBookOutline:
+        """轻量润色文字；失败或结构被改动时使用未润色版本."""
+        try:
+            refined = await self.story_agent._llm.generate_structured(
+                prompt=REFINE_PROMPT.format(
+                    age_months=age_months,
+                    child_name=child_name,
+                    outline_json=outline.model_dump_json(indent=2),
+                ),
+                output_schema=PictureBookOutline,
+                temperature=0.3,
+            )
+            if isinstance(refined, dict):
+                refined = PictureBookOutline.model_validate(refined)
+            if len(refined.pages) != len(outline.pages):
+                raise ValueError("refinement changed the page count")
+            # 插图提示词保持离线校验过的版本
+            for page, original in zip(refined.pages, outline.pages):
+                page.image_prompt = original.image_prompt
+            return refined
+        except Exception as e:
+            logger.warning(f"[OutlineBank] refinement failed, using banked text: {e}")
+            return outline
+
+    # ===== offline build =====
+
+    async def count(self, theme_id: str, bucket: str, key: str) -> int:
+        async with self._sessions()() as db:
+            result = await db.execute(
+                select(func.count()).select_from(OutlineBankEntry).where(
+                    OutlineBankEntry.theme_id == theme_id,
+                    OutlineBankEntry.age_bucket == bucket,
+                    OutlineBankEntry.style_key == key,
+                )
+            )
+            return int(result.scalar() or 0)
+
+    async def build(
+        self,
+        theme_ids: Iterable[str] | None = None,
+        art_styles: Iterable[str] = ("pixar_3d",),
+        age_buckets: Iterable[str] | None = None,
+        per_key: int = 3,
+        concurrency: int = 4,
+        max_attempts: int = 2,
+    ) -> dict[str, int]:
+        """为每个 主题 × 年龄段 × 美术风格 补齐 per_key 份校验通过的大纲.
+
+        Returns:
+            {"generated": n, "rejected": n, "failed": n}
+        """
+        themes = [THEME_REGISTRY[t] for t in theme_ids] if theme_ids else list(THEME_REGISTRY.values())
+        buckets = [b for b in AGE_BUCKETS if age_buckets is None or b[2] in set(age_buckets)]
+        slots = asyncio.Semaphore(concurrency)
+        counts = {"generated": 0, "rejected": 0, "failed": 0}
+
+        async def fill(theme: Theme, bucket: tuple, art_style: str) -> None:
+            _, _, label, representative_age = bucket
+            style = StyleConfig(art_style=art_style)
+            key = style_key(style)
+            missing = per_key - await self.count(theme.id, label, key)
+            attempts = 0
+            while missing > 0 and attempts < per_key * max_attempts:
+                attempts += 1
+                async with slots:
+                    try:
+                        outline = await self.story_agent.generate_outline(
+                            child_name=PLACEHOLDER_NAME,
+                            age_months=representative_age,
+                            theme_topic=theme.name,
+                            theme_category=theme.category,
+                            favorite_characters=DEFAULT_CHARACTERS,
+                            style_config=style,
+                        )
+                        if isinstance(outline, dict):
+                            outline = PictureBookOutline.model_validate(outline)
+                    except Exception as e:
+                        counts["failed"] += 1
+                        logger.warning(f"[OutlineBank] generation failed for {theme.id}:{label}:{art_style}: {e}")
+                        continue
+                problems = validate_outline(outline)
+                if problems:
+                    counts["rejected"] += 1
+                    logger.warning(f"[OutlineBank] rejected {theme.id}:{label}:{art_style}: {'; '.join(problems)}")
+                    continue
+                await self.add(theme.id, label, key, outline, model=self._model_name())
+                counts["generated"] += 1
+                missing -= 1
+
+        await asyncio.gather(*(
+            fill(theme, bucket, art_style)
+            for theme in themes
+            for bucket in buckets
+            if bucket[0] <= theme.age_range[1] and theme.age_range[0] < bucket[1]
+            for art_style in art_styles
+        ))
+        return counts
+
+    async def add(
+        self,
+        theme_id: str,
+        bucket: str,
+        key: str,
+        outline: PictureBookOutline,
+        model: str = "",
+    ) -> str:
+        async with self._sessions()() as db:
+            entry = OutlineBankEntry(
+                theme_id=theme_id,
+                age_bucket=bucket,
+                style_key=key,
+                outline=outline.model_dump(),
+                model=model,
+            )
+            db.add(entry)
+            await db.commit()
+            return entry.id
+
+    def _model_name(self) -> str:
+        return str(getattr(self.story_agent._llm, "model_name", ""))
+
+
+async def main():
+    """CLI entry point for building the outline bank."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pre-generate preset theme outlines")
+    parser.add_argument(
+        "--themes",
+        default="",
+        help="Comma-separated theme ids (default: all themes)",
+    )
+    parser.add_argument(
+        "--styles",
+        default="",
+        help="Comma-separated art styles (default: OUTLINE_BANK_ART_STYLES)",
+    )
+    parser.add_argument(
+        "--ages",
+        default="",
+        help="Comma-separated age buckets, e.g. 12-23,24-35 (default: all)",
+    )
+    parser.add_argument(
+        "--per-key",
+        type=int,
+        default=3,
+        help="Outlines per theme x age bucket x style (default: 3)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Concurrent LLM calls (default: 4)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+    from moana.config import get_settings
+
+    styles = args.styles or get_settings().outline_bank_art_styles
+    counts = await OutlineBank().build(
+        theme_ids=[t.strip() for t in args.themes.split(",") if t.strip()] or None,
+        art_styles=[s.strip() for s in styles.split(",") if s.strip()],
+        age_buckets=[a.strip() for a in args.ages.split(",") if a.strip()] or None,
+        per_key=args.per_key,
+        concurrency=args.concurrency,
+    )
+    print(f"Generated: {counts['generated']}  Rejected: {counts['rejected']}  Failed: {counts['failed']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
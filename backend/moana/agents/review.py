@@ -2,8 +2,11 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from pydantic import BaseModel, Field
+
 from moana.services.llm.gemini import GeminiService
 from moana.services.moderation import AliyunModerationService, ModerationResult
+from moana.services.moderation.base import ModerationCategory, ModerationService
 
 
 @dataclass
@@ -40,6 +43,20 @@ REVIEW_SYSTEM_PROMPT = """你是一位专业的儿童内容审核专家，负责
 请对内容进行评估，输出JSON格式结果。"""
 
 
+class TextReview(BaseModel):
+    """LLM review of one text."""
+    index: int = Field(description="文本编号（从 0 开始）")
+    is_appropriate: bool = True
+    age_suitable: bool = True
+    concerns: list[str] = Field(default_factory=list)
+    suggestions: list[str] = Field(default_factory=list)
+
+
+class BatchTextReview(BaseModel):
+    """LLM review of several texts in one call."""
+    reviews: list[TextReview]
+
+
 class ReviewAgent:
     """Agent for reviewing and moderating content."""
 
@@ -47,6 +64,50 @@ class ReviewAgent:
         self._llm = GeminiService()
         self._moderation = AliyunModerationService()
 
+    @property
+    def moderation_service(self) -> ModerationService:
+        return self._moderation
+
+    async def review_texts(self, texts: list[str]) -> list[ModerationResult]:
+        """Review several texts (e.g. all pages of a book) in one LLM call.
+
+        Args:
+            texts: Texts to review
+
+        Returns:
+            One ModerationResult per text; LLM 未返回的编号视为未检查（skipped）
+        """
+        if not texts:
+            return []
+
+        numbered = "\n".join(f"[{i}] {text}" for i, text in enumerate(texts))
+        prompt = f"""请逐条审核以下儿童内容是否适合1-3岁幼儿，每条文本输出一条评估（index 与编号一致）：
+
+{numbered}"""
+
+        batch = await self._llm.generate_structured(
+            prompt=prompt,
+            output_schema=BatchTextReview,
+            system_prompt=REVIEW_SYSTEM_PROMPT,
+            temperature=0.3,
+        )
+
+        by_index = {review.index: review for review in batch.reviews}
+        results = []
+        for i in range(len(texts)):
+            review = by_index.get(i)
+            if review is None:
+                results.append(ModerationResult(is_safe=True, reason="Not reviewed", skipped=True))
+                continue
+            approved = review.is_appropriate and review.age_suitable
+            results.append(ModerationResult(
+                is_safe=approved,
+                categories=[] if approved else [ModerationCategory.INAPPROPRIATE],
+                reason="; ".join(review.concerns) or None,
+                raw_response=review.model_dump(),
+            ))
+        return results
+
     async def review_text(self, text: str) -> ReviewResult:
         """Review text content for children's appropriateness.
 
@@ -136,6 +197,8 @@ class ReviewAgent:
     ) -> ReviewResult:
         """Review complete content with text, images, and audio.
 
+        文字、图片、音频并发审核（见 ModerationEngine），审核结论按内容哈希缓存。
+
         Args:
             text: Text content to review
             image_urls: List of image URLs to review
@@ -144,37 +207,25 @@ class ReviewAgent:
         Returns:
             Combined ReviewResult
         """
-        results: list[ReviewResult] = []
-
-        if text:
-            results.append(await self.review_text(text))
-
-        if image_urls:
-            for url in image_urls:
-                results.append(await self.review_image(url))
+        from moana.services.moderation.engine import ModerationEngine
 
-        if audio_url:
-            moderation_result = await self._moderation.moderate_audio(audio_url)
-            results.append(ReviewResult(
-                is_approved=moderation_result.is_safe,
-                moderation_result=moderation_result,
-            ))
-
-        if not results:
-            return ReviewResult(
-                is_approved=True,
-                moderation_result=ModerationResult(is_safe=True),
-            )
+        engine = ModerationEngine(self._moderation, reviewer=self)
+        book = await engine.moderate_book(
+            texts=[text] if text else [],
+            image_urls=image_urls,
+            audio_urls=[audio_url] if audio_url else [],
+        )
 
-        # Content is approved only if ALL parts are approved
-        is_approved = all(r.is_approved for r in results)
         suggestions = []
-        for r in results:
-            suggestions.extend(r.suggestions)
+        for review in book.reviews:
+            if review.raw_response:
+                suggestions.extend(review.raw_response.get("suggestions", []))
+        if not book.combined.is_safe:
+            suggestions.insert(0, "内容未通过自动审核，请修改后重新提交")
 
-        # Use the first moderation result as representative
         return ReviewResult(
-            is_approved=is_approved,
-            moderation_result=results[0].moderation_result,
+            is_approved=book.combined.is_safe and all(r.is_safe for r in book.reviews),
+            moderation_result=book.combined,
+            ai_review=book.reviews[0].raw_response if book.reviews else None,
             suggestions=suggestions,
         )
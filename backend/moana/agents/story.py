@@ -1,8 +1,15 @@
+import json
+import logging
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Optional
+
+from pydantic import ValidationError
 
 from moana.services.llm import get_llm_service
-from moana.agents.schemas import PictureBookOutline
+from moana.services.llm.json_stream import IncrementalJSONArrayParser
+from moana.agents.schemas import PictureBookOutline, PictureBookPage
+
+logger = logging.getLogger(__name__)
 
 
 # ========== 增强配置数据类 ==========
@@ -247,6 +254,7 @@ class StoryAgent:
         favorite_characters: list[str] | None = None,
         num_pages: int = 8,
         style_config: StyleConfig | None = None,
+        on_page: Callable[[int, PictureBookPage], None] | None = None,
     ) -> PictureBookOutline:
         """Generate a picture book outline.
 
@@ -258,6 +266,8 @@ class StoryAgent:
             favorite_characters: 喜欢的角色列表
             num_pages: 绘本页数
             style_config: 风格配置（美术风格、主角、色彩）
+            on_page: 流式生成时每页完成即回调 (页下标, 页面)，
+                     调用方可在大纲完成前开始该页的插图和音频
         """
         chars = favorite_characters or ["小兔子"]
         chars_str = "、".join(chars)
@@ -279,6 +289,9 @@ class StoryAgent:
 
 请输出完整的绘本结构。"""
 
+        if on_page is not None:
+            return await self._generate_outline_stream(prompt, system_prompt, on_page)
+
         outline = await self._llm.generate_structured(
             prompt=prompt,
             output_schema=PictureBookOutline,
@@ -288,6 +301,66 @@ class StoryAgent:
 
         return outline
 
+    async def _generate_outline_stream(
+        self,
+        prompt: str,
+        system_prompt: str,
+        on_page: Callable[[int, PictureBookPage], None],
+    ) -> PictureBookOutline:
+        """流式生成大纲，pages 数组中每个元素闭合时立即回调.
+
+        流式输出无法解析或校验失败时退回 generate_structured，
+        只对与已分发内容不同（或尚未分发）的页面再次回调。
+        """
+        schema_json = json.dumps(PictureBookOutline.model_json_schema(), indent=2)
+        structured_prompt = f"""{prompt}
+
+Please respond with a valid JSON object that matches this schema:
+{schema_json}
+
+IMPORTANT:
+- Respond ONLY with the JSON object
+- Do NOT include markdown code blocks
+- Output the "pages" array before "total_interactions"
+- The response must be complete and valid JSON"""
+
+        parser = IncrementalJSONArrayParser("pages")
+        dispatched: dict[int, PictureBookPage] = {}
+        page_index = 0
+        try:
+            async for chunk in self._llm.generate_stream(
+                prompt=structured_prompt,
+                system_prompt=f"{system_prompt}\nYou are a helpful assistant that responds in valid JSON format only.",
+                temperature=0.8,
+                max_tokens=8192,
+            ):
+                for item in parser.feed(chunk):
+                    try:
+                        page = PictureBookPage.model_validate(item)
+                    except ValidationError as e:
+                        # 不提前分发，最终校验失败时整体退回非流式生成
+                        logger.warning(f"[StoryAgent] Streamed page {page_index + 1} is invalid: {e}")
+                    else:
+                        on_page(page_index, page)
+                        dispatched[page_index] = page
+                    page_index += 1
+
+            return PictureBookOutline.model_validate(parser.result())
+        except ValueError as e:
+            # JSONDecodeError / ValidationError 均为 ValueError；截断的输出由 result() 抛出
+            logger.warning(f"[StoryAgent] Streamed outline unusable, falling back to structured output: {e}")
+
+        outline = await self._llm.generate_structured(
+            prompt=prompt,
+            output_schema=PictureBookOutline,
+            system_prompt=system_prompt,
+            temperature=0.8,
+        )
+        for index, page in enumerate(outline.pages):
+            if dispatched.get(index) != page:
+                on_page(index, page)
+        return outline
+
     async def refine_page(
         self,
         page: dict,
@@ -4,6 +4,13 @@
 Includes:
 - Storage statistics and cleanup
 - System health checks
+- Generation scheduler stats
+- Provider limiter / quota / HTTP pool / event loop monitoring
+- LLM helper call cache metrics
+- Outstanding provider job polling
+- Content moderation engine metrics
+- TTS audio cache hit rate
+- ffmpeg transcoding concurrency
 """
 import logging
 from typing import Optional
@@ -40,6 +47,7 @@ class CleanupResponse(BaseModel):
     deleted_bytes: int
     deleted_mb: float
     failed_deletions: int
+    evicted_cache_entries: int = 0
     dry_run: bool
     duration_seconds: float
     orphan_file_list: list[str]
@@ -81,6 +89,8 @@ async def cleanup_storage(
     - dry_run=true (default): Only reports what would be deleted
     - min_age_hours: Only files older than this are considered orphans
       (prevents deleting files that are still being generated)
+    - TTS cache entries unused for TTS_CACHE_MAX_IDLE_DAYS are evicted first;
+      audio still cached is never treated as orphaned
 
     **Example usage:**
     1. First run with dry_run=true to see what would be deleted
@@ -92,6 +102,7 @@ async def cleanup_storage(
     - orphan_files: Files identified as orphans
     - deleted_files: Files actually deleted (0 if dry_run)
     - deleted_mb: Space freed in MB
+    - evicted_cache_entries: Stale TTS cache entries removed (or to be removed)
     """
     try:
         cleanup = OrphanFileCleanup(min_age_hours=min_age_hours)
@@ -105,6 +116,7 @@ async def cleanup_storage(
             deleted_bytes=result.deleted_bytes,
             deleted_mb=round(result.deleted_bytes / (1024 * 1024), 2),
             failed_deletions=result.failed_deletions,
+            evicted_cache_entries=result.evicted_cache_entries,
             dry_run=result.dry_run,
             duration_seconds=round(result.duration_seconds, 2),
             orphan_file_list=result.orphan_file_list[:100],  # Limit for response
@@ -128,17 +140,133 @@ async def get_providers():
     """Get currently configured service providers.
 
     Returns the active providers for each service type,
-    useful for debugging and monitoring.
+    useful for debugging and monitoring, plus the remaining
+    request quota of quota-limited providers (Veo, Suno) and
+    image provider latency / hedging counters.
     """
     from moana.config import get_settings
+    from moana.services.image.hedged import image_hedge_stats
+    from moana.services.ratelimit import provider_quota_status
 
     settings = get_settings()
 
     return {
         "llm": settings.llm_provider,
-        "image": settings.image_provider,
+        "image": settings.image_provider_chain or settings.image_provider,
         "tts": settings.tts_provider,
         "music": settings.music_provider,
         "video": settings.video_provider,
         "storage": settings.storage_provider,
+        "quota": await provider_quota_status(),
+        "image_hedging": image_hedge_stats(),
     }
+
+
+@router.get("/scheduler")
+async def get_scheduler_stats():
+    """Get generation scheduler stats for this worker.
+
+    Returns running/queued counts per content type.
+    """
+    from moana.services.scheduler import get_generation_scheduler
+
+    return get_generation_scheduler().stats()
+
+
+@router.get("/limiters")
+async def get_limiter_stats():
+    """Get adaptive provider concurrency limits for this worker.
+
+    Returns current limit, in-flight and waiting calls per provider/model.
+    """
+    from moana.services.ratelimit import provider_limiter_stats
+
+    return {"limiters": provider_limiter_stats()}
+
+
+@router.get("/http-pools")
+async def get_http_pool_stats():
+    """Get pooled upstream HTTP client usage for this worker.
+
+    Returns requests, in-flight calls and open/idle connections per upstream,
+    useful for tuning HTTP_MAX_CONNECTIONS / HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    plus pooled Qwen realtime TTS WebSocket sessions.
+    """
+    from moana.services.http import http_pool_stats
+    from moana.services.tts.qwen import get_qwen_session_pool
+
+    return {"pools": http_pool_stats(), "tts_sessions": get_qwen_session_pool().stats()}
+
+
+@router.get("/llm-memo")
+async def get_llm_memo_stats():
+    """Get LLM helper call cache metrics for this worker.
+
+    Returns memory / persistent hits, misses and hit rate per call site
+    (smart_analyze, suno_prompt, video_style, intent).
+    """
+    from moana.services.llm import llm_memo_stats
+
+    return {"sites": llm_memo_stats()}
+
+
+@router.get("/loop")
+async def get_loop_stats(
+    top: int = Query(10, ge=1, le=50, description="Number of top offenders to return"),
+):
+    """Get event loop lag for this worker.
+
+    Returns p50/p99/max lag over the recent window and the call sites
+    that blocked the loop longest (with captured stacks).
+    """
+    from moana.services.loop_monitor import get_loop_monitor
+
+    return get_loop_monitor().stats(top=top)
+
+
+@router.get("/jobs")
+async def get_job_stats():
+    """Get outstanding provider jobs tracked by this worker.
+
+    Returns per-kind outstanding counts and learned completion durations
+    that drive the adaptive polling schedule.
+    """
+    from moana.services.jobs import get_job_poller
+
+    return get_job_poller().stats()
+
+
+@router.get("/moderation")
+async def get_moderation_stats():
+    """Get content moderation engine metrics for this worker.
+
+    Returns provider checks, verdict cache hits, failures and
+    background reviews still running.
+    """
+    from moana.services.moderation import get_moderation_engine
+
+    return get_moderation_engine().stats()
+
+
+@router.get("/tts-cache")
+async def get_tts_cache_stats():
+    """Get TTS audio cache metrics.
+
+    Returns this worker's hits / misses / hit rate plus persisted entry
+    count and lifetime hits across all workers.
+    """
+    from moana.services.tts.cache import tts_cache_stats
+
+    return await tts_cache_stats()
+
+
+@router.get("/ffmpeg")
+async def get_ffmpeg_stats():
+    """Get ffmpeg transcoding load for this worker.
+
+    Returns running / waiting processes against FFMPEG_MAX_CONCURRENCY,
+    plus spawned and failed process counts.
+    """
+    from moana.services.audio import ffmpeg_stats
+
+    return ffmpeg_stats()
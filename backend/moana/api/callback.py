@@ -9,12 +9,28 @@ from typing import Any
 from fastapi import APIRouter, Query
 from pydantic import BaseModel
 
+from moana.services.task_state import TaskStateStore, get_task_state_store
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# In-memory task status storage (use Redis in production for persistence)
-_task_status: dict[str, dict[str, Any]] = {}
+
+# Task status storage (backend configured via TASK_STATE_BACKEND)
+def _task_store() -> TaskStateStore:
+    return get_task_state_store("suno")
+
+
+def _video_task_store() -> TaskStateStore:
+    return get_task_state_store("suno_video")
+
+
+def _format_updated_at(state: dict[str, Any]) -> dict[str, Any]:
+    """Convert stored epoch updated_at to ISO format for responses."""
+    updated_at = state.get("updated_at")
+    if isinstance(updated_at, (int, float)):
+        state = {**state, "updated_at": datetime.fromtimestamp(updated_at).isoformat()}
+    return state
 
 
 class SunoCallbackPayload(BaseModel):
@@ -51,6 +67,8 @@ async def suno_callback(
     - FIRST_SUCCESS: First song completed
     - SUCCESS: All songs completed
     - Error states: SENSITIVE_WORD_ERROR, CREATE_TASK_FAILED, etc.
+
+    写入状态存储后，等待该任务的 SunoMusicService 会被立即唤醒。
     """
     # Use task_id from query param or payload
     effective_task_id = task_id or payload.taskId
@@ -99,16 +117,22 @@ async def suno_callback(
         ]
         logger.info(f"  Tracks received: {len(tracks)}")
 
-    # Store status
-    _task_status[effective_task_id] = {
-        "task_id": effective_task_id,
-        "status": status,
-        "progress": progress_map.get(status, 20),
-        "stage": stage_map.get(status, "processing"),
-        "error_message": payload.errorMessage,
-        "updated_at": datetime.now().isoformat(),
-        "tracks": tracks,
-    }
+    # Store status (final statuses expire after the finished TTL)
+    store = _task_store()
+    progress = progress_map.get(status, 20)
+    await store.set(
+        effective_task_id,
+        {
+            "task_id": effective_task_id,
+            "suno_task_id": payload.taskId,
+            "status": status,
+            "progress": progress,
+            "stage": stage_map.get(status, "processing"),
+            "error_message": payload.errorMessage,
+            "tracks": tracks,
+        },
+        ttl=store.finished_ttl if progress >= 100 else None,
+    )
 
     return {"status": "ok", "received": status}
 
@@ -119,9 +143,9 @@ async def get_suno_task_status(task_id: str) -> TaskStatusResponse:
 
     Frontend can poll this endpoint to show progress.
     """
-    if task_id in _task_status:
-        data = _task_status[task_id]
-        return TaskStatusResponse(**data)
+    data = await _task_store().get(task_id)
+    if data is not None:
+        return TaskStatusResponse(**_format_updated_at(data))
 
     # Task not found - might not have received callback yet
     return TaskStatusResponse(
@@ -137,10 +161,9 @@ async def get_suno_task_status(task_id: str) -> TaskStatusResponse:
 async def clear_task_status(task_id: str):
     """Clear task status after frontend has retrieved final result.
 
-    Helps prevent memory leak from accumulated task statuses.
+    Finished statuses also expire automatically after the finished TTL.
     """
-    if task_id in _task_status:
-        del _task_status[task_id]
+    if await _task_store().delete(task_id):
         return {"status": "ok", "message": "Task status cleared"}
     return {"status": "ok", "message": "Task not found"}
 
@@ -151,10 +174,8 @@ async def list_task_statuses(limit: int = 50):
 
     Returns most recent tasks first.
     """
-    tasks = list(_task_status.values())
-    # Sort by updated_at descending
-    tasks.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
-    return {"tasks": tasks[:limit], "total": len(_task_status)}
+    tasks = await _task_store().list_states(limit=limit)
+    return {"tasks": [_format_updated_at(t) for t in tasks], "total": len(tasks)}
 
 
 # ========== Video Callback ==========
@@ -170,10 +191,6 @@ class SunoVideoCallbackPayload(BaseModel):
         extra = "allow"
 
 
-# Video task status storage
-_video_task_status: dict[str, dict[str, Any]] = {}
-
-
 @router.post("/suno/video")
 async def suno_video_callback(
     payload: SunoVideoCallbackPayload,
@@ -192,13 +209,17 @@ async def suno_video_callback(
     video_url = payload.videoUrl or ""
     logger.info(f"Suno video callback: task_id={effective_task_id}, status={status}, video_url={video_url[:50] if video_url else 'N/A'}")
 
-    _video_task_status[effective_task_id] = {
-        "task_id": effective_task_id,
-        "status": status,
-        "video_url": video_url,
-        "error_message": payload.errorMessage,
-        "updated_at": datetime.now().isoformat(),
-    }
+    store = _video_task_store()
+    await store.set(
+        effective_task_id,
+        {
+            "task_id": effective_task_id,
+            "status": status,
+            "video_url": video_url,
+            "error_message": payload.errorMessage,
+        },
+        ttl=store.finished_ttl if status != "PENDING" else None,
+    )
 
     return {"status": "ok", "received": status}
 
@@ -206,8 +227,9 @@ async def suno_video_callback(
 @router.get("/suno/video/status/{task_id}")
 async def get_suno_video_status(task_id: str):
     """Get status of a Suno video generation task."""
-    if task_id in _video_task_status:
-        return _video_task_status[task_id]
+    data = await _video_task_store().get(task_id)
+    if data is not None:
+        return _format_updated_at(data)
 
     return {
         "task_id": task_id,
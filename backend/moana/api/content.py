@@ -1,10 +1,16 @@
 # src/moana/api/content.py
 import asyncio
+import json
 import logging
+import time
 from datetime import datetime
-from typing import Annotated, Optional, Any
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Response
+from fastapi import (
+    APIRouter, Depends, HTTPException, Query, BackgroundTasks, Response,
+    Header, Request, WebSocket, WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 from sqlalchemy import select, desc, literal_column, text
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,9 +19,24 @@ from uuid import uuid4
 from moana.database import get_db, async_session_factory
 from moana.models.content import Content, ContentType, ContentStatus
 from moana.pipelines.picture_book import PictureBookPipeline
+from moana.pipelines.checkpoint import PipelineCheckpoint
 from moana.pipelines.nursery_rhyme import NurseryRhymePipeline
 from moana.pipelines.video import VideoPipeline
 from moana.services.music.base import MusicStyle
+from moana.services.scheduler import (
+    JobPriority,
+    QueueFullError,
+    get_generation_deduplicator,
+    get_generation_scheduler,
+    request_fingerprint,
+)
+from moana.services.task_state import (
+    TERMINAL_STATUSES,
+    TaskStateStore,
+    TaskProgressReporter,
+    get_task_state_store,
+    wait_task_event,
+)
 from moana.themes import get_themes_by_category, Theme
 
 logger = logging.getLogger(__name__)
@@ -23,8 +44,9 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # ========== 异步任务状态存储 ==========
-# 生产环境应使用 Redis
-_task_status: dict[str, dict[str, Any]] = {}
+# 后端由 TASK_STATE_BACKEND 配置，多 worker 部署时使用 sql 或 redis 共享状态
+def _task_store() -> TaskStateStore:
+    return get_task_state_store("content")
 
 
 # ========== Content List API ==========
@@ -387,9 +409,14 @@ async def get_content(
     """Get content details by ID.
 
     返回内容详情，根据内容类型返回扁平化的数据结构：
-    - picture_book: 包含 pages 数组、educational_goal、total_interactions
+    - picture_book: 包含 pages 数组、educational_goal、total_interactions、
+      narration（整本朗读的整段音频与 cue 表，可能为 null）
     - nursery_rhyme: 包含 lyrics、audio_url、cover_url、educational_goal
     - video: 包含 video_url、clips、thumbnail_url
+
+    status 为 partial 时绘本仍在生成：未就绪的页面 ready=false，
+    image_url 为空，audio_url 为空或为正在流式写入的音频（可边写边播放），
+    前端可按 ready_pages 逐页播放并稍后刷新。
     """
     result = await db.execute(
         select(Content).where(Content.id == content_id)
@@ -409,6 +436,7 @@ async def get_content(
         "theme_category": content.theme_category,
         "theme_topic": content.theme_topic,
         "personalization": content.personalization,
+        "status": content.status.value,
         "created_at": content.created_at.isoformat() if content.created_at else None,
     }
 
@@ -428,6 +456,7 @@ async def get_content(
                 "image_thumb_url": page.get("image_thumb_url"),
                 "audio_url": page.get("audio_url", ""),
                 "duration": page.get("audio_duration", page.get("duration", 5)),
+                "ready": page.get("ready", True),
             }
             # Include interaction if present
             if page.get("interaction"):
@@ -440,6 +469,9 @@ async def get_content(
             "total_duration": content.duration or sum(p.get("duration", 5) for p in transformed_pages),
             "total_interactions": content_data.get("total_interactions", len([p for p in raw_pages if p.get("interaction")])),
             "cover_url": (raw_pages[0].get("image_thumb_url") or raw_pages[0].get("image_url")) if raw_pages else None,
+            "ready_pages": sum(1 for p in transformed_pages if p["ready"]),
+            # 整本朗读时播放器可只下载 narration.audio_url，按 cues 翻页
+            "narration": content_data.get("narration"),
         })
     elif content.content_type.value == "nursery_rhyme":
         # Nursery rhyme specific fields
@@ -1012,6 +1044,7 @@ async def save_content_to_db(
     duration: Optional[int],
     generated_by: dict,
     child_id: Optional[str] = None,
+    status: ContentStatus = ContentStatus.READY,
 ) -> str:
     """Save generated content to database using raw SQL to avoid enum issues."""
     import json
@@ -1026,7 +1059,7 @@ async def save_content_to_db(
             generated_by, duration
         ) VALUES (
             :id, :child_id, :title, :content_type, :theme_category, :theme_topic,
-            :personalization, :content_data, 'ready', 'pending', '{}',
+            :personalization, :content_data, :status, 'pending', '{}',
             :generated_by, :duration
         )
     """)
@@ -1042,12 +1075,153 @@ async def save_content_to_db(
         "content_data": json.dumps(content_data),
         "generated_by": json.dumps(generated_by),
         "duration": duration,
+        "status": status.value,
     })
     await db.commit()
 
     return content_id
 
 
+async def update_content_in_db(
+    db: AsyncSession,
+    content_id: str,
+    status: ContentStatus,
+    title: Optional[str] = None,
+    personalization: Optional[dict] = None,
+    content_data: Optional[dict] = None,
+    duration: Optional[int] = None,
+    generated_by: Optional[dict] = None,
+) -> None:
+    """Update generated content using raw SQL (same enum handling as save_content_to_db)."""
+    fields = {
+        "status": status.value,
+        "title": title,
+        "personalization": json.dumps(personalization) if personalization is not None else None,
+        "content_data": json.dumps(content_data) if content_data is not None else None,
+        "duration": duration,
+        "generated_by": json.dumps(generated_by) if generated_by is not None else None,
+    }
+    fields = {k: v for k, v in fields.items() if v is not None}
+    assignments = ", ".join(f"{k} = :{k}" for k in fields)
+
+    await db.execute(
+        text(f"UPDATE contents SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = :id"),
+        {**fields, "id": content_id},
+    )
+    await db.commit()
+
+
+class _PartialPictureBookWriter:
+    """渐进式交付绘本：大纲完成即创建 partial 内容，每页就绪后写入.
+
+    GET /content/{id} 对未就绪的页面返回占位（ready=false），播放器可以
+    在第一页就绪后立即开始阅读。同一任务的页面写入串行执行，避免并发
+    覆盖 content_data。
+    """
+
+    def __init__(self):
+        self.content_id: str | None = None
+        self._content_data: dict = {}
+        self._lock = asyncio.Lock()
+
+    async def start(
+        self,
+        outline,
+        theme_category: str,
+        theme_topic: str,
+        personalization: dict,
+        extra_data: dict,
+        content_id: str | None = None,
+    ) -> str:
+        """创建（或重试时重置）partial 内容，所有页面先写入占位."""
+        self._content_data = {
+            "pages": [
+                {
+                    "page_num": page.page_num,
+                    "text": page.text,
+                    "image_url": None,
+                    "image_thumb_url": None,
+                    "image_prompt": page.image_prompt,
+                    "audio_url": None,
+                    "audio_duration": 0,
+                    "interaction": page.interaction.model_dump() if page.interaction else None,
+                    "ready": False,
+                }
+                for page in outline.pages
+            ],
+            "educational_goal": outline.educational_goal,
+            "total_interactions": outline.total_interactions,
+            **extra_data,
+        }
+
+        async with async_session_factory() as db:
+            if content_id and await db.get(Content, content_id) is not None:
+                await update_content_in_db(
+                    db,
+                    content_id,
+                    status=ContentStatus.PARTIAL,
+                    title=outline.title,
+                    personalization=personalization,
+                    content_data=self._content_data,
+                )
+            else:
+                content_id = await save_content_to_db(
+                    db=db,
+                    title=outline.title,
+                    content_type=ContentType.PICTURE_BOOK,
+                    theme_category=theme_category,
+                    theme_topic=theme_topic,
+                    personalization=personalization,
+                    content_data=self._content_data,
+                    duration=None,
+                    generated_by={},
+                    status=ContentStatus.PARTIAL,
+                )
+
+        self.content_id = content_id
+        return content_id
+
+    async def page_ready(self, index: int, page_data: dict) -> None:
+        """写入一页已完成的插图和音频."""
+        async with self._lock:
+            self._content_data["pages"][index] = {**page_data, "ready": True}
+            async with async_session_factory() as db:
+                await update_content_in_db(
+                    db,
+                    self.content_id,
+                    status=ContentStatus.PARTIAL,
+                    content_data=self._content_data,
+                )
+
+    async def page_audio(self, index: int, audio_url: str) -> None:
+        """写入正在流式合成的音频 URL（页面仍未就绪，但音频已可边写边播放）."""
+        async with self._lock:
+            pages = self._content_data.get("pages", [])
+            # 大纲流式生成时音频可能早于 partial 内容创建，此时由 page_ready 写入
+            if self.content_id is None or index >= len(pages) or pages[index].get("ready"):
+                return
+            page = pages[index]
+            page["audio_url"] = audio_url
+            async with async_session_factory() as db:
+                await update_content_in_db(
+                    db,
+                    self.content_id,
+                    status=ContentStatus.PARTIAL,
+                    content_data=self._content_data,
+                )
+
+    async def finish(self, **fields) -> None:
+        """全部完成，写入最终内容并标记为 ready."""
+        async with self._lock:
+            async with async_session_factory() as db:
+                await update_content_in_db(db, self.content_id, status=ContentStatus.READY, **fields)
+
+    async def fail(self) -> None:
+        """生成失败，partial 内容标记为 failed."""
+        async with async_session_factory() as db:
+            await update_content_in_db(db, self.content_id, status=ContentStatus.FAILED)
+
+
 class ProtagonistConfig(BaseModel):
     """主角配置."""
     animal: str | None = Field(default="bunny", description="动物类型: bunny, bear, cat, dog, panda, fox")
@@ -1154,6 +1328,8 @@ class AsyncTaskResponse(BaseModel):
     task_id: str
     status: str
     message: str
+    queue_position: int | None = None  # 排队位置（0 = 下一个执行）
+    estimated_wait_seconds: int | None = None  # 预计排队等待秒数
 
 
 class TaskStatusResponse(BaseModel):
@@ -1166,6 +1342,132 @@ class TaskStatusResponse(BaseModel):
     content_id: str | None = None  # 完成后的内容ID
     result: dict | None = None  # 完成后的结果
     error: str | None = None
+    queue_position: int | None = None  # 排队中时的位置（0 = 下一个执行）
+    estimated_wait_seconds: int | None = None  # 排队中时的预计等待秒数
+
+
+def _queue_full_exception(error: QueueFullError) -> HTTPException:
+    """队列已满 -> 429 + Retry-After."""
+    return HTTPException(
+        status_code=429,
+        detail={"code": "QUEUE_FULL", "message": "生成任务排队已满，请稍后再试"},
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
+def _check_queue_capacity(content_type: str) -> None:
+    """在创建任务前检查排队容量，避免队列已满时还执行智能分析等前置步骤."""
+    try:
+        get_generation_scheduler().check_capacity(content_type)
+    except QueueFullError as e:
+        raise _queue_full_exception(e)
+
+
+async def _submit_generation(
+    task_id: str,
+    content_type: str,
+    factory,
+    priority: int = JobPriority.NORMAL,
+    fingerprint: str | None = None,
+) -> AsyncTaskResponse:
+    """提交生成任务到调度器，返回排队信息."""
+    try:
+        info = get_generation_scheduler().submit(task_id, content_type, factory, priority=priority)
+    except QueueFullError as e:
+        await _task_store().delete(task_id)
+        if fingerprint:
+            await get_generation_deduplicator().release(fingerprint, task_id)
+        raise _queue_full_exception(e)
+
+    if info.position or info.estimated_wait_seconds:
+        await _task_store().update(
+            task_id,
+            queue_position=info.position,
+            estimated_wait_seconds=info.estimated_wait_seconds,
+        )
+    return AsyncTaskResponse(
+        task_id=task_id,
+        status="pending",
+        message="",
+        queue_position=info.position,
+        estimated_wait_seconds=info.estimated_wait_seconds,
+    )
+
+
+async def _coalesce_generation(
+    task_id: str,
+    content_type: str,
+    request: BaseModel,
+) -> tuple[str, AsyncTaskResponse | None]:
+    """相同参数的请求合并到进行中的任务，或复用窗口内已完成的内容.
+
+    调用前需已写入 task_id 的 pending 状态。
+
+    Returns:
+        (请求指纹, 命中时直接返回的响应；未命中为 None)
+    """
+    fingerprint = request_fingerprint(content_type, request.model_dump(exclude_none=True))
+    decision = await get_generation_deduplicator().claim(fingerprint, task_id)
+    if decision.action == "new":
+        return fingerprint, None
+
+    # 命中已有任务，丢弃刚创建的 pending 状态
+    await _task_store().delete(task_id)
+
+    if decision.action == "reuse":
+        logger.info(f"[Dedup] {content_type} request reuses content {decision.content_id} "
+                    f"from task {decision.task_id}")
+        return fingerprint, AsyncTaskResponse(
+            task_id=decision.task_id,
+            status="completed",
+            message="相同内容已生成，直接返回",
+        )
+
+    logger.info(f"[Dedup] {content_type} request joined in-flight task {decision.task_id}")
+    status = await _task_store().get(decision.task_id) or {}
+    existing = _build_task_status_response(decision.task_id, status)
+    return fingerprint, AsyncTaskResponse(
+        task_id=decision.task_id,
+        status=existing.status,
+        message="相同请求正在生成中，已合并到现有任务",
+        queue_position=existing.queue_position,
+        estimated_wait_seconds=existing.estimated_wait_seconds,
+    )
+
+
+async def _get_task_status_response(task_id: str) -> TaskStatusResponse:
+    """读取任务状态."""
+    status = await _task_store().get(task_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return _build_task_status_response(task_id, status)
+
+
+def _build_task_status_response(task_id: str, status: dict) -> TaskStatusResponse:
+    """状态 dict -> 响应；排队中的任务优先使用本进程调度器的实时排队信息."""
+    queue_position = None
+    estimated_wait = None
+    if status.get("status") == "pending":
+        info = get_generation_scheduler().queue_info(task_id)
+        if info is not None:
+            queue_position = info.position
+            estimated_wait = info.estimated_wait_seconds
+        else:
+            queue_position = status.get("queue_position")
+            estimated_wait = status.get("estimated_wait_seconds")
+
+    return TaskStatusResponse(
+        task_id=task_id,
+        status=status.get("status", "unknown"),
+        progress=status.get("progress", 0),
+        stage=status.get("stage"),
+        message=status.get("message"),
+        content_id=status.get("content_id"),
+        result=status.get("result"),
+        error=status.get("error"),
+        queue_position=queue_position,
+        estimated_wait_seconds=estimated_wait,
+    )
 
 
 async def _generate_picture_book_background(
@@ -1189,22 +1491,83 @@ async def _generate_picture_book_background(
     creation_mode: str = "preset",
     custom_prompt: str | None = None,
 ):
-    """后台执行绘本生成任务."""
+    """后台执行绘本生成任务.
+
+    生成参数随检查点保存；同一 task_id 重试时从最后完成的单元继续。
+    大纲完成后即创建 partial 内容并把 content_id 写入任务状态，之后每页
+    插图和音频就绪就追加到内容中，前端无需等待整本书完成即可开始阅读。
+    """
+    params = {
+        "child_name": child_name,
+        "age_months": age_months,
+        "theme_topic": theme_topic,
+        "theme_category": theme_category,
+        "favorite_characters": favorite_characters,
+        "voice_id": voice_id,
+        "art_style": art_style,
+        "protagonist_animal": protagonist_animal,
+        "protagonist_color": protagonist_color,
+        "protagonist_accessory": protagonist_accessory,
+        "color_palette": color_palette,
+        "story_enhancement": story_enhancement,
+        "visual_enhancement": visual_enhancement,
+        "creation_mode": creation_mode,
+        "custom_prompt": custom_prompt,
+    }
+
+    partial = _PartialPictureBookWriter()
+
     try:
-        _task_status[task_id] = {
+        await _task_store().set(task_id, {
             "status": "processing",
             "progress": 5,
             "stage": "init",
             "message": "初始化...",
-        }
+        })
 
         pipeline = PictureBookPipeline()
+        reporter = TaskProgressReporter(_task_store(), task_id)
+        checkpoint = PipelineCheckpoint(task_id)
+        await checkpoint.load(params)
+
+        personalization = {
+            "child_name": child_name,
+            "favorite_characters": favorite_characters or [],
+            "age_months": age_months,
+        }
+        if voice_id:
+            personalization["voice_id"] = voice_id
+        user_inputs = {
+            # 保存用户输入的增强参数
+            "story_enhancement": story_enhancement,
+            "visual_enhancement": visual_enhancement,
+            # 保存创作模式和自定义提示词
+            "creation_mode": creation_mode,
+            "custom_prompt": custom_prompt,
+        }
 
-        _task_status[task_id].update({
-            "progress": 10,
-            "stage": "story",
-            "message": "正在创作故事...",
-        })
+        async def on_outline(outline):
+            # 重试时复用上次创建的 partial 内容
+            content_id = await partial.start(
+                outline,
+                theme_category=theme_category,
+                theme_topic=theme_topic,
+                personalization=personalization,
+                extra_data=user_inputs,
+                content_id=checkpoint.units.get("content_id"),
+            )
+            await checkpoint.save("content_id", content_id)
+            await _task_store().update(task_id, content_id=content_id)
+
+        await _task_store().update(
+            task_id,
+            progress=10,
+            stage="story",
+            message="正在创作故事...",
+        )
+
+        # 插图与音频并行生成，分别记录已完成数量
+        media_done = {"images": 0, "audio": 0}
 
         def on_progress(progress):
             """进度回调 - 接收 GenerationProgress 对象.
@@ -1212,8 +1575,7 @@ async def _generate_picture_book_background(
             进度分配 (总计 100%):
             - init: 0-5%
             - story: 5-20%
-            - images: 20-70% (按图片数量均分)
-            - audio: 70-95% (按音频数量均分)
+            - images + audio: 20-95% (并行进行；每张图片占 50% / 页数，每条音频占 25% / 页数)
             - save: 95-100%
             """
             # 阶段代码映射
@@ -1228,29 +1590,25 @@ async def _generate_picture_book_background(
                 stage_range = 10  # 10-20%
                 calculated_progress = base_progress + int(stage_range * current / max(total, 1))
 
-            elif stage_code == "images":
-                # 图片生成: 20-70%，每张图片均分
-                stage = f"image_{current}" if current > 0 else "image_1"
-                base_progress = 20
-                stage_range = 50  # 20-70%
-                calculated_progress = base_progress + int(stage_range * current / max(total, 1))
-
-            elif stage_code == "audio":
-                # 音频生成: 70-95%，每个音频均分
-                stage = f"audio_{current}" if current > 0 else "audio_1"
-                base_progress = 70
-                stage_range = 25  # 70-95%
-                calculated_progress = base_progress + int(stage_range * current / max(total, 1))
+            elif stage_code in ("images", "audio"):
+                # 插图 / 音频并行生成: 20-95%，按两者的已完成数量合计
+                prefix = "image" if stage_code == "images" else "audio"
+                stage = f"{prefix}_{current}" if current > 0 else f"{prefix}_1"
+                media_done[stage_code] = max(media_done[stage_code], current)
+                pages = max(total, 1)
+                calculated_progress = 20 + int(
+                    50 * media_done["images"] / pages + 25 * media_done["audio"] / pages
+                )
 
             else:
                 stage = stage_code
                 calculated_progress = 50
 
-            _task_status[task_id].update({
-                "progress": calculated_progress,
-                "stage": stage,
-                "message": progress.message,
-            })
+            reporter.report(
+                progress=calculated_progress,
+                stage=stage,
+                message=progress.message,
+            )
 
         result = await pipeline.generate(
             child_name=child_name,
@@ -1271,70 +1629,77 @@ async def _generate_picture_book_background(
             visual_enhancement=visual_enhancement,
             # 传递任务 ID 用于日志记录
             task_id=task_id,
+            checkpoint=checkpoint,
+            # 渐进式交付
+            on_outline=on_outline,
+            on_page_ready=partial.page_ready,
+            on_page_audio=partial.page_audio,
+            # 预设主题优先使用预生成大纲
+            use_outline_bank=creation_mode == "preset",
         )
+        await reporter.flush()
 
-        _task_status[task_id].update({
-            "progress": 95,
-            "stage": "saving",
-            "message": "保存到数据库...",
-        })
+        await _task_store().update(
+            task_id,
+            progress=95,
+            stage="saving",
+            message="保存到数据库...",
+        )
 
-        # 使用独立的数据库会话保存
-        async with async_session_factory() as db:
-            # 合并 personalization 和用户输入参数
-            personalization = result.get("personalization", {})
-            personalization["age_months"] = age_months
-            if voice_id:
-                personalization["voice_id"] = voice_id
+        content_id = partial.content_id
+        await partial.finish(
+            title=result["title"],
+            personalization=personalization,
+            content_data={
+                "pages": result.get("pages", []),
+                "educational_goal": result.get("educational_goal", ""),
+                "total_interactions": result.get("total_interactions", 0),
+                # 保存风格配置
+                "style_config": result.get("style_config", {}),
+                # 整本朗读：整段音频 + 页码 -> 起止时间 cue 表（逐页合成时为 None）
+                "narration": result.get("narration"),
+                **user_inputs,
+            },
+            duration=int(result.get("total_duration", 0)),
+            generated_by=result.get("generated_by", {}),
+        )
 
-            content_id = await save_content_to_db(
-                db=db,
-                title=result["title"],
-                content_type=ContentType.PICTURE_BOOK,
-                theme_category=theme_category,
-                theme_topic=theme_topic,
-                personalization=personalization,
-                content_data={
-                    "pages": result.get("pages", []),
-                    "educational_goal": result.get("educational_goal", ""),
-                    "total_interactions": result.get("total_interactions", 0),
-                    # 保存风格配置
-                    "style_config": result.get("style_config", {}),
-                    # 保存用户输入的增强参数
-                    "story_enhancement": story_enhancement,
-                    "visual_enhancement": visual_enhancement,
-                    # 保存创作模式和自定义提示词
-                    "creation_mode": creation_mode,
-                    "custom_prompt": custom_prompt,
-                },
-                duration=int(result.get("total_duration", 0)),
-                generated_by=result.get("generated_by", {}),
-            )
+        # 更新生成日志的 content_id
+        from moana.services.logging import GenerationLogger
+        gen_logger = GenerationLogger(task_id=task_id)
+        await gen_logger.update_content_id(content_id)
 
-            # 更新生成日志的 content_id
-            from moana.services.logging import GenerationLogger
-            gen_logger = GenerationLogger(task_id=task_id)
-            await gen_logger.update_content_id(content_id)
+        # 内容已落库，检查点不再需要
+        await checkpoint.clear()
 
-        _task_status[task_id] = {
+        # 整本内容审核在后台并发执行，完成后写入 review_status
+        from moana.services.moderation import schedule_content_review
+        schedule_content_review(content_id, {"pages": result.get("pages", [])})
+
+        await _task_store().set(task_id, {
             "status": "completed",
             "progress": 100,
             "stage": "completed",
             "message": "生成完成",
+            # 只保存 content_id 引用，完整数据通过 GET /content/{id} 获取
             "content_id": content_id,
-            "result": result,
-        }
+        })
         logger.info(f"Picture book task {task_id} completed, content_id={content_id}")
 
     except Exception as e:
         logger.exception(f"Picture book task {task_id} failed: {e}")
-        _task_status[task_id] = {
+        if partial.content_id:
+            try:
+                await partial.fail()
+            except Exception:
+                logger.exception(f"Failed to mark partial content {partial.content_id} as failed")
+        await _task_store().set(task_id, {
             "status": "failed",
             "progress": 0,
             "stage": "failed",
             "message": "生成失败",
             "error": str(e),
-        }
+        })
 
 
 @router.post("/picture-book/async", response_model=AsyncTaskResponse)
@@ -1361,58 +1726,69 @@ async def generate_picture_book_async(
                 f"color_palette={request.color_palette}, "
                 f"child_name={request.child_name}")
 
+    _check_queue_capacity("picture_book")
     task_id = str(uuid4())
 
     # 初始化任务状态
-    _task_status[task_id] = {
+    await _task_store().set(task_id, {
         "status": "pending",
         "progress": 0,
         "stage": "pending",
         "message": "排队中...",
-    }
-
-    # Handle smart mode
-    theme_topic = request.theme_topic
-    theme_category = request.theme_category
-
-    if request.creation_mode == "smart":
-        from moana.services.smart import SmartPromptAnalyzer
-
-        if not request.custom_prompt:
-            raise HTTPException(
-                status_code=422,
-                detail={"code": "VALIDATION_ERROR", "message": "智能创作模式下必须提供 custom_prompt"}
-            )
+    })
 
-        logger.info(f"Smart mode: analyzing prompt '{request.custom_prompt[:50]}...'")
+    fingerprint, coalesced = await _coalesce_generation(task_id, "picture_book", request)
+    if coalesced is not None:
+        return coalesced
 
-        analyzer = SmartPromptAnalyzer()
-        analysis = await analyzer.analyze(
-            custom_prompt=request.custom_prompt,
-            child_name=request.child_name,
-            age_months=request.age_months,
-            content_type="picture_book",
-        )
-        theme_topic = analysis.theme_topic
-        theme_category = analysis.theme_category
-
-        logger.info(f"Smart mode: inferred topic='{theme_topic}', category='{theme_category}'")
-    else:  # preset mode
-        # Validate that theme_topic and theme_category are provided
-        if not theme_topic or not theme_category:
-            raise HTTPException(
-                status_code=422,
-                detail={"code": "VALIDATION_ERROR", "message": "预设模式下必须提供 theme_topic 和 theme_category"}
+    try:
+        # Handle smart mode
+        theme_topic = request.theme_topic
+        theme_category = request.theme_category
+
+        if request.creation_mode == "smart":
+            from moana.services.smart import SmartPromptAnalyzer
+
+            if not request.custom_prompt:
+                raise HTTPException(
+                    status_code=422,
+                    detail={"code": "VALIDATION_ERROR", "message": "智能创作模式下必须提供 custom_prompt"}
+                )
+
+            logger.info(f"Smart mode: analyzing prompt '{request.custom_prompt[:50]}...'")
+
+            analyzer = SmartPromptAnalyzer()
+            analysis = await analyzer.analyze(
+                custom_prompt=request.custom_prompt,
+                child_name=request.child_name,
+                age_months=request.age_months,
+                content_type="picture_book",
             )
-
-    # 解析主角设定
-    protagonist = request.protagonist
-    protagonist_animal = protagonist.animal if protagonist else None
-    protagonist_color = protagonist.color if protagonist else None
-    protagonist_accessory = protagonist.accessory if protagonist else None
-
-    # 使用 asyncio.create_task 立即开始执行
-    asyncio.create_task(
+            theme_topic = analysis.theme_topic
+            theme_category = analysis.theme_category
+
+            logger.info(f"Smart mode: inferred topic='{theme_topic}', category='{theme_category}'")
+        else:  # preset mode
+            # Validate that theme_topic and theme_category are provided
+            if not theme_topic or not theme_category:
+                raise HTTPException(
+                    status_code=422,
+                    detail={"code": "VALIDATION_ERROR", "message": "预设模式下必须提供 theme_topic 和 theme_category"}
+                )
+
+        # 解析主角设定
+        protagonist = request.protagonist
+        protagonist_animal = protagonist.animal if protagonist else None
+        protagonist_color = protagonist.color if protagonist else None
+        protagonist_accessory = protagonist.accessory if protagonist else None
+    except Exception:
+        # 未能提交的任务不应被后续相同请求合并
+        await get_generation_deduplicator().release(fingerprint, task_id)
+        await _task_store().delete(task_id)
+        raise
+
+    # 提交到调度器，有空闲槽位时立即执行，否则排队
+    response = await _submit_generation(task_id, "picture_book", lambda: (
         _generate_picture_book_background(
             task_id=task_id,
             child_name=request.child_name,
@@ -1434,13 +1810,48 @@ async def generate_picture_book_async(
             creation_mode=request.creation_mode,
             custom_prompt=request.custom_prompt,
         )
-    )
+    ), fingerprint=fingerprint)
+    response.message = "绘本生成任务已创建，请轮询状态"
+    return response
 
-    return AsyncTaskResponse(
-        task_id=task_id,
-        status="pending",
-        message="绘本生成任务已创建，请轮询状态",
+
+# 处理中的任务超过该时长没有任何进度更新，视为所在 worker 已退出，允许重试
+_STALE_TASK_SECONDS = 600
+
+
+@router.post("/picture-book/retry/{task_id}", response_model=AsyncTaskResponse)
+async def retry_picture_book(task_id: str):
+    """重试失败（或所在 worker 已退出）的绘本任务，从检查点继续.
+
+    已完成的故事大纲、插图、音频不会重新生成。
+    """
+    params = await PipelineCheckpoint.get_params(task_id)
+    if params is None:
+        raise HTTPException(status_code=404, detail="No checkpoint for task")
+
+    status = await _task_store().get(task_id)
+    if status is not None and status.get("status") != "failed":
+        stale = time.time() - float(status.get("updated_at") or 0) > _STALE_TASK_SECONDS
+        queued_here = get_generation_scheduler().queue_info(task_id) is not None
+        if status.get("status") == "completed" or queued_here or not stale:
+            raise HTTPException(status_code=409, detail="Task is not retryable")
+
+    _check_queue_capacity("picture_book")
+    await _task_store().set(task_id, {
+        "status": "pending",
+        "progress": 0,
+        "stage": "pending",
+        "message": "排队中...",
+    })
+
+    # 重试任务优先执行
+    response = await _submit_generation(
+        task_id, "picture_book",
+        lambda: _generate_picture_book_background(task_id=task_id, **params),
+        priority=JobPriority.HIGH,
     )
+    response.message = "绘本任务已重新提交，将从检查点继续"
+    return response
 
 
 @router.get("/picture-book/status/{task_id}", response_model=TaskStatusResponse)
@@ -1449,20 +1860,7 @@ async def get_picture_book_status(task_id: str):
 
     前端应每 3-5 秒轮询一次，直到 status 为 completed 或 failed。
     """
-    if task_id not in _task_status:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    status = _task_status[task_id]
-    return TaskStatusResponse(
-        task_id=task_id,
-        status=status.get("status", "unknown"),
-        progress=status.get("progress", 0),
-        stage=status.get("stage"),
-        message=status.get("message"),
-        content_id=status.get("content_id"),
-        result=status.get("result"),
-        error=status.get("error"),
-    )
+    return await _get_task_status_response(task_id)
 
 
 @router.post("/picture-book", response_model=PictureBookResponse)
@@ -1507,6 +1905,7 @@ async def generate_picture_book(
                 "pages": result.get("pages", []),
                 "educational_goal": result.get("educational_goal", ""),
                 "total_interactions": result.get("total_interactions", 0),
+                "narration": result.get("narration"),
             },
             duration=int(result.get("total_duration", 0)),
             generated_by=result.get("generated_by", {}),
@@ -1705,14 +2104,15 @@ async def _generate_nursery_rhyme_background(
     music_style = style_map.get(music_style_str, MusicStyle.CHEERFUL)
 
     try:
-        _task_status[task_id] = {
+        await _task_store().set(task_id, {
             "status": "processing",
             "progress": 5,
             "stage": "init",
             "message": "初始化...",
-        }
+        })
 
         pipeline = NurseryRhymePipeline()
+        reporter = TaskProgressReporter(_task_store(), task_id)
 
         def on_progress(progress):
             """进度回调 - 儿歌进度分配:
@@ -1740,17 +2140,18 @@ async def _generate_nursery_rhyme_background(
                 stage = stage_code
                 calculated_progress = 50
 
-            _task_status[task_id].update({
-                "progress": calculated_progress,
-                "stage": stage,
-                "message": progress.message,
-            })
+            reporter.report(
+                progress=calculated_progress,
+                stage=stage,
+                message=progress.message,
+            )
 
-        _task_status[task_id].update({
-            "progress": 10,
-            "stage": "lyrics",
-            "message": "正在创作歌词...",
-        })
+        await _task_store().update(
+            task_id,
+            progress=10,
+            stage="lyrics",
+            message="正在创作歌词...",
+        )
 
         # V2: 直接传递 params dict 给 pipeline
         result = await pipeline.generate_v2(
@@ -1759,12 +2160,14 @@ async def _generate_nursery_rhyme_background(
             on_progress=on_progress,
             task_id=task_id,
         )
+        await reporter.flush()
 
-        _task_status[task_id].update({
-            "progress": 95,
-            "stage": "saving",
-            "message": "保存到数据库...",
-        })
+        await _task_store().update(
+            task_id,
+            progress=95,
+            stage="saving",
+            message="保存到数据库...",
+        )
 
         # 使用独立的数据库会话保存
         async with async_session_factory() as db:
@@ -1804,25 +2207,25 @@ async def _generate_nursery_rhyme_background(
             gen_logger = GenerationLogger(task_id=task_id)
             await gen_logger.update_content_id(content_id)
 
-        _task_status[task_id] = {
+        await _task_store().set(task_id, {
             "status": "completed",
             "progress": 100,
             "stage": "completed",
             "message": "生成完成",
+            # 只保存 content_id 引用，完整数据通过 GET /content/{id} 获取
             "content_id": content_id,
-            "result": result,
-        }
+        })
         logger.info(f"Nursery rhyme task {task_id} completed, content_id={content_id}")
 
     except Exception as e:
         logger.exception(f"Nursery rhyme task {task_id} failed: {e}")
-        _task_status[task_id] = {
+        await _task_store().set(task_id, {
             "status": "failed",
             "progress": 0,
             "stage": "failed",
             "message": "生成失败",
             "error": str(e),
-        }
+        })
 
 
 @router.post("/nursery-rhyme/async", response_model=AsyncTaskResponse)
@@ -1840,72 +2243,79 @@ async def generate_nursery_rhyme_async(
 
     参数说明见 nursery-rhyme-v2-api-guide.md
     """
+    _check_queue_capacity("nursery_rhyme")
     task_id = str(uuid4())
 
     # 初始化任务状态
-    _task_status[task_id] = {
+    await _task_store().set(task_id, {
         "status": "pending",
         "progress": 0,
         "stage": "pending",
         "message": "排队中...",
-    }
-
-    # 获取所有参数（透传给 PromptEnhancer）
-    params = request.to_enhancer_params()
-
-    # Handle smart mode
-    theme_topic = params.get("theme_topic", "")
-    theme_category = params.get("theme_category", "")
-
-    if request.creation_mode == "smart":
-        from moana.services.smart import SmartPromptAnalyzer
-
-        if not request.custom_prompt:
-            raise HTTPException(
-                status_code=422,
-                detail={"code": "VALIDATION_ERROR", "message": "智能创作模式下必须提供 custom_prompt"}
-            )
+    })
 
-        logger.info(f"Smart mode: analyzing prompt '{request.custom_prompt[:50]}...'")
+    fingerprint, coalesced = await _coalesce_generation(task_id, "nursery_rhyme", request)
+    if coalesced is not None:
+        return coalesced
 
-        analyzer = SmartPromptAnalyzer()
-        analysis = await analyzer.analyze(
-            custom_prompt=request.custom_prompt,
-            child_name=request.child_name,
-            age_months=request.age_months,
-            content_type="nursery_rhyme",
-        )
-        theme_topic = analysis.theme_topic
-        theme_category = analysis.theme_category
-
-        # 更新 params 中的主题信息
-        params["theme_topic"] = theme_topic
-        params["theme_category"] = theme_category
-
-        logger.info(f"Smart mode: inferred topic='{theme_topic}', category='{theme_category}'")
-    else:  # preset mode
-        # Validate that theme_topic and theme_category are provided
-        if not theme_topic or not theme_category:
-            raise HTTPException(
-                status_code=422,
-                detail={"code": "VALIDATION_ERROR", "message": "预设模式下必须提供 theme_topic 和 theme_category"}
+    try:
+        # 获取所有参数（透传给 PromptEnhancer）
+        params = request.to_enhancer_params()
+
+        # Handle smart mode
+        theme_topic = params.get("theme_topic", "")
+        theme_category = params.get("theme_category", "")
+
+        if request.creation_mode == "smart":
+            from moana.services.smart import SmartPromptAnalyzer
+
+            if not request.custom_prompt:
+                raise HTTPException(
+                    status_code=422,
+                    detail={"code": "VALIDATION_ERROR", "message": "智能创作模式下必须提供 custom_prompt"}
+                )
+
+            logger.info(f"Smart mode: analyzing prompt '{request.custom_prompt[:50]}...'")
+
+            analyzer = SmartPromptAnalyzer()
+            analysis = await analyzer.analyze(
+                custom_prompt=request.custom_prompt,
+                child_name=request.child_name,
+                age_months=request.age_months,
+                content_type="nursery_rhyme",
             )
-
-    logger.info(f"[NurseryRhyme V2] Received {len(params)} parameters for task {task_id}")
-
-    # 使用 asyncio.create_task 立即开始执行
-    asyncio.create_task(
+            theme_topic = analysis.theme_topic
+            theme_category = analysis.theme_category
+
+            # 更新 params 中的主题信息
+            params["theme_topic"] = theme_topic
+            params["theme_category"] = theme_category
+
+            logger.info(f"Smart mode: inferred topic='{theme_topic}', category='{theme_category}'")
+        else:  # preset mode
+            # Validate that theme_topic and theme_category are provided
+            if not theme_topic or not theme_category:
+                raise HTTPException(
+                    status_code=422,
+                    detail={"code": "VALIDATION_ERROR", "message": "预设模式下必须提供 theme_topic 和 theme_category"}
+                )
+
+        logger.info(f"[NurseryRhyme V2] Received {len(params)} parameters for task {task_id}")
+    except Exception:
+        # 未能提交的任务不应被后续相同请求合并
+        await get_generation_deduplicator().release(fingerprint, task_id)
+        await _task_store().delete(task_id)
+        raise
+
+    # 提交到调度器，有空闲槽位时立即执行，否则排队
+    response = await _submit_generation(task_id, "nursery_rhyme", lambda: (
         _generate_nursery_rhyme_background(
             task_id=task_id,
             params=params,
         )
-    )
-
-    return AsyncTaskResponse(
-        task_id=task_id,
-        status="pending",
-        message="儿歌生成任务已创建，请轮询状态",
-    )
+    ), fingerprint=fingerprint)
+    response.message = "儿歌生成任务已创建，请轮询状态"
+    return response
 
 
 @router.get("/nursery-rhyme/status/{task_id}")
@@ -1919,20 +2329,7 @@ async def get_nursery_rhyme_status(task_id: str, response: Response):
     response.headers["Pragma"] = "no-cache"
     response.headers["Expires"] = "0"
 
-    if task_id not in _task_status:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    status = _task_status[task_id]
-    return TaskStatusResponse(
-        task_id=task_id,
-        status=status.get("status", "unknown"),
-        progress=status.get("progress", 0),
-        stage=status.get("stage"),
-        message=status.get("message"),
-        content_id=status.get("content_id"),
-        result=status.get("result"),
-        error=status.get("error"),
-    )
+    return await _get_task_status_response(task_id)
 
 
 @router.post("/nursery-rhyme", response_model=NurseryRhymeResponse)
@@ -2025,14 +2422,15 @@ async def _generate_video_background(
 ):
     """后台执行视频生成任务."""
     try:
-        _task_status[task_id] = {
+        await _task_store().set(task_id, {
             "status": "processing",
             "progress": 5,
             "stage": "init",
             "message": "初始化...",
-        }
+        })
 
         pipeline = VideoPipeline()
+        reporter = TaskProgressReporter(_task_store(), task_id)
         pages = picture_book_data.get("pages", [])
         total_pages = len(pages)
 
@@ -2063,28 +2461,31 @@ async def _generate_video_background(
                 calculated_progress = 50
                 message = progress.message
 
-            _task_status[task_id].update({
-                "progress": calculated_progress,
-                "stage": stage,
-                "message": message,
-            })
+            reporter.report(
+                progress=calculated_progress,
+                stage=stage,
+                message=message,
+            )
 
-        _task_status[task_id].update({
-            "progress": 10,
-            "stage": "clip_1",
-            "message": f"正在生成第 1/{total_pages} 个视频片段...",
-        })
+        await _task_store().update(
+            task_id,
+            progress=10,
+            stage="clip_1",
+            message=f"正在生成第 1/{total_pages} 个视频片段...",
+        )
 
         result = await pipeline.generate(
             picture_book_data=picture_book_data,
             on_progress=on_progress,
         )
+        await reporter.flush()
 
-        _task_status[task_id].update({
-            "progress": 95,
-            "stage": "saving",
-            "message": "保存到数据库...",
-        })
+        await _task_store().update(
+            task_id,
+            progress=95,
+            stage="saving",
+            message="保存到数据库...",
+        )
 
         # 使用独立的数据库会话保存
         async with async_session_factory() as db:
@@ -2104,28 +2505,32 @@ async def _generate_video_background(
                 generated_by=result.get("generated_by", {}),
             )
 
-        # 将 content_id 添加到结果中
-        result["id"] = content_id
-
-        _task_status[task_id] = {
+        await _task_store().set(task_id, {
             "status": "completed",
             "progress": 100,
             "stage": "completed",
             "message": "生成完成",
             "content_id": content_id,
-            "result": result,
-        }
+            # 仅保留播放所需的摘要，片段列表等完整数据在数据库中
+            "result": {
+                "id": content_id,
+                "title": result["title"],
+                "video_url": result.get("video_url", ""),
+                "thumbnail_url": result.get("thumbnail_url", ""),
+                "duration": result.get("duration", 0),
+            },
+        })
         logger.info(f"Video task {task_id} completed, content_id={content_id}")
 
     except Exception as e:
         logger.exception(f"Video task {task_id} failed: {e}")
-        _task_status[task_id] = {
+        await _task_store().set(task_id, {
             "status": "failed",
             "progress": 0,
             "stage": "failed",
             "message": "生成失败",
             "error": str(e),
-        }
+        })
 
 
 @router.post("/video/async", response_model=AsyncTaskResponse)
@@ -2143,18 +2548,19 @@ async def generate_video_async(
     Returns:
         task_id 用于轮询状态
     """
+    _check_queue_capacity("video")
     task_id = str(uuid4())
 
     # 初始化任务状态
-    _task_status[task_id] = {
+    await _task_store().set(task_id, {
         "status": "pending",
         "progress": 0,
         "stage": "pending",
         "message": "排队中...",
-    }
+    })
 
-    # 使用 asyncio.create_task 立即开始执行
-    asyncio.create_task(
+    # 提交到调度器，有空闲槽位时立即执行，否则排队
+    response = await _submit_generation(task_id, "video", lambda: (
         _generate_video_background(
             task_id=task_id,
             picture_book_data=request.picture_book,
@@ -2163,13 +2569,9 @@ async def generate_video_async(
             theme_category=request.theme_category,
             motion_style=request.motion_style,
         )
-    )
-
-    return AsyncTaskResponse(
-        task_id=task_id,
-        status="pending",
-        message="视频生成任务已创建，请轮询状态",
-    )
+    ))
+    response.message = "视频生成任务已创建，请轮询状态"
+    return response
 
 
 @router.get("/video/status/{task_id}", response_model=TaskStatusResponse)
@@ -2187,22 +2589,134 @@ async def get_video_status(task_id: str):
     - result: 完成后的视频数据
     - error: 失败时的错误信息
     """
-    if task_id not in _task_status:
+    return await _get_task_status_response(task_id)
+
+
+# ========== Task Progress Stream (SSE / WebSocket) ==========
+
+# 心跳间隔，需小于 Cloudflare 100 秒空闲超时
+_STREAM_HEARTBEAT_SECONDS = 15.0
+# 其它 worker 写入的状态无法在本进程内通知，按此间隔回读存储兜底
+_STREAM_POLL_SECONDS = 1.0
+
+
+def _task_event_id(status: dict) -> int:
+    """事件 ID = 状态更新时间（微秒），同一任务内单调递增."""
+    return int(float(status.get("updated_at") or 0) * 1_000_000)
+
+
+async def _task_event_stream(task_id: str, last_event_id: int = 0):
+    """任务进度事件流.
+
+    产出 (event_id, event_name, payload)；超过心跳间隔没有变化时产出 None。
+    状态是累积快照，断线重连时只需补发比 last_event_id 新的最新状态，
+    不会丢失进度信息。任务结束（completed/failed）或状态过期后结束。
+    """
+    last_sent = time.monotonic()
+    last_queue_position = None
+
+    while True:
+        status = await _task_store().get(task_id)
+        if status is None:
+            return
+
+        event_id = _task_event_id(status)
+        response = _build_task_status_response(task_id, status)
+        finished = status.get("status") in TERMINAL_STATUSES
+
+        if event_id > last_event_id or response.queue_position != last_queue_position:
+            last_event_id = max(event_id, last_event_id)
+            last_queue_position = response.queue_position
+            last_sent = time.monotonic()
+            event_name = status.get("status") if finished else "progress"
+            yield last_event_id, event_name, response.model_dump()
+
+        if finished:
+            return
+
+        idle = time.monotonic() - last_sent
+        if idle >= _STREAM_HEARTBEAT_SECONDS:
+            last_sent = time.monotonic()
+            yield None
+            continue
+
+        await wait_task_event(
+            "content", task_id,
+            timeout=min(_STREAM_POLL_SECONDS, _STREAM_HEARTBEAT_SECONDS - idle),
+        )
+
+
+@router.get("/tasks/{task_id}/events")
+async def stream_task_events(
+    task_id: str,
+    request: Request,
+    last_event_id: Optional[int] = Query(None, description="断线续传的事件 ID（不支持自定义请求头时使用）"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """以 Server-Sent Events 推送任务进度，替代 status 轮询.
+
+    适用于绘本/儿歌/视频等所有异步任务。事件格式：
+    - event: progress | completed | failed
+    - id: 事件 ID（断线重连时浏览器会通过 Last-Event-ID 请求头带回）
+    - data: 与 status 接口相同的 TaskStatusResponse JSON
+
+    每 15 秒发送一次注释心跳帧，防止 Cloudflare 空闲断开。
+    """
+    if await _task_store().get(task_id) is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    status = _task_status[task_id]
-    return TaskStatusResponse(
-        task_id=task_id,
-        status=status.get("status", "unknown"),
-        progress=status.get("progress", 0),
-        stage=status.get("stage"),
-        message=status.get("message"),
-        content_id=status.get("content_id"),
-        result=status.get("result"),
-        error=status.get("error"),
+    resume_from = last_event_id or 0
+    if last_event_id_header and last_event_id_header.isdigit():
+        resume_from = max(resume_from, int(last_event_id_header))
+
+    async def event_source():
+        yield "retry: 3000\n\n"
+        async for item in _task_event_stream(task_id, resume_from):
+            if await request.is_disconnected():
+                return
+            if item is None:
+                yield ": heartbeat\n\n"
+                continue
+            event_id, event_name, payload = item
+            data = json.dumps(payload, ensure_ascii=False)
+            yield f"id: {event_id}\nevent: {event_name}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # 关闭 Nginx 缓冲
+        },
     )
 
 
+@router.websocket("/tasks/{task_id}/ws")
+async def task_events_websocket(websocket: WebSocket, task_id: str, last_event_id: int = 0):
+    """以 WebSocket 推送任务进度.
+
+    消息格式: {"type": "progress"|"completed"|"failed"|"heartbeat", "id": ..., "data": {...}}
+    断线重连时通过 ?last_event_id= 续传。
+    """
+    await websocket.accept()
+
+    if await _task_store().get(task_id) is None:
+        await websocket.send_json({"type": "error", "message": "Task not found"})
+        await websocket.close(code=4404)
+        return
+
+    try:
+        async for item in _task_event_stream(task_id, last_event_id):
+            if item is None:
+                await websocket.send_json({"type": "heartbeat"})
+                continue
+            event_id, event_name, payload = item
+            await websocket.send_json({"type": event_name, "id": event_id, "data": payload})
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
 # ========== Standalone Video API ==========
 
 async def _generate_standalone_video_background(
@@ -2215,14 +2729,15 @@ async def _generate_standalone_video_background(
 
     try:
         pipeline = StandaloneVideoPipeline()
+        reporter = TaskProgressReporter(_task_store(), task_id)
 
         def on_progress(progress):
-            _task_status[task_id] = {
-                "status": "processing",
-                "progress": progress.progress,
-                "stage": progress.stage,
-                "message": progress.message,
-            }
+            reporter.report(
+                status="processing",
+                progress=progress.progress,
+                stage=progress.stage,
+                message=progress.message,
+            )
 
         result = await pipeline.generate(
             child_name=request.child_name,
@@ -2240,6 +2755,7 @@ async def _generate_standalone_video_background(
             scene_template=request.scene_template,
             on_progress=on_progress,
         )
+        await reporter.flush()
 
         # Save to database
         async with async_session_factory() as db:
@@ -2262,7 +2778,7 @@ async def _generate_standalone_video_background(
                 generated_by=result["generated_by"],
             )
 
-            _task_status[task_id] = {
+            await _task_store().set(task_id, {
                 "status": "completed",
                 "progress": 100,
                 "stage": "complete",
@@ -2275,17 +2791,17 @@ async def _generate_standalone_video_background(
                     "thumbnail_url": result["thumbnail_url"],
                     "duration": result["duration"],
                 },
-            }
+            })
 
     except Exception as e:
         logger.error(f"Standalone video task {task_id} failed: {e}")
-        _task_status[task_id] = {
+        await _task_store().set(task_id, {
             "status": "failed",
             "progress": 0,
             "stage": "failed",
             "message": "生成失败",
             "error": str(e),
-        }
+        })
 
 
 @router.post("/video/standalone/async", response_model=AsyncTaskResponse)
@@ -2300,24 +2816,21 @@ async def generate_standalone_video_async(request: StandaloneVideoRequest):
     """
     import uuid
 
+    _check_queue_capacity("video")
     task_id = f"standalone_video_{uuid.uuid4().hex[:12]}"
 
-    _task_status[task_id] = {
+    await _task_store().set(task_id, {
         "status": "pending",
         "progress": 0,
         "stage": "init",
         "message": "排队中...",
-    }
-
-    asyncio.create_task(
-        _generate_standalone_video_background(task_id, request)
-    )
+    })
 
-    return AsyncTaskResponse(
-        task_id=task_id,
-        status="pending",
-        message="视频生成任务已创建，请轮询状态",
+    response = await _submit_generation(
+        task_id, "video", lambda: _generate_standalone_video_background(task_id, request)
     )
+    response.message = "视频生成任务已创建，请轮询状态"
+    return response
 
 
 @router.post("/video", response_model=VideoResponse)
@@ -54,6 +54,10 @@ class Settings(BaseSettings):
     qwen_image_model: str = "qwen-image-plus"
     # Qwen TTS (主力)
     qwen_tts_model: str = "qwen3-tts-flash-realtime"
+    qwen_tts_pool_enabled: bool = True  # 复用已配置音色的 WebSocket 会话（空闲会话数随 TTS 并发上限）
+    qwen_tts_session_max_age: int = 600  # 会话最长存活时间（秒）
+    qwen_tts_session_idle_timeout: int = 45  # 空闲超过该时间的会话不再复用（秒）
+    qwen_tts_session_max_uses: int = 100  # 单个会话最多合成次数
     # 阿里万相图片 (主力) - wan2.6-t2i 支持同步接口
     wanx_image_model: str = "wan2.6-t2i"
     # 阿里万相视频 (主力) - wan2.6-i2v 支持有声+多镜头
@@ -123,6 +127,80 @@ class Settings(BaseSettings):
     oss_bucket: str = "moana-content"
     oss_endpoint: str = ""
 
+    # === 异步任务状态存储 ===
+    # memory: 单进程（开发环境）| sql: task_states 表 | redis: Redis 协议服务（多 worker 推荐）
+    task_state_backend: str = "memory"
+    task_state_redis_url: str = "redis://localhost:6379/0"
+    task_state_redis_pool_size: int = 8  # 每个 namespace 的 Redis 连接池大小
+    task_state_finished_ttl: int = 3600  # 已完成/失败任务保留时长（秒）
+    task_state_active_ttl: int = 21600  # 未完成任务最长保留时长（秒）
+
+    # === 生成任务调度（每个 worker 进程内生效） ===
+    scheduler_picture_book_concurrency: int = 3
+    scheduler_nursery_rhyme_concurrency: int = 2
+    scheduler_video_concurrency: int = 1
+    scheduler_max_queue: int = 20  # 每种内容类型最多排队数，超出返回 429
+    dedup_reuse_window_seconds: int = 600  # 相同请求复用已完成内容的时间窗口，0 表示只合并进行中的请求
+
+    # === 上游 HTTP 连接池（每个上游一个共享客户端） ===
+    http_max_connections: int = 100  # 每个客户端最大连接数
+    http_max_keepalive_connections: int = 20  # 每个客户端保持的空闲连接数
+    http_keepalive_expiry: float = 30.0  # 空闲连接保留时长（秒）
+    http_http2: bool = True  # 启用 HTTP/2（需安装 h2，否则回退 HTTP/1.1）
+    http_default_timeout: float = 60.0  # 调用方未指定时的请求超时（秒）
+
+    # === 同步 SDK 调用线程池 / 事件循环诊断 ===
+    blocking_executor_workers: int = 16  # google-genai、oss2 等同步调用的专用线程数
+    image_executor_workers: int = 0  # PIL 图片后处理进程数，0 表示 CPU 核数
+    loop_slow_callback_ms: int = 0  # >0 时开启 asyncio debug，记录占用事件循环超过该毫秒数的步骤
+    loop_monitor_enabled: bool = True  # 轻量事件循环延迟采样 + 阻塞调用点记录（/admin/loop）
+    loop_monitor_interval_ms: int = 500  # 采样间隔
+    loop_monitor_slow_ms: int = 100  # 延迟超过该值视为阻塞并记录调用栈
+
+    # === ffmpeg 转码（管道输入输出，不落临时文件） ===
+    ffmpeg_max_concurrency: int = 2  # 每个 worker 同时运行的 ffmpeg 进程上限
+    ffmpeg_batch_size: int = 8  # 批量转码时单个 ffmpeg 进程处理的片段数
+
+    # === 稀缺 provider 请求额度（0 表示不限；每日额度按 UTC 自然日，多 worker 共享） ===
+    quota_veo_per_minute: int = 2
+    quota_veo_per_day: int = 10
+    quota_suno_per_minute: int = 0
+    quota_suno_per_day: int = 0
+    quota_max_wait_seconds: int = 90  # 每分钟额度不足时最多等待的秒数
+    video_fallback_providers: str = "wanx,minimax"  # Veo 额度用尽时依次改用的视频 provider，留空则直接失败
+
+    # === LLM 辅助调用缓存（相同输入 + 模型直接复用结果） ===
+    llm_memo_enabled: bool = True
+    llm_memo_sites: str = "smart_analyze,suno_prompt,video_style,intent"  # 启用缓存的调用点，"*" 表示全部
+    llm_memo_ttl: int = 7 * 86400  # 持久层（任务状态存储 namespace=llm_memo）过期时间（秒）
+    llm_memo_max_entries: int = 512  # 每个调用点的内存 LRU 容量
+
+    # === TTS 音频缓存（相同文本 + 音色 + 语速 + 模型复用已上传音频） ===
+    tts_cache_enabled: bool = True
+    tts_cache_max_idle_days: int = 90  # 超过该天数未命中的条目由存储清理淘汰，音频随后作为孤儿文件删除
+
+    # === 整本朗读（绘本一次 TTS 合成整本，按静音切分为每页音频，另存整段音频 + cue 表） ===
+    tts_whole_book_enabled: bool = False
+    tts_whole_book_silence_db: float = -35.0  # 低于该音量视为静音
+    tts_whole_book_min_silence: float = 0.5  # 可作为页间切点的最短静音（秒）
+
+    # === 内容审核（内容落库后后台执行，完成前 review_status 保持 pending） ===
+    moderation_enabled: bool = True
+    moderation_llm_review: bool = True  # 文字额外做一次批量 LLM 适龄复核，存疑时转人工审核
+    moderation_cache_ttl: int = 30 * 86400  # 审核结论缓存（任务状态存储 namespace=moderation）过期时间（秒）
+    moderation_concurrency: int = 8  # 图片 / 音频审核的最大并发数
+
+    # === 预设主题大纲库（python -m moana.agents.outline_bank 离线生成） ===
+    outline_bank_enabled: bool = True  # 预设模式优先从大纲库取大纲，未命中时实时生成
+    outline_bank_refine: bool = False  # 取出后用 LLM 轻量润色文字（会增加一次较短的 LLM 调用）
+    outline_bank_art_styles: str = "pixar_3d,watercolor,chibi,ghibli"  # 离线生成的美术风格
+
+    # === 图像生成对冲 / 故障转移 ===
+    image_provider_chain: str = ""  # 如 "gemini,wanx,flux"：按顺序对冲 / 故障转移，留空则只用 IMAGE_PROVIDER
+    image_hedge_quantile: float = 0.95  # 当前调用超过该 provider 滚动分位延迟时向下一个 provider 发出对冲请求
+    image_hedge_min_samples: int = 20  # 样本不足时使用默认对冲延迟
+    image_hedge_default_delay: float = 45.0  # 秒
+
     # === WeChat OAuth ===
     wechat_app_id: str = ""
     wechat_app_secret: str = ""
@@ -1,4 +1,5 @@
 # src/moana/main.py
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -16,6 +17,8 @@ from moana.api.admin import router as admin_router
 # Phase 6 routers
 from moana.routers import auth_router, analytics_router, library_router, feedback_router
 
+logger = logging.getLogger(__name__)
+
 
 # API 前缀 - 独立子域名，无需 /kids 前缀
 API_PREFIX = "/api/v1"
@@ -28,9 +31,40 @@ async def lifespan(app: FastAPI):
     settings = get_settings()
     if settings.debug:
         await init_db()
+    if settings.loop_slow_callback_ms > 0:
+        from moana.services.executor import enable_slow_callback_warnings
+
+        enable_slow_callback_warnings(settings.loop_slow_callback_ms)
+    if settings.loop_monitor_enabled:
+        from moana.services.loop_monitor import get_loop_monitor
+
+        get_loop_monitor().start()
+    from moana.services.http import get_http_registry
+
+    get_http_registry()
+    from moana.services.jobs import get_job_poller
+
+    # 恢复上一个 worker 未完成的 provider 任务
+    try:
+        await get_job_poller().recover()
+    except Exception as e:
+        logger.warning(f"Failed to recover outstanding jobs: {e}")
     yield
     # Shutdown
-    pass
+    from moana.services.executor import shutdown_blocking_executor, shutdown_image_executor
+    from moana.services.http import close_http_clients
+    from moana.services.jobs import close_job_poller
+    from moana.services.loop_monitor import stop_loop_monitor
+    from moana.services.scheduler import get_generation_scheduler
+    from moana.services.tts.qwen import close_qwen_session_pool
+
+    await stop_loop_monitor()
+    await close_job_poller()
+    await get_generation_scheduler().shutdown()
+    await close_qwen_session_pool()
+    await close_http_clients()
+    shutdown_blocking_executor()
+    shutdown_image_executor()
 
 
 app = FastAPI(
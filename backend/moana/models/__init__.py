@@ -16,6 +16,9 @@ from moana.models.favorite import Favorite
 from moana.models.share import Share, SharePlatform
 from moana.models.generation_log import GenerationLog, GenerationStep, LogLevel
 from moana.models.feedback import Feedback, FeedbackType, FeedbackStatus
+from moana.models.task_state import TaskState
+from moana.models.outline_bank import OutlineBankEntry
+from moana.models.tts_cache import TTSCacheEntry
 
 __all__ = [
     "Base",
@@ -40,4 +43,7 @@ __all__ = [
     "Feedback",
     "FeedbackType",
     "FeedbackStatus",
+    "TaskState",
+    "OutlineBankEntry",
+    "TTSCacheEntry",
 ]
@@ -25,6 +25,7 @@ class ContentStatus(str, Enum):
     """Content generation status."""
     PENDING = "pending"
     GENERATING = "generating"
+    PARTIAL = "partial"  # 已可阅读部分页面，其余页面仍在生成
     READY = "ready"
     FAILED = "failed"
 
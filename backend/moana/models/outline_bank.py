@@ -0,0 +1,35 @@
+# src/moana/models/outline_bank.py
+"""预生成绘本大纲库模型.
+
+预设主题 × 年龄段 × 风格的大纲离线生成并校验后入库，请求时按孩子名字
+替换占位符即可使用，不再在关键路径上调用大纲 LLM。
+"""
+from typing import Any
+from uuid import uuid4
+from sqlalchemy import String, JSON, Integer, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from moana.models.base import Base, TimestampMixin
+
+
+class OutlineBankEntry(Base, TimestampMixin):
+    """A validated, name-agnostic picture book outline."""
+
+    __tablename__ = "outline_bank"
+    __table_args__ = (
+        Index("ix_outline_bank_lookup", "theme_id", "age_bucket", "style_key"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    theme_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    age_bucket: Mapped[str] = mapped_column(String(16), nullable=False)
+    # art_style|protagonist_animal|protagonist_color|protagonist_accessory|color_palette
+    style_key: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    # PictureBookOutline JSON，孩子名字为占位符
+    outline: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    model: Mapped[str] = mapped_column(String(100), nullable=False, default="")
+    served_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<OutlineBankEntry {self.theme_id}:{self.age_bucket}:{self.style_key}>"
@@ -0,0 +1,28 @@
+# src/moana/models/task_state.py
+"""异步任务状态模型.
+
+供 SqlTaskStateStore 使用，多 worker 共享任务进度。
+"""
+from typing import Any
+from sqlalchemy import String, JSON, Float
+from sqlalchemy.orm import Mapped, mapped_column
+
+from moana.models.base import Base, TimestampMixin
+
+
+class TaskState(Base, TimestampMixin):
+    """Async generation task state."""
+
+    __tablename__ = "task_states"
+
+    namespace: Mapped[str] = mapped_column(String(32), primary_key=True)
+    task_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+
+    # 状态 JSON: status, progress, stage, message, content_id, error ...
+    state: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+
+    # 过期时间 (epoch 秒)，到期后由 evict_expired 清理
+    expires_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<TaskState {self.namespace}:{self.task_id}>"
@@ -0,0 +1,43 @@
+# src/moana/models/tts_cache.py
+"""TTS 音频缓存模型.
+
+按 (规范化文本, 音色, 语速, provider, 模型) 的哈希索引已合成并上传的音频，
+相同文本（问候语、互动提问、预设主题的重复句）不再重复合成和上传。
+长期未命中的条目由存储清理任务淘汰，对应文件随之作为孤儿文件删除。
+"""
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from moana.models.base import Base, TimestampMixin
+
+
+class TTSCacheEntry(Base, TimestampMixin):
+    """A synthesized, stored audio clip addressed by its synthesis inputs."""
+
+    __tablename__ = "tts_cache"
+    __table_args__ = (
+        Index("ix_tts_cache_last_used_at", "last_used_at"),
+    )
+
+    # sha256(provider, model, voice_id, speed, normalized text)
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    provider: Mapped[str] = mapped_column(String(32), nullable=False)
+    model: Mapped[str] = mapped_column(String(100), nullable=False, default="")
+    voice_id: Mapped[str] = mapped_column(String(100), nullable=False, default="")
+    speed: Mapped[float] = mapped_column(Float, nullable=False, default=1.0)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+
+    audio_url: Mapped[str] = mapped_column(String(1000), nullable=False)
+    duration: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<TTSCacheEntry {self.provider}:{self.voice_id} {self.text[:20]!r}>"
@@ -1,4 +1,5 @@
 from moana.pipelines.picture_book import PictureBookPipeline, GenerationProgress
 from moana.pipelines.nursery_rhyme import NurseryRhymePipeline
+from moana.pipelines.checkpoint import PipelineCheckpoint
 
-__all__ = ["PictureBookPipeline", "NurseryRhymePipeline", "GenerationProgress"]
+__all__ = ["PictureBookPipeline", "NurseryRhymePipeline", "GenerationProgress", "PipelineCheckpoint"]
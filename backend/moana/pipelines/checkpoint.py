@@ -0,0 +1,106 @@
+# src/moana/pipelines/checkpoint.py
+"""Generation checkpoints keyed by task id.
+
+每完成一个生成单元（故事大纲、单页插图、单页音频）就写入检查点。
+同一 task_id 重试或换 worker 重新执行时，已完成的单元直接复用，
+只为失败/未完成的部分再次调用 LLM / 图像 / TTS 服务。
+
+检查点复用任务状态存储（namespace="checkpoint"），sql / redis 后端下
+跨进程、跨重启可见。
+"""
+import dataclasses
+import hashlib
+import json
+import logging
+from typing import Any, Optional
+
+from moana.services.task_state import TaskStateStore, get_task_state_store
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineCheckpoint:
+    """Checkpoint of one generation task.
+
+    每个单元存为独立的顶层字段（unit:<key>），并发写入不同单元时由存储的
+    原子合并保证互不覆盖。
+    """
+
+    UNIT_PREFIX = "unit:"
+
+    def __init__(self, task_id: str, store: Optional[TaskStateStore] = None):
+        self.task_id = task_id
+        self._store = store or get_task_state_store("checkpoint")
+        # load() 后可用的已完成单元
+        self.units: dict[str, Any] = {}
+
+    @staticmethod
+    def fingerprint(params: dict[str, Any]) -> str:
+        """生成参数指纹，参数变化时旧检查点作废."""
+        payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    async def load(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Load saved units for these params (starts fresh on mismatch).
+
+        Args:
+            params: 生成参数，随检查点保存，供重试时原样恢复
+
+        Returns:
+            已完成单元 {unit_key: value}
+        """
+        fingerprint = self.fingerprint(params)
+        saved = await self._store.get(self.task_id)
+
+        units: dict[str, Any] = {}
+        if saved and saved.get("fingerprint") == fingerprint:
+            units = {
+                k[len(self.UNIT_PREFIX):]: v
+                for k, v in saved.items()
+                if k.startswith(self.UNIT_PREFIX) and v is not None
+            }
+            if units:
+                logger.info(f"[Checkpoint] Task {self.task_id} resuming with {len(units)} saved units")
+
+        await self._store.set(self.task_id, {
+            "status": "processing",
+            "fingerprint": fingerprint,
+            "params": params,
+            **{f"{self.UNIT_PREFIX}{k}": v for k, v in units.items()},
+        })
+        self.units = units
+        return dict(units)
+
+    async def save(self, key: str, value: Any) -> None:
+        """Save one completed unit (dataclasses are stored as dicts)."""
+        if dataclasses.is_dataclass(value):
+            value = dataclasses.asdict(value)
+        self.units[key] = value
+        try:
+            await self._store.update(self.task_id, **{f"{self.UNIT_PREFIX}{key}": value})
+        except Exception as e:
+            # 检查点失败不影响生成本身
+            logger.warning(f"[Checkpoint] Failed to save {key} for task {self.task_id}: {e}")
+
+    async def discard(self, *keys: str) -> None:
+        """Forget units that no longer match the task (stored as null, skipped by load)."""
+        for key in keys:
+            self.units.pop(key, None)
+        try:
+            await self._store.update(self.task_id, **{f"{self.UNIT_PREFIX}{key}": None for key in keys})
+        except Exception as e:
+            logger.warning(f"[Checkpoint] Failed to discard {list(keys)} for task {self.task_id}: {e}")
+
+    async def clear(self) -> None:
+        """Drop the checkpoint once the result is persisted."""
+        await self._store.delete(self.task_id)
+
+    @classmethod
+    async def get_params(
+        cls,
+        task_id: str,
+        store: Optional[TaskStateStore] = None,
+    ) -> Optional[dict[str, Any]]:
+        """获取检查点中保存的生成参数（用于重试）."""
+        saved = await (store or get_task_state_store("checkpoint")).get(task_id)
+        return saved.get("params") if saved else None
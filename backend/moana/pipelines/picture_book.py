@@ -1,18 +1,22 @@
 import asyncio
 import time
 from dataclasses import dataclass
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Optional
 
 import logging
 
+from moana.agents.outline_bank import OutlineBank
 from moana.agents.story import StoryAgent, StyleConfig, StoryEnhancement, VisualEnhancement
-from moana.agents.schemas import PictureBookOutline
+from moana.agents.schemas import PictureBookOutline, PictureBookPage
+from moana.config import get_settings
 from moana.services.image import get_image_service
-from moana.services.image.base import BaseImageService, ImageStyle
-from moana.services.tts import get_tts_service
-from moana.services.tts.base import BaseTTSService
+from moana.services.image.base import BaseImageService, ImageResult, ImageStyle
+from moana.services.tts import get_cached_tts_service
+from moana.services.tts.base import BaseTTSService, TTSResult
+from moana.services.tts.narration import BookNarration, NarrationSplitError, narrate_book
 from moana.services.logging import GenerationLogger
 from moana.models.generation_log import GenerationStep, LogLevel
+from moana.pipelines.checkpoint import PipelineCheckpoint
 
 logger = logging.getLogger(__name__)
 
@@ -29,23 +33,20 @@ class GenerationProgress:
 class PictureBookPipeline:
     """Pipeline for generating complete picture books."""
 
-    # 并发控制：限制同时进行的 TTS 请求数（避免触发阿里云 QPS 限制）
-    TTS_CONCURRENCY_LIMIT = 2
-    # 并发控制：限制同时进行的图片生成请求数
-    IMAGE_CONCURRENCY_LIMIT = 3
+    # 大纲流式生成期间用于进度估算的页数（StoryAgent 默认页数）
+    EXPECTED_PAGES = 8
 
     def __init__(
         self,
         story_agent: StoryAgent | None = None,
         image_service: BaseImageService | None = None,
         tts_service: BaseTTSService | None = None,
+        outline_bank: OutlineBank | None = None,
     ):
         self._story_agent = story_agent or StoryAgent()
         self._image_service = image_service or get_image_service()
-        self._tts_service = tts_service or get_tts_service()
-        # 信号量用于限制并发
-        self._tts_semaphore = asyncio.Semaphore(self.TTS_CONCURRENCY_LIMIT)
-        self._image_semaphore = asyncio.Semaphore(self.IMAGE_CONCURRENCY_LIMIT)
+        self._tts_service = tts_service or get_cached_tts_service()
+        self._outline_bank = outline_bank
 
     async def generate(
         self,
@@ -67,6 +68,16 @@ class PictureBookPipeline:
         visual_enhancement: dict | None = None,
         # ===== 日志记录 =====
         task_id: str | None = None,
+        # ===== 断点续传 =====
+        checkpoint: PipelineCheckpoint | None = None,
+        # ===== 渐进式交付 =====
+        on_outline: Callable[[PictureBookOutline], Awaitable[None]] | None = None,
+        on_page_ready: Callable[[int, dict[str, Any]], Awaitable[None]] | None = None,
+        on_page_audio: Callable[[int, str], Awaitable[None]] | None = None,
+        # ===== 预设主题大纲库 =====
+        use_outline_bank: bool = False,
+        # ===== 整本朗读 =====
+        whole_book_audio: bool | None = None,
     ) -> dict[str, Any]:
         """Generate a complete picture book with images and audio.
 
@@ -84,6 +95,13 @@ class PictureBookPipeline:
             protagonist_accessory: 主角配饰 (blue overalls, red scarf 等)
             color_palette: 色彩风格 (pastel, vibrant, warm, cool, monochrome)
             task_id: 任务 ID，用于日志记录
+            checkpoint: 已 load 的检查点；已完成的大纲/插图/音频直接复用，新完成的单元写回
+            on_outline: 大纲完成后回调（可先创建只含文字的内容）
+            on_page_ready: 某页插图和音频都完成后回调 (页下标, 页面数据)，页面可能乱序完成
+            on_page_audio: 某页音频第一块落盘、可边写边播放时回调 (页下标, 音频 URL)
+            use_outline_bank: 预设主题优先从大纲库取大纲（未命中时实时生成）
+            whole_book_audio: 整本一次合成再按静音切分（默认 TTS_WHOLE_BOOK_ENABLED）；
+                需要完整大纲，音频不再随大纲流式提前分发
         """
         # 初始化日志记录器
         gen_logger = GenerationLogger(task_id=task_id) if task_id else None
@@ -137,109 +155,207 @@ class PictureBookPipeline:
             visual_enhancement=visual_enh,
         )
 
-        # Stage 1: Generate story outline
-        if on_progress:
-            on_progress(GenerationProgress("outline", 0, 1, "正在创作故事..."))
+        saved = checkpoint.units if checkpoint else {}
+        if checkpoint and "outline" not in saved:
+            # 大纲未保存时，上次提前分发的插图/音频对应的是另一份大纲，不能复用
+            checkpoint.units = saved = {}
 
-        story_start_time = time.time()
-        try:
-            outline = await self._story_agent.generate_outline(
-                child_name=child_name,
-                age_months=age_months,
-                theme_topic=theme_topic,
-                theme_category=theme_category,
-                favorite_characters=favorite_characters,
-                style_config=style_config,
-            )
-            story_duration = time.time() - story_start_time
+        if whole_book_audio is None:
+            whole_book_audio = get_settings().tts_whole_book_enabled
 
-            if gen_logger:
-                await gen_logger.log_step(
-                    step=GenerationStep.STORY_GENERATE,
-                    message=f"故事大纲生成完成: {outline.title}",
-                    input_params={"style_config": style_config.__dict__ if hasattr(style_config, '__dict__') else str(style_config)},
-                    output_result={
-                        "title": outline.title,
-                        "page_count": len(outline.pages),
-                        "educational_goal": outline.educational_goal,
-                    },
-                    duration=story_duration,
-                )
-        except Exception as e:
-            if gen_logger:
-                await gen_logger.log_error(
-                    step=GenerationStep.STORY_GENERATE,
-                    message="故事生成失败",
-                    error=e,
-                )
-            raise
+        # 大纲流式生成时每页一完成就分发插图和音频（TTS 只依赖页面文字），
+        # 大纲完成后补齐未分发的页面；插图、音频各自受信号量限制
+        total = self.EXPECTED_PAGES
+        image_tasks: dict[int, asyncio.Task] = {}
+        audio_tasks: dict[int, asyncio.Task] = {}
+        narration_task: asyncio.Task | None = None
+
+        # 按完成数量（而非页码）上报进度，页面乱序完成时进度仍单调递增
+        completed = {"images": 0, "audio": 0}
 
-        if on_progress:
-            on_progress(GenerationProgress("outline", 1, 1, "故事创作完成"))
+        def page_done(stage: str, label: str) -> None:
+            completed[stage] += 1
+            if on_progress:
+                done = completed[stage]
+                expected = max(total, done)
+                on_progress(GenerationProgress(stage, done, expected, f"{label} {done}/{expected} 完成"))
+
+        dispatched: dict[int, PictureBookPage] = {}
+        stale_tasks: list[asyncio.Task] = []
+
+        def dispatch(index: int, page: PictureBookPage) -> None:
+            previous = dispatched.get(index)
+            if previous == page:
+                return
+            if previous is not None:
+                # 流式大纲退回非流式生成后该页内容变了：作废按旧内容提前分发的任务
+                logger.info(f"[PictureBook] Page {index + 1} changed after early dispatch, regenerating")
+                discard_page(index)
+            dispatched[index] = page
+            logger.debug(f"[PictureBook] Dispatching page {index + 1}")
+            image_tasks[index] = asyncio.ensure_future(self._generate_page_image(
+                page.image_prompt, index, total,
+                lambda: page_done("images", "插图"), gen_logger, checkpoint,
+            ))
+            if whole_book_audio:
+                return
+            audio_tasks[index] = asyncio.ensure_future(self._generate_page_audio(
+                page.text, voice_id, index, total,
+                lambda: page_done("audio", "音频"), gen_logger, checkpoint,
+                (lambda url: on_page_audio(index, url)) if on_page_audio else None,
+            ))
+
+        def discard_page(index: int) -> None:
+            dispatched.pop(index, None)
+            for tasks in (image_tasks, audio_tasks):
+                task = tasks.pop(index, None)
+                if task is not None:
+                    task.cancel()
+                    stale_tasks.append(task)
+            if checkpoint:
+                # 已完成的旧单元也不能在重试时复用
+                stale_tasks.append(asyncio.ensure_future(
+                    checkpoint.discard(f"image_{index}", f"audio_{index}")
+                ))
 
-        # Stage 2: Generate images for each page (parallel)
-        if on_progress:
-            on_progress(GenerationProgress("images", 0, len(outline.pages), "正在生成插图..."))
+        try:
+            # Stage 1: Generate story outline (streamed, pages dispatched early)
+            if on_progress:
+                on_progress(GenerationProgress("outline", 0, 1, "正在创作故事..."))
 
-        images_start_time = time.time()
-        image_tasks = [
-            self._generate_page_image(page.image_prompt, i, len(outline.pages), on_progress, gen_logger)
-            for i, page in enumerate(outline.pages)
-        ]
-        image_results = await asyncio.gather(*image_tasks)
-        images_duration = time.time() - images_start_time
+            story_start_time = time.time()
+            try:
+                outline_source = "checkpoint"
+                if "outline" in saved:
+                    outline = PictureBookOutline.model_validate(saved["outline"])
+                    logger.info(f"[PictureBook] Reusing checkpointed outline: {outline.title}")
+                else:
+                    outline = None
+                    if use_outline_bank:
+                        outline = await self._draw_banked_outline(
+                            theme_topic, age_months, child_name, style_config, favorite_characters
+                        )
+                        outline_source = "bank"
+                    if outline is None:
+                        outline = await self._story_agent.generate_outline(
+                            child_name=child_name,
+                            age_months=age_months,
+                            theme_topic=theme_topic,
+                            theme_category=theme_category,
+                            favorite_characters=favorite_characters,
+                            style_config=style_config,
+                            on_page=dispatch,
+                        )
+                        outline_source = "llm"
+                    if checkpoint:
+                        await checkpoint.save("outline", outline.model_dump())
+                story_duration = time.time() - story_start_time
 
-        if gen_logger:
-            await gen_logger.log_step(
-                step=GenerationStep.IMAGE_GENERATE,
-                message=f"所有图片生成完成 ({len(image_results)} 张)",
-                output_result={"image_count": len(image_results), "total_duration": images_duration},
-                duration=images_duration,
-            )
+                if gen_logger:
+                    await gen_logger.log_step(
+                        step=GenerationStep.STORY_GENERATE,
+                        message=f"故事大纲生成完成: {outline.title}",
+                        input_params={"style_config": style_config.__dict__ if hasattr(style_config, '__dict__') else str(style_config)},
+                        output_result={
+                            "title": outline.title,
+                            "page_count": len(outline.pages),
+                            "educational_goal": outline.educational_goal,
+                            "early_dispatched_pages": len(image_tasks),
+                            "outline_source": outline_source,
+                        },
+                        duration=story_duration,
+                    )
+            except Exception as e:
+                if gen_logger:
+                    await gen_logger.log_error(
+                        step=GenerationStep.STORY_GENERATE,
+                        message="故事生成失败",
+                        error=e,
+                    )
+                raise
 
-        # Stage 3: Generate audio for each page (parallel)
-        if on_progress:
-            on_progress(GenerationProgress("audio", 0, len(outline.pages), "正在生成朗读音频..."))
+            if on_progress:
+                on_progress(GenerationProgress("outline", 1, 1, "故事创作完成"))
+            if on_outline:
+                await on_outline(outline)
+
+            # Stage 2: Wait for images and audio of all pages
+            total = len(outline.pages)
+            for index in [i for i in dispatched if i >= total]:
+                discard_page(index)
+            if stale_tasks:
+                await asyncio.gather(*stale_tasks, return_exceptions=True)
+            if on_progress and not image_tasks:
+                on_progress(GenerationProgress("images", 0, total, "正在生成插图和朗读音频..."))
+            for i, page in enumerate(outline.pages):
+                dispatch(i, page)
+            if whole_book_audio:
+                narration_task = asyncio.ensure_future(self._generate_book_audio(
+                    outline.pages, voice_id,
+                    lambda: page_done("audio", "音频"), gen_logger, checkpoint, on_page_audio,
+                ))
+
+                async def page_audio(index: int) -> TTSResult:
+                    _, results = await asyncio.shield(narration_task)
+                    return results[index]
+
+                for i in range(total):
+                    audio_tasks[i] = asyncio.ensure_future(page_audio(i))
+
+            async def run_images() -> list[ImageResult]:
+                results = await asyncio.gather(*[image_tasks[i] for i in range(total)])
+                images_duration = time.time() - story_start_time
+                if gen_logger:
+                    await gen_logger.log_step(
+                        step=GenerationStep.IMAGE_GENERATE,
+                        message=f"所有图片生成完成 ({len(results)} 张)",
+                        output_result={"image_count": len(results), "total_duration": images_duration},
+                        duration=images_duration,
+                    )
+                return results
 
-        audio_start_time = time.time()
-        audio_tasks = [
-            self._generate_page_audio(page.text, voice_id, i, len(outline.pages), on_progress, gen_logger)
-            for i, page in enumerate(outline.pages)
-        ]
-        audio_results = await asyncio.gather(*audio_tasks)
-        audio_duration = time.time() - audio_start_time
+            async def run_audio() -> list[TTSResult]:
+                results = await asyncio.gather(*[audio_tasks[i] for i in range(total)])
+                audio_duration = time.time() - story_start_time
+                if gen_logger:
+                    await gen_logger.log_step(
+                        step=GenerationStep.AUDIO_SYNTHESIZE,
+                        message=f"所有音频生成完成 ({len(results)} 条)",
+                        output_result={"audio_count": len(results), "total_duration": audio_duration},
+                        duration=audio_duration,
+                    )
+                return results
 
-        if gen_logger:
-            await gen_logger.log_step(
-                step=GenerationStep.AUDIO_SYNTHESIZE,
-                message=f"所有音频生成完成 ({len(audio_results)} 条)",
-                output_result={"audio_count": len(audio_results), "total_duration": audio_duration},
-                duration=audio_duration,
+            async def finish_page(index: int, page: PictureBookPage) -> dict[str, Any]:
+                page_data = self._build_page_data(
+                    page, await image_tasks[index], await audio_tasks[index]
+                )
+                if on_page_ready:
+                    await on_page_ready(index, page_data)
+                return page_data
+
+            _, _, pages = await self._run_concurrently(
+                run_images(),
+                run_audio(),
+                asyncio.gather(*[finish_page(i, page) for i, page in enumerate(outline.pages)]),
             )
+        except BaseException:
+            # 失败时取消已分发的页面任务，避免孤儿任务继续消耗配额
+            tasks = [
+                *image_tasks.values(), *audio_tasks.values(), *stale_tasks,
+                *([narration_task] if narration_task else []),
+            ]
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
 
         # Combine results
-        pages = []
-        total_duration = 0
-
-        for i, page in enumerate(outline.pages):
-            img_result = image_results[i]
-            audio_result = audio_results[i]
-
-            # 只存储每页的独有内容，通用配置（model/style/voice_id）由 style_config 和 generated_by 提供
-            page_data = {
-                "page_num": page.page_num,
-                "text": page.text,
-                "image_url": img_result.url,
-                "image_thumb_url": img_result.thumb_url,
-                "image_prompt": page.image_prompt,
-                "audio_url": audio_result.audio_url,
-                "audio_duration": audio_result.duration,
-                "interaction": page.interaction.model_dump() if page.interaction else None,
-            }
-            pages.append(page_data)
-            total_duration += audio_result.duration
+        total_duration = sum(page["audio_duration"] for page in pages)
+        narration = narration_task.result()[0] if narration_task else None
 
-        return {
+        result = {
             "title": outline.title,
             "theme_topic": outline.theme_topic,
             "educational_goal": outline.educational_goal,
@@ -263,54 +379,128 @@ class PictureBookPipeline:
                 "tts_model": getattr(self._tts_service, 'model_name', 'unknown'),
             },
         }
+        if narration:
+            # 播放器可只下载整段音频，按 cue 表翻页
+            result["narration"] = narration.to_dict()
+        return result
+
+    async def _draw_banked_outline(
+        self,
+        theme_topic: str,
+        age_months: int,
+        child_name: str,
+        style_config: StyleConfig,
+        favorite_characters: list[str] | None,
+    ) -> PictureBookOutline | None:
+        """从大纲库取预生成大纲；未命中或大纲库不可用时返回 None."""
+        settings = get_settings()
+        if not settings.outline_bank_enabled:
+            return None
+        if self._outline_bank is None:
+            self._outline_bank = OutlineBank(story_agent=self._story_agent)
+        try:
+            return await self._outline_bank.draw(
+                theme_topic=theme_topic,
+                age_months=age_months,
+                child_name=child_name,
+                style_config=style_config,
+                favorite_characters=favorite_characters,
+                refine=settings.outline_bank_refine,
+            )
+        except Exception as e:
+            logger.warning(f"[PictureBook] Outline bank unavailable, generating outline: {e}")
+            return None
+
+    @staticmethod
+    def _build_page_data(page: PictureBookPage, img_result: ImageResult, audio_result: TTSResult) -> dict[str, Any]:
+        """组装单页数据.
+
+        只存储每页的独有内容，通用配置（model/style/voice_id）由 style_config 和 generated_by 提供
+        """
+        return {
+            "page_num": page.page_num,
+            "text": page.text,
+            "image_url": img_result.url,
+            "image_thumb_url": img_result.thumb_url,
+            "image_prompt": page.image_prompt,
+            "audio_url": audio_result.audio_url,
+            "audio_duration": audio_result.duration,
+            "interaction": page.interaction.model_dump() if page.interaction else None,
+        }
+
+    @staticmethod
+    async def _run_concurrently(*coros):
+        """Run coroutines concurrently; on the first failure cancel the rest.
+
+        与 asyncio.gather 不同，失败时不会留下仍在调用图像/TTS 服务的孤儿任务
+        （它们不再受调度器并发限制，只会白白消耗配额）。
+        """
+        tasks = [asyncio.ensure_future(c) for c in coros]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
 
     async def _generate_page_image(
         self,
         prompt: str,
         index: int,
         total: int,
-        on_progress: Callable[[GenerationProgress], None] | None,
+        on_done: Callable[[], None] | None,
         gen_logger: GenerationLogger | None = None,
+        checkpoint: PipelineCheckpoint | None = None,
     ):
-        """Generate image for a single page with concurrency control.
+        """Generate image for a single page.
+
+        并发由图像服务的 provider 限流器控制（moana.services.ratelimit）。
 
         注意：使用 ImageStyle.NONE 是因为 StoryAgent 生成的 image_prompt
         已经包含了完整的风格描述（基于用户选择的 art_style）。
         这样前端传来的任何艺术风格都会透传到图片服务，不会被后端过滤。
         """
-        async with self._image_semaphore:
-            start_time = time.time()
-            logger.debug(f"[PictureBook] Generating image {index+1}/{total}, prompt: {prompt[:100]}...")
+        saved = checkpoint.units.get(f"image_{index}") if checkpoint else None
+        if saved:
+            if on_done:
+                on_done()
+            return ImageResult(**saved)
 
-            try:
-                result = await self._image_service.generate(
-                    prompt=prompt,
-                    style=ImageStyle.NONE,
-                )
-                duration = time.time() - start_time
+        start_time = time.time()
+        logger.debug(f"[PictureBook] Generating image {index+1}/{total}, prompt: {prompt[:100]}...")
 
-                if gen_logger:
-                    await gen_logger.log_step(
-                        step=GenerationStep.IMAGE_GENERATE,
-                        message=f"图片 {index+1}/{total} 生成完成",
-                        input_params={"prompt": prompt[:200], "page_index": index + 1},
-                        output_result={"url": result.url, "model": getattr(result, 'model', 'unknown')},
-                        duration=duration,
-                    )
-            except Exception as e:
-                if gen_logger:
-                    await gen_logger.log_error(
-                        step=GenerationStep.IMAGE_GENERATE,
-                        message=f"图片 {index+1}/{total} 生成失败",
-                        error=e,
-                        input_params={"prompt": prompt[:200], "page_index": index + 1},
-                    )
-                raise
+        try:
+            result = await self._image_service.generate(
+                prompt=prompt,
+                style=ImageStyle.NONE,
+            )
+            duration = time.time() - start_time
 
-            if on_progress:
-                on_progress(GenerationProgress("images", index + 1, total, f"插图 {index + 1}/{total} 完成"))
+            if gen_logger:
+                await gen_logger.log_step(
+                    step=GenerationStep.IMAGE_GENERATE,
+                    message=f"图片 {index+1}/{total} 生成完成",
+                    input_params={"prompt": prompt[:200], "page_index": index + 1},
+                    output_result={"url": result.url, "model": getattr(result, 'model', 'unknown')},
+                    duration=duration,
+                )
+            if checkpoint:
+                await checkpoint.save(f"image_{index}", result)
+        except Exception as e:
+            if gen_logger:
+                await gen_logger.log_error(
+                    step=GenerationStep.IMAGE_GENERATE,
+                    message=f"图片 {index+1}/{total} 生成失败",
+                    error=e,
+                    input_params={"prompt": prompt[:200], "page_index": index + 1},
+                )
+            raise
+
+        if on_done:
+            on_done()
 
-            return result
+        return result
 
     async def _generate_page_audio(
         self,
@@ -318,46 +508,131 @@ class PictureBookPipeline:
         voice_id: str | None,
         index: int,
         total: int,
-        on_progress: Callable[[GenerationProgress], None] | None,
+        on_done: Callable[[], None] | None,
         gen_logger: GenerationLogger | None = None,
+        checkpoint: PipelineCheckpoint | None = None,
+        on_audio_url: Callable[[str], Awaitable[None]] | None = None,
     ):
-        """Generate audio for a single page with concurrency control."""
-        async with self._tts_semaphore:
-            start_time = time.time()
-            # 增加请求间隔，进一步避免触发 QPS 限制
-            await asyncio.sleep(0.5)
+        """Generate audio for a single page (concurrency limited by the TTS provider limiter).
 
-            try:
+        on_audio_url 非空时使用流式合成，音频第一块落盘即回调。
+        """
+        saved = checkpoint.units.get(f"audio_{index}") if checkpoint else None
+        if saved:
+            if on_done:
+                on_done()
+            return TTSResult(**saved)
+
+        start_time = time.time()
+
+        try:
+            if on_audio_url:
+                result = await self._tts_service.synthesize_streaming(
+                    text=text,
+                    voice_id=voice_id,
+                    speed=0.9,  # Slightly slower for children
+                    on_audio_url=on_audio_url,
+                )
+            else:
                 result = await self._tts_service.synthesize(
                     text=text,
                     voice_id=voice_id,
                     speed=0.9,  # Slightly slower for children
                 )
-                duration = time.time() - start_time
+            duration = time.time() - start_time
 
-                if gen_logger:
-                    await gen_logger.log_step(
-                        step=GenerationStep.AUDIO_SYNTHESIZE,
-                        message=f"音频 {index+1}/{total} 合成完成",
-                        input_params={"text": text, "voice_id": voice_id, "page_index": index + 1},
-                        output_result={
-                            "audio_url": result.audio_url,
-                            "duration": result.duration,
-                            "model": getattr(result, 'model', 'unknown'),
-                        },
-                        duration=duration,
-                    )
-            except Exception as e:
-                if gen_logger:
-                    await gen_logger.log_error(
-                        step=GenerationStep.AUDIO_SYNTHESIZE,
-                        message=f"音频 {index+1}/{total} 合成失败",
-                        error=e,
-                        input_params={"text": text, "voice_id": voice_id, "page_index": index + 1},
-                    )
-                raise
+            if gen_logger:
+                await gen_logger.log_step(
+                    step=GenerationStep.AUDIO_SYNTHESIZE,
+                    message=f"音频 {index+1}/{total} 合成完成",
+                    input_params={"text": text, "voice_id": voice_id, "page_index": index + 1},
+                    output_result={
+                        "audio_url": result.audio_url,
+                        "duration": result.duration,
+                        "model": getattr(result, 'model', 'unknown'),
+                    },
+                    duration=duration,
+                )
+            if checkpoint:
+                await checkpoint.save(f"audio_{index}", result)
+        except Exception as e:
+            if gen_logger:
+                await gen_logger.log_error(
+                    step=GenerationStep.AUDIO_SYNTHESIZE,
+                    message=f"音频 {index+1}/{total} 合成失败",
+                    error=e,
+                    input_params={"text": text, "voice_id": voice_id, "page_index": index + 1},
+                )
+            raise
 
-            if on_progress:
-                on_progress(GenerationProgress("audio", index + 1, total, f"音频 {index + 1}/{total} 完成"))
+        if on_done:
+            on_done()
+
+        return result
+
+    async def _generate_book_audio(
+        self,
+        pages: list[PictureBookPage],
+        voice_id: str | None,
+        on_done: Callable[[], None] | None,
+        gen_logger: GenerationLogger | None = None,
+        checkpoint: PipelineCheckpoint | None = None,
+        on_page_audio: Callable[[int, str], Awaitable[None]] | None = None,
+    ) -> tuple[BookNarration | None, list[TTSResult]]:
+        """Narrate the whole book in one TTS request and split it into page clips.
+
+        整本合成或切分的任何失败（静音不足、ffmpeg 不可用、下载或 provider 报错）都退回
+        逐页合成，返回的 narration 为 None。
+        """
+        total = len(pages)
+        saved = checkpoint.units if checkpoint else {}
+        if all(f"audio_{i}" in saved for i in range(total)):
+            results = [TTSResult(**saved[f"audio_{i}"]) for i in range(total)]
+            narration = saved.get("narration")
+            for _ in range(total):
+                if on_done:
+                    on_done()
+            return (BookNarration(**narration, pages=results) if narration else None), results
+
+        settings = get_settings()
+        start_time = time.time()
+        try:
+            narration = await narrate_book(
+                self._tts_service,
+                [page.text for page in pages],
+                voice_id=voice_id,
+                speed=0.9,  # Slightly slower for children
+                noise_db=settings.tts_whole_book_silence_db,
+                min_silence=settings.tts_whole_book_min_silence,
+            )
+        except Exception as e:
+            # 切分失败、下载失败（httpx）、provider 报错 / 重试耗尽（ValueError、RetryError）都退回逐页合成
+            level = logging.INFO if isinstance(e, NarrationSplitError) else logging.WARNING
+            logger.log(level, f"[PictureBook] Whole-book narration failed, synthesizing per page: {type(e).__name__}: {e}")
+            results = await asyncio.gather(*[
+                self._generate_page_audio(
+                    page.text, voice_id, i, total, on_done, gen_logger, checkpoint,
+                    (lambda url, i=i: on_page_audio(i, url)) if on_page_audio else None,
+                )
+                for i, page in enumerate(pages)
+            ])
+            return None, list(results)
 
-            return result
+        if gen_logger:
+            await gen_logger.log_step(
+                step=GenerationStep.AUDIO_SYNTHESIZE,
+                message=f"整本朗读合成完成 ({total} 页)",
+                input_params={"voice_id": voice_id, "page_count": total},
+                output_result=narration.to_dict(),
+                duration=time.time() - start_time,
+            )
+        if checkpoint:
+            await checkpoint.save("narration", narration.to_dict())
+        for i, result in enumerate(narration.pages):
+            if checkpoint:
+                await checkpoint.save(f"audio_{i}", result)
+            if on_page_audio:
+                await on_page_audio(i, result.audio_url)
+            if on_done:
+                on_done()
+        return narration, narration.pages
@@ -1,4 +1,4 @@
 """Audio processing utilities."""
-from moana.services.audio.converter import AudioConverter
+from moana.services.audio.converter import AudioConverter, ffmpeg_stats, reset_ffmpeg_limiter
 
-__all__ = ["AudioConverter"]
+__all__ = ["AudioConverter", "ffmpeg_stats", "reset_ffmpeg_limiter"]
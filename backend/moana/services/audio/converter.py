@@ -3,14 +3,94 @@
 Note: This module uses asyncio.create_subprocess_exec which is the safe
 equivalent of Node.js execFile - it passes arguments as a list without
 shell expansion, preventing command injection vulnerabilities.
+
+转码全程走管道（stdin -> stdout），不落临时文件；输出为分片 MP4（m4a，
+可直接播放）或 ADTS（裸 AAC）。所有 ffmpeg 进程共享一个并发上限
+（FFMPEG_MAX_CONCURRENCY），多本绘本同时生成时不会瞬间派生大量进程。
+wav_to_aac_batch 在一次 ffmpeg 调用中转换多个片段（每个片段一对额外管道）。
 """
 import asyncio
 import logging
-import tempfile
-from pathlib import Path
+import os
+import re
+from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# 输出容器 -> (ffmpeg 参数, MIME, 扩展名)
+# 管道输出无法回写 moov（+faststart），MP4 使用分片格式
+OUTPUT_FORMATS: dict[str, tuple[list[str], str, str]] = {
+    "mp4": (["-f", "mp4", "-movflags", "frag_keyframe+empty_moov+default_base_moof"], "audio/mp4", "m4a"),
+    "adts": (["-f", "adts"], "audio/aac", "aac"),
+}
+
+
+class FFmpegLimiter:
+    """Process-wide cap on concurrently running ffmpeg processes."""
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.running = 0
+        self.waiting = 0
+        self.processes = 0
+        self.failures = 0
+
+    async def __aenter__(self) -> None:
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        self.processes += 1
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.running -= 1
+        if exc_type is not None:
+            self.failures += 1
+        self._semaphore.release()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": self.running,
+            "waiting": self.waiting,
+            "processes": self.processes,
+            "failures": self.failures,
+        }
+
+
+_limiter: Optional[FFmpegLimiter] = None
+
+
+def get_ffmpeg_limiter() -> FFmpegLimiter:
+    """Get the shared ffmpeg limiter (sized by FFMPEG_MAX_CONCURRENCY)."""
+    global _limiter
+    if _limiter is None:
+        from moana.config import get_settings
+
+        _limiter = FFmpegLimiter(get_settings().ffmpeg_max_concurrency)
+    return _limiter
+
+
+def reset_ffmpeg_limiter() -> None:
+    """Drop the limiter (tests)."""
+    global _limiter
+    _limiter = None
+
+
+_SILENCE_START = re.compile(r"silence_start: (-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end: (-?[\d.]+)")
+# null muxer 结束时的统计行 "size=N/A time=00:00:12.34 ..."
+_DECODED_TIME = re.compile(r"time=(\d+:\d+:[\d.]+)")
+
+
+def _aac_args(bitrate: str, container: str) -> list[str]:
+    if container not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported AAC container: {container}")
+    return ["-c:a", "aac", "-b:a", bitrate, *OUTPUT_FORMATS[container][0]]
+
 
 class AudioConverter:
     """Audio format converter using ffmpeg."""
@@ -19,54 +99,279 @@ class AudioConverter:
     async def wav_to_aac(
         wav_data: bytes,
         bitrate: str = "96k",
+        container: str = "mp4",
     ) -> bytes:
         """Convert WAV audio to AAC format.
 
         Args:
             wav_data: Input WAV audio bytes
             bitrate: Output bitrate (default 96k, suitable for speech)
+            container: "mp4" (fragmented M4A) or "adts" (raw AAC stream)
 
         Returns:
-            AAC audio bytes (in M4A container)
+            AAC audio bytes
 
         Raises:
             RuntimeError: If ffmpeg conversion fails
         """
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as wav_file:
-            wav_path = Path(wav_file.name)
-            wav_file.write(wav_data)
+        aac_data, _ = await _run_stdio(
+            ["-f", "wav", "-i", "pipe:0", *_aac_args(bitrate, container), "pipe:1"],
+            wav_data,
+        )
+
+        logger.info(
+            f"Converted WAV ({len(wav_data)} bytes) to AAC ({len(aac_data)} bytes), "
+            f"ratio: {len(aac_data) / max(len(wav_data), 1):.1%}"
+        )
+        return aac_data
+
+    @staticmethod
+    async def wav_to_aac_batch(
+        clips: list[bytes],
+        bitrate: str = "96k",
+        container: str = "mp4",
+        max_clips_per_process: Optional[int] = None,
+    ) -> list[bytes]:
+        """Convert many WAV clips, several per ffmpeg invocation.
+
+        每个片段通过一对额外的管道（pipe:<fd>）输入 / 输出，一个进程转换一组片段；
+        非 POSIX 平台逐个调用 wav_to_aac。
+
+        Args:
+            clips: Input WAV audio bytes, one per clip
+            bitrate: Output bitrate
+            container: "mp4" (fragmented M4A) or "adts" (raw AAC stream)
+            max_clips_per_process: Clips per ffmpeg process (FFMPEG_BATCH_SIZE by default)
+
+        Returns:
+            AAC audio bytes for each clip, in order
+        """
+        if not clips:
+            return []
+        if os.name != "posix":
+            return [await AudioConverter.wav_to_aac(c, bitrate, container) for c in clips]
 
-        aac_path = wav_path.with_suffix(".m4a")
+        if max_clips_per_process is None:
+            from moana.config import get_settings
 
+            max_clips_per_process = get_settings().ffmpeg_batch_size
+        size = max(1, max_clips_per_process)
+        groups = [clips[i:i + size] for i in range(0, len(clips), size)]
+        results = await asyncio.gather(*(_convert_group(g, bitrate, container) for g in groups))
+        return [aac for group in results for aac in group]
+
+    @staticmethod
+    async def detect_silences(
+        audio: bytes,
+        noise_db: float = -35.0,
+        min_duration: float = 0.5,
+    ) -> tuple[list[tuple[float, float]], float]:
+        """Find silent spans with ffmpeg silencedetect.
+
+        Args:
+            audio: 任意 ffmpeg 可识别格式的音频
+            noise_db: 低于该音量视为静音
+            min_duration: 最短静音时长（秒）
+
+        Returns:
+            ([(静音开始, 静音结束), ...], 音频总时长)，单位秒
+        """
+        _, stderr = await _run_stdio(
+            [
+                "-loglevel", "info", "-i", "pipe:0",
+                "-af", f"silencedetect=noise={noise_db}dB:d={min_duration}",
+                "-f", "null", "-",
+            ],
+            audio,
+        )
+        log = stderr.decode(errors="replace")
+        starts = [float(v) for v in _SILENCE_START.findall(log)]
+        ends = [float(v) for v in _SILENCE_END.findall(log)]
+        duration = max([_parse_time(t) for t in _DECODED_TIME.findall(log)] + ends + [0.0])
+        if len(starts) > len(ends):
+            # 结尾静音持续到音频末尾
+            ends.append(duration)
+        return list(zip(starts, ends)), duration
+
+    @staticmethod
+    async def probe_duration(audio: bytes) -> float:
+        """Decoded duration of the audio in seconds (ffmpeg 解码到 null 输出)."""
+        _, stderr = await _run_stdio(
+            ["-loglevel", "info", "-i", "pipe:0", "-f", "null", "-"],
+            audio,
+        )
+        times = _DECODED_TIME.findall(stderr.decode(errors="replace"))
+        return max([_parse_time(t) for t in times] + [0.0])
+
+    @staticmethod
+    async def split(
+        audio: bytes,
+        cuts: list[float],
+        bitrate: str = "96k",
+        container: str = "mp4",
+    ) -> list[bytes]:
+        """Cut audio at the given offsets into len(cuts) + 1 AAC clips.
+
+        POSIX 上一个 ffmpeg 进程解码一次、每段一个输出管道。
+        """
+        bounds = [0.0, *cuts, None]
+        segments = [
+            ["-ss", f"{start:.3f}", *(["-to", f"{end:.3f}"] if end is not None else [])]
+            for start, end in zip(bounds, bounds[1:])
+        ]
+        if os.name != "posix":
+            clips = []
+            for segment in segments:
+                clip, _ = await _run_stdio(
+                    ["-i", "pipe:0", *segment, *_aac_args(bitrate, container), "pipe:1"], audio
+                )
+                clips.append(clip)
+            return clips
+        return await _run_piped(
+            [([], audio)],
+            [["-map", "0:a", *segment, *_aac_args(bitrate, container)] for segment in segments],
+        )
+
+
+async def _run_stdio(args: list[str], data: bytes) -> tuple[bytes, bytes]:
+    """Run ffmpeg with data on stdin; returns (stdout, stderr)."""
+    async with get_ffmpeg_limiter():
+        # Using create_subprocess_exec (safe, no shell expansion)
+        process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-hide_banner", "-loglevel", "error", *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
         try:
-            # Run ffmpeg to convert WAV to AAC
+            stdout, stderr = await process.communicate(data)
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+
+        if process.returncode != 0:
+            logger.error(f"ffmpeg failed: {stderr.decode()}")
+            raise RuntimeError(f"ffmpeg conversion failed: {stderr.decode()[:200]}")
+    return stdout, stderr
+
+
+def _parse_time(value: str) -> float:
+    hours, minutes, seconds = value.split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+async def _convert_group(clips: list[bytes], bitrate: str, container: str) -> list[bytes]:
+    """Run one ffmpeg process converting len(clips) inputs to as many outputs."""
+    outputs = await _run_piped(
+        [(["-f", "wav"], clip) for clip in clips],
+        [["-map", f"{index}:a", *_aac_args(bitrate, container)] for index in range(len(clips))],
+    )
+    logger.info(
+        f"Converted {len(clips)} WAV clips ({sum(map(len, clips))} bytes) to AAC "
+        f"({sum(map(len, outputs))} bytes) in one ffmpeg process"
+    )
+    return outputs
+
+
+async def _run_piped(
+    inputs: list[tuple[list[str], bytes]],
+    outputs: list[list[str]],
+) -> list[bytes]:
+    """Run one ffmpeg process with a pipe per input and per output.
+
+    Args:
+        inputs: (输入参数, 数据)，参数放在对应的 -i pipe:<fd> 之前
+        outputs: 输出参数，放在对应的 pipe:<fd> 之前
+
+    Returns:
+        每个输出的字节，顺序与 outputs 一致
+    """
+    loop = asyncio.get_running_loop()
+    in_pipes = [os.pipe() for _ in inputs]  # (ffmpeg 读端, 本进程写端)
+    out_pipes = [os.pipe() for _ in outputs]  # (本进程读端, ffmpeg 写端)
+    child_fds = [r for r, _ in in_pipes] + [w for _, w in out_pipes]
+    parent_fds = [w for _, w in in_pipes] + [r for r, _ in out_pipes]
+
+    args = ["ffmpeg", "-hide_banner", "-loglevel", "error"]
+    for (r, _), (input_args, _) in zip(in_pipes, inputs):
+        args += [*input_args, "-i", f"pipe:{r}"]
+    for (_, w), output_args in zip(out_pipes, outputs):
+        args += [*output_args, f"pipe:{w}"]
+
+    transports: list[asyncio.BaseTransport] = []
+    pending: dict[int, Any] = {}  # 尚未交给 transport 的父进程端（文件对象）
+    try:
+        async with get_ffmpeg_limiter():
             # Using create_subprocess_exec (safe, no shell expansion)
             process = await asyncio.create_subprocess_exec(
-                "ffmpeg",
-                "-y",
-                "-i", str(wav_path),
-                "-c:a", "aac",
-                "-b:a", bitrate,
-                "-movflags", "+faststart",
-                str(aac_path),
-                stdout=asyncio.subprocess.PIPE,
+                *args,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE,
+                pass_fds=child_fds,
+            )
+            # 子进程已继承，父进程必须关闭子进程端，否则读端永远收不到 EOF
+            for fd in child_fds:
+                os.close(fd)
+            child_fds = []
+            pending = {fd: os.fdopen(fd, "wb" if i < len(inputs) else "rb", 0) for i, fd in enumerate(parent_fds)}
+            parent_fds = []
+
+            async def feed(fd: int, data: bytes) -> None:
+                transport, protocol = await loop.connect_write_pipe(
+                    asyncio.streams.FlowControlMixin, pending.pop(fd)
+                )
+                transports.append(transport)
+                writer = asyncio.StreamWriter(transport, protocol, None, loop)
+                try:
+                    writer.write(data)
+                    await writer.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    # ffmpeg 提前退出，错误由返回码报告
+                    pass
+                finally:
+                    writer.close()
+
+            async def drain(fd: int) -> bytes:
+                reader = asyncio.StreamReader()
+                transport, _ = await loop.connect_read_pipe(
+                    lambda: asyncio.StreamReaderProtocol(reader), pending.pop(fd)
+                )
+                transports.append(transport)
+                return await reader.read()
+
+            io = asyncio.gather(
+                *(feed(w, data) for (_, w), (_, data) in zip(in_pipes, inputs)),
+                *(drain(r) for r, _ in out_pipes),
+                process.stderr.read(),
             )
-            stdout, stderr = await process.communicate()
+            try:
+                results = await io
+                await process.wait()
+            except BaseException:
+                io.cancel()
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
 
+            stderr = results[-1]
             if process.returncode != 0:
                 logger.error(f"ffmpeg failed: {stderr.decode()}")
                 raise RuntimeError(f"ffmpeg conversion failed: {stderr.decode()[:200]}")
+    finally:
+        for fd in child_fds + parent_fds:
+            os.close(fd)
+        for pipe in pending.values():
+            pipe.close()
+        for transport in transports:
+            transport.close()
 
-            # Read converted file
-            aac_data = aac_path.read_bytes()
-            logger.info(
-                f"Converted WAV ({len(wav_data)} bytes) to AAC ({len(aac_data)} bytes), "
-                f"ratio: {len(aac_data) / len(wav_data):.1%}"
-            )
-            return aac_data
+    return list(results[len(inputs):len(inputs) + len(outputs)])
 
-        finally:
-            # Cleanup temp files
-            wav_path.unlink(missing_ok=True)
-            aac_path.unlink(missing_ok=True)
+
+def ffmpeg_stats() -> dict[str, Any]:
+    """Running / waiting ffmpeg processes for this worker."""
+    return get_ffmpeg_limiter().stats()
@@ -0,0 +1,143 @@
+# src/moana/services/executor.py
+"""Dedicated thread pool for blocking SDK / storage calls.
+
+google-genai、google-generativeai (REST transport)、oss2 等 SDK 只提供同步接口，
+直接在事件循环中调用会让同一 worker 上的所有请求卡住一个网络往返。
+这些调用统一通过 run_blocking 提交到固定大小的专用线程池（与默认
+executor 隔离，避免和其他 to_thread 调用互相挤占）。
+
+PIL 编码 / 缩放是 CPU 密集型（持有 GIL 的部分也不少），放到线程里仍会拖慢事件循环，
+通过 run_image_task 提交到按 CPU 核数配置的进程池（IMAGE_EXECUTOR_WORKERS）。
+进程池不可用（创建失败 / 子进程崩溃）时该次调用退回专用线程池。
+
+调试：LOOP_SLOW_CALLBACK_MS > 0 时开启 asyncio debug 模式，任何占用事件循环
+超过阈值的回调 / 协程步骤都会由 asyncio logger 记录 "Executing ... took ..."。
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Process-wide executors
+_executor: Optional[ThreadPoolExecutor] = None
+_image_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """Get the shared executor for blocking calls (sized by BLOCKING_EXECUTOR_WORKERS)."""
+    global _executor
+    if _executor is None:
+        from moana.config import get_settings
+
+        _executor = ThreadPoolExecutor(
+            max_workers=get_settings().blocking_executor_workers,
+            thread_name_prefix="moana-blocking",
+        )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call in the dedicated executor.
+
+    Usage:
+        response = await run_blocking(client.models.generate_content, model=..., contents=...)
+    """
+    loop = asyncio.get_running_loop()
+    # 与 asyncio.to_thread 一样传递 contextvars
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_blocking_executor(), call)
+
+
+def shutdown_blocking_executor(wait: bool = False) -> None:
+    """Shut down the executor (application shutdown / tests)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait, cancel_futures=True)
+        _executor = None
+
+
+def get_image_executor() -> Optional[ProcessPoolExecutor]:
+    """Get the process pool for image post-processing (sized by IMAGE_EXECUTOR_WORKERS).
+
+    无法创建进程池（如受限环境不支持多进程）时返回 None。
+    """
+    global _image_executor
+    if _image_executor is None:
+        from moana.config import get_settings
+
+        workers = get_settings().image_executor_workers or os.cpu_count() or 1
+        try:
+            # spawn：事件循环 / 线程池所在进程 fork 出的子进程可能继承被持有的锁
+            _image_executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        except OSError as e:
+            logger.warning(f"Cannot create image process pool: {e}")
+            return None
+    return _image_executor
+
+
+async def run_image_task(func: Callable[..., T], /, *args: Any) -> T:
+    """Run a CPU-bound image call in the process pool.
+
+    func 和参数需可 pickle（模块级函数 / 静态方法，bytes 等）。
+    进程池不可用时在线程池执行；func 自身抛出的异常（如 PIL 的
+    UnidentifiedImageError，属于 OSError）原样传给调用方。
+
+    Usage:
+        webp = await run_image_task(ImageOptimizer.png_to_webp, png_data, 90)
+    """
+    executor = get_image_executor()
+    if executor is None:
+        return await run_blocking(func, *args)
+
+    loop = asyncio.get_running_loop()
+    try:
+        # 提交时按需启动子进程，进程数 / 内存不足时抛出 OSError
+        future = loop.run_in_executor(executor, func, *args)
+    except (BrokenProcessPool, OSError) as e:
+        logger.warning(f"Image process pool unavailable, running in thread pool: {e}")
+        shutdown_image_executor()
+        return await run_blocking(func, *args)
+
+    try:
+        return await future
+    except BrokenProcessPool as e:
+        # 子进程崩溃：丢弃进程池（下次重建），本次在线程池执行
+        logger.warning(f"Image process pool broke, running in thread pool: {e}")
+        shutdown_image_executor()
+        return await run_blocking(func, *args)
+
+
+def shutdown_image_executor(wait: bool = False) -> None:
+    """Shut down the image process pool (application shutdown / tests)."""
+    global _image_executor
+    if _image_executor is not None:
+        _image_executor.shutdown(wait=wait, cancel_futures=True)
+        _image_executor = None
+
+
+def enable_slow_callback_warnings(
+    threshold_ms: int,
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+) -> None:
+    """Log every callback / coroutine step that holds the loop longer than threshold_ms.
+
+    基于 asyncio debug 模式（有额外开销，仅用于排查）。
+    """
+    loop = loop or asyncio.get_running_loop()
+    loop.set_debug(True)
+    loop.slow_callback_duration = threshold_ms / 1000
+    logging.getLogger("asyncio").setLevel(logging.WARNING)
+    logger.warning(f"Event loop debug enabled: flagging steps slower than {threshold_ms}ms")
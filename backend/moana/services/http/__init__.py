@@ -0,0 +1,26 @@
+# src/moana/services/http/__init__.py
+"""Shared HTTP client pool for upstream provider calls.
+
+Usage:
+    from moana.services.http import http_client
+
+    async with http_client("wanx", timeout=60.0) as client:
+        response = await client.post(url, json=payload)
+"""
+from moana.services.http.registry import (
+    HTTPClientRegistry,
+    PooledHTTPClient,
+    close_http_clients,
+    get_http_registry,
+    http_client,
+    http_pool_stats,
+)
+
+__all__ = [
+    "HTTPClientRegistry",
+    "PooledHTTPClient",
+    "close_http_clients",
+    "get_http_registry",
+    "http_client",
+    "http_pool_stats",
+]
@@ -0,0 +1,250 @@
+# src/moana/services/http/registry.py
+"""Shared, pooled httpx clients for upstream provider calls.
+
+每个上游（suno、wanx、minimax、wechat ...）一个长期存在的 AsyncClient，
+复用 TCP/TLS 连接（keep-alive），安装了 h2 时启用 HTTP/2。
+此前每次调用（包括每 5 秒一次的 Suno 状态轮询）都新建客户端、重新握手。
+
+代理变体：
+- 默认：遵循环境变量中的代理设置（HTTP(S)_PROXY）
+- proxy="http://..."：显式代理
+- direct=True：忽略环境代理直连（如 Suno CDN 通过代理访问会 403）
+
+客户端按事件循环缓存（测试中每个用例一个新循环），应用关闭时统一关闭。
+"""
+import asyncio
+import importlib.util
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PoolEntry:
+    """A registered client and its usage counters."""
+    name: str
+    variant: str
+    client: httpx.AsyncClient
+    loop: asyncio.AbstractEventLoop
+    created_at: float = field(default_factory=time.time)
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+
+
+class PooledHTTPClient:
+    """View over a shared client with a per-call default timeout.
+
+    共享客户端不可在使用方关闭；timeout 作为每次请求的参数传入，互不影响。
+    """
+
+    def __init__(self, entry: _PoolEntry, timeout: Optional[float] = None):
+        self._entry = entry
+        self._timeout = timeout
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._entry.client
+
+    def _with_timeout(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        if self._timeout is not None:
+            kwargs.setdefault("timeout", self._timeout)
+        return kwargs
+
+    async def _send(self, method: str, *args: Any, **kwargs: Any) -> httpx.Response:
+        entry = self._entry
+        entry.requests += 1
+        entry.in_flight += 1
+        try:
+            return await getattr(entry.client, method)(*args, **self._with_timeout(kwargs))
+        except Exception:
+            entry.errors += 1
+            raise
+        finally:
+            entry.in_flight -= 1
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._send("request", method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._send("get", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._send("post", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._send("put", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._send("delete", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        entry = self._entry
+        entry.requests += 1
+        entry.in_flight += 1
+        try:
+            async with entry.client.stream(method, url, **self._with_timeout(kwargs)) as response:
+                yield response
+        except Exception:
+            entry.errors += 1
+            raise
+        finally:
+            entry.in_flight -= 1
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class HTTPClientRegistry:
+    """Process-wide registry of pooled clients keyed by upstream name and proxy variant."""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        default_timeout: float = 60.0,
+    ):
+        """Initialize registry.
+
+        Args:
+            max_connections: 每个客户端的最大连接数
+            max_keepalive_connections: 每个客户端保持的空闲连接数
+            keepalive_expiry: 空闲连接保留时长（秒）
+            http2: 是否启用 HTTP/2（需要安装 h2，否则回退 HTTP/1.1）
+            default_timeout: 调用方未指定时的默认超时（秒）
+        """
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._http2 = http2 and _http2_available()
+        self._default_timeout = default_timeout
+        self._entries: dict[tuple[str, str], _PoolEntry] = {}
+
+    @property
+    def http2(self) -> bool:
+        return self._http2
+
+    def _get_entry(self, name: str, proxy: Optional[str], direct: bool) -> _PoolEntry:
+        variant = "direct" if direct else (proxy or "env")
+        key = (name, variant)
+        loop = asyncio.get_running_loop()
+        entry = self._entries.get(key)
+        if entry is not None and entry.loop is loop and not entry.client.is_closed:
+            return entry
+
+        kwargs: dict[str, Any] = {
+            "limits": self._limits,
+            "timeout": self._default_timeout,
+            "http2": self._http2,
+        }
+        if direct:
+            kwargs["trust_env"] = False
+        elif proxy:
+            kwargs["proxy"] = proxy
+        entry = _PoolEntry(name=name, variant=variant, client=httpx.AsyncClient(**kwargs), loop=loop)
+        self._entries[key] = entry
+        logger.debug(f"[HTTP] created pooled client {name} ({variant}, http2={self._http2})")
+        return entry
+
+    def client(
+        self,
+        name: str,
+        timeout: Optional[float] = None,
+        proxy: Optional[str] = None,
+        direct: bool = False,
+    ) -> PooledHTTPClient:
+        """Get a view over the shared client for an upstream."""
+        return PooledHTTPClient(self._get_entry(name, proxy, direct), timeout)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Pool usage per client (供调优连接数)."""
+        stats = []
+        for entry in sorted(self._entries.values(), key=lambda e: (e.name, e.variant)):
+            pool = getattr(getattr(entry.client, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", []) or [])
+            idle = sum(1 for conn in connections if getattr(conn, "is_idle", lambda: False)())
+            stats.append({
+                "name": entry.name,
+                "variant": entry.variant,
+                "http2": self._http2,
+                "requests": entry.requests,
+                "errors": entry.errors,
+                "in_flight": entry.in_flight,
+                "connections": len(connections),
+                "idle_connections": idle,
+                "closed": entry.client.is_closed,
+            })
+        return stats
+
+    async def aclose(self) -> None:
+        """Close all clients owned by the running loop and forget the rest."""
+        loop = asyncio.get_running_loop()
+        entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            if entry.loop is loop and not entry.client.is_closed:
+                try:
+                    await entry.client.aclose()
+                except Exception as e:
+                    logger.warning(f"[HTTP] failed to close client {entry.name}: {e}")
+
+
+# Process-wide registry
+_registry: Optional[HTTPClientRegistry] = None
+
+
+def get_http_registry() -> HTTPClientRegistry:
+    """Get the shared client registry (configured from settings on first use)."""
+    global _registry
+    if _registry is None:
+        from moana.config import get_settings
+
+        settings = get_settings()
+        _registry = HTTPClientRegistry(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+            http2=settings.http_http2,
+            default_timeout=settings.http_default_timeout,
+        )
+    return _registry
+
+
+@asynccontextmanager
+async def http_client(
+    name: str,
+    timeout: Optional[float] = None,
+    proxy: Optional[str] = None,
+    direct: bool = False,
+) -> AsyncIterator[PooledHTTPClient]:
+    """Borrow the pooled client for an upstream (does not close it on exit).
+
+    Usage:
+        async with http_client("suno", timeout=30.0) as client:
+            response = await client.get(url)
+    """
+    yield get_http_registry().client(name, timeout=timeout, proxy=proxy, direct=direct)
+
+
+def http_pool_stats() -> list[dict[str, Any]]:
+    """Pool usage of all registered clients."""
+    return get_http_registry().stats() if _registry is not None else []
+
+
+async def close_http_clients() -> None:
+    """Close all pooled clients (application shutdown / tests)."""
+    global _registry
+    if _registry is not None:
+        await _registry.aclose()
+        _registry = None
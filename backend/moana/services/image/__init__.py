@@ -1,14 +1,10 @@
 from moana.config import get_settings
 from moana.services.image.base import BaseImageService, ImageResult, ImageStyle
 from moana.services.image.flux import FluxService
-from moana.services.image.optimizer import ImageOptimizer
+from moana.services.image.optimizer import ImageOptimizer, OptimizedImage, compress_image, optimize_image
 
 
-def get_image_service() -> BaseImageService:
-    """Factory function to get image service based on config."""
-    settings = get_settings()
-    provider = settings.image_provider
-
+def _create_image_service(provider: str) -> BaseImageService:
     match provider:
         case "gemini":
             from moana.services.image.gemini import GeminiImageService
@@ -31,12 +27,33 @@ def get_image_service() -> BaseImageService:
             raise ValueError(f"Unknown image provider: {provider}")
 
 
+def get_image_service() -> BaseImageService:
+    """Factory function to get image service based on config.
+
+    配置了 IMAGE_PROVIDER_CHAIN 时返回跨 provider 对冲 / 故障转移的组合服务。
+    """
+    settings = get_settings()
+    chain = [name.strip() for name in settings.image_provider_chain.split(",") if name.strip()]
+    if len(chain) > 1:
+        from moana.services.image.hedged import HedgedImageService
+        return HedgedImageService(
+            chain,
+            _create_image_service,
+            hedge_quantile=settings.image_hedge_quantile,
+            min_samples=settings.image_hedge_min_samples,
+            default_hedge_delay=settings.image_hedge_default_delay,
+        )
+    return _create_image_service(chain[0] if chain else settings.image_provider)
+
 __all__ = [
     "BaseImageService",
     "ImageResult",
     "ImageStyle",
     "FluxService",
     "ImageOptimizer",
+    "OptimizedImage",
+    "optimize_image",
+    "compress_image",
     "get_image_service",
     "ImagenQuotaExceededError",
     "ImagenSafetyFilterError",
@@ -3,6 +3,8 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 
 from moana.config import get_settings
 from moana.services.image.base import BaseImageService, ImageResult, ImageStyle
+from moana.services.ratelimit import provider_limited
+from moana.services.http import http_client
 
 
 class FluxService(BaseImageService):
@@ -17,6 +19,7 @@ class FluxService(BaseImageService):
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
     )
+    @provider_limited("image")
     async def generate(
         self,
         prompt: str,
@@ -28,7 +31,7 @@ class FluxService(BaseImageService):
         """Generate an image using Flux API."""
         enhanced_prompt = self.enhance_prompt_for_children(prompt, style)
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with http_client("fal", timeout=120.0) as client:
             # Submit generation request
             response = await client.post(
                 f"{self._api_base}/v1/flux-pro-1.1",
@@ -3,7 +3,6 @@
 使用 Gemini 原生多模态能力生成图像 (Nano Banana Pro)。
 文档: https://ai.google.dev/gemini-api/docs/image-generation
 """
-import asyncio
 import logging
 import re
 
@@ -12,9 +11,11 @@ from google.genai import types
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from moana.config import get_settings
+from moana.services.executor import run_blocking
 from moana.services.image.base import BaseImageService, ImageResult, ImageStyle
+from moana.services.ratelimit import provider_limited
 from moana.services.storage import get_storage_service
-from moana.services.image.optimizer import ImageOptimizer
+from moana.services.image.optimizer import optimize_image
 
 logger = logging.getLogger(__name__)
 
@@ -81,6 +82,7 @@ class GeminiImageService(BaseImageService):
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
     )
+    @provider_limited("image")
     async def generate(
         self,
         prompt: str,
@@ -99,9 +101,7 @@ class GeminiImageService(BaseImageService):
         logger.info(f"Generating image with Gemini: {sanitized_prompt[:100]}...")
 
         # Gemini 图像生成使用 generate_content API
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
+        response = await run_blocking(
             lambda: self._client.models.generate_content(
                 model=self._model,
                 contents=sanitized_prompt,
@@ -130,24 +130,12 @@ class GeminiImageService(BaseImageService):
 
         logger.info(f"Generated {len(image_data)} bytes, optimizing and saving...")
 
-        # Convert PNG to WebP
-        try:
-            webp_data = ImageOptimizer.png_to_webp(image_data, quality=90)
-            image_bytes = webp_data
-            content_type = "image/webp"
-            key_suffix = "webp"
-        except Exception as e:
-            logger.warning(f"WebP conversion failed, using PNG: {e}")
-            image_bytes = image_data
-            content_type = "image/png"
-            key_suffix = "png"
-
-        # Generate thumbnail
-        try:
-            thumb_data = ImageOptimizer.generate_thumbnail(image_bytes, size=256, quality=85)
-        except Exception as e:
-            logger.warning(f"Thumbnail generation failed: {e}")
-            thumb_data = None
+        # Convert PNG to WebP and generate thumbnail (image process pool, off the event loop)
+        optimized = await optimize_image(image_data, quality=90, thumb_size=256, thumb_quality=85)
+        image_bytes = optimized.data
+        content_type = optimized.content_type
+        key_suffix = optimized.ext
+        thumb_data = optimized.thumb
 
         # Save main image
         storage = get_storage_service()
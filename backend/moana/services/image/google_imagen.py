@@ -8,7 +8,9 @@ from google.genai import types
 from google.genai.errors import ClientError
 
 from moana.config import get_settings
+from moana.services.executor import run_blocking
 from moana.services.image.base import BaseImageService, ImageResult, ImageStyle
+from moana.services.ratelimit import provider_limited
 from moana.services.storage import get_storage_service
 
 logger = logging.getLogger(__name__)
@@ -94,6 +96,7 @@ class GoogleImagenService(BaseImageService):
     def provider_name(self) -> str:
         return "imagen"
 
+    @provider_limited("image")
     async def generate(
         self,
         prompt: str,
@@ -115,11 +118,12 @@ class GoogleImagenService(BaseImageService):
 
         logger.info(f"Generating image with Imagen 4: {sanitized_prompt[:100]}...")
 
-        # Call Imagen 4 API (sync call)
+        # Call Imagen 4 API (sync SDK call, run in the blocking executor)
         # Note: Use 'allow_adult' for cartoon/illustration style images
         # 'dont_allow' would block ANY human-like descriptions including cartoon characters
         try:
-            response = self._client.models.generate_images(
+            response = await run_blocking(
+                self._client.models.generate_images,
                 model=self._model,
                 prompt=sanitized_prompt,
                 config=types.GenerateImagesConfig(
@@ -0,0 +1,239 @@
+# src/moana/services/image/hedged.py
+"""Hedged / failover image generation across an ordered provider chain.
+
+单个 provider 的长尾延迟（或安全过滤拒绝后的重试）会拖慢整本绘本。
+HedgedImageService 按 IMAGE_PROVIDER_CHAIN 顺序调用：
+- 当前调用超过该 provider 滚动 p95 延迟仍未返回时，向链上下一个 provider
+  发出对冲请求（样本不足时使用默认延迟）
+- 某个 provider 失败时立即改用下一个（failover）；链上非末位的 provider
+  只尝试一次（跳过其自身的 tenacity 重试），安全过滤拒绝等错误不再等待
+  重试退避，延迟样本也不包含退避时间
+- 取第一个成功结果，取消其余进行中的请求
+"""
+import asyncio
+import functools
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from tenacity import stop_after_attempt
+
+from moana.services.image.base import BaseImageService, ImageResult, ImageStyle
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one provider."""
+
+    def __init__(self, window: int = 100):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.failures = 0
+        self.hedges = 0  # 因本 provider 过慢而发出的对冲请求数
+        self.wins = 0  # 作为对冲请求胜出的次数
+
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+# Process-wide latency trackers (shared by all service instances)
+_trackers: dict[str, LatencyTracker] = {}
+
+
+def get_latency_tracker(provider: str) -> LatencyTracker:
+    if provider not in _trackers:
+        _trackers[provider] = LatencyTracker()
+    return _trackers[provider]
+
+
+def image_hedge_stats() -> dict[str, dict[str, Any]]:
+    """Per-provider latency percentiles and hedge counters."""
+    stats = {}
+    for name, tracker in _trackers.items():
+        p50 = tracker.quantile(0.5)
+        p95 = tracker.quantile(0.95)
+        stats[name] = {
+            "samples": len(tracker),
+            "p50": round(p50, 2) if p50 is not None else None,
+            "p95": round(p95, 2) if p95 is not None else None,
+            "calls": tracker.calls,
+            "failures": tracker.failures,
+            "hedges": tracker.hedges,
+            "hedge_wins": tracker.wins,
+        }
+    return stats
+
+
+def reset_image_hedge_stats() -> None:
+    """Drop all latency samples (tests)."""
+    _trackers.clear()
+
+
+class HedgedImageService(BaseImageService):
+    """Image service that hedges and fails over across a provider chain."""
+
+    def __init__(
+        self,
+        providers: list[str],
+        factory: Callable[[str], BaseImageService],
+        hedge_quantile: float = 0.95,
+        min_samples: int = 20,
+        default_hedge_delay: float = 45.0,
+    ):
+        """Initialize hedged service.
+
+        Args:
+            providers: provider 名称（按优先级排列）
+            factory: provider 名称 -> 服务实例（首次使用时创建）
+            hedge_quantile: 超过该分位延迟后发出对冲请求
+            min_samples: 使用分位延迟所需的最少样本数
+            default_hedge_delay: 样本不足时的对冲延迟（秒）
+        """
+        if not providers:
+            raise ValueError("HedgedImageService requires at least one provider")
+        self._names = providers
+        self._factory = factory
+        self._hedge_quantile = hedge_quantile
+        self._min_samples = min_samples
+        self._default_hedge_delay = default_hedge_delay
+        self._services: dict[str, BaseImageService] = {}
+
+    @property
+    def provider_name(self) -> str:
+        return self._names[0]
+
+    @property
+    def providers(self) -> list[str]:
+        return list(self._names)
+
+    def _service(self, name: str) -> BaseImageService:
+        if name not in self._services:
+            self._services[name] = self._factory(name)
+        return self._services[name]
+
+    def hedge_delay(self, provider: str) -> float:
+        """对冲延迟：provider 的滚动分位延迟（样本不足时用默认值）."""
+        tracker = get_latency_tracker(provider)
+        if len(tracker) >= self._min_samples:
+            return tracker.quantile(self._hedge_quantile)
+        return self._default_hedge_delay
+
+    def _generate_fn(self, name: str, service: BaseImageService) -> Callable[..., Awaitable[ImageResult]]:
+        """链上还有后备 provider 时只调用一次（provider 的 @retry 支持 retry_with）."""
+        if name == self._names[-1]:
+            return service.generate
+        retry_with = getattr(getattr(type(service), "generate", None), "retry_with", None)
+        if retry_with is None:
+            return service.generate
+        return functools.partial(retry_with(stop=stop_after_attempt(1), reraise=True), service)
+
+    async def _timed(self, name: str, service: BaseImageService, kwargs: dict) -> ImageResult:
+        tracker = get_latency_tracker(name)
+        tracker.calls += 1
+        started = time.monotonic()
+        try:
+            result = await self._generate_fn(name, service)(**kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            tracker.failures += 1
+            raise
+        tracker.record(time.monotonic() - started)
+        return result
+
+    async def generate(
+        self,
+        prompt: str,
+        style: ImageStyle = ImageStyle.STORYBOOK,
+        width: int = 1024,
+        height: int = 1024,
+        negative_prompt: str | None = None,
+    ) -> ImageResult:
+        kwargs = dict(
+            prompt=prompt,
+            style=style,
+            width=width,
+            height=height,
+            negative_prompt=negative_prompt,
+        )
+        loop = asyncio.get_running_loop()
+        queue = list(self._names)
+        pending: dict[asyncio.Task, str] = {}
+        hedged: set[str] = set()
+        last_error: Optional[BaseException] = None
+        # 最近一次发出的请求（对冲计时以它为准）
+        latest: Optional[tuple[str, float]] = None
+
+        def launch(hedge: bool = False) -> bool:
+            nonlocal last_error, latest
+            while queue:
+                name = queue.pop(0)
+                try:
+                    service = self._service(name)
+                except Exception as e:
+                    logger.warning(f"Image provider {name} unavailable: {e}")
+                    last_error = e
+                    continue
+                if hedge:
+                    hedged.add(name)
+                pending[loop.create_task(self._timed(name, service, kwargs))] = name
+                latest = (name, loop.time())
+                return True
+            return False
+
+        launch()
+        try:
+            while pending:
+                timeout = None
+                if queue and latest is not None:
+                    name, started = latest
+                    timeout = max(0.0, started + self.hedge_delay(name) - loop.time())
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    slow = latest[0]
+                    if launch(hedge=True):
+                        get_latency_tracker(slow).hedges += 1
+                        logger.info(
+                            f"[ImageHedge] {slow} exceeded {self.hedge_delay(slow):.1f}s, "
+                            f"hedging with {latest[0]}"
+                        )
+                    continue
+
+                for task in done:
+                    name = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if name in hedged:
+                            get_latency_tracker(name).wins += 1
+                        if name != self._names[0]:
+                            logger.info(f"[ImageHedge] served by {name}")
+                        return task.result()
+                    logger.warning(f"[ImageHedge] {name} failed: {type(error).__name__}: {error}")
+                    last_error = error
+
+                # 失败后立即改用下一个 provider
+                launch()
+        finally:
+            for task in pending:
+                if task.done() and not task.cancelled():
+                    task.exception()
+                else:
+                    task.cancel()
+
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError("No image provider available")
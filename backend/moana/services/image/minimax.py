@@ -5,12 +5,13 @@
 避免微信小程序的合法域名限制问题。
 """
 import hashlib
-import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from moana.config import get_settings
 from moana.services.image.base import BaseImageService, ImageResult, ImageStyle
+from moana.services.ratelimit import provider_limited
 from moana.services.storage import get_storage_service
+from moana.services.http import http_client
 
 
 class MiniMaxImageService(BaseImageService):
@@ -29,6 +30,7 @@ class MiniMaxImageService(BaseImageService):
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
     )
+    @provider_limited("image")
     async def generate(
         self,
         prompt: str,
@@ -43,7 +45,7 @@ class MiniMaxImageService(BaseImageService):
         # 计算宽高比
         aspect_ratio = self._get_aspect_ratio(width, height)
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with http_client("minimax", timeout=120.0) as client:
             response = await client.post(
                 f"{self._api_base}/v1/image_generation",
                 headers={
@@ -116,7 +118,7 @@ class MiniMaxImageService(BaseImageService):
             本地存储 URL (https://kids.jackverse.cn/media/images/...)
         """
         # 下载图片文件
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with http_client("minimax", timeout=60.0) as client:
             response = await client.get(remote_url)
             response.raise_for_status()
             image_data = response.content
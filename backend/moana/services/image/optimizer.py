@@ -1,11 +1,30 @@
-"""Image optimization utilities."""
+"""Image optimization utilities.
+
+这里的方法都是同步、CPU 密集的；服务中通过 optimize_image / compress_image
+在图片进程池（moana.services.executor.run_image_task）中执行，不阻塞事件循环。
+"""
 import io
 import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
 from PIL import Image
 
+from moana.services.executor import run_image_task
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class OptimizedImage:
+    """Upload-ready image plus its thumbnail."""
+    data: bytes
+    content_type: str
+    ext: str
+    thumb: Optional[bytes] = None
+    warnings: list[str] = field(default_factory=list)  # 子进程中的降级原因，由调用方记录
+
+
 class ImageOptimizer:
     """Image format conversion and optimization."""
 
@@ -75,3 +94,79 @@ class ImageOptimizer:
             f"Generated {size}x{size} thumbnail ({len(thumb_data)} bytes)"
         )
         return thumb_data
+
+    @staticmethod
+    def optimize(
+        image_data: bytes,
+        quality: int = 90,
+        thumb_size: int = 256,
+        thumb_quality: int = 85,
+    ) -> OptimizedImage:
+        """Convert to WebP and build a thumbnail in one pass.
+
+        WebP 转换失败时保留 PNG；缩略图失败时 thumb 为 None。
+        """
+        warnings = []
+        try:
+            result = OptimizedImage(ImageOptimizer.png_to_webp(image_data, quality=quality), "image/webp", "webp")
+        except Exception as e:
+            warnings.append(f"WebP conversion failed, using PNG: {e}")
+            result = OptimizedImage(image_data, "image/png", "png")
+
+        try:
+            result.thumb = ImageOptimizer.generate_thumbnail(result.data, size=thumb_size, quality=thumb_quality)
+        except Exception as e:
+            warnings.append(f"Thumbnail generation failed: {e}")
+        result.warnings = warnings
+        return result
+
+    @staticmethod
+    def compress_jpeg(
+        image_data: bytes,
+        max_size: int = 1280,
+        quality: int = 85,
+    ) -> bytes:
+        """Downscale to max_size on the longest side and re-encode as JPEG.
+
+        Args:
+            image_data: Input image bytes
+            max_size: Longest side after scaling (default 1280)
+            quality: JPEG quality (0-100, default 85)
+
+        Returns:
+            JPEG image bytes
+        """
+        img = Image.open(io.BytesIO(image_data))
+        if img.mode in ("RGBA", "P"):
+            img = img.convert("RGB")
+
+        if max(img.size) > max_size:
+            ratio = max_size / max(img.size)
+            new_size = (int(img.size[0] * ratio), int(img.size[1] * ratio))
+            img = img.resize(new_size, Image.Resampling.LANCZOS)
+
+        output = io.BytesIO()
+        img.save(output, format="JPEG", quality=quality, optimize=True)
+        return output.getvalue()
+
+
+async def optimize_image(
+    image_data: bytes,
+    quality: int = 90,
+    thumb_size: int = 256,
+    thumb_quality: int = 85,
+) -> OptimizedImage:
+    """ImageOptimizer.optimize in the image process pool."""
+    result = await run_image_task(ImageOptimizer.optimize, image_data, quality, thumb_size, thumb_quality)
+    for warning in result.warnings:
+        logger.warning(warning)
+    logger.info(
+        f"Optimized image ({len(image_data)} bytes) to {result.ext} ({len(result.data)} bytes)"
+        + (f", thumbnail {len(result.thumb)} bytes" if result.thumb else "")
+    )
+    return result
+
+
+async def compress_image(image_data: bytes, max_size: int = 1280, quality: int = 85) -> bytes:
+    """ImageOptimizer.compress_jpeg in the image process pool."""
+    return await run_image_task(ImageOptimizer.compress_jpeg, image_data, max_size, quality)
@@ -20,7 +20,9 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 
 from moana.config import get_settings
 from moana.services.image.base import BaseImageService, ImageResult, ImageStyle
+from moana.services.ratelimit import provider_limited
 from moana.services.storage import get_storage_service
+from moana.services.http import http_client
 
 
 class WanxImageService(BaseImageService):
@@ -54,6 +56,7 @@ class WanxImageService(BaseImageService):
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
     )
+    @provider_limited("image")
     async def generate(
         self,
         prompt: str,
@@ -119,7 +122,7 @@ class WanxImageService(BaseImageService):
             },
         }
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with http_client("dashscope", timeout=120.0) as client:
             response = await client.post(
                 self.SYNC_API_ENDPOINT,
                 headers={
@@ -185,7 +188,7 @@ class WanxImageService(BaseImageService):
             },
         }
 
-        async with httpx.AsyncClient(timeout=300.0) as client:
+        async with http_client("dashscope", timeout=300.0) as client:
             # 1. 创建任务
             response = await client.post(
                 self.ASYNC_API_ENDPOINT,
@@ -276,7 +279,7 @@ class WanxImageService(BaseImageService):
         Returns:
             本地存储 URL (https://kids.jackverse.cn/media/image/...)
         """
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with http_client("dashscope", timeout=60.0) as client:
             response = await client.get(remote_url)
             response.raise_for_status()
             image_data = response.content
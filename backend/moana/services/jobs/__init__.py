@@ -0,0 +1,29 @@
+# src/moana/services/jobs/__init__.py
+"""Long-running provider job polling.
+
+Usage:
+    from moana.services.jobs import JobKind, JobStatus, get_job_poller
+
+    poller = get_job_poller()
+    poller.ensure_kind(JobKind("wanx_video", query=self._query_jobs))
+    video_url = await poller.wait("wanx_video", task_id, timeout=600)
+"""
+from moana.services.jobs.poller import (
+    JobFailedError,
+    JobKind,
+    JobPoller,
+    JobStatus,
+    JobTimeoutError,
+    close_job_poller,
+    get_job_poller,
+)
+
+__all__ = [
+    "JobFailedError",
+    "JobKind",
+    "JobPoller",
+    "JobStatus",
+    "JobTimeoutError",
+    "close_job_poller",
+    "get_job_poller",
+]
@@ -0,0 +1,465 @@
+# src/moana/services/jobs/poller.py
+"""Shared polling engine for long-running provider jobs.
+
+Wanx / MiniMax / Veo / Suno MV 等异步任务以前各自 sleep 固定 5~10 秒轮询。
+现在统一登记到 JobPoller：
+- 按任务类型（kind）注册查询函数，到期的任务按 max_batch 分批查询
+  （provider 支持批量查询时一次请求查询多个任务）
+- 轮询间隔按该类型历史完成时长自适应：预计完成前不做无效查询，
+  之后按预计时长的 10% 轮询（限制在 [min_interval, max_interval]），并加随机抖动
+- 完成 / 失败时解析等待方的 future
+- 任务记录写入任务状态存储（namespace="jobs"），worker 重启后：
+  submit_once 对相同请求复用未完成的任务，recover 恢复跟踪未完成任务
+"""
+import asyncio
+import json
+import logging
+import random
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from moana.services.task_state import TaskStateStore, get_task_state_store
+
+logger = logging.getLogger(__name__)
+
+
+class JobFailedError(RuntimeError):
+    """Provider reported the job as failed."""
+
+
+class JobTimeoutError(TimeoutError):
+    """Job did not finish within its timeout."""
+
+
+@dataclass
+class JobStatus:
+    """Status of one job returned by a kind's query function."""
+    state: str  # running | succeeded | failed
+    result: Any = None
+    error: Optional[str] = None
+
+
+JobQuery = Callable[[list[str]], Awaitable[dict[str, JobStatus]]]
+
+
+@dataclass
+class JobKind:
+    """A provider job type and how to query it."""
+    name: str
+    query: JobQuery
+    max_batch: int = 1  # 单次查询的最大任务数
+    expected_duration: float = 120.0  # 没有历史数据时的预计完成时长（秒）
+    min_interval: float = 3.0
+    max_interval: float = 30.0
+    max_query_errors: int = 5  # 连续查询失败次数上限
+
+
+@dataclass
+class _Job:
+    kind: str
+    job_id: str
+    started: float  # monotonic
+    deadline: float  # monotonic
+    next_check: float
+    future: asyncio.Future
+    checks: int = 0
+    query_errors: int = 0
+    waiters: int = 0
+
+
+def _json_safe(value: Any) -> Any:
+    """结果可 JSON 序列化时才持久化."""
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return None
+
+
+class JobPoller:
+    """Tracks outstanding provider jobs and polls them on a shared schedule."""
+
+    def __init__(
+        self,
+        store: Optional[TaskStateStore] = None,
+        history_size: int = 50,
+        jitter: float = 0.2,
+        max_concurrent_queries: int = 8,
+        reuse_window: float = 600.0,
+    ):
+        """Initialize poller.
+
+        Args:
+            store: 任务记录存储
+            history_size: 每种任务保留的完成时长样本数
+            jitter: 轮询间隔随机抖动比例
+            max_concurrent_queries: 同时进行的状态查询数
+            reuse_window: submit_once 复用已完成任务的时间窗口（秒）
+        """
+        self._store = store or get_task_state_store("jobs")
+        self._kinds: dict[str, JobKind] = {}
+        self._history: dict[str, deque[float]] = {}
+        self._history_size = history_size
+        self._jitter = jitter
+        self._query_slots = asyncio.Semaphore(max_concurrent_queries)
+        self._reuse_window = reuse_window
+        self._jobs: dict[tuple[str, str], _Job] = {}
+        self._recovered: dict[str, list[dict[str, Any]]] = {}
+        self._wakeup = asyncio.Event()
+        self._engine: Optional[asyncio.Task] = None
+        self._queries = 0
+
+    # ===== registration =====
+
+    def register_kind(self, kind: JobKind) -> None:
+        """Register (or replace) a job kind; resumes recovered jobs of this kind."""
+        self._kinds[kind.name] = kind
+        self._history.setdefault(kind.name, deque(maxlen=self._history_size))
+        for record in self._recovered.pop(kind.name, []):
+            remaining = float(record.get("deadline_at") or 0) - time.time()
+            if remaining > 0:
+                self._start(kind.name, record["job_id"], remaining, submitted_at=record.get("submitted_at"))
+
+    def ensure_kind(self, kind: JobKind) -> None:
+        """Register a job kind once; later calls with the same name are no-ops.
+
+        provider 服务在每次请求时调用，查询函数只绑定第一次注册的实例。
+        """
+        if kind.name not in self._kinds:
+            self.register_kind(kind)
+
+    # ===== public API =====
+
+    async def submit_once(
+        self,
+        kind: str,
+        request_key: str,
+        submit: Callable[[], Awaitable[str]],
+        timeout: float = 600.0,
+    ) -> str:
+        """Submit a job unless an identical request already has one outstanding.
+
+        worker 重启后重试同一请求时复用未完成（或刚完成）的任务，避免重复提交。
+        """
+        key = f"request:{kind}:{request_key}"
+        existing = await self._store.get(key)
+        if existing and existing.get("job_id"):
+            record = await self._store.get(f"{kind}:{existing['job_id']}")
+            if record is not None:
+                state = record.get("status")
+                finished_at = float(record.get("updated_at") or 0)
+                if state == "processing" or (
+                    state == "completed" and time.time() - finished_at <= self._reuse_window
+                ):
+                    logger.info(f"[Jobs] reusing {kind} job {existing['job_id']} for identical request")
+                    return existing["job_id"]
+
+        job_id = await submit()
+        await self._store.set(key, {"job_id": job_id, "status": "processing"}, ttl=int(timeout) + 3600)
+        await self._persist_start(kind, job_id, timeout)
+        return job_id
+
+    async def wait(self, kind: str, job_id: str, timeout: float = 600.0) -> Any:
+        """Track a job (if not already tracked) and wait for its result.
+
+        Raises:
+            JobFailedError: provider 报告任务失败
+            JobTimeoutError: 超时
+        """
+        if kind not in self._kinds:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        job = self._jobs.get((kind, job_id))
+        if job is None:
+            record = await self._store.get(f"{kind}:{job_id}")
+            if record is not None and record.get("status") == "completed" and record.get("result") is not None:
+                return record["result"]
+            if record is not None and record.get("status") == "failed":
+                raise JobFailedError(record.get("error") or "job failed")
+            submitted_at = None
+            if record is not None and record.get("status") == "processing":
+                submitted_at = record.get("submitted_at")
+            else:
+                await self._persist_start(kind, job_id, timeout)
+            job = self._jobs.get((kind, job_id)) or self._start(
+                kind, job_id, timeout, submitted_at=submitted_at
+            )
+
+        job.waiters += 1
+        try:
+            return await asyncio.shield(job.future)
+        finally:
+            job.waiters -= 1
+
+    async def complete(
+        self,
+        kind: str,
+        job_id: str,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Record a job that finished without being polled (e.g. already done when submitted).
+
+        与轮询完成走同一条路径：唤醒等待方并持久化终态，避免记录停留在
+        processing（否则 submit_once 会复用、recover 会重新跟踪）。
+        """
+        job = self._jobs.get((kind, job_id))
+        if job is not None:
+            self._finish(job, result=result, error=error)
+            return
+        await self._persist_finish(kind, job_id, result, error)
+
+    async def recover(self, limit: int = 1000) -> int:
+        """Load outstanding jobs persisted by a previous worker.
+
+        已注册的类型立即恢复跟踪，其余在 register_kind 时恢复。
+        """
+        count = 0
+        for record in await self._store.list_states(limit=limit):
+            if record.get("status") != "processing" or "kind" not in record:
+                continue
+            if (record["kind"], record["job_id"]) in self._jobs:
+                continue
+            count += 1
+            if record["kind"] in self._kinds:
+                remaining = float(record.get("deadline_at") or 0) - time.time()
+                if remaining > 0:
+                    self._start(record["kind"], record["job_id"], remaining, submitted_at=record.get("submitted_at"))
+            else:
+                self._recovered.setdefault(record["kind"], []).append(record)
+        if count:
+            logger.info(f"[Jobs] recovered {count} outstanding jobs")
+        return count
+
+    def stats(self) -> dict[str, Any]:
+        """Outstanding jobs and learned durations per kind."""
+        kinds = {}
+        for name, kind in self._kinds.items():
+            history = list(self._history.get(name, []))
+            kinds[name] = {
+                "outstanding": sum(1 for key in self._jobs if key[0] == name),
+                "expected_duration": round(self._expected(kind), 1),
+                "samples": len(history),
+                "max_batch": kind.max_batch,
+            }
+        return {
+            "outstanding": len(self._jobs),
+            "queries": self._queries,
+            "pending_recovery": sum(len(v) for v in self._recovered.values()),
+            "kinds": kinds,
+        }
+
+    async def close(self) -> None:
+        """Stop the engine (outstanding jobs remain persisted for recovery)."""
+        if self._engine is not None:
+            self._engine.cancel()
+            try:
+                await self._engine
+            except asyncio.CancelledError:
+                pass
+            self._engine = None
+        for job in self._jobs.values():
+            if not job.future.done():
+                job.future.cancel()
+        self._jobs.clear()
+
+    # ===== scheduling =====
+
+    def _expected(self, kind: JobKind) -> float:
+        history = self._history.get(kind.name)
+        if history:
+            return statistics.median(history)
+        return kind.expected_duration
+
+    def _next_delay(self, kind: JobKind, elapsed: float) -> float:
+        """自适应间隔：预计完成前（历史 20 分位）不查询，之后按预计时长 10% 轮询."""
+        history = sorted(self._history.get(kind.name) or [])
+        if history:
+            early = history[int(len(history) * 0.2)]
+        else:
+            early = kind.expected_duration * 0.5
+        step = min(max(self._expected(kind) * 0.1, kind.min_interval), kind.max_interval)
+        delay = early - elapsed if elapsed < early else step
+        delay = max(delay, kind.min_interval)
+        return delay * random.uniform(1 - self._jitter, 1 + self._jitter)
+
+    def _start(
+        self,
+        kind: str,
+        job_id: str,
+        timeout: float,
+        submitted_at: Optional[float] = None,
+    ) -> _Job:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        # 恢复的任务按原提交时间计算已耗时
+        elapsed = max(0.0, time.time() - submitted_at) if submitted_at else 0.0
+        started = now - elapsed
+        job = _Job(
+            kind=kind,
+            job_id=job_id,
+            started=started,
+            deadline=now + timeout,
+            next_check=now + self._next_delay(self._kinds[kind], elapsed),
+            future=loop.create_future(),
+        )
+        self._jobs[(kind, job_id)] = job
+        self._ensure_engine()
+        self._wakeup.set()
+        return job
+
+    def _ensure_engine(self) -> None:
+        if self._engine is None or self._engine.done():
+            self._engine = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._jobs:
+            now = loop.time()
+            self._expire(now)
+            due = [job for job in self._jobs.values() if job.next_check <= now]
+            if not due:
+                upcoming = min(
+                    [job.next_check for job in self._jobs.values()]
+                    + [job.deadline for job in self._jobs.values()],
+                    default=now + 1,
+                )
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, upcoming - now))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            batches: list[tuple[JobKind, list[_Job]]] = []
+            by_kind: dict[str, list[_Job]] = {}
+            for job in due:
+                by_kind.setdefault(job.kind, []).append(job)
+            for name, jobs in by_kind.items():
+                kind = self._kinds[name]
+                if kind.max_batch > 1:
+                    # 批次有空位时顺带查询即将到期（min_interval 内）的同类任务
+                    soon = sorted(
+                        (
+                            job for job in self._jobs.values()
+                            if job.kind == name and now < job.next_check <= now + kind.min_interval
+                        ),
+                        key=lambda job: job.next_check,
+                    )
+                    room = -len(jobs) % kind.max_batch
+                    jobs.extend(soon[:room])
+                    due.extend(soon[:room])
+                for i in range(0, len(jobs), kind.max_batch):
+                    batches.append((kind, jobs[i:i + kind.max_batch]))
+            # 查询期间先推迟下次检查，避免重复调度
+            for job in due:
+                job.next_check = float("inf")
+            await asyncio.gather(*(self._query_batch(kind, jobs) for kind, jobs in batches))
+
+    def _expire(self, now: float) -> None:
+        for job in list(self._jobs.values()):
+            if now >= job.deadline:
+                elapsed = now - job.started
+                self._finish(job, error=JobTimeoutError(
+                    f"{job.kind} job {job.job_id} timed out after {elapsed:.0f}s"
+                ))
+
+    async def _query_batch(self, kind: JobKind, jobs: list[_Job]) -> None:
+        loop = asyncio.get_running_loop()
+        ids = [job.job_id for job in jobs]
+        try:
+            async with self._query_slots:
+                self._queries += 1
+                statuses = await kind.query(ids)
+        except Exception as e:
+            for job in jobs:
+                job.query_errors += 1
+                logger.warning(
+                    f"[Jobs] {kind.name} status query failed "
+                    f"({job.query_errors}/{kind.max_query_errors}): {type(e).__name__}: {e}"
+                )
+                if job.query_errors >= kind.max_query_errors:
+                    self._finish(job, error=JobFailedError(f"Too many consecutive polling errors: {e}"))
+                else:
+                    job.next_check = loop.time() + self._next_delay(kind, loop.time() - job.started)
+            return
+
+        for job in jobs:
+            job.query_errors = 0
+            job.checks += 1
+            status = statuses.get(job.job_id)
+            elapsed = loop.time() - job.started
+            if status is None or status.state == "running":
+                job.next_check = loop.time() + self._next_delay(kind, elapsed)
+                logger.debug(f"[Jobs] {kind.name} {job.job_id} running ({elapsed:.0f}s)")
+            elif status.state == "succeeded":
+                self._history[kind.name].append(elapsed)
+                logger.info(f"[Jobs] {kind.name} {job.job_id} succeeded after {elapsed:.0f}s ({job.checks} checks)")
+                self._finish(job, result=status.result)
+            else:
+                self._finish(job, error=JobFailedError(status.error or f"{kind.name} job failed"))
+
+    def _finish(self, job: _Job, result: Any = None, error: Optional[BaseException] = None) -> None:
+        self._jobs.pop((job.kind, job.job_id), None)
+        if not job.future.done():
+            if error is not None:
+                job.future.set_exception(error)
+                # 没有等待方时避免 "exception was never retrieved"
+                job.future.exception()
+            else:
+                job.future.set_result(result)
+        asyncio.get_running_loop().create_task(self._persist_finish(job.kind, job.job_id, result, error))
+
+    # ===== persistence =====
+
+    async def _persist_start(self, kind: str, job_id: str, timeout: float) -> None:
+        now = time.time()
+        await self._store.set(f"{kind}:{job_id}", {
+            "kind": kind,
+            "job_id": job_id,
+            "status": "processing",
+            "submitted_at": now,
+            "deadline_at": now + timeout,
+        })
+
+    async def _persist_finish(
+        self,
+        kind: str,
+        job_id: str,
+        result: Any,
+        error: Optional[BaseException],
+    ) -> None:
+        try:
+            if error is None:
+                await self._store.update(f"{kind}:{job_id}", status="completed", result=_json_safe(result))
+            else:
+                await self._store.update(f"{kind}:{job_id}", status="failed", error=str(error))
+        except Exception as e:
+            logger.warning(f"[Jobs] failed to persist {kind} {job_id}: {e}")
+
+
+# One poller per event loop (the engine task and futures are loop-bound)
+_poller: Optional[JobPoller] = None
+_poller_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_job_poller() -> JobPoller:
+    """Get the shared poller for the running event loop."""
+    global _poller, _poller_loop
+    loop = asyncio.get_running_loop()
+    if _poller is None or _poller_loop is not loop:
+        _poller = JobPoller()
+        _poller_loop = loop
+    return _poller
+
+
+async def close_job_poller() -> None:
+    """Stop the shared poller (application shutdown / tests)."""
+    global _poller, _poller_loop
+    if _poller is not None and _poller_loop is asyncio.get_running_loop():
+        await _poller.close()
+    _poller = None
+    _poller_loop = None
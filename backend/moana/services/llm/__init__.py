@@ -2,6 +2,7 @@ from moana.config import get_settings
 from moana.services.llm.base import BaseLLMService
 from moana.services.llm.claude import ClaudeService
 from moana.services.llm.gemini import GeminiService
+from moana.services.llm.memo import LLMMemo, get_llm_memo, llm_memo_stats, reset_llm_memos
 from moana.services.llm.openrouter import OpenRouterService
 
 
@@ -30,4 +31,14 @@ def get_llm_service() -> BaseLLMService:
         raise ValueError(f"Unsupported LLM provider: {provider}")
 
 
-__all__ = ["BaseLLMService", "ClaudeService", "GeminiService", "OpenRouterService", "get_llm_service"]
+__all__ = [
+    "BaseLLMService",
+    "ClaudeService",
+    "GeminiService",
+    "OpenRouterService",
+    "get_llm_service",
+    "LLMMemo",
+    "get_llm_memo",
+    "llm_memo_stats",
+    "reset_llm_memos",
+]
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, TypeVar, Type
+from typing import Any, AsyncIterator, TypeVar, Type
 from pydantic import BaseModel
 
 T = TypeVar("T", bound=BaseModel)
@@ -25,6 +25,24 @@ class BaseLLMService(ABC):
         """Generate text completion."""
         pass
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        """Generate text completion as incremental chunks.
+
+        默认实现一次性返回完整结果；支持流式输出的服务应覆盖此方法。
+        """
+        yield await self.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
     @abstractmethod
     async def generate_structured(
         self,
@@ -1,5 +1,5 @@
 import json
-from typing import Type, TypeVar
+from typing import AsyncIterator, Type, TypeVar
 from anthropic import AsyncAnthropic
 from pydantic import BaseModel
 
@@ -41,6 +41,24 @@ class ClaudeService(BaseLLMService):
 
         return response.content[0].text
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        """Stream text completion using Claude."""
+        async with self._client.messages.stream(
+            model=self._model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system_prompt or "",
+            messages=[{"role": "user", "content": prompt}],
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
     async def generate_structured(
         self,
         prompt: str,
@@ -5,12 +5,13 @@
 """
 import json
 import re
-from typing import Type, TypeVar
+from typing import Any, AsyncIterator, Type, TypeVar
 
 import google.generativeai as genai
 from pydantic import BaseModel
 
 from moana.config import get_settings
+from moana.services.executor import get_blocking_executor, run_blocking
 from moana.services.llm.base import BaseLLMService
 
 T = TypeVar("T", bound=BaseModel)
@@ -37,15 +38,14 @@ class GeminiService(BaseLLMService):
     def model_name(self) -> str:
         return self._model_name
 
-    async def generate(
+    def _build_request(
         self,
         prompt: str,
-        system_prompt: str | None = None,
-        temperature: float = 0.7,
-        max_tokens: int = 4096,
-    ) -> str:
-        """使用 Gemini 生成文本."""
-        import asyncio
+        system_prompt: str | None,
+        temperature: float,
+        max_tokens: int,
+    ) -> tuple[str, Any, dict]:
+        """构建 (完整提示, 生成参数, 安全设置)."""
         from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
         # 构建完整提示
@@ -69,16 +69,26 @@ class GeminiService(BaseLLMService):
             HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_ONLY_HIGH,
             HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_ONLY_HIGH,
         }
+        return full_prompt, generation_config, safety_settings
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> str:
+        """使用 Gemini 生成文本."""
+        full_prompt, generation_config, safety_settings = self._build_request(
+            prompt, system_prompt, temperature, max_tokens
+        )
 
-        # REST transport 只支持同步调用，使用 run_in_executor
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: self._model.generate_content(
-                full_prompt,
-                generation_config=generation_config,
-                safety_settings=safety_settings,
-            )
+        # REST transport 只支持同步调用，放到专用线程池执行
+        response = await run_blocking(
+            self._model.generate_content,
+            full_prompt,
+            generation_config=generation_config,
+            safety_settings=safety_settings,
         )
 
         # 处理安全过滤的情况
@@ -88,6 +98,57 @@ class GeminiService(BaseLLMService):
 
         return response.text
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        """使用 Gemini 流式生成文本.
+
+        REST transport 的流式响应是同步迭代器，在线程中消费并通过队列
+        转交给事件循环。
+        """
+        import asyncio
+
+        full_prompt, generation_config, safety_settings = self._build_request(
+            prompt, system_prompt, temperature, max_tokens
+        )
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        def consume() -> None:
+            try:
+                response = self._model.generate_content(
+                    full_prompt,
+                    generation_config=generation_config,
+                    safety_settings=safety_settings,
+                    stream=True,
+                )
+                for chunk in response:
+                    if not chunk.candidates or not chunk.candidates[0].content.parts:
+                        if chunk.candidates and chunk.candidates[0].finish_reason not in (None, 0, 1):
+                            raise ValueError(
+                                f"Gemini response blocked (finish_reason={chunk.candidates[0].finish_reason})"
+                            )
+                        continue
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk.text)
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+
+        worker = loop.run_in_executor(get_blocking_executor(), consume)
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        await worker
+
     async def generate_structured(
         self,
         prompt: str,
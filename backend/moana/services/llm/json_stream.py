@@ -0,0 +1,111 @@
+# src/moana/services/llm/json_stream.py
+"""Incremental JSON parser for streamed LLM output.
+
+LLM 逐段返回结构化 JSON 时，无需等待整个对象生成完毕：解析器跟踪
+字符串 / 转义 / 括号深度，每当顶层对象中指定数组（如 "pages"）的某个
+元素闭合，就立即解析并返回该元素。
+
+输出前后的 markdown 代码块、说明文字会被忽略（从第一个 "{" 开始解析）。
+"""
+import json
+from typing import Any
+
+
+class IncrementalJSONArrayParser:
+    """Yield elements of a top-level array field as soon as each one closes.
+
+    Usage:
+        parser = IncrementalJSONArrayParser("pages")
+        async for chunk in llm.generate_stream(...):
+            for page in parser.feed(chunk):
+                dispatch(page)
+        outline = parser.result()
+    """
+
+    def __init__(self, array_key: str):
+        self.array_key = array_key
+        self._root_start: int | None = None
+        self._root_end: int | None = None
+        self._pos = 0  # 已扫描的字符数
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: str | None = None  # 顶层对象中最近一个字符串（可能是 key）
+        self._in_array = False
+        self._element_start: int | None = None
+        self._text = ""
+
+    def feed(self, chunk: str) -> list[Any]:
+        """Consume a chunk and return array elements completed by it.
+
+        无法解析的元素以 None 返回，由调用方决定如何处理。
+        """
+        self._text += chunk
+        completed: list[Any] = []
+        text = self._text
+
+        while self._pos < len(text):
+            i = self._pos
+            char = text[i]
+            self._pos += 1
+
+            if self._root_end is not None:
+                break  # 顶层对象已结束，其余为尾随文本
+
+            if self._root_start is None:
+                if char == "{":
+                    self._root_start = i
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = text[self._string_start + 1:i]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 2 and char == "[" and self._last_key == self.array_key:
+                    self._in_array = True
+                elif self._depth == 3 and self._in_array and char == "{":
+                    self._element_start = i
+            elif char in "}]":
+                if self._depth == 3 and self._in_array and char == "}" and self._element_start is not None:
+                    try:
+                        completed.append(json.loads(text[self._element_start:i + 1]))
+                    except json.JSONDecodeError:
+                        # 括号闭合但元素本身不是合法 JSON（如尾随逗号），用 None 占位保持下标
+                        completed.append(None)
+                    self._element_start = None
+                self._depth -= 1
+                if self._depth == 1:
+                    self._in_array = False
+                elif self._depth == 0:
+                    self._root_end = i + 1
+
+        return completed
+
+    @property
+    def text(self) -> str:
+        """All text fed so far."""
+        return self._text
+
+    def result(self) -> Any:
+        """Parse the complete top-level object.
+
+        Raises:
+            ValueError: 顶层 JSON 对象尚未完整
+        """
+        if self._root_start is None or self._root_end is None:
+            raise ValueError("Incomplete JSON object in streamed response")
+        return json.loads(self._text[self._root_start:self._root_end])
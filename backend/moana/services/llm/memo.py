@@ -0,0 +1,186 @@
+# src/moana/services/llm/memo.py
+"""Memoization for deterministic LLM helper calls.
+
+预设主题 / 年龄 / 风格组合经常以完全相同的输入调用提示词分析、Suno 提示词增强、
+图片风格识别、意图解析等辅助 LLM 调用，每次 1~5 秒。LLMMemo 按
+(调用点, 模型, 规范化输入) 缓存结果：
+- 内存 LRU 层：进程内，最多 max_entries 条
+- 持久层：任务状态存储（namespace="llm_memo"），带 TTL，多 worker 共享
+
+调用点需显式接入（get_llm_memo(site)），并可通过 LLM_MEMO_SITES 单独关闭。
+只缓存成功结果：compute 抛出异常或返回 None 时不写入缓存。
+"""
+import hashlib
+import json
+import logging
+import re
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from moana.services.task_state import TaskStateStore, get_task_state_store
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_input(value: Any) -> Any:
+    """规范化输入：字符串去首尾空白并合并连续空白，dict 去掉 None 值."""
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", value.strip())
+    if isinstance(value, dict):
+        return {str(k): normalize_input(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [normalize_input(v) for v in value]
+    return value
+
+
+def memo_key(site: str, model: str, inputs: Any) -> str:
+    payload = json.dumps(
+        {"site": site, "model": model, "inputs": normalize_input(inputs)},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMMemo:
+    """Two-tier (LRU + persistent TTL) cache for one LLM call site."""
+
+    def __init__(
+        self,
+        site: str,
+        ttl: int = 86400,
+        max_entries: int = 512,
+        store: Optional[TaskStateStore] = None,
+        enabled: bool = True,
+    ):
+        """Initialize memo.
+
+        Args:
+            site: 调用点名称（也是缓存键的一部分）
+            ttl: 持久层过期时间（秒）
+            max_entries: 内存 LRU 层容量
+            store: 持久层存储（默认 namespace="llm_memo"）
+            enabled: 关闭时直接调用 compute
+        """
+        self.site = site
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._store = store
+        self._lru: OrderedDict[str, Any] = OrderedDict()
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def store(self) -> TaskStateStore:
+        if self._store is None:
+            self._store = get_task_state_store("llm_memo")
+        return self._store
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    async def get_or_compute(
+        self,
+        inputs: Any,
+        model: str,
+        compute: Callable[[], Awaitable[T]],
+        encode: Callable[[T], Any] = lambda value: value,
+        decode: Callable[[Any], T] = lambda value: value,
+    ) -> T:
+        """Return the cached result for (model, inputs) or compute and cache it.
+
+        Args:
+            inputs: 影响结果的全部输入（JSON 可序列化）
+            model: 模型名称
+            compute: 实际的 LLM 调用
+            encode / decode: 结果与 JSON 可序列化值之间的转换
+        """
+        if not self.enabled:
+            return await compute()
+
+        key = memo_key(self.site, str(model), inputs)
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            self.memory_hits += 1
+            return decode(self._lru[key])
+
+        try:
+            record = await self.store.get(key)
+        except Exception as e:
+            logger.warning(f"[LLMMemo] {self.site} store read failed: {e}")
+            record = None
+        if record is not None and "value" in record:
+            self.store_hits += 1
+            self._remember(key, record["value"])
+            return decode(record["value"])
+
+        self.misses += 1
+        result = await compute()
+        if result is None:
+            return result
+
+        value = encode(result)
+        self._remember(key, value)
+        try:
+            await self.store.set(key, {"site": self.site, "model": str(model), "value": value}, ttl=self.ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"[LLMMemo] {self.site} store write failed: {e}")
+        return result
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def stats(self) -> dict[str, Any]:
+        hits = self.memory_hits + self.store_hits
+        total = hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._lru),
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "errors": self.errors,
+        }
+
+
+# Process-wide memos per call site
+_memos: dict[str, LLMMemo] = {}
+
+
+def get_llm_memo(site: str) -> LLMMemo:
+    """Get the memo for a call site (configured from settings on first use)."""
+    if site not in _memos:
+        from moana.config import get_settings
+
+        settings = get_settings()
+        sites = {name.strip() for name in settings.llm_memo_sites.split(",") if name.strip()}
+        _memos[site] = LLMMemo(
+            site,
+            ttl=settings.llm_memo_ttl,
+            max_entries=settings.llm_memo_max_entries,
+            enabled=settings.llm_memo_enabled and ("*" in sites or site in sites),
+        )
+    return _memos[site]
+
+
+def llm_memo_stats() -> dict[str, dict[str, Any]]:
+    """Hit / miss metrics per call site."""
+    return {site: memo.stats() for site, memo in _memos.items()}
+
+
+def reset_llm_memos() -> None:
+    """Drop all memos (tests)."""
+    _memos.clear()
@@ -5,13 +5,13 @@ OpenRouter 提供统一接口访问多种 LLM 模型（Claude, GPT, Llama 等）
 文档: https://openrouter.ai/docs
 """
 import json
-from typing import Type, TypeVar
+from typing import AsyncIterator, Type, TypeVar
 
-import httpx
 from pydantic import BaseModel
 
 from moana.config import get_settings
 from moana.services.llm.base import BaseLLMService
+from moana.services.http import http_client
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -71,7 +71,7 @@ class OpenRouterService(BaseLLMService):
             "max_tokens": max_tokens,
         }
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with http_client("openrouter", timeout=120.0) as client:
             response = await client.post(
                 f"{self.API_BASE}/chat/completions",
                 headers=headers,
@@ -85,6 +85,56 @@ class OpenRouterService(BaseLLMService):
 
         return data["choices"][0]["message"]["content"]
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+    ) -> AsyncIterator[str]:
+        """使用 OpenRouter 流式生成文本（SSE）."""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        headers = {
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": self._site_url,
+            "X-Title": self._site_name,
+        }
+        payload = {
+            "model": self._model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+        }
+
+        async with http_client("openrouter", timeout=120.0) as client:
+            async with client.stream(
+                "POST",
+                f"{self.API_BASE}/chat/completions",
+                headers=headers,
+                json=payload,
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    # SSE: "data: {...}"，": OPENROUTER PROCESSING" 等注释行忽略
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    event = json.loads(data)
+                    if "error" in event:
+                        raise ValueError(f"OpenRouter error: {event['error']}")
+                    choices = event.get("choices") or []
+                    content = choices[0].get("delta", {}).get("content") if choices else None
+                    if content:
+                        yield content
+
     async def generate_structured(
         self,
         prompt: str,
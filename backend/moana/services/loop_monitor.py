@@ -0,0 +1,217 @@
+# src/moana/services/loop_monitor.py
+"""Event loop lag sampler and blocking-call detector.
+
+- 采样：事件循环中的协程每 interval 秒 sleep 一次，实际唤醒延迟即为 loop lag，
+  保留最近 window 个样本计算 p50 / p99
+- 阻塞检测：后台看门狗线程检查采样心跳，超过 interval + slow_threshold 未更新
+  即认为事件循环被占用，抓取事件循环线程当前栈（sys._current_frames），
+  恢复后按阻塞时长归入对应的"肇事"调用点
+
+开销很小（每 interval 一次唤醒 + 一个轻量线程），可在生产环境常开；
+需要逐个回调的详细计时时使用 executor.enable_slow_callback_warnings（debug 模式）。
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class _Offender:
+    """Aggregated stalls attributed to one call site."""
+    location: str
+    stack: list[str]
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_seen: float = field(default_factory=time.time)
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _summarize_stack(frame, limit: int = 12) -> tuple[str, list[str]]:
+    """(肇事位置, 栈摘要)：优先取最内层的 moana 代码帧."""
+    summary = traceback.extract_stack(frame)[-limit:]
+    lines = [f"{f.filename}:{f.lineno} in {f.name}" for f in summary]
+    location = lines[-1] if lines else "<unknown>"
+    for f in reversed(summary):
+        if f.filename.startswith(_PACKAGE_DIR):
+            location = f"{os.path.relpath(f.filename, os.path.dirname(_PACKAGE_DIR))}:{f.lineno} in {f.name}"
+            break
+    return location, lines
+
+
+class LoopMonitor:
+    """Samples event loop lag and attributes stalls to the blocking call site."""
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        slow_threshold: float = 0.1,
+        window: int = 1200,
+        max_offenders: int = 50,
+    ):
+        """Initialize monitor.
+
+        Args:
+            interval: 采样间隔（秒）
+            slow_threshold: 判定为阻塞的延迟阈值（秒）
+            window: 保留的样本数
+            max_offenders: 最多记录的肇事调用点数
+        """
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.max_offenders = max_offenders
+        self._samples: deque[float] = deque(maxlen=window)
+        self._offenders: dict[str, _Offender] = {}
+        self._stalls = 0
+        self._beat = time.monotonic()
+        self._pending: Optional[tuple[str, list[str]]] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling on the running loop."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._started_at = time.time()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="moana-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._watchdog = None
+
+    async def _sample(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - started - self.interval)
+            self._beat = now
+            self._samples.append(lag)
+
+            pending, self._pending = self._pending, None
+            if lag >= self.slow_threshold:
+                self._stalls += 1
+                if pending is not None:
+                    self._record(pending, lag)
+
+    def _watch(self) -> None:
+        """看门狗线程：事件循环超时未心跳时抓取其当前栈."""
+        poll = max(self.slow_threshold / 2, 0.01)
+        while not self._stop.wait(poll):
+            if self._pending is not None:
+                continue
+            if time.monotonic() - self._beat < self.interval + self.slow_threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._pending = _summarize_stack(frame)
+
+    def _record(self, pending: tuple[str, list[str]], lag: float) -> None:
+        location, stack = pending
+        lag_ms = lag * 1000
+        offender = self._offenders.get(location)
+        if offender is None:
+            if len(self._offenders) >= self.max_offenders:
+                # 淘汰最久未出现的调用点
+                oldest = min(self._offenders.values(), key=lambda o: o.last_seen)
+                del self._offenders[oldest.location]
+            offender = _Offender(location=location, stack=stack)
+            self._offenders[location] = offender
+        offender.count += 1
+        offender.total_ms += lag_ms
+        offender.max_ms = max(offender.max_ms, lag_ms)
+        offender.stack = stack
+        offender.last_seen = time.time()
+        logger.warning(f"[LoopMonitor] event loop blocked {lag_ms:.0f}ms at {location}")
+
+    def stats(self, top: int = 10) -> dict[str, Any]:
+        """Lag percentiles and the worst offenders."""
+        samples = sorted(self._samples)
+        offenders = sorted(self._offenders.values(), key=lambda o: o.total_ms, reverse=True)
+        return {
+            "running": self.running,
+            "interval_ms": round(self.interval * 1000),
+            "slow_threshold_ms": round(self.slow_threshold * 1000),
+            "samples": len(samples),
+            "lag_ms": {
+                "p50": round(_percentile(samples, 50) * 1000, 2),
+                "p99": round(_percentile(samples, 99) * 1000, 2),
+                "max": round((samples[-1] if samples else 0.0) * 1000, 2),
+            },
+            "stalls": self._stalls,
+            "top_offenders": [
+                {
+                    "location": o.location,
+                    "count": o.count,
+                    "total_ms": round(o.total_ms, 1),
+                    "max_ms": round(o.max_ms, 1),
+                    "stack": o.stack,
+                }
+                for o in offenders[:top]
+            ],
+        }
+
+
+# Process-wide monitor
+_monitor: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """Get the shared monitor (configured from settings on first use)."""
+    global _monitor
+    if _monitor is None:
+        from moana.config import get_settings
+
+        settings = get_settings()
+        _monitor = LoopMonitor(
+            interval=settings.loop_monitor_interval_ms / 1000,
+            slow_threshold=settings.loop_monitor_slow_ms / 1000,
+        )
+    return _monitor
+
+
+async def stop_loop_monitor() -> None:
+    """Stop and drop the shared monitor."""
+    global _monitor
+    if _monitor is not None:
+        await _monitor.stop()
+        _monitor = None
@@ -5,10 +5,22 @@ from moana.services.moderation.base import (
     ContentModerationRequest,
 )
 from moana.services.moderation.aliyun import AliyunModerationService
+from moana.services.moderation.engine import (
+    BookModeration,
+    ModerationEngine,
+    get_moderation_engine,
+    reset_moderation_engine,
+    schedule_content_review,
+)
 
 __all__ = [
     "ModerationService",
     "ModerationResult",
     "ContentModerationRequest",
     "AliyunModerationService",
+    "BookModeration",
+    "ModerationEngine",
+    "get_moderation_engine",
+    "reset_moderation_engine",
+    "schedule_content_review",
 ]
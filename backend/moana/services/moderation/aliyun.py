@@ -105,6 +105,7 @@ class AliyunModerationService(ModerationService):
             return ModerationResult(
                 is_safe=True,
                 reason="Moderation not configured",
+                skipped=True,
             )
 
         # For MVP, return safe result (actual API integration would require signing)
@@ -112,6 +113,7 @@ class AliyunModerationService(ModerationService):
         return ModerationResult(
             is_safe=True,
             reason="Moderation check skipped (MVP)",
+            skipped=True,
         )
 
     async def moderate_image(self, image_url: str) -> ModerationResult:
@@ -120,6 +122,7 @@ class AliyunModerationService(ModerationService):
             return ModerationResult(
                 is_safe=True,
                 reason="Moderation not configured",
+                skipped=True,
             )
 
         # For MVP, return safe result
@@ -127,6 +130,7 @@ class AliyunModerationService(ModerationService):
         return ModerationResult(
             is_safe=True,
             reason="Moderation check skipped (MVP)",
+            skipped=True,
         )
 
     async def moderate_audio(self, audio_url: str) -> ModerationResult:
@@ -135,6 +139,7 @@ class AliyunModerationService(ModerationService):
             return ModerationResult(
                 is_safe=True,
                 reason="Moderation not configured",
+                skipped=True,
             )
 
         # For MVP, return safe result
@@ -142,4 +147,5 @@ class AliyunModerationService(ModerationService):
         return ModerationResult(
             is_safe=True,
             reason="Moderation check skipped (MVP)",
+            skipped=True,
         )
@@ -1,4 +1,5 @@
 # src/moana/services/moderation/base.py
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
@@ -25,6 +26,8 @@ class ModerationResult:
     confidence: float = 1.0
     reason: Optional[str] = None
     raw_response: Optional[dict] = None
+    # 未实际检查（未配置 / 调用失败）的放行结果，不写入审核缓存
+    skipped: bool = False
 
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -35,6 +38,37 @@ class ModerationResult:
             "reason": self.reason,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "ModerationResult":
+        """Restore a result serialized with to_dict."""
+        return cls(
+            is_safe=data["is_safe"],
+            categories=[ModerationCategory(c) for c in data.get("categories", [])],
+            confidence=data.get("confidence", 1.0),
+            reason=data.get("reason"),
+        )
+
+
+def combine_results(results: list[ModerationResult]) -> ModerationResult:
+    """Combine results: content is safe only if ALL checks pass."""
+    if not results:
+        return ModerationResult(is_safe=True)
+
+    categories = []
+    reasons = []
+    for r in results:
+        categories.extend(r.categories)
+        if r.reason:
+            reasons.append(r.reason)
+
+    return ModerationResult(
+        is_safe=all(r.is_safe for r in results),
+        categories=list(set(categories)),
+        confidence=min(r.confidence for r in results),
+        reason="; ".join(reasons) if reasons else None,
+        skipped=all(r.skipped for r in results),
+    )
+
 
 @dataclass
 class ContentModerationRequest:
@@ -84,41 +118,30 @@ class ModerationService(ABC):
         """
         pass
 
+    async def moderate_texts(self, texts: list[str]) -> list[ModerationResult]:
+        """Check several texts, one result per text (in order).
+
+        默认并发调用 moderate_text；支持批量接口的 provider 应覆盖为单次请求。
+        """
+        return list(await asyncio.gather(*(self.moderate_text(t) for t in texts)))
+
     async def moderate_content(
         self,
         request: ContentModerationRequest,
     ) -> ModerationResult:
         """Moderate content based on provided request.
 
-        Checks all non-None content types and returns combined result.
+        Checks all non-None content types concurrently and returns combined result.
         """
-        results: list[ModerationResult] = []
+        checks = []
 
         if request.text:
-            results.append(await self.moderate_text(request.text))
+            checks.append(self.moderate_text(request.text))
 
         if request.image_url:
-            results.append(await self.moderate_image(request.image_url))
+            checks.append(self.moderate_image(request.image_url))
 
         if request.audio_url:
-            results.append(await self.moderate_audio(request.audio_url))
-
-        if not results:
-            return ModerationResult(is_safe=True)
-
-        # Combine results: content is safe only if ALL checks pass
-        is_safe = all(r.is_safe for r in results)
-        categories = []
-        reasons = []
-
-        for r in results:
-            categories.extend(r.categories)
-            if r.reason:
-                reasons.append(r.reason)
-
-        return ModerationResult(
-            is_safe=is_safe,
-            categories=list(set(categories)),
-            confidence=min(r.confidence for r in results),
-            reason="; ".join(reasons) if reasons else None,
-        )
+            checks.append(self.moderate_audio(request.audio_url))
+
+        return combine_results(list(await asyncio.gather(*checks)))
@@ -0,0 +1,316 @@
+# src/moana/services/moderation/engine.py
+"""Concurrent, cached moderation of a whole content item.
+
+ModerationService.moderate_content / ReviewAgent 逐项串行审核，一本 8 页绘本
+需要十几次审核调用。ModerationEngine：
+- 同时检查整本内容：全部页面文字、插图、音频并发执行（图片 / 音频受并发上限约束）
+- 文字批量审核：所有页面文字一次 provider 批量请求 + 一次 LLM 复核
+- 按内容哈希缓存审核结论（文字按内容，图片 / 音频按 URL），重审与任务重试不再调用
+  provider；持久层为任务状态存储（namespace="moderation"），多 worker 共享
+- schedule_content_review 在内容落库后于后台执行，不阻塞生成任务；完成前内容保持
+  review_status=pending，完成后写入 approved / rejected / manual_review
+
+未实际检查的放行结果（ModerationResult.skipped）不写入缓存。
+"""
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional, Protocol
+
+from moana.models.content import ReviewStatus
+from moana.services.moderation.base import (
+    ModerationResult,
+    ModerationService,
+    combine_results,
+)
+from moana.services.task_state import TaskStateStore, get_task_state_store
+
+logger = logging.getLogger(__name__)
+
+
+class TextReviewer(Protocol):
+    """Batched child-appropriateness review (e.g. ReviewAgent)."""
+
+    async def review_texts(self, texts: list[str]) -> list[ModerationResult]:
+        ...
+
+
+def verdict_key(kind: str, content: str) -> str:
+    return hashlib.sha256(f"{kind}\n{content}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class BookModeration:
+    """Moderation verdicts for every asset of one content item."""
+    texts: list[ModerationResult] = field(default_factory=list)
+    reviews: list[ModerationResult] = field(default_factory=list)  # LLM 复核（与 texts 一一对应）
+    images: list[ModerationResult] = field(default_factory=list)
+    audios: list[ModerationResult] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)  # 未能完成的自动审核
+
+    @property
+    def combined(self) -> ModerationResult:
+        return combine_results(self.texts + self.images + self.audios)
+
+    @property
+    def skipped(self) -> int:
+        """provider 未实际检查的条目数（如未配置或尚未实现的审核接口）."""
+        return sum(1 for r in self.texts + self.images + self.audios if r.skipped)
+
+    @property
+    def review_status(self) -> ReviewStatus:
+        """自动审核拦截 -> rejected；LLM 复核存疑或审核未完成（含 provider 跳过检查）-> manual_review."""
+        if not self.combined.is_safe:
+            return ReviewStatus.REJECTED
+        if self.errors or self.skipped or any(not r.is_safe for r in self.reviews):
+            return ReviewStatus.MANUAL_REVIEW
+        return ReviewStatus.APPROVED
+
+    def to_dict(self) -> dict:
+        """Review result stored in contents.review_result."""
+        flagged = [
+            {"kind": kind, "index": index, **result.to_dict()}
+            for kind, results in (
+                ("text", self.texts),
+                ("review", self.reviews),
+                ("image", self.images),
+                ("audio", self.audios),
+            )
+            for index, result in enumerate(results)
+            if not result.is_safe
+        ]
+        return {
+            "status": self.review_status.value,
+            "moderation": self.combined.to_dict(),
+            "checked": {
+                "texts": len(self.texts),
+                "images": len(self.images),
+                "audios": len(self.audios),
+                "skipped": self.skipped,
+            },
+            "flagged": flagged,
+            "errors": self.errors,
+        }
+
+
+class ModerationEngine:
+    """Fan-out moderation with a content-hash verdict cache."""
+
+    def __init__(
+        self,
+        service: ModerationService,
+        reviewer: Optional[TextReviewer] = None,
+        store: Optional[TaskStateStore] = None,
+        ttl: int = 30 * 86400,
+        concurrency: int = 8,
+    ):
+        """Initialize engine.
+
+        Args:
+            service: 自动审核 provider
+            reviewer: 文字 LLM 复核（None 表示只做自动审核）
+            store: 审核结论缓存（默认 namespace="moderation"）
+            ttl: 缓存过期时间（秒）
+            concurrency: 图片 / 音频审核的最大并发数
+        """
+        self._service = service
+        self._reviewer = reviewer
+        self._store = store
+        self._ttl = ttl
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.cache_hits = 0
+        self.checks = 0
+        self.failures = 0
+
+    @property
+    def store(self) -> TaskStateStore:
+        if self._store is None:
+            self._store = get_task_state_store("moderation")
+        return self._store
+
+    async def _bounded(self, check: Awaitable[ModerationResult]) -> ModerationResult:
+        async with self._semaphore:
+            return await check
+
+    async def _cached(
+        self,
+        kind: str,
+        items: list[str],
+        compute: Callable[[list[str]], Awaitable[list[ModerationResult]]],
+        errors: Optional[list[str]] = None,
+    ) -> list[ModerationResult]:
+        """Look up cached verdicts; compute the misses (deduplicated) in one batch."""
+        verdicts: dict[str, ModerationResult] = {}
+        for item in dict.fromkeys(items):
+            try:
+                record = await self.store.get(verdict_key(kind, item))
+            except Exception as e:
+                logger.warning(f"[Moderation] cache read failed: {e}")
+                record = None
+            if record is not None:
+                self.cache_hits += 1
+                verdicts[item] = ModerationResult.from_dict(record)
+
+        misses = [item for item in dict.fromkeys(items) if item not in verdicts]
+        if misses:
+            self.checks += len(misses)
+            try:
+                results = await compute(misses)
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"[Moderation] {kind} check failed: {type(e).__name__}: {e}")
+                if errors is not None:
+                    errors.append(f"{kind}: {e}")
+                results = [
+                    ModerationResult(is_safe=True, reason=f"{kind} check failed", skipped=True)
+                    for _ in misses
+                ]
+            for item, result in zip(misses, results):
+                verdicts[item] = result
+                if result.skipped:
+                    continue
+                try:
+                    await self.store.set(verdict_key(kind, item), result.to_dict(), ttl=self._ttl)
+                except Exception as e:
+                    logger.warning(f"[Moderation] cache write failed: {e}")
+
+        return [verdicts[item] for item in items]
+
+    async def _moderate_each(self, check: Callable[[str], Awaitable[ModerationResult]], items: list[str]):
+        return list(await asyncio.gather(*(self._bounded(check(item)) for item in items)))
+
+    async def moderate_book(
+        self,
+        texts: list[str],
+        image_urls: Optional[list[str]] = None,
+        audio_urls: Optional[list[str]] = None,
+    ) -> BookModeration:
+        """Moderate all texts, images and audio of one content item concurrently."""
+        result = BookModeration()
+        texts = [t for t in texts if t]
+        image_urls = [u for u in image_urls or [] if u]
+        audio_urls = [u for u in audio_urls or [] if u]
+
+        async def no_review() -> list[ModerationResult]:
+            return []
+
+        reviews = (
+            self._cached("review", texts, self._reviewer.review_texts, result.errors)
+            if self._reviewer is not None and texts
+            else no_review()
+        )
+        result.texts, result.reviews, result.images, result.audios = await asyncio.gather(
+            self._cached("text", texts, self._service.moderate_texts, result.errors),
+            reviews,
+            self._cached(
+                "image", image_urls,
+                lambda urls: self._moderate_each(self._service.moderate_image, urls),
+                result.errors,
+            ),
+            self._cached(
+                "audio", audio_urls,
+                lambda urls: self._moderate_each(self._service.moderate_audio, urls),
+                result.errors,
+            ),
+        )
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "checks": self.checks,
+            "cache_hits": self.cache_hits,
+            "failures": self.failures,
+            "pending_reviews": len(_pending),
+        }
+
+
+def content_assets(content_data: dict) -> tuple[list[str], list[str], list[str]]:
+    """Collect (texts, image_urls, audio_urls) from stored content_data."""
+    texts, images, audios = [], [], []
+    for page in content_data.get("pages", []):
+        texts.append(page.get("text") or "")
+        images.append(page.get("image_url") or "")
+        audios.append(page.get("audio_url") or "")
+    for key, bucket in (("lyrics", texts), ("cover_url", images), ("audio_url", audios)):
+        if isinstance(content_data.get(key), str):
+            bucket.append(content_data[key])
+    return texts, images, audios
+
+
+_engine: Optional[ModerationEngine] = None
+# 后台审核任务（保持强引用，避免被回收）
+_pending: set[asyncio.Task] = set()
+
+
+def get_moderation_engine() -> ModerationEngine:
+    """Get the process-wide moderation engine (configured from settings)."""
+    global _engine
+    if _engine is None:
+        from moana.agents.review import ReviewAgent
+        from moana.config import get_settings
+
+        settings = get_settings()
+        agent = ReviewAgent()
+        _engine = ModerationEngine(
+            service=agent.moderation_service,
+            reviewer=agent if settings.moderation_llm_review else None,
+            ttl=settings.moderation_cache_ttl,
+            concurrency=settings.moderation_concurrency,
+        )
+    return _engine
+
+
+def reset_moderation_engine() -> None:
+    """Drop the engine (tests)."""
+    global _engine
+    _engine = None
+
+
+async def review_content(content_id: str, content_data: dict) -> ReviewStatus:
+    """Moderate one stored content item and write its review status."""
+    import json
+
+    from sqlalchemy import text
+
+    from moana.database import async_session_factory
+
+    texts, images, audios = content_assets(content_data)
+    result = await get_moderation_engine().moderate_book(texts, images, audios)
+    status = result.review_status
+
+    async with async_session_factory() as db:
+        await db.execute(
+            text(
+                "UPDATE contents SET review_status = :review_status, review_result = :review_result, "
+                "updated_at = CURRENT_TIMESTAMP WHERE id = :id"
+            ),
+            {
+                "review_status": status.value,
+                "review_result": json.dumps(result.to_dict(), ensure_ascii=False),
+                "id": content_id,
+            },
+        )
+        await db.commit()
+
+    logger.info(f"[Moderation] content {content_id} -> {status.value}")
+    return status
+
+
+def schedule_content_review(content_id: str, content_data: dict) -> Optional[asyncio.Task]:
+    """Run review_content in the background (content stays pending until it finishes)."""
+    from moana.config import get_settings
+
+    if not get_settings().moderation_enabled:
+        return None
+
+    async def run() -> None:
+        try:
+            await review_content(content_id, content_data)
+        except Exception:
+            logger.exception(f"[Moderation] review of content {content_id} failed")
+
+    task = asyncio.get_running_loop().create_task(run())
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+    return task
@@ -1,8 +1,9 @@
-import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from moana.config import get_settings
 from moana.services.music.base import BaseMusicService, MusicResult, MusicStyle
+from moana.services.ratelimit import provider_limited
+from moana.services.http import http_client
 
 
 class MiniMaxMusicService(BaseMusicService):
@@ -22,6 +23,7 @@ class MiniMaxMusicService(BaseMusicService):
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
     )
+    @provider_limited("music")
     async def generate(
         self,
         lyrics: str,
@@ -32,7 +34,7 @@ class MiniMaxMusicService(BaseMusicService):
         """Generate music using MiniMax Music 2.0 API."""
         full_style_prompt = self.build_style_prompt(style_prompt, style)
 
-        async with httpx.AsyncClient(timeout=300.0) as client:
+        async with http_client("minimax", timeout=300.0) as client:
             response = await client.post(
                 f"{self._api_base}/v1/music_generation",
                 headers={
@@ -6,6 +6,7 @@
 """
 import asyncio
 import logging
+import time
 from dataclasses import dataclass
 
 import httpx
@@ -13,10 +14,23 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 
 from moana.config import get_settings
 from moana.services.music.base import BaseMusicService, MusicResult, MusicStyle
+from moana.services.ratelimit import get_provider_quota, provider_limited
 from moana.services.storage import get_storage_service
+from moana.services.task_state import get_task_state_store, wait_for_task_state
+from moana.services.http import PooledHTTPClient, http_client
+from moana.services.jobs import JobFailedError, JobKind, JobStatus, JobTimeoutError, get_job_poller
 
 logger = logging.getLogger(__name__)
 
+# 回调推送的终态（TEXT_SUCCESS / FIRST_SUCCESS 为中间状态）
+CALLBACK_FINAL_STATUSES = frozenset({
+    "SUCCESS",
+    "SENSITIVE_WORD_ERROR",
+    "CREATE_TASK_FAILED",
+    "GENERATE_AUDIO_FAILED",
+    "CALLBACK_EXCEPTION",
+})
+
 
 class SunoServiceError(Exception):
     """Base error for Suno service."""
@@ -81,6 +95,11 @@ class SunoMusicService(BaseMusicService):
     CALLBACK_FIRST = "first"    # 第一首歌完成
     CALLBACK_COMPLETE = "complete"  # 全部完成
 
+    # 回调丢失时的兜底轮询间隔（秒）：10s 起，每次 x1.5，最长 60s
+    FALLBACK_POLL_INITIAL = 10.0
+    FALLBACK_POLL_BACKOFF = 1.5
+    FALLBACK_POLL_MAX = 60.0
+
     def __init__(self):
         settings = get_settings()
         self._api_key = settings.suno_api_key
@@ -145,10 +164,6 @@ class SunoMusicService(BaseMusicService):
         logger.debug(f"Music prompt length: {len(prompt)} chars")
         return prompt
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-    )
     async def generate(
         self,
         prompt: str,
@@ -165,12 +180,32 @@ class SunoMusicService(BaseMusicService):
         Returns:
             MusicResult: 包含第一首歌曲的结果（两首都会保存）
         """
+        # 占用请求额度（QUOTA_SUNO_* 为 0 时不限）；在重试之外只占用一次
+        await get_provider_quota(self.provider_name).acquire(
+            max_wait=get_settings().quota_max_wait_seconds
+        )
+        return await self._generate(prompt, style, callback_task_id)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+    )
+    async def _generate(
+        self,
+        prompt: str,
+        style: MusicStyle,
+        callback_task_id: str | None,
+    ) -> MusicResult:
+        """提交任务、等待完成并保存歌曲（失败时整体重试）."""
         # 1. 提交生成任务
+        submitted_at = time.time()
         task_id = await self._create_task(prompt, callback_task_id)
         logger.info(f"Suno task created: {task_id}")
 
-        # 2. 轮询等待完成 (最多 5 分钟)
-        result = await self._poll_until_complete(task_id, timeout=300, interval=5)
+        # 2. 等待回调通知完成（最多 5 分钟，轮询仅作兜底）
+        result = await self._wait_until_complete(
+            task_id, callback_task_id, timeout=300, submitted_at=submitted_at
+        )
 
         # 3. 下载并保存所有歌曲到本地存储，并获取时间戳歌词和音乐视频
         saved_tracks = []
@@ -276,10 +311,12 @@ class SunoMusicService(BaseMusicService):
             callback_task_id=callback_task_id,
         )
 
+    @provider_limited("music")
     async def _create_task(self, prompt: str, callback_task_id: str | None = None) -> str:
         """Submit music generation task to Suno API.
 
         使用 customMode=false，只提供 prompt，让 Suno 自由创作。
+        并发槽位只覆盖提交请求，等待回调和下载期间不占用。
         """
         # 构建回调 URL
         callback_url = f"{self._callback_base}/api/v1/callback/suno"
@@ -297,7 +334,7 @@ class SunoMusicService(BaseMusicService):
         logger.info(f"Creating Suno task with prompt: {prompt[:100]}...")
         logger.debug(f"Request body: {request_body}")
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with http_client("suno", timeout=60.0) as client:
             response = await client.post(
                 f"{self._api_base}/api/v1/generate",
                 headers={
@@ -324,84 +361,145 @@ class SunoMusicService(BaseMusicService):
 
         return task_id
 
-    async def _poll_until_complete(
-        self, task_id: str, timeout: int = 300, interval: int = 5
+    async def _fetch_record(self, client: PooledHTTPClient, task_id: str) -> SunoGenerationResult | None:
+        """Query record-info once.
+
+        Returns:
+            SunoGenerationResult on SUCCESS, None while still generating
+        """
+        response = await client.get(
+            f"{self._api_base}/api/v1/generate/record-info",
+            headers={"Authorization": f"Bearer {self._api_key}"},
+            params={"taskId": task_id},
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        data = result.get("data", {})
+        status = data.get("status", "")
+
+        logger.info(f"Suno task {task_id} status: {status}")
+
+        if status == "SUCCESS":
+            suno_data = data.get("response", {}).get("sunoData", [])
+            if not suno_data:
+                raise SunoServiceError("No audio data in SUCCESS response")
+
+            # 解析所有歌曲
+            tracks = []
+            for item in suno_data:
+                # Suno customMode=false 时，生成的歌词在 prompt 字段中
+                # customMode=true 时，歌词在 lyric/lyrics 字段
+                generated_lyric = (
+                    item.get("lyric", "") or
+                    item.get("lyrics", "") or
+                    item.get("prompt", "")  # customMode=false 时歌词在 prompt 字段
+                )
+                # 视频 URL（Suno 会生成音乐视频）
+                video_url = (
+                    item.get("videoUrl", "") or
+                    item.get("video_url", "") or
+                    item.get("sourceVideoUrl", "") or
+                    item.get("source_video_url", "")
+                )
+                track = SunoTrack(
+                    id=item.get("id", ""),
+                    audio_url=item.get("audioUrl", "") or item.get("audio_url", ""),
+                    stream_url=item.get("streamAudioUrl", "") or item.get("stream_audio_url", ""),
+                    cover_url=item.get("imageUrl", "") or item.get("image_url", ""),
+                    video_url=video_url,
+                    title=item.get("title", ""),
+                    tags=item.get("tags", ""),
+                    duration=item.get("duration", 0),
+                    prompt=item.get("prompt", ""),
+                    model=item.get("modelName", "") or item.get("model_name", ""),
+                    lyric=generated_lyric,
+                )
+                tracks.append(track)
+                logger.info(f"  Track: {track.title}, duration: {track.duration}s, lyric: {len(track.lyric)} chars, video: {bool(video_url)}")
+
+            return SunoGenerationResult(
+                task_id=task_id,
+                tracks=tracks,
+                status="SUCCESS",
+            )
+
+        if status == "SENSITIVE_WORD_ERROR":
+            raise ContentModerationError("Content flagged by Suno moderation")
+
+        if status in ("CREATE_TASK_FAILED", "GENERATE_AUDIO_FAILED", "CALLBACK_EXCEPTION"):
+            error_msg = data.get("errorMessage", "Unknown error")
+            raise SunoServiceError(f"Suno generation failed: {error_msg}")
+
+        return None
+
+    async def _wait_until_complete(
+        self,
+        task_id: str,
+        callback_task_id: str | None = None,
+        timeout: int = 300,
+        submitted_at: float = 0.0,
     ) -> SunoGenerationResult:
-        """Poll Suno API until task completes.
+        """Wait for a Suno task, woken by the /callback/suno push.
+
+        回调写入 suno 任务状态后立即唤醒（跨 worker 通过回读共享存储）；
+        收到 SUCCESS 回调后只查询一次 record-info 获取完整结果。
+        record-info 轮询仅作兜底（回调丢失 / 回调地址不可达），间隔按
+        FALLBACK_POLL_* 退避。
+
+        Args:
+            task_id: Suno 任务 ID
+            callback_task_id: 回调 URL 中携带的任务 ID（回调状态的存储键）
+            timeout: 最长等待秒数
+            submitted_at: 提交时间 (epoch)，早于它的回调状态视为旧任务忽略
 
         Returns:
             SunoGenerationResult: 包含所有生成的歌曲
         """
-        elapsed = 0
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            while elapsed < timeout:
-                response = await client.get(
-                    f"{self._api_base}/api/v1/generate/record-info",
-                    headers={"Authorization": f"Bearer {self._api_key}"},
-                    params={"taskId": task_id},
+        store = get_task_state_store("suno")
+        callback_key = callback_task_id or task_id
+        seen_update = submitted_at
+
+        def callback_final(state: dict) -> bool:
+            return (
+                state.get("status") in CALLBACK_FINAL_STATUSES
+                and float(state.get("updated_at") or 0) > seen_update
+                and state.get("suno_task_id") in (None, task_id)
+            )
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        poll_delay = self.FALLBACK_POLL_INITIAL
+        next_poll = loop.time() + poll_delay
+
+        async with http_client("suno", timeout=30.0) as client:
+            while loop.time() < deadline:
+                state = await wait_for_task_state(
+                    store,
+                    callback_key,
+                    callback_final,
+                    timeout=max(0.0, min(next_poll, deadline) - loop.time()),
                 )
-                response.raise_for_status()
-                result = response.json()
-
-                data = result.get("data", {})
-                status = data.get("status", "")
-
-                logger.info(f"Suno task {task_id} status: {status} (elapsed: {elapsed}s)")
-
-                if status == "SUCCESS":
-                    suno_data = data.get("response", {}).get("sunoData", [])
-                    if not suno_data:
-                        raise SunoServiceError("No audio data in SUCCESS response")
-
-                    # 解析所有歌曲
-                    tracks = []
-                    for item in suno_data:
-                        # Suno customMode=false 时，生成的歌词在 prompt 字段中
-                        # customMode=true 时，歌词在 lyric/lyrics 字段
-                        generated_lyric = (
-                            item.get("lyric", "") or
-                            item.get("lyrics", "") or
-                            item.get("prompt", "")  # customMode=false 时歌词在 prompt 字段
-                        )
-                        # 视频 URL（Suno 会生成音乐视频）
-                        video_url = (
-                            item.get("videoUrl", "") or
-                            item.get("video_url", "") or
-                            item.get("sourceVideoUrl", "") or
-                            item.get("source_video_url", "")
-                        )
-                        track = SunoTrack(
-                            id=item.get("id", ""),
-                            audio_url=item.get("audioUrl", "") or item.get("audio_url", ""),
-                            stream_url=item.get("streamAudioUrl", "") or item.get("stream_audio_url", ""),
-                            cover_url=item.get("imageUrl", "") or item.get("image_url", ""),
-                            video_url=video_url,
-                            title=item.get("title", ""),
-                            tags=item.get("tags", ""),
-                            duration=item.get("duration", 0),
-                            prompt=item.get("prompt", ""),
-                            model=item.get("modelName", "") or item.get("model_name", ""),
-                            lyric=generated_lyric,
-                        )
-                        tracks.append(track)
-                        logger.info(f"  Track: {track.title}, duration: {track.duration}s, lyric: {len(track.lyric)} chars, video: {bool(video_url)}")
-
-                    return SunoGenerationResult(
-                        task_id=task_id,
-                        tracks=tracks,
-                        status="SUCCESS",
-                    )
-
-                if status == "SENSITIVE_WORD_ERROR":
-                    raise ContentModerationError("Content flagged by Suno moderation")
-
-                if status in ("CREATE_TASK_FAILED", "GENERATE_AUDIO_FAILED", "CALLBACK_EXCEPTION"):
-                    error_msg = data.get("errorMessage", "Unknown error")
-                    raise SunoServiceError(f"Suno generation failed: {error_msg}")
-
-                await asyncio.sleep(interval)
-                elapsed += interval
+
+                if state is not None:
+                    seen_update = float(state.get("updated_at") or 0)
+                    status = state["status"]
+                    logger.info(f"Suno task {task_id} callback: {status}")
+                    if status == "SENSITIVE_WORD_ERROR":
+                        raise ContentModerationError("Content flagged by Suno moderation")
+                    if status != "SUCCESS":
+                        error_msg = state.get("error_message") or status
+                        raise SunoServiceError(f"Suno generation failed: {error_msg}")
+                elif loop.time() < next_poll:
+                    continue
+
+                # 回调 SUCCESS 或兜底轮询时间到：查询一次完整结果
+                result = await self._fetch_record(client, task_id)
+                if result is not None:
+                    return result
+                if state is None:
+                    poll_delay = min(poll_delay * self.FALLBACK_POLL_BACKOFF, self.FALLBACK_POLL_MAX)
+                next_poll = loop.time() + poll_delay
 
         raise SunoServiceError(f"Suno task {task_id} timed out after {timeout}s")
 
@@ -413,7 +511,7 @@ class SunoMusicService(BaseMusicService):
         logger.info(f"Downloading audio: {remote_url[:50]}...")
 
         # 禁用代理，直连 Suno CDN
-        async with httpx.AsyncClient(timeout=120.0, proxy=None) as client:
+        async with http_client("suno", timeout=120.0, direct=True) as client:
             response = await client.get(remote_url)
             response.raise_for_status()
             audio_data = response.content
@@ -445,7 +543,7 @@ class SunoMusicService(BaseMusicService):
 
         try:
             # 禁用代理，Suno CDN 通过代理访问会返回 403
-            async with httpx.AsyncClient(timeout=60.0, proxy=None) as client:
+            async with http_client("suno", timeout=60.0, direct=True) as client:
                 response = await client.get(remote_url)
                 response.raise_for_status()
                 image_data = response.content
@@ -482,7 +580,7 @@ class SunoMusicService(BaseMusicService):
 
     async def get_task_status(self, task_id: str) -> dict:
         """查询任务状态，供前端轮询使用."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client("suno", timeout=30.0) as client:
             response = await client.get(
                 f"{self._api_base}/api/v1/generate/record-info",
                 headers={"Authorization": f"Bearer {self._api_key}"},
@@ -526,7 +624,7 @@ class SunoMusicService(BaseMusicService):
         """
         logger.info(f"Fetching timestamped lyrics for task={task_id}, audio={audio_id}")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client("suno", timeout=30.0) as client:
             response = await client.post(
                 f"{self._api_base}/api/v1/generate/get-timestamped-lyrics",
                 headers={
@@ -575,7 +673,7 @@ class SunoMusicService(BaseMusicService):
 
         logger.info(f"Downloading video: {remote_url[:50]}...")
 
-        async with httpx.AsyncClient(timeout=180.0) as client:
+        async with http_client("suno", timeout=180.0) as client:
             response = await client.get(remote_url)
             response.raise_for_status()
             video_data = response.content
@@ -627,7 +725,7 @@ class SunoMusicService(BaseMusicService):
 
         logger.info(f"Creating music video for task={task_id}, audio={audio_id}")
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with http_client("suno", timeout=60.0) as client:
             response = await client.post(
                 f"{self._api_base}/api/v1/mp4/generate",
                 headers={
@@ -667,7 +765,7 @@ class SunoMusicService(BaseMusicService):
         Returns:
             视频信息字典，包含 video_url, status 等
         """
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client("suno", timeout=30.0) as client:
             response = await client.get(
                 f"{self._api_base}/api/v1/mp4/record-info",
                 headers={"Authorization": f"Bearer {self._api_key}"},
@@ -709,7 +807,6 @@ class SunoMusicService(BaseMusicService):
         audio_id: str,
         author: str = "",
         timeout: int = 180,
-        interval: int = 5,
     ) -> str:
         """创建音乐视频并等待完成，返回本地视频 URL.
 
@@ -718,7 +815,6 @@ class SunoMusicService(BaseMusicService):
             audio_id: 音轨 ID
             author: 作者名
             timeout: 超时时间（秒）
-            interval: 轮询间隔（秒）
 
         Returns:
             本地存储的视频 URL
@@ -727,30 +823,39 @@ class SunoMusicService(BaseMusicService):
         if not video_task_id:
             return ""
 
-        # 轮询等待视频完成
-        elapsed = 0
-        while elapsed < timeout:
+        # 由共享轮询器等待视频完成
+        poller = get_job_poller()
+        poller.ensure_kind(JobKind(
+            name="suno_mv",
+            query=self._query_video_jobs,
+            expected_duration=60.0,
+            min_interval=3.0,
+            max_interval=15.0,
+        ))
+        try:
+            video_url = await poller.wait("suno_mv", video_task_id, timeout=timeout)
+        except JobTimeoutError:
+            logger.warning(f"Video task {video_task_id} timed out after {timeout}s")
+            return ""
+        except JobFailedError as e:
+            logger.warning(f"Video generation failed: {e}")
+            return ""
+
+        if not video_url:
+            return ""
+        # 下载并保存到本地
+        return await self._download_and_save_video(video_url, f"suno_mv_{video_task_id}")
+
+    async def _query_video_jobs(self, video_task_ids: list[str]) -> dict[str, JobStatus]:
+        """查询音乐视频任务状态."""
+        statuses = {}
+        for video_task_id in video_task_ids:
             info = await self.get_music_video_info(video_task_id)
             status = info.get("status", "")
-            logger.info(f"Video task {video_task_id} status: {status} (elapsed: {elapsed}s)")
-
             if status == "SUCCESS":
-                video_url = info.get("video_url", "")
-                if video_url:
-                    # 下载并保存到本地
-                    local_url = await self._download_and_save_video(
-                        video_url,
-                        f"suno_mv_{video_task_id}"
-                    )
-                    return local_url
-                return ""
-
-            if status in ("ERROR", "FAILED"):
-                logger.warning(f"Video generation failed: {info}")
-                return ""
-
-            await asyncio.sleep(interval)
-            elapsed += interval
-
-        logger.warning(f"Video task {video_task_id} timed out after {timeout}s")
-        return ""
+                statuses[video_task_id] = JobStatus("succeeded", result=info.get("video_url", ""))
+            elif status in ("ERROR", "FAILED"):
+                statuses[video_task_id] = JobStatus("failed", error=str(info))
+            else:
+                statuses[video_task_id] = JobStatus("running")
+        return statuses
@@ -19,6 +19,8 @@ import httpx
 
 from moana.config import get_settings
 from moana.services.prompt.templates import build_preset_template, build_smart_template
+from moana.services.http import http_client
+from moana.services.llm import get_llm_memo
 
 logger = logging.getLogger(__name__)
 
@@ -170,8 +172,12 @@ class PromptEnhancer:
 
         logger.info(f"Template prompt ({len(template_prompt)} chars): {template_prompt[:100]}...")
 
-        # Enhance with Gemini (use REST API with proxy)
-        enhanced_prompt = await self._call_gemini_api(template_prompt)
+        # Enhance with Gemini (use REST API with proxy)；相同模板直接复用缓存结果
+        enhanced_prompt = await get_llm_memo("suno_prompt").get_or_compute(
+            inputs={"template_prompt": template_prompt},
+            model=self._model_name,
+            compute=lambda: self._call_gemini_api(template_prompt),
+        )
 
         if not enhanced_prompt:
             logger.warning("Gemini API failed, using fallback prompt")
@@ -220,7 +226,7 @@ class PromptEnhancer:
         }
 
         try:
-            async with httpx.AsyncClient(proxy=proxy_url, timeout=30.0) as client:
+            async with http_client("gemini", timeout=30.0, proxy=proxy_url) as client:
                 response = await client.post(
                     url,
                     json=payload,
@@ -0,0 +1,48 @@
+# src/moana/services/ratelimit/__init__.py
+"""Provider rate limiting.
+
+Usage:
+    from moana.services.ratelimit import provider_limited
+
+    class MyImageService(BaseImageService):
+        @provider_limited("image")
+        async def generate(self, prompt, ...): ...
+
+    # 稀缺 provider 提交前占用请求额度
+    await get_provider_quota("veo").acquire(max_wait=90)
+"""
+from moana.services.ratelimit.adaptive import (
+    DEFAULT_LIMITS,
+    AdaptiveLimiter,
+    get_provider_limiter,
+    is_rate_limit_error,
+    provider_limited,
+    provider_limiter_stats,
+    reset_provider_limiters,
+)
+from moana.services.ratelimit.quota import (
+    ProviderQuota,
+    QuotaExhaustedError,
+    QuotaLedger,
+    TokenBucket,
+    get_provider_quota,
+    provider_quota_status,
+    reset_provider_quotas,
+)
+
+__all__ = [
+    "DEFAULT_LIMITS",
+    "AdaptiveLimiter",
+    "get_provider_limiter",
+    "is_rate_limit_error",
+    "provider_limited",
+    "provider_limiter_stats",
+    "reset_provider_limiters",
+    "ProviderQuota",
+    "QuotaExhaustedError",
+    "QuotaLedger",
+    "TokenBucket",
+    "get_provider_quota",
+    "provider_quota_status",
+    "reset_provider_quotas",
+]
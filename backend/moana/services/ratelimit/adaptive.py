@@ -0,0 +1,235 @@
+# src/moana/services/ratelimit/adaptive.py
+"""Adaptive (AIMD) concurrency limiter for upstream providers.
+
+每个 provider + model 一个进程内共享的限流器：
+- 调用成功：并发上限加性增长（约每 limit 次成功 +1），直到 max_limit
+- 遇到 429 / QPS / 配额类错误：并发上限减半（不低于 min_limit），
+  冷却期内的后续限流错误不再重复减半
+
+替代各 pipeline 内部固定的信号量和盲等 sleep，多本绘本同时生成时
+对同一 provider 的总并发仍受控。
+"""
+import asyncio
+import functools
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional
+
+import httpx
+
+from moana.services.ratelimit.quota import QuotaExhaustedError
+
+logger = logging.getLogger(__name__)
+
+# 限流类错误关键字（小写匹配）
+_RATE_LIMIT_MARKERS = (
+    "429",
+    "rate limit",
+    "ratelimit",
+    "too many requests",
+    "throttl",
+    "qps",
+    "resource_exhausted",
+    "quota",
+)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """判断异常是否为上游限流（包括 __cause__ 链）."""
+    seen: set[int] = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, QuotaExhaustedError):
+            # 本地额度检查，并非上游限流信号
+            return False
+        if isinstance(current, httpx.HTTPStatusError) and current.response.status_code == 429:
+            return True
+        if getattr(current, "status_code", None) == 429 or getattr(current, "code", None) == 429:
+            return True
+        message = str(current).lower()
+        if any(marker in message for marker in _RATE_LIMIT_MARKERS):
+            return True
+        current = current.__cause__
+    return False
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter shared by all callers of one provider/model."""
+
+    def __init__(
+        self,
+        key: str,
+        initial_limit: int = 2,
+        min_limit: int = 1,
+        max_limit: int = 8,
+        decrease_factor: float = 0.5,
+        cooldown: float = 5.0,
+    ):
+        """Initialize limiter.
+
+        Args:
+            key: 限流器标识（kind:provider:model）
+            initial_limit: 初始并发上限
+            min_limit: 并发上限下限
+            max_limit: 并发上限上限
+            decrease_factor: 遇到限流时的乘性减小系数
+            cooldown: 两次减小之间的最短间隔（秒）
+        """
+        self.key = key
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        self._successes = 0
+        self._throttled = 0
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限."""
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait for a free slot."""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 槽位已经移交，取消时归还
+                self._release_slot()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self, throttled: bool = False) -> None:
+        """Release a slot and adjust the limit from the call outcome."""
+        if throttled:
+            self._on_throttled()
+        else:
+            self._on_success()
+        self._release_slot()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot for one upstream call."""
+        await self.acquire()
+        try:
+            yield
+        except BaseException as e:
+            self.release(throttled=isinstance(e, Exception) and is_rate_limit_error(e))
+            raise
+        else:
+            self.release()
+
+    def stats(self) -> dict[str, Any]:
+        """当前状态（供监控）."""
+        return {
+            "key": self.key,
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "successes": self._successes,
+            "throttled": self._throttled,
+        }
+
+    def _on_success(self) -> None:
+        self._successes += 1
+        if self._limit < self.max_limit:
+            # 加性增长：约每 limit 次成功 +1
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def _on_throttled(self) -> None:
+        self._throttled += 1
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        logger.warning(f"[Limiter] {self.key} throttled, concurrency {previous} -> {self.limit}")
+
+    def _release_slot(self) -> None:
+        self._in_flight -= 1
+        # 按新的上限唤醒等待者（槽位直接移交）
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done() or waiter.get_loop().is_closed():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+
+# 各类服务的 (初始, 最小, 最大) 并发上限
+DEFAULT_LIMITS: dict[str, tuple[int, int, int]] = {
+    "image": (3, 1, 8),
+    "tts": (2, 1, 6),
+    "music": (4, 1, 8),
+    "video": (2, 1, 4),
+}
+
+# Process-wide limiter registry
+_limiters: dict[str, AdaptiveLimiter] = {}
+
+
+def get_provider_limiter(kind: str, provider: str, model: str | None = None) -> AdaptiveLimiter:
+    """Get the shared limiter for a provider/model (created on first use)."""
+    key = f"{kind}:{provider}:{model or 'default'}"
+    limiter = _limiters.get(key)
+    if limiter is None:
+        initial, minimum, maximum = DEFAULT_LIMITS.get(kind, (2, 1, 4))
+        limiter = AdaptiveLimiter(key, initial_limit=initial, min_limit=minimum, max_limit=maximum)
+        _limiters[key] = limiter
+    return limiter
+
+
+def provider_limiter_stats() -> list[dict[str, Any]]:
+    """All limiters' current state."""
+    return [limiter.stats() for limiter in sorted(_limiters.values(), key=lambda l: l.key)]
+
+
+def reset_provider_limiters() -> None:
+    """Drop all limiters (useful for testing)."""
+    _limiters.clear()
+
+
+def provider_limited(kind: str) -> Callable:
+    """Decorator limiting a service method with its provider's adaptive limiter.
+
+    provider 取 service 的 provider_name（没有则用类名），model 取 model_name / _model。
+
+    Usage:
+        class WanxImageService(BaseImageService):
+            @provider_limited("image")
+            async def generate(self, prompt, ...): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            provider = getattr(self, "provider_name", None) or type(self).__name__
+            model = getattr(self, "model_name", None) or getattr(self, "_model", None)
+            limiter = get_provider_limiter(kind, provider, model if isinstance(model, str) else None)
+            async with limiter.slot():
+                return await func(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,221 @@
+# src/moana/services/ratelimit/quota.py
+"""Request-rate and daily quota guards for scarce providers (Veo, Suno).
+
+与 adaptive.py 控制的"并发数"不同，这里限制的是"提交次数"：
+- TokenBucket：每分钟请求数（进程内令牌桶，短暂等待后放行）
+- QuotaLedger：每日请求数（记录在任务状态存储 namespace="quota"，
+  多 worker 共享；按 UTC 自然日划分窗口，每个窗口一个原子计数器）
+
+额度用尽时抛出 QuotaExhaustedError（带 retry_after），调用方可以
+改用其他 provider 或稍后重试。
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from moana.services.task_state import TaskStateStore, get_task_state_store
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaExhaustedError(Exception):
+    """Provider request quota is used up for the current window."""
+
+    def __init__(self, provider: str, retry_after: float, scope: str):
+        self.provider = provider
+        self.retry_after = retry_after
+        self.scope = scope  # minute | day
+        super().__init__(
+            f"{provider} {scope} request quota exhausted, retry after {retry_after:.0f}s"
+        )
+
+
+class TokenBucket:
+    """Per-process token bucket refilled at rate_per_minute."""
+
+    def __init__(self, rate_per_minute: int, capacity: Optional[int] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity or rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until the next token is available."""
+        self._refill()
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def reserve(self, max_wait: float = 0.0) -> Optional[float]:
+        """Reserve a token.
+
+        Returns:
+            需要等待的秒数（0 表示立即可用）；等待超过 max_wait 时返回 None 且不占用令牌
+        """
+        wait = self.wait_time()
+        if wait > max_wait:
+            return None
+        # 允许令牌为负：后续调用者按顺序排在这次预约之后
+        self._tokens -= 1
+        return wait
+
+    def refund(self) -> None:
+        """Return a reserved token (the call was not submitted)."""
+        self._tokens = min(self.capacity, self._tokens + 1)
+
+    @property
+    def available(self) -> int:
+        self._refill()
+        return max(0, int(self._tokens))
+
+
+def _utc_window(now: Optional[datetime] = None) -> tuple[str, float]:
+    """当前 UTC 日窗口标识及距离重置的秒数."""
+    now = now or datetime.now(timezone.utc)
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return now.strftime("%Y%m%d"), (tomorrow - now).total_seconds()
+
+
+class QuotaLedger:
+    """Persistent daily request counter shared across workers.
+
+    每个 provider 每个 UTC 日一个 "{provider}:{day}" 计数器（store.incr 带上限原子自增），
+    占用和查询都只需一次存储往返，并发下也不会超发。
+    """
+
+    def __init__(self, store: Optional[TaskStateStore] = None):
+        self._store = store or get_task_state_store("quota")
+
+    async def reserve(self, provider: str, daily_limit: int) -> bool:
+        """Reserve one request for today. Returns False if the quota is used up."""
+        day, reset_in = _utc_window()
+        # 保留到窗口结束后再多一天，便于排查
+        ttl = int(reset_in) + 86400
+        return await self._store.incr(f"{provider}:{day}", limit=daily_limit, ttl=ttl) is not None
+
+    async def used(self, provider: str, daily_limit: int) -> int:
+        """Requests reserved today."""
+        day, _ = _utc_window()
+        return min(await self._store.counter(f"{provider}:{day}"), daily_limit)
+
+
+class ProviderQuota:
+    """Rate + daily quota guard for one provider."""
+
+    def __init__(
+        self,
+        provider: str,
+        per_minute: int = 0,
+        per_day: int = 0,
+        ledger: Optional[QuotaLedger] = None,
+    ):
+        """Initialize quota guard.
+
+        Args:
+            provider: provider 名称
+            per_minute: 每分钟请求上限，0 表示不限
+            per_day: 每日请求上限（UTC），0 表示不限
+            ledger: 每日额度账本
+        """
+        self.provider = provider
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self._bucket = TokenBucket(per_minute) if per_minute > 0 else None
+        self._ledger = ledger or (QuotaLedger() if per_day > 0 else None)
+
+    @property
+    def enabled(self) -> bool:
+        return self._bucket is not None or self._ledger is not None
+
+    async def acquire(self, max_wait: float = 0.0) -> None:
+        """Take one request from the quota before submitting to the provider.
+
+        每分钟额度在 max_wait 秒内可恢复时等待后放行；否则抛出异常。
+
+        Raises:
+            QuotaExhaustedError: 当前分钟或当天额度已用完
+        """
+        wait = 0.0
+        if self._bucket is not None:
+            reserved = self._bucket.reserve(max_wait)
+            if reserved is None:
+                raise QuotaExhaustedError(self.provider, self._bucket.wait_time(), "minute")
+            wait = reserved
+
+        if self._ledger is not None and self.per_day > 0:
+            if not await self._ledger.reserve(self.provider, self.per_day):
+                if self._bucket is not None:
+                    self._bucket.refund()
+                _, reset_in = _utc_window()
+                raise QuotaExhaustedError(self.provider, reset_in, "day")
+
+        if wait > 0:
+            logger.info(f"[Quota] {self.provider} rate limited, waiting {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+    async def status(self) -> dict[str, Any]:
+        """剩余额度（供监控）."""
+        info: dict[str, Any] = {
+            "provider": self.provider,
+            "per_minute": self.per_minute or None,
+            "per_day": self.per_day or None,
+        }
+        if self._bucket is not None:
+            info["minute_remaining"] = self._bucket.available
+        if self._ledger is not None and self.per_day > 0:
+            used = await self._ledger.used(self.provider, self.per_day)
+            _, reset_in = _utc_window()
+            info["day_used"] = used
+            info["day_remaining"] = max(0, self.per_day - used)
+            info["day_resets_in_seconds"] = int(reset_in)
+        return info
+
+
+# Process-wide quota registry
+_quotas: dict[str, ProviderQuota] = {}
+
+
+def get_provider_quota(provider: str) -> ProviderQuota:
+    """Get the quota guard for a provider, configured by QUOTA_<PROVIDER>_PER_MINUTE/_PER_DAY."""
+    quota = _quotas.get(provider)
+    if quota is None:
+        from moana.config import get_settings
+
+        settings = get_settings()
+        quota = ProviderQuota(
+            provider,
+            per_minute=getattr(settings, f"quota_{provider}_per_minute", 0),
+            per_day=getattr(settings, f"quota_{provider}_per_day", 0),
+        )
+        _quotas[provider] = quota
+    return quota
+
+
+async def provider_quota_status() -> list[dict[str, Any]]:
+    """Remaining quota of all configured providers."""
+    from moana.config import get_settings
+
+    settings = get_settings()
+    providers = sorted(
+        name[len("quota_"):-len("_per_day")]
+        for name in type(settings).model_fields
+        if name.startswith("quota_") and name.endswith("_per_day")
+    )
+    statuses = []
+    for provider in providers:
+        quota = get_provider_quota(provider)
+        if quota.enabled:
+            statuses.append(await quota.status())
+    return statuses
+
+
+def reset_provider_quotas() -> None:
+    """Drop all quota guards (useful for testing)."""
+    _quotas.clear()
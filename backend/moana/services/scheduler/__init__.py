@@ -0,0 +1,85 @@
+# src/moana/services/scheduler/__init__.py
+"""Generation job scheduler.
+
+Usage:
+    from moana.services.scheduler import get_generation_scheduler, QueueFullError
+
+    scheduler = get_generation_scheduler()
+    info = scheduler.submit(task_id, "picture_book", lambda: run(task_id))
+"""
+from moana.services.scheduler.dedup import (
+    DedupDecision,
+    GenerationDeduplicator,
+    request_fingerprint,
+)
+from moana.services.scheduler.scheduler import (
+    GenerationScheduler,
+    JobPriority,
+    QueueFullError,
+    QueueInfo,
+)
+
+# Cached scheduler / deduplicator instances
+_scheduler: GenerationScheduler | None = None
+_deduplicator: GenerationDeduplicator | None = None
+
+
+def get_generation_scheduler() -> GenerationScheduler:
+    """Get the process-wide generation scheduler configured from settings."""
+    global _scheduler
+
+    if _scheduler is not None:
+        return _scheduler
+
+    from moana.config import get_settings
+
+    settings = get_settings()
+    _scheduler = GenerationScheduler(
+        limits={
+            "picture_book": settings.scheduler_picture_book_concurrency,
+            "nursery_rhyme": settings.scheduler_nursery_rhyme_concurrency,
+            "video": settings.scheduler_video_concurrency,
+        },
+        max_queue=settings.scheduler_max_queue,
+        # 初始预计耗时（秒），运行后按实际耗时动态修正
+        expected_durations={
+            "picture_book": 150.0,
+            "nursery_rhyme": 120.0,
+            "video": 240.0,
+        },
+    )
+    return _scheduler
+
+
+def get_generation_deduplicator() -> GenerationDeduplicator:
+    """Get the request deduplicator configured from settings."""
+    global _deduplicator
+
+    if _deduplicator is None:
+        from moana.config import get_settings
+
+        _deduplicator = GenerationDeduplicator(
+            reuse_window=get_settings().dedup_reuse_window_seconds,
+        )
+    return _deduplicator
+
+
+def reset_generation_scheduler() -> None:
+    """Reset the cached scheduler and deduplicator (useful for testing)."""
+    global _scheduler, _deduplicator
+    _scheduler = None
+    _deduplicator = None
+
+
+__all__ = [
+    "DedupDecision",
+    "GenerationDeduplicator",
+    "GenerationScheduler",
+    "JobPriority",
+    "QueueFullError",
+    "QueueInfo",
+    "get_generation_deduplicator",
+    "get_generation_scheduler",
+    "request_fingerprint",
+    "reset_generation_scheduler",
+]
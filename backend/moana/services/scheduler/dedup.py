@@ -0,0 +1,129 @@
+# src/moana/services/scheduler/dedup.py
+"""In-flight request coalescing and result reuse.
+
+家长连点、小程序网络抖动重试会产生参数完全相同的生成请求。按归一化
+参数计算指纹：
+- 相同请求仍在生成中 -> 合并到已有 task_id (singleflight)
+- 相同请求在复用窗口内已完成 -> 直接返回已有 content_id
+- 之前的任务失败 / 已过期 / 超出窗口 -> 正常创建新任务
+
+指纹 -> task_id 的映射保存在任务状态存储（namespace="dedup"），多 worker
+共享；任务本身的状态仍从 content 任务存储读取。
+"""
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from moana.services.task_state import TaskStateStore, get_task_state_store
+
+
+@dataclass
+class DedupDecision:
+    """Result of claiming a request fingerprint."""
+    action: str  # new | join | reuse
+    task_id: str
+    content_id: Optional[str] = None
+
+
+def _normalize(value: Any) -> Any:
+    """归一化参数：去掉空值、首尾空白，字符串列表排序."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        normalized = {k: _normalize(v) for k, v in value.items()}
+        return {k: v for k, v in normalized.items() if v not in (None, "", [], {})}
+    if isinstance(value, (list, tuple)):
+        items = [_normalize(v) for v in value]
+        items = [v for v in items if v not in (None, "", [], {})]
+        if all(isinstance(v, str) for v in items):
+            items = sorted(items)
+        return items
+    return value
+
+
+def request_fingerprint(content_type: str, params: dict[str, Any]) -> str:
+    """Fingerprint of a generation request."""
+    payload = json.dumps(
+        {"type": content_type, "params": _normalize(params)},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class GenerationDeduplicator:
+    """Singleflight + recent result reuse for generation requests."""
+
+    def __init__(
+        self,
+        reuse_window: int = 600,
+        store: Optional[TaskStateStore] = None,
+        task_store: Optional[TaskStateStore] = None,
+    ):
+        """Initialize deduplicator.
+
+        Args:
+            reuse_window: 已完成内容的复用窗口（秒），0 表示只合并进行中的请求
+            store: 指纹映射存储
+            task_store: 任务状态存储
+        """
+        self.reuse_window = reuse_window
+        self._store = store or get_task_state_store("dedup")
+        self._task_store = task_store or get_task_state_store("content")
+
+    async def claim(self, fingerprint: str, task_id: str) -> DedupDecision:
+        """Claim a fingerprint for task_id, or return the task to join / reuse.
+
+        调用前应已为 task_id 写入 pending 状态，避免并发的相同请求把
+        刚认领的指纹误判为已过期。
+        """
+        entry = {"task_id": task_id}
+
+        for _ in range(2):
+            if await self._store.add(fingerprint, entry):
+                return DedupDecision(action="new", task_id=task_id)
+
+            existing = await self._store.get(fingerprint)
+            if existing is None:
+                continue  # 恰好过期，重新认领
+
+            existing_task_id = existing.get("task_id")
+            status = await self._task_store.get(existing_task_id) if existing_task_id else None
+            if status is not None:
+                state = status.get("status")
+                if state in ("pending", "processing"):
+                    return DedupDecision(action="join", task_id=existing_task_id)
+
+                finished_at = float(status.get("updated_at") or 0)
+                if (
+                    state == "completed"
+                    and status.get("content_id")
+                    and time.time() - finished_at <= self.reuse_window
+                ):
+                    return DedupDecision(
+                        action="reuse",
+                        task_id=existing_task_id,
+                        content_id=status["content_id"],
+                    )
+
+            # 失败 / 过期 / 超出复用窗口：接管指纹。以被接管的 task_id 为条件原子认领
+            # （add 仅在不存在时写入），并发的相同重试只有一个接管，其余加入它的任务
+            takeover_key = f"{fingerprint}:takeover:{existing_task_id}"
+            if await self._store.add(takeover_key, entry):
+                await self._store.set(fingerprint, entry)
+                return DedupDecision(action="new", task_id=task_id)
+            winner = await self._store.get(takeover_key)
+            if winner and winner.get("task_id"):
+                return DedupDecision(action="join", task_id=winner["task_id"])
+
+        await self._store.set(fingerprint, entry)
+        return DedupDecision(action="new", task_id=task_id)
+
+    async def release(self, fingerprint: str, task_id: str) -> None:
+        """Release a claim (e.g. the task was rejected before starting)."""
+        existing = await self._store.get(fingerprint)
+        if existing and existing.get("task_id") == task_id:
+            await self._store.delete(fingerprint)
@@ -0,0 +1,227 @@
+# src/moana/services/scheduler/scheduler.py
+"""Bounded generation job scheduler.
+
+替代直接 asyncio.create_task 的"发射后不管"模式：
+- 每种内容类型独立的并发上限与等待队列（优先级堆）
+- 队列满时抛出 QueueFullError，由 API 层转换为 429 + Retry-After
+- 根据历史耗时（EWMA）估算排队等待时间
+- 运行中的 asyncio.Task 由调度器强引用，避免执行中途被 GC 回收
+
+注意：调度器是进程内的，多 worker 部署时并发上限按 worker 计算。
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+JobFactory = Callable[[], Awaitable[Any]]
+
+
+class JobPriority(IntEnum):
+    """任务优先级，数值越小越先执行."""
+    HIGH = 0
+    NORMAL = 10
+    LOW = 20
+
+
+class QueueFullError(Exception):
+    """Raised when a content type's wait queue is full."""
+
+    def __init__(self, content_type: str, retry_after: int):
+        self.content_type = content_type
+        self.retry_after = retry_after
+        super().__init__(f"{content_type} queue is full, retry after {retry_after}s")
+
+
+@dataclass(order=True)
+class _QueuedJob:
+    priority: int
+    seq: int
+    task_id: str = field(compare=False)
+    factory: JobFactory = field(compare=False)
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+
+
+@dataclass
+class QueueInfo:
+    """Queue position of a waiting task."""
+    position: int  # 前面还有几个任务 (0 = 下一个执行)
+    estimated_wait_seconds: int
+
+
+class _Lane:
+    """Per content type queue + running set."""
+
+    def __init__(self, limit: int, expected_duration: float):
+        self.limit = limit
+        self.avg_duration = expected_duration
+        self.heap: list[_QueuedJob] = []
+        self.running: dict[str, asyncio.Task] = {}
+
+    def record_duration(self, seconds: float, alpha: float = 0.3) -> None:
+        self.avg_duration = alpha * seconds + (1 - alpha) * self.avg_duration
+
+    def estimate_wait(self, ahead: int) -> int:
+        """排在 ahead 个任务之后需要等待的秒数."""
+        if len(self.running) < self.limit and ahead == 0:
+            return 0
+        rounds = ahead // self.limit + 1
+        return int(math.ceil(rounds * self.avg_duration))
+
+
+class GenerationScheduler:
+    """Priority scheduler with per content type concurrency limits."""
+
+    def __init__(
+        self,
+        limits: dict[str, int],
+        max_queue: int = 20,
+        expected_durations: Optional[dict[str, float]] = None,
+    ):
+        """Initialize scheduler.
+
+        Args:
+            limits: 每种内容类型的最大并发数，如 {"picture_book": 3}
+            max_queue: 每种内容类型的最大排队数
+            expected_durations: 每种内容类型的初始预计耗时（秒），用于估算等待
+        """
+        self._limits = dict(limits)
+        self._max_queue = max_queue
+        self._expected = expected_durations or {}
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lanes: dict[str, _Lane] = {}
+
+    def _lane(self, content_type: str) -> _Lane:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 事件循环变化（测试 / 热重载）时旧任务已无法继续，重置状态
+            self._loop = loop
+            self._lanes = {}
+        lane = self._lanes.get(content_type)
+        if lane is None:
+            lane = _Lane(
+                limit=max(1, self._limits.get(content_type, 1)),
+                expected_duration=self._expected.get(content_type, 120.0),
+            )
+            self._lanes[content_type] = lane
+        return lane
+
+    def check_capacity(self, content_type: str) -> None:
+        """在执行昂贵的前置步骤前检查是否还能排队.
+
+        Raises:
+            QueueFullError: 队列已满
+        """
+        lane = self._lane(content_type)
+        if len(lane.running) >= lane.limit and len(lane.heap) >= self._max_queue:
+            retry_after = max(1, int(lane.avg_duration / lane.limit))
+            raise QueueFullError(content_type, retry_after)
+
+    def submit(
+        self,
+        task_id: str,
+        content_type: str,
+        factory: JobFactory,
+        priority: int = JobPriority.NORMAL,
+    ) -> QueueInfo:
+        """Submit a job; runs immediately if a slot is free, otherwise queues it.
+
+        Args:
+            task_id: 任务 ID
+            content_type: 内容类型（决定并发上限）
+            factory: 返回协程的无参函数，到达执行时才调用
+            priority: 优先级，数值越小越先执行
+
+        Returns:
+            QueueInfo，position=0 且 estimated_wait_seconds=0 表示已开始执行
+
+        Raises:
+            QueueFullError: 队列已满
+        """
+        self.check_capacity(content_type)
+        lane = self._lane(content_type)
+
+        job = _QueuedJob(priority=int(priority), seq=next(self._seq), task_id=task_id, factory=factory)
+        if len(lane.running) < lane.limit:
+            self._start(content_type, lane, job)
+            return QueueInfo(position=0, estimated_wait_seconds=0)
+
+        heapq.heappush(lane.heap, job)
+        info = self.queue_info(task_id)
+        logger.info(f"[Scheduler] {content_type} task {task_id} queued at position {info.position}")
+        return info
+
+    def _start(self, content_type: str, lane: _Lane, job: _QueuedJob) -> None:
+        started_at = time.monotonic()
+        task = asyncio.get_running_loop().create_task(job.factory())
+        lane.running[job.task_id] = task
+
+        def _on_done(t: asyncio.Task) -> None:
+            lane.running.pop(job.task_id, None)
+            if not t.cancelled():
+                lane.record_duration(time.monotonic() - started_at)
+                if t.exception() is not None:
+                    logger.error(f"[Scheduler] task {job.task_id} raised: {t.exception()}")
+            self._dispatch(content_type, lane)
+
+        task.add_done_callback(_on_done)
+
+    def _dispatch(self, content_type: str, lane: _Lane) -> None:
+        if self._lanes.get(content_type) is not lane:
+            return
+        while lane.heap and len(lane.running) < lane.limit:
+            self._start(content_type, lane, heapq.heappop(lane.heap))
+
+    def queue_info(self, task_id: str) -> Optional[QueueInfo]:
+        """Get queue position of a waiting task (None if not queued here)."""
+        for lane in self._lanes.values():
+            ordered = sorted(lane.heap)
+            for ahead, job in enumerate(ordered):
+                if job.task_id == task_id:
+                    return QueueInfo(position=ahead, estimated_wait_seconds=lane.estimate_wait(ahead))
+        return None
+
+    def cancel(self, task_id: str) -> bool:
+        """Remove a waiting job or cancel a running one."""
+        for lane in self._lanes.values():
+            for job in lane.heap:
+                if job.task_id == task_id:
+                    lane.heap.remove(job)
+                    heapq.heapify(lane.heap)
+                    return True
+            task = lane.running.get(task_id)
+            if task is not None:
+                task.cancel()
+                return True
+        return False
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per content type running/queued counts (for monitoring)."""
+        return {
+            content_type: {
+                "running": len(lane.running),
+                "queued": len(lane.heap),
+                "limit": lane.limit,
+                "avg_duration_seconds": round(lane.avg_duration, 1),
+            }
+            for content_type, lane in self._lanes.items()
+        }
+
+    async def shutdown(self) -> None:
+        """Drop queued jobs and cancel running ones."""
+        tasks = []
+        for lane in self._lanes.values():
+            lane.heap.clear()
+            tasks.extend(lane.running.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -7,6 +7,8 @@ from google import genai
 from google.genai import types
 
 from moana.config import get_settings
+from moana.services.executor import run_blocking
+from moana.services.llm import get_llm_memo
 
 logger = logging.getLogger(__name__)
 
@@ -65,29 +67,22 @@ class SmartPromptAnalyzer:
         Returns:
             AnalysisResult with extracted theme and enhanced prompt
         """
-        prompt = self.ANALYSIS_PROMPT.format(
-            custom_prompt=custom_prompt,
-            child_name=child_name,
-            age_months=age_months,
-            content_type=content_type,
-        )
-
         logger.info(f"Analyzing prompt: {custom_prompt[:50]}...")
 
         try:
-            response = self._client.models.generate_content(
+            data = await get_llm_memo("smart_analyze").get_or_compute(
+                inputs={
+                    "custom_prompt": custom_prompt,
+                    "child_name": child_name,
+                    "age_months": age_months,
+                    "content_type": content_type,
+                },
                 model=self._model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
+                compute=lambda: self._analyze_with_llm(
+                    custom_prompt, child_name, age_months, content_type
                 ),
             )
 
-            result_text = response.text.strip()
-            logger.debug(f"Analysis result: {result_text}")
-
-            data = json.loads(result_text)
-
             return AnalysisResult(
                 theme_category=data.get("theme_category", "other"),
                 theme_topic=data.get("theme_topic", custom_prompt[:20]),
@@ -106,3 +101,32 @@ class SmartPromptAnalyzer:
                 educational_goal="",
                 title=f"{child_name}的故事",
             )
+
+    async def _analyze_with_llm(
+        self,
+        custom_prompt: str,
+        child_name: str,
+        age_months: int,
+        content_type: str,
+    ) -> dict:
+        """调用 Gemini 分析，返回解析后的 JSON（失败时抛出异常，不进入缓存）."""
+        prompt = self.ANALYSIS_PROMPT.format(
+            custom_prompt=custom_prompt,
+            child_name=child_name,
+            age_months=age_months,
+            content_type=content_type,
+        )
+
+        response = await run_blocking(
+            self._client.models.generate_content,
+            model=self._model,
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json",
+            ),
+        )
+
+        result_text = response.text.strip()
+        logger.debug(f"Analysis result: {result_text}")
+
+        return json.loads(result_text)
@@ -12,7 +12,7 @@ Usage:
     result = await storage.upload_bytes(data, "image.jpg", "image/jpeg")
     print(result.url)
 """
-from moana.services.storage.base import StorageService, StorageResult
+from moana.services.storage.base import StorageService, StorageResult, StreamingUpload
 from moana.services.storage.local import LocalStorageService
 from moana.services.storage.oss import OSSStorageService
 from moana.services.storage.cleanup import OrphanFileCleanup, CleanupResult
@@ -58,6 +58,7 @@ def reset_storage_service() -> None:
 __all__ = [
     "StorageService",
     "StorageResult",
+    "StreamingUpload",
     "LocalStorageService",
     "OSSStorageService",
     "OrphanFileCleanup",
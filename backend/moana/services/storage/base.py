@@ -22,6 +22,58 @@ class StorageResult:
         }
 
 
+class StreamingUpload(ABC):
+    """Incremental upload opened with StorageService.open_stream.
+
+    write() 逐块写入；支持追加写入的后端在第一块落盘后即设置 url（可边写边播放），
+    complete() 结束写入并返回最终结果，失败时调用 abort() 清理已写入的部分。
+    """
+
+    def __init__(self, key: str, content_type: Optional[str] = None):
+        self.key = key
+        self.content_type = content_type
+        self.url: Optional[str] = None
+        self.bytes_written = 0
+
+    @abstractmethod
+    async def write(self, data: bytes) -> None:
+        """Append a chunk."""
+        pass
+
+    @abstractmethod
+    async def complete(self) -> StorageResult:
+        """Finish the upload."""
+        pass
+
+    @abstractmethod
+    async def abort(self) -> None:
+        """Discard whatever was written."""
+        pass
+
+
+class BufferedUpload(StreamingUpload):
+    """Fallback for backends without incremental writes: buffer, then upload_bytes."""
+
+    def __init__(self, storage: "StorageService", key: str, content_type: Optional[str] = None):
+        super().__init__(key, content_type)
+        self._storage = storage
+        self._buffer = bytearray()
+
+    async def write(self, data: bytes) -> None:
+        self._buffer += data
+        self.bytes_written += len(data)
+
+    async def complete(self) -> StorageResult:
+        result = await self._storage.upload_bytes(bytes(self._buffer), self.key, self.content_type)
+        self._buffer = bytearray()
+        if result.success:
+            self.key, self.url = result.key, result.url
+        return result
+
+    async def abort(self) -> None:
+        self._buffer = bytearray()
+
+
 class StorageService(ABC):
     """Abstract base class for storage services."""
 
@@ -111,3 +163,22 @@ class StorageService(ABC):
             True if exists, False otherwise
         """
         pass
+
+    async def open_stream(
+        self,
+        key: str,
+        content_type: Optional[str] = None,
+    ) -> StreamingUpload:
+        """Open an incremental upload.
+
+        默认实现在内存中缓冲，complete() 时一次性上传；本地存储与 OSS 覆盖为
+        真正的追加写入。
+
+        Args:
+            key: Storage key/path (must be unique; streamed objects are not content-hashed)
+            content_type: MIME type
+
+        Returns:
+            StreamingUpload handle
+        """
+        return BufferedUpload(self, key, content_type)
@@ -41,6 +41,7 @@ class CleanupResult:
     deleted_files: int = 0
     deleted_bytes: int = 0
     failed_deletions: int = 0
+    evicted_cache_entries: int = 0  # 淘汰的 TTS 缓存条目
     dry_run: bool = True
     duration_seconds: float = 0.0
     orphan_file_list: list[str] = field(default_factory=list)
@@ -55,6 +56,7 @@ class CleanupResult:
             "deleted_bytes": self.deleted_bytes,
             "deleted_mb": round(self.deleted_bytes / (1024 * 1024), 2),
             "failed_deletions": self.failed_deletions,
+            "evicted_cache_entries": self.evicted_cache_entries,
             "dry_run": self.dry_run,
             "duration_seconds": round(self.duration_seconds, 2),
             "orphan_file_list": self.orphan_file_list[:100],  # Limit to 100 for display
@@ -70,6 +72,7 @@ class OrphanFileCleanup:
         storage_path: Optional[str] = None,
         base_url: Optional[str] = None,
         min_age_hours: int = 24,
+        tts_cache_max_idle_days: Optional[int] = None,
     ):
         """Initialize cleanup service.
 
@@ -78,6 +81,8 @@ class OrphanFileCleanup:
             base_url: Base URL for files (from config if not specified)
             min_age_hours: Only consider files older than this many hours as orphans.
                           This prevents deleting files that are still being generated.
+            tts_cache_max_idle_days: TTS cache entries unused for this many days are
+                          evicted; their audio then counts as orphaned (from config if not specified)
         """
         settings = get_settings()
 
@@ -93,6 +98,11 @@ class OrphanFileCleanup:
         ).rstrip("/")
 
         self.min_age_hours = min_age_hours
+        self.tts_cache_max_idle_days = (
+            tts_cache_max_idle_days
+            if tts_cache_max_idle_days is not None
+            else settings.tts_cache_max_idle_days
+        )
         self.storage_service = LocalStorageService(
             storage_path=str(self.storage_path),
             base_url=self.base_url,
@@ -145,6 +155,17 @@ class OrphanFileCleanup:
                 if key:
                     referenced_keys.add(key)
 
+        # TTS 缓存条目引用的音频（已淘汰的条目在 scan_and_clean 中先行删除）
+        try:
+            from moana.services.tts.cache import cached_audio_urls
+
+            for url in await cached_audio_urls(self.tts_cache_max_idle_days):
+                key = self._url_to_key(url)
+                if key:
+                    referenced_keys.add(key)
+        except Exception as e:
+            logger.warning(f"Failed to read TTS cache references: {e}")
+
         return referenced_keys
 
     def _extract_urls_from_content_data(self, content_data: dict) -> set[str]:
@@ -192,6 +213,13 @@ class OrphanFileCleanup:
                             if key:
                                 keys.add(key)
 
+        # whole-book narration (picture_book)
+        narration = content_data.get("narration")
+        if isinstance(narration, dict) and narration.get("audio_url"):
+            key = self._url_to_key(narration["audio_url"])
+            if key:
+                keys.add(key)
+
         # all_tracks array (nursery_rhyme)
         all_tracks = content_data.get("all_tracks", [])
         if isinstance(all_tracks, list):
@@ -248,6 +276,18 @@ class OrphanFileCleanup:
         cutoff_time = datetime.now() - timedelta(hours=min_age)
 
         try:
+            # Step 0: Evict stale TTS cache entries (their audio becomes orphaned below)
+            try:
+                from moana.services.tts.cache import evict_stale_entries
+
+                evicted = await evict_stale_entries(self.tts_cache_max_idle_days, dry_run=dry_run)
+                result.evicted_cache_entries = len(evicted)
+                if evicted:
+                    logger.info(f"Evicted {len(evicted)} TTS cache entries unused for {self.tts_cache_max_idle_days}d")
+            except Exception as e:
+                logger.warning(f"TTS cache eviction failed: {e}")
+                result.errors.append(f"TTS cache eviction failed: {str(e)}")
+
             # Step 1: Get all referenced keys from database
             logger.info("Scanning database for referenced files...")
             referenced_keys = await self._get_referenced_keys_from_db()
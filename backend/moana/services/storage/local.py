@@ -6,6 +6,7 @@ Ideal for personal use, development, or single-server deployments.
 """
 import os
 import hashlib
+import uuid
 import aiofiles
 import aiofiles.os
 from pathlib import Path
@@ -13,7 +14,51 @@ from typing import Optional, BinaryIO
 from datetime import datetime
 
 from moana.config import get_settings
-from moana.services.storage.base import StorageService, StorageResult
+from moana.services.storage.base import StorageService, StorageResult, StreamingUpload
+
+
+class LocalStreamingUpload(StreamingUpload):
+    """Append chunks straight to the final file (served while still being written)."""
+
+    def __init__(self, full_path: Path, key: str, url: str, content_type: Optional[str] = None):
+        super().__init__(key, content_type)
+        self._full_path = full_path
+        self._public_url = url
+        self._file = None
+
+    async def write(self, data: bytes) -> None:
+        if not data:
+            return
+        if self._file is None:
+            self._full_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = await aiofiles.open(self._full_path, "wb")
+        await self._file.write(data)
+        await self._file.flush()
+        self.bytes_written += len(data)
+        self.url = self._public_url
+
+    async def _close(self) -> None:
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
+
+    async def complete(self) -> StorageResult:
+        try:
+            await self._close()
+        except Exception as e:
+            return StorageResult(success=False, error=f"Failed to save file: {str(e)}")
+        if not self.bytes_written:
+            return StorageResult(success=False, error="No data written")
+        return StorageResult(success=True, url=self._public_url, key=self.key)
+
+    async def abort(self) -> None:
+        try:
+            await self._close()
+            if self._full_path.exists():
+                await aiofiles.os.remove(self._full_path)
+        except Exception:
+            pass
+        self.url = None
 
 
 class LocalStorageService(StorageService):
@@ -189,6 +234,30 @@ class LocalStorageService(StorageService):
                 error=f"Failed to save file: {str(e)}",
             )
 
+    async def open_stream(
+        self,
+        key: str,
+        content_type: Optional[str] = None,
+    ) -> StreamingUpload:
+        """Open an incremental upload written directly to the final file.
+
+        数据未知时无法按内容哈希命名，扁平 key 使用 {category}/{date}/{name}_{uuid}.{ext}。
+        """
+        if "/" in key and not key.startswith("temp/"):
+            final_key = key
+        else:
+            stem = key.rsplit(".", 1)[0] if "." in key else key
+            final_key = (
+                f"{self._get_category(content_type)}/{self._get_date_path()}/"
+                f"{stem}_{uuid.uuid4().hex[:8]}.{self._get_extension(key, content_type)}"
+            )
+        return LocalStreamingUpload(
+            self._get_full_path(final_key),
+            final_key,
+            self._get_public_url(final_key),
+            content_type,
+        )
+
     async def download_file(self, key: str) -> Optional[bytes]:
         """Download a file from local storage."""
         try:
@@ -3,13 +3,72 @@ from typing import Optional, BinaryIO
 from io import BytesIO
 
 from moana.config import get_settings
-from moana.services.storage.base import StorageService, StorageResult
+from moana.services.executor import run_blocking
+from moana.services.storage.base import (
+    BufferedUpload,
+    StorageResult,
+    StorageService,
+    StreamingUpload,
+)
+
+
+class OSSAppendUpload(StreamingUpload):
+    """Upload to an OSS appendable object (readable while being appended).
+
+    第一块立即追加（尽快得到可播放 URL），之后累积到 min_part 字节再追加，
+    减少请求次数。
+    """
+
+    def __init__(self, service: "OSSStorageService", bucket, key: str, content_type: Optional[str] = None,
+                 min_part: int = 256 * 1024):
+        super().__init__(key, content_type)
+        self._service = service
+        self._bucket = bucket
+        self._buffer = bytearray()
+        self._position = 0
+        self._min_part = min_part
+
+    async def _append(self) -> None:
+        headers = {"Content-Type": self.content_type} if self.content_type and not self._position else None
+        data = bytes(self._buffer)
+        self._buffer = bytearray()
+        result = await run_blocking(self._bucket.append_object, self.key, self._position, data, headers=headers)
+        self._position = result.next_position
+        self.url = self._service._get_public_url(self.key)
+
+    async def write(self, data: bytes) -> None:
+        if not data:
+            return
+        self._buffer += data
+        self.bytes_written += len(data)
+        if not self._position or len(self._buffer) >= self._min_part:
+            await self._append()
+
+    async def complete(self) -> StorageResult:
+        try:
+            if self._buffer:
+                await self._append()
+        except Exception as e:
+            return StorageResult(success=False, error=str(e))
+        if not self.bytes_written:
+            return StorageResult(success=False, error="No data written")
+        return StorageResult(success=True, url=self._service._get_public_url(self.key), key=self.key)
+
+    async def abort(self) -> None:
+        self._buffer = bytearray()
+        if self._position:
+            try:
+                await run_blocking(self._bucket.delete_object, self.key)
+            except Exception:
+                pass
+        self.url = None
 
 
 class OSSStorageService(StorageService):
     """Aliyun OSS storage service.
 
-    Uses oss2 library for file operations.
+    Uses oss2 library for file operations. oss2 is synchronous, so network
+    calls run in the blocking executor instead of on the event loop.
     """
 
     def __init__(self):
@@ -63,7 +122,7 @@ class OSSStorageService(StorageService):
             if content_type:
                 headers["Content-Type"] = content_type
 
-            bucket.put_object(key, file, headers=headers or None)
+            await run_blocking(bucket.put_object, key, file, headers=headers or None)
             url = self._get_public_url(key)
 
             return StorageResult(
@@ -86,6 +145,18 @@ class OSSStorageService(StorageService):
         """Upload bytes to OSS."""
         return await self.upload_file(BytesIO(data), key, content_type)
 
+    async def open_stream(
+        self,
+        key: str,
+        content_type: Optional[str] = None,
+    ) -> StreamingUpload:
+        """Open an incremental upload as an OSS appendable object."""
+        bucket = self._get_bucket()
+        if bucket is None:
+            # 未配置时走缓冲上传，complete() 返回与 upload_bytes 相同的错误
+            return BufferedUpload(self, key, content_type)
+        return OSSAppendUpload(self, bucket, key, content_type)
+
     async def download_file(self, key: str) -> Optional[bytes]:
         """Download a file from OSS."""
         bucket = self._get_bucket()
@@ -93,8 +164,7 @@ class OSSStorageService(StorageService):
             return None
 
         try:
-            result = bucket.get_object(key)
-            return result.read()
+            return await run_blocking(lambda: bucket.get_object(key).read())
         except Exception:
             return None
 
@@ -105,7 +175,7 @@ class OSSStorageService(StorageService):
             return False
 
         try:
-            bucket.delete_object(key)
+            await run_blocking(bucket.delete_object, key)
             return True
         except Exception:
             return False
@@ -129,6 +199,6 @@ class OSSStorageService(StorageService):
             return False
 
         try:
-            return bucket.object_exists(key)
+            return await run_blocking(bucket.object_exists, key)
         except Exception:
             return False
@@ -0,0 +1,92 @@
+# src/moana/services/task_state/__init__.py
+"""Async generation task state stores.
+
+Supports multiple backends:
+- memory: In-process dict (single worker / development)
+- sql: task_states table in the main database
+- redis: Any Redis-protocol server (recommended for multi-worker deployments)
+
+Usage:
+    from moana.services.task_state import get_task_state_store
+
+    store = get_task_state_store("content")
+    await store.set(task_id, {"status": "pending", "progress": 0})
+    await store.update(task_id, progress=30, stage="image_1")
+"""
+from moana.services.task_state.base import TaskStateStore, TERMINAL_STATUSES
+from moana.services.task_state.memory import MemoryTaskStateStore
+from moana.services.task_state.sql import SqlTaskStateStore
+from moana.services.task_state.redis import (
+    RedisTaskStateStore,
+    RedisProtocolClient,
+    RedisProtocolError,
+)
+from moana.services.task_state.reporter import TaskProgressReporter
+from moana.services.task_state.events import (
+    notify_task_event,
+    wait_for_task_state,
+    wait_task_event,
+)
+
+# Cached store instances per namespace
+_stores: dict[str, TaskStateStore] = {}
+
+
+def get_task_state_store(namespace: str) -> TaskStateStore:
+    """Get the configured task state store for a namespace.
+
+    Returns the appropriate store based on TASK_STATE_BACKEND config:
+    - "memory": MemoryTaskStateStore (default)
+    - "sql": SqlTaskStateStore
+    - "redis": RedisTaskStateStore
+
+    Instances are cached per namespace.
+    """
+    if namespace in _stores:
+        return _stores[namespace]
+
+    from moana.config import get_settings
+
+    settings = get_settings()
+    backend = settings.task_state_backend.lower()
+    ttl_kwargs = {
+        "finished_ttl": settings.task_state_finished_ttl,
+        "active_ttl": settings.task_state_active_ttl,
+    }
+
+    if backend == "sql":
+        store: TaskStateStore = SqlTaskStateStore(namespace, **ttl_kwargs)
+    elif backend == "redis":
+        store = RedisTaskStateStore(
+            namespace,
+            url=settings.task_state_redis_url,
+            max_connections=settings.task_state_redis_pool_size,
+            **ttl_kwargs,
+        )
+    else:
+        store = MemoryTaskStateStore(namespace, **ttl_kwargs)
+
+    _stores[namespace] = store
+    return store
+
+
+def reset_task_state_stores() -> None:
+    """Reset cached stores (useful for testing)."""
+    _stores.clear()
+
+
+__all__ = [
+    "TaskStateStore",
+    "TERMINAL_STATUSES",
+    "MemoryTaskStateStore",
+    "SqlTaskStateStore",
+    "RedisTaskStateStore",
+    "RedisProtocolClient",
+    "RedisProtocolError",
+    "TaskProgressReporter",
+    "notify_task_event",
+    "wait_task_event",
+    "wait_for_task_state",
+    "get_task_state_store",
+    "reset_task_state_stores",
+]
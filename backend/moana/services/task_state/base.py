@@ -0,0 +1,164 @@
+# src/moana/services/task_state/base.py
+"""Task state store base class.
+
+异步生成任务（绘本/儿歌/视频）的状态存储抽象。多 worker 部署时各进程
+共享同一个后端，状态查询不再依赖落在同一进程上。
+"""
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from moana.services.task_state.events import notify_task_event
+
+# 终态：进入终态后使用较短的 finished_ttl，到期后被淘汰
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+
+class TaskStateStore(ABC):
+    """Abstract base class for task state backends.
+
+    每条状态是一个 JSON 可序列化的 dict，按 (namespace, task_id) 存储。
+    所有后端都遵循相同的语义：
+
+    - set: 整体覆盖状态
+    - update: 原子地合并字段；非终态下 progress 只增不减
+    - 终态任务保留 finished_ttl 秒，未完成任务保留 active_ttl 秒（防止进程崩溃后残留）
+    - incr / counter: 与状态独立的计数器（如每日请求额度），一次往返原子自增
+    """
+
+    # 每写入多少次顺带清理一次过期状态（对不支持原生 TTL 的后端）
+    SWEEP_EVERY = 100
+
+    def __init__(
+        self,
+        namespace: str,
+        finished_ttl: int = 3600,
+        active_ttl: int = 6 * 3600,
+    ):
+        self.namespace = namespace
+        self.finished_ttl = finished_ttl
+        self.active_ttl = active_ttl
+        self._writes = 0
+
+    def _ttl_for(self, state: dict[str, Any]) -> int:
+        """根据任务状态选择 TTL."""
+        if state.get("status") in TERMINAL_STATUSES:
+            return self.finished_ttl
+        return self.active_ttl
+
+    def _merge(self, current: dict[str, Any], fields: dict[str, Any]) -> dict[str, Any]:
+        """合并字段到当前状态.
+
+        进度回调可能乱序到达（多个并发子任务各自上报），因此任务仍在
+        进行中时 progress 不会回退；状态切换（如 failed 置 0）不受限制。
+        终态只能通过显式修改 status 改变，迟到的进度上报会被忽略。
+        """
+        if current.get("status") in TERMINAL_STATUSES and "status" not in fields:
+            return current
+        merged = {**current, **fields}
+        status_changed = "status" in fields and fields["status"] != current.get("status")
+        if (
+            not status_changed
+            and current.get("status") not in TERMINAL_STATUSES
+            and isinstance(fields.get("progress"), (int, float))
+            and isinstance(current.get("progress"), (int, float))
+            and fields["progress"] < current["progress"]
+        ):
+            merged["progress"] = current["progress"]
+        merged["updated_at"] = time.time()
+        return merged
+
+    def _stamp(self, state: dict[str, Any]) -> dict[str, Any]:
+        """为整体写入的状态补充 updated_at (epoch 秒)."""
+        return {**state, "updated_at": time.time()}
+
+    def _notify(self, task_id: str) -> None:
+        """通知本进程内等待该任务的推送协程."""
+        notify_task_event(self.namespace, task_id)
+
+    def _should_sweep(self) -> bool:
+        """写入计数，达到阈值时返回 True."""
+        self._writes += 1
+        return self._writes % self.SWEEP_EVERY == 0
+
+    @abstractmethod
+    async def get(self, task_id: str) -> Optional[dict[str, Any]]:
+        """Get task state, or None if missing/expired."""
+        pass
+
+    @abstractmethod
+    async def set(
+        self,
+        task_id: str,
+        state: dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> None:
+        """Replace task state.
+
+        Args:
+            task_id: Task identifier
+            state: Full state dict (JSON serializable)
+            ttl: Override TTL in seconds (defaults by status)
+        """
+        pass
+
+    @abstractmethod
+    async def add(
+        self,
+        task_id: str,
+        state: dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> bool:
+        """Atomically create state only if no live state exists (SETNX).
+
+        Returns:
+            True if created, False if a live state already exists
+        """
+        pass
+
+    @abstractmethod
+    async def update(self, task_id: str, **fields: Any) -> Optional[dict[str, Any]]:
+        """Atomically merge fields into an existing task state.
+
+        Returns:
+            Merged state, or None if the task does not exist
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, task_id: str) -> bool:
+        """Delete task state. Returns True if it existed."""
+        pass
+
+    @abstractmethod
+    async def list_states(self, limit: int = 50) -> list[dict[str, Any]]:
+        """List live task states, most recently updated first."""
+        pass
+
+    @abstractmethod
+    async def evict_expired(self) -> int:
+        """Remove expired states. Returns number of evicted entries."""
+        pass
+
+    @abstractmethod
+    async def incr(self, key: str, limit: int = 0, ttl: Optional[int] = None) -> Optional[int]:
+        """Atomically increment a counter, refusing to go past limit.
+
+        Args:
+            key: Counter key (independent of task states)
+            limit: Maximum value, 0 means unlimited
+            ttl: Expiry in seconds, set when the counter is created
+
+        Returns:
+            New value, or None if the counter already reached limit
+        """
+        pass
+
+    @abstractmethod
+    async def counter(self, key: str) -> int:
+        """Current counter value (0 if missing/expired)."""
+        pass
+
+    async def close(self) -> None:
+        """Release backend resources."""
+        pass
@@ -0,0 +1,70 @@
+# src/moana/services/task_state/events.py
+"""In-process task change notifications.
+
+状态存储每次写入后调用 notify_task_event；SSE / WebSocket 推送协程通过
+wait_task_event 被立即唤醒。其它 worker 写入的变化无法在本进程内通知，
+推送协程会以较短的间隔回读存储兜底（wait_for_task_state 封装了这一模式）。
+"""
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from moana.services.task_state.base import TaskStateStore
+
+# 每个等待者持有自己的 Event：某个等待者超时离开不会影响同一任务的其他等待者
+_waiters: dict[tuple[str, str], set[asyncio.Event]] = {}
+
+
+def notify_task_event(namespace: str, task_id: str) -> None:
+    """Wake all coroutines waiting on this task."""
+    for event in _waiters.pop((namespace, task_id), ()):
+        event.set()
+
+
+async def wait_task_event(namespace: str, task_id: str, timeout: float) -> bool:
+    """Wait until the task changes or timeout expires.
+
+    Returns:
+        True if woken by a change, False on timeout
+    """
+    key = (namespace, task_id)
+    event = asyncio.Event()
+    waiters = _waiters.setdefault(key, set())
+    waiters.add(event)
+    try:
+        await asyncio.wait_for(event.wait(), timeout=timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        # 最后一个等待者离开时清理，避免积累
+        waiters.discard(event)
+        if not waiters and _waiters.get(key) is waiters:
+            del _waiters[key]
+
+
+async def wait_for_task_state(
+    store: "TaskStateStore",
+    task_id: str,
+    predicate: Callable[[dict[str, Any]], bool],
+    timeout: float,
+    recheck: float = 2.0,
+) -> Optional[dict[str, Any]]:
+    """Wait until the stored state of a task satisfies predicate.
+
+    本进程内的写入立即唤醒；其它 worker 的写入（sql / redis 后端共享）
+    通过每 recheck 秒回读存储发现，因此可以跨 worker 使用。
+
+    Returns:
+        满足条件的状态，超时返回 None
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        state = await store.get(task_id)
+        if state is not None and predicate(state):
+            return state
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return None
+        await wait_task_event(store.namespace, task_id, timeout=min(recheck, remaining))
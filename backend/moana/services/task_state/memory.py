@@ -0,0 +1,106 @@
+# src/moana/services/task_state/memory.py
+"""In-process task state store.
+
+仅适用于单 worker 开发环境；多 worker 部署请使用 sql 或 redis 后端。
+"""
+import time
+from typing import Any, Optional
+
+from moana.services.task_state.base import TaskStateStore
+
+
+class MemoryTaskStateStore(TaskStateStore):
+    """Dict-backed task state store with TTL eviction.
+
+    所有操作在事件循环内同步完成，天然是原子的。
+    """
+
+    def __init__(self, namespace: str, **kwargs: Any):
+        super().__init__(namespace, **kwargs)
+        # task_id -> (state, expires_at)
+        self._entries: dict[str, tuple[dict[str, Any], float]] = {}
+        # key -> (value, expires_at)
+        self._counters: dict[str, tuple[int, float]] = {}
+
+    def _live(self, task_id: str) -> Optional[dict[str, Any]]:
+        entry = self._entries.get(task_id)
+        if entry is None:
+            return None
+        state, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[task_id]
+            return None
+        return state
+
+    def _write(self, task_id: str, state: dict[str, Any], ttl: int) -> None:
+        self._entries[task_id] = (state, time.time() + ttl)
+        if self._should_sweep():
+            self._sweep()
+
+    def _sweep(self) -> int:
+        now = time.time()
+        expired = [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        return len(expired)
+
+    async def get(self, task_id: str) -> Optional[dict[str, Any]]:
+        state = self._live(task_id)
+        return dict(state) if state is not None else None
+
+    async def set(
+        self,
+        task_id: str,
+        state: dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> None:
+        state = self._stamp(state)
+        self._write(task_id, state, ttl or self._ttl_for(state))
+        self._notify(task_id)
+
+    async def add(
+        self,
+        task_id: str,
+        state: dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> bool:
+        if self._live(task_id) is not None:
+            return False
+        await self.set(task_id, state, ttl)
+        return True
+
+    async def update(self, task_id: str, **fields: Any) -> Optional[dict[str, Any]]:
+        current = self._live(task_id)
+        if current is None:
+            return None
+        merged = self._merge(current, fields)
+        self._write(task_id, merged, self._ttl_for(merged))
+        self._notify(task_id)
+        return dict(merged)
+
+    async def delete(self, task_id: str) -> bool:
+        return self._entries.pop(task_id, None) is not None
+
+    async def list_states(self, limit: int = 50) -> list[dict[str, Any]]:
+        self._sweep()
+        states = [dict(state) for state, _ in self._entries.values()]
+        states.sort(key=lambda s: s.get("updated_at", 0), reverse=True)
+        return states[:limit]
+
+    async def evict_expired(self) -> int:
+        return self._sweep()
+
+    async def incr(self, key: str, limit: int = 0, ttl: Optional[int] = None) -> Optional[int]:
+        value = await self.counter(key)
+        if limit and value >= limit:
+            return None
+        expires_at = self._counters[key][1] if value else time.time() + (ttl or self.active_ttl)
+        self._counters[key] = (value + 1, expires_at)
+        return value + 1
+
+    async def counter(self, key: str) -> int:
+        entry = self._counters.get(key)
+        if entry is None or entry[1] <= time.time():
+            self._counters.pop(key, None)
+            return 0
+        return entry[0]
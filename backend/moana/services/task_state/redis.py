@@ -0,0 +1,276 @@
+# src/moana/services/task_state/redis.py
+"""Redis-protocol task state store.
+
+直接实现 RESP 协议的最小客户端（不依赖 redis-py），兼容 Redis / KeyDB /
+Dragonfly 等实现了 RESP 的服务。状态以 JSON 字符串存储，过期交给服务端
+原生 TTL 处理；update 使用 WATCH/MULTI/EXEC 乐观事务保证原子合并。
+"""
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import urlparse
+
+from moana.services.task_state.base import TaskStateStore
+
+logger = logging.getLogger(__name__)
+
+
+class RedisProtocolError(Exception):
+    """Error reply (-ERR ...) returned by the server."""
+    pass
+
+
+class RespConnection:
+    """Single RESP connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+
+    @staticmethod
+    def _encode(args: tuple[Any, ...]) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(f"${len(data)}\r\n".encode())
+            parts.append(data + b"\r\n")
+        return b"".join(parts)
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        prefix, payload = line[:1], line[1:-2]
+
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise RedisProtocolError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2].decode()
+        if prefix == b"*":
+            count = int(payload)
+            if count < 0:
+                return None
+            return [await self._read_reply() for _ in range(count)]
+        raise RedisProtocolError(f"Unknown reply prefix: {prefix!r}")
+
+    async def execute(self, *args: Any) -> Any:
+        """Send one command and read its reply."""
+        self._writer.write(self._encode(args))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    def abort(self) -> None:
+        """Close without waiting (safe while being cancelled)."""
+        self._writer.close()
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except Exception:
+            pass
+
+
+class RedisProtocolClient:
+    """Minimal async client with a small pool of lazily opened connections.
+
+    每条命令（或 connection() 内的整个 WATCH/MULTI/EXEC）独占一条连接，
+    最多 max_connections 条并发；正常归还的连接复用，出现任何异常
+    （包括取消、超时）时连接的协议状态不可信，直接关闭丢弃。
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        timeout: float = 5.0,
+        max_connections: int = 8,
+    ):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.max_connections = max(1, max_connections)
+        self._idle: list[RespConnection] = []
+        self._slots = asyncio.Semaphore(self.max_connections)
+
+    async def _connect(self) -> RespConnection:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port),
+            timeout=self.timeout,
+        )
+        conn = RespConnection(reader, writer)
+        try:
+            if self.password:
+                await conn.execute("AUTH", self.password)
+            if self.db:
+                await conn.execute("SELECT", self.db)
+        except BaseException:
+            conn.abort()
+            raise
+        return conn
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[RespConnection]:
+        """Acquire one pooled connection exclusively."""
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else await self._connect()
+            try:
+                yield conn
+            except BaseException:
+                # 可能停在半条回复或未结束的事务中，丢弃而不是放回连接池
+                conn.abort()
+                raise
+            self._idle.append(conn)
+
+    async def execute(self, *args: Any) -> Any:
+        async with self.connection() as conn:
+            return await asyncio.wait_for(conn.execute(*args), timeout=self.timeout)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await conn.close()
+
+
+class RedisTaskStateStore(TaskStateStore):
+    """Task state store speaking the Redis protocol."""
+
+    KEY_PREFIX = "moana:task"
+    COUNTER_PREFIX = "moana:counter"
+    MAX_UPDATE_RETRIES = 10
+
+    def __init__(
+        self,
+        namespace: str,
+        url: str = "redis://localhost:6379/0",
+        client: Optional[RedisProtocolClient] = None,
+        max_connections: int = 8,
+        **kwargs: Any,
+    ):
+        super().__init__(namespace, **kwargs)
+        self._client = client or RedisProtocolClient(url, max_connections=max_connections)
+
+    def _key(self, task_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{self.namespace}:{task_id}"
+
+    async def get(self, task_id: str) -> Optional[dict[str, Any]]:
+        raw = await self._client.execute("GET", self._key(task_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def set(
+        self,
+        task_id: str,
+        state: dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> None:
+        state = self._stamp(state)
+        await self._client.execute(
+            "SET", self._key(task_id),
+            json.dumps(state, ensure_ascii=False),
+            "EX", ttl or self._ttl_for(state),
+        )
+        self._notify(task_id)
+
+    async def add(
+        self,
+        task_id: str,
+        state: dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> bool:
+        state = self._stamp(state)
+        reply = await self._client.execute(
+            "SET", self._key(task_id),
+            json.dumps(state, ensure_ascii=False),
+            "EX", ttl or self._ttl_for(state),
+            "NX",
+        )
+        if reply is None:
+            return False
+        self._notify(task_id)
+        return True
+
+    async def update(self, task_id: str, **fields: Any) -> Optional[dict[str, Any]]:
+        key = self._key(task_id)
+
+        for _ in range(self.MAX_UPDATE_RETRIES):
+            async with self._client.connection() as conn:
+                await conn.execute("WATCH", key)
+                raw = await conn.execute("GET", key)
+                if raw is None:
+                    await conn.execute("UNWATCH")
+                    return None
+
+                merged = self._merge(json.loads(raw), fields)
+                await conn.execute("MULTI")
+                await conn.execute(
+                    "SET", key,
+                    json.dumps(merged, ensure_ascii=False),
+                    "EX", self._ttl_for(merged),
+                )
+                # 被其它 worker 抢先修改时 EXEC 返回 nil，重试
+                if await conn.execute("EXEC") is not None:
+                    self._notify(task_id)
+                    return merged
+
+        logger.warning(f"Task state update for {key} gave up after contention")
+        return None
+
+    async def delete(self, task_id: str) -> bool:
+        return bool(await self._client.execute("DEL", self._key(task_id)))
+
+    async def list_states(self, limit: int = 50) -> list[dict[str, Any]]:
+        pattern = f"{self.KEY_PREFIX}:{self.namespace}:*"
+        keys: list[str] = []
+        cursor = "0"
+        while True:
+            cursor, batch = await self._client.execute(
+                "SCAN", cursor, "MATCH", pattern, "COUNT", 200
+            )
+            keys.extend(batch)
+            if cursor == "0":
+                break
+
+        if not keys:
+            return []
+        values = await self._client.execute("MGET", *keys)
+        states = [json.loads(v) for v in values if v is not None]
+        states.sort(key=lambda s: s.get("updated_at", 0), reverse=True)
+        return states[:limit]
+
+    async def evict_expired(self) -> int:
+        # 服务端原生 TTL 负责淘汰
+        return 0
+
+    def _counter_key(self, key: str) -> str:
+        return f"{self.COUNTER_PREFIX}:{self.namespace}:{key}"
+
+    async def incr(self, key: str, limit: int = 0, ttl: Optional[int] = None) -> Optional[int]:
+        counter_key = self._counter_key(key)
+        # 先以 NX 带 TTL 创建计数器再自增：过期时间随创建原子写入，
+        # 即使自增后连接中断，计数器也不会成为永不过期的键
+        await self._client.execute("SET", counter_key, 0, "EX", ttl or self.active_ttl, "NX")
+        value = await self._client.execute("INCR", counter_key)
+        if limit and value > limit:
+            # 超出上限：撤销本次自增（并发超发的请求各自撤销，不会多放行）
+            await self._client.execute("DECR", counter_key)
+            return None
+        return value
+
+    async def counter(self, key: str) -> int:
+        raw = await self._client.execute("GET", self._counter_key(key))
+        return int(raw) if raw is not None else 0
+
+    async def close(self) -> None:
+        await self._client.close()
@@ -0,0 +1,46 @@
+# src/moana/services/task_state/reporter.py
+"""Bridge synchronous pipeline progress callbacks to the async store."""
+import asyncio
+import logging
+from typing import Any, Optional
+
+from moana.services.task_state.base import TaskStateStore
+
+logger = logging.getLogger(__name__)
+
+
+class TaskProgressReporter:
+    """同步进度回调 -> 异步状态存储.
+
+    Pipeline 的 on_progress 是同步回调，而状态存储是异步的。report() 只把
+    字段合并进待写缓冲并确保有一个写入协程在运行；同一任务的写入按顺序
+    串行执行，积压时自动合并为一次 update，避免高频回调压垮后端。
+    """
+
+    def __init__(self, store: TaskStateStore, task_id: str):
+        self._store = store
+        self._task_id = task_id
+        self._pending: dict[str, Any] = {}
+        # 持有写入任务的强引用，防止被 GC 回收
+        self._flusher: Optional[asyncio.Task] = None
+
+    def report(self, **fields: Any) -> None:
+        """Queue fields for the next update (non-blocking)."""
+        self._pending.update(fields)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while self._pending:
+            fields, self._pending = self._pending, {}
+            try:
+                await self._store.update(self._task_id, **fields)
+            except Exception as e:
+                logger.warning(f"Failed to update task state {self._task_id}: {e}")
+
+    async def flush(self) -> None:
+        """Wait until all queued fields are written."""
+        if self._flusher is not None:
+            await self._flusher
+        if self._pending:
+            await self._drain()
@@ -0,0 +1,209 @@
+# src/moana/services/task_state/sql.py
+"""SQL-backed task state store.
+
+使用 task_states 表（PostgreSQL / SQLite），多 worker 共享同一数据库即可。
+update 在事务内 SELECT ... FOR UPDATE 后合并，保证并发写入不丢字段。
+"""
+import time
+from typing import Any, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from moana.models.task_state import TaskState
+from moana.services.task_state.base import TaskStateStore
+
+
+class SqlTaskStateStore(TaskStateStore):
+    """Task state store backed by the task_states table."""
+
+    def __init__(
+        self,
+        namespace: str,
+        session_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(namespace, **kwargs)
+        self._session_factory = session_factory
+
+    def _sessions(self) -> async_sessionmaker[AsyncSession]:
+        if self._session_factory is None:
+            from moana.database import get_session_factory
+
+            self._session_factory = get_session_factory()
+        return self._session_factory
+
+    def _key(self, task_id: str) -> tuple[str, str]:
+        return (self.namespace, task_id)
+
+    async def get(self, task_id: str) -> Optional[dict[str, Any]]:
+        async with self._sessions()() as db:
+            row = await db.get(TaskState, self._key(task_id))
+            if row is None or row.expires_at <= time.time():
+                return None
+            return dict(row.state)
+
+    async def set(
+        self,
+        task_id: str,
+        state: dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> None:
+        state = self._stamp(state)
+        expires_at = time.time() + (ttl or self._ttl_for(state))
+
+        # 两个 worker 同时插入同一 task_id 时，后到者改为更新
+        for _ in range(2):
+            async with self._sessions()() as db:
+                row = await db.get(TaskState, self._key(task_id))
+                if row is None:
+                    db.add(TaskState(
+                        namespace=self.namespace,
+                        task_id=task_id,
+                        state=state,
+                        expires_at=expires_at,
+                    ))
+                else:
+                    row.state = state
+                    row.expires_at = expires_at
+                try:
+                    await db.commit()
+                    break
+                except IntegrityError:
+                    await db.rollback()
+
+        self._notify(task_id)
+        if self._should_sweep():
+            await self.evict_expired()
+
+    async def add(
+        self,
+        task_id: str,
+        state: dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> bool:
+        state = self._stamp(state)
+        expires_at = time.time() + (ttl or self._ttl_for(state))
+
+        async with self._sessions()() as db:
+            row = await db.get(TaskState, self._key(task_id), with_for_update=True)
+            if row is not None and row.expires_at > time.time():
+                return False
+            if row is None:
+                db.add(TaskState(
+                    namespace=self.namespace,
+                    task_id=task_id,
+                    state=state,
+                    expires_at=expires_at,
+                ))
+            else:
+                # 已过期的旧记录直接接管
+                row.state = state
+                row.expires_at = expires_at
+            try:
+                await db.commit()
+            except IntegrityError:
+                # 并发插入，对方先成功
+                await db.rollback()
+                return False
+
+        self._notify(task_id)
+        return True
+
+    async def update(self, task_id: str, **fields: Any) -> Optional[dict[str, Any]]:
+        async with self._sessions()() as db:
+            result = await db.execute(
+                select(TaskState)
+                .where(
+                    TaskState.namespace == self.namespace,
+                    TaskState.task_id == task_id,
+                )
+                .with_for_update()
+            )
+            row = result.scalar_one_or_none()
+            if row is None or row.expires_at <= time.time():
+                return None
+
+            merged = self._merge(dict(row.state), fields)
+            # 赋值新 dict，确保 JSON 列被标记为已修改
+            row.state = merged
+            row.expires_at = time.time() + self._ttl_for(merged)
+            await db.commit()
+
+        self._notify(task_id)
+        if self._should_sweep():
+            await self.evict_expired()
+        return dict(merged)
+
+    async def delete(self, task_id: str) -> bool:
+        async with self._sessions()() as db:
+            result = await db.execute(
+                delete(TaskState).where(
+                    TaskState.namespace == self.namespace,
+                    TaskState.task_id == task_id,
+                )
+            )
+            await db.commit()
+            return result.rowcount > 0
+
+    async def list_states(self, limit: int = 50) -> list[dict[str, Any]]:
+        async with self._sessions()() as db:
+            result = await db.execute(
+                select(TaskState.state)
+                .where(
+                    TaskState.namespace == self.namespace,
+                    TaskState.expires_at > time.time(),
+                )
+                .order_by(TaskState.updated_at.desc())
+                .limit(limit)
+            )
+            states = [dict(state) for state in result.scalars().all()]
+        states.sort(key=lambda s: s.get("updated_at", 0), reverse=True)
+        return states[:limit]
+
+    async def incr(self, key: str, limit: int = 0, ttl: Optional[int] = None) -> Optional[int]:
+        # 计数器作为 {"count": n} 状态行存放，在一个事务内锁行自增
+        counter_id = f"counter:{key}"
+        for _ in range(2):
+            async with self._sessions()() as db:
+                row = await db.get(TaskState, self._key(counter_id), with_for_update=True)
+                now = time.time()
+                live = row is not None and row.expires_at > now
+                value = int(row.state.get("count", 0)) if live else 0
+                if limit and value >= limit:
+                    return None
+                state = {"count": value + 1, "updated_at": now}
+                if row is None:
+                    db.add(TaskState(
+                        namespace=self.namespace,
+                        task_id=counter_id,
+                        state=state,
+                        expires_at=now + (ttl or self.active_ttl),
+                    ))
+                else:
+                    row.state = state
+                    if not live:
+                        row.expires_at = now + (ttl or self.active_ttl)
+                try:
+                    await db.commit()
+                    return value + 1
+                except IntegrityError:
+                    # 并发创建同一计数器，重试时按已存在的行自增
+                    await db.rollback()
+        return None
+
+    async def counter(self, key: str) -> int:
+        state = await self.get(f"counter:{key}")
+        return int(state.get("count", 0)) if state else 0
+
+    async def evict_expired(self) -> int:
+        async with self._sessions()() as db:
+            result = await db.execute(
+                delete(TaskState).where(
+                    TaskState.namespace == self.namespace,
+                    TaskState.expires_at <= time.time(),
+                )
+            )
+            await db.commit()
+            return result.rowcount
@@ -23,4 +23,22 @@ def get_tts_service() -> BaseTTSService:
         raise ValueError(f"Unknown TTS provider: {provider}")
 
 
-__all__ = ["BaseTTSService", "TTSResult", "Voice", "FishSpeechService", "get_tts_service"]
+def get_cached_tts_service() -> BaseTTSService:
+    """TTS service with the content-addressed audio cache (TTS_CACHE_ENABLED)."""
+    settings = get_settings()
+    service = get_tts_service()
+    if not settings.tts_cache_enabled:
+        return service
+
+    from moana.services.tts.cache import CachedTTSService
+    return CachedTTSService(service, provider=settings.tts_provider)
+
+
+__all__ = [
+    "BaseTTSService",
+    "TTSResult",
+    "Voice",
+    "FishSpeechService",
+    "get_tts_service",
+    "get_cached_tts_service",
+]
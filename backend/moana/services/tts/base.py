@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
 
 
 @dataclass
@@ -24,6 +25,9 @@ class TTSResult:
 class BaseTTSService(ABC):
     """Abstract base class for TTS services."""
 
+    # TTSResult.duration 是估算值（如按字数）而非实际音频时长
+    duration_is_estimate: bool = False
+
     @abstractmethod
     async def synthesize(
         self,
@@ -34,6 +38,23 @@ class BaseTTSService(ABC):
         """Synthesize speech from text."""
         pass
 
+    async def synthesize_streaming(
+        self,
+        text: str,
+        voice_id: str | None = None,
+        speed: float = 1.0,
+        on_audio_url: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> TTSResult:
+        """Synthesize speech, reporting a playable URL as early as possible.
+
+        默认实现在合成完成后回调；支持流式写入存储的 provider 覆盖此方法，
+        在第一块音频落盘后立即回调 on_audio_url。
+        """
+        result = await self.synthesize(text=text, voice_id=voice_id, speed=speed)
+        if on_audio_url:
+            await on_audio_url(result.audio_url)
+        return result
+
     @abstractmethod
     async def list_voices(self, language: str = "zh") -> list[Voice]:
         """List available voices."""
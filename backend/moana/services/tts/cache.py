@@ -0,0 +1,310 @@
+# src/moana/services/tts/cache.py
+"""Content-addressed TTS audio cache.
+
+问候语、互动提问、预设主题里的重复句子在不同绘本中反复出现，每次都重新合成、
+重新上传。CachedTTSService 包装任意 TTS provider（Gemini / Qwen / MiniMax /
+FishSpeech）：
+- 键：sha256(provider, model, voice_id, speed, 规范化文本)
+- 值：已上传音频的 URL 与时长，持久化在 tts_cache 表；provider 只返回估算
+  时长时（duration_is_estimate，如 Qwen）写入前先用 ffmpeg 测量实际时长
+- 同一进程内相同键的并发请求只合成一次（single-flight，跨实例共享）
+- 淘汰：OrphanFileCleanup 删除长期未命中的条目，其音频随后作为孤儿文件清理；
+  仍有效的条目引用的文件不会被清理
+"""
+import asyncio
+import dataclasses
+import hashlib
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from moana.models.tts_cache import TTSCacheEntry
+from moana.services.audio import AudioConverter
+from moana.services.tts.base import BaseTTSService, TTSResult, Voice
+from moana.services.tts.narration import fetch_audio
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """去首尾空白并合并连续空白（不改变标点，标点影响停顿）."""
+    return _WHITESPACE.sub(" ", text.strip())
+
+
+def tts_cache_key(text: str, voice_id: str, speed: float, provider: str, model: str) -> str:
+    payload = "\n".join([provider, model, voice_id, f"{speed:.2f}", normalize_text(text)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCacheStats:
+    """Process-wide hit / miss counters."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # 与进行中的相同请求合并
+        self.errors = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "errors": self.errors,
+        }
+
+
+_stats = TTSCacheStats()
+
+# 进行中的合成（按缓存键），get_cached_tts_service 每次创建的包装实例共享
+_inflight: dict[str, asyncio.Future] = {}
+
+
+class CachedTTSService(BaseTTSService):
+    """TTS service wrapper that reuses previously synthesized audio."""
+
+    def __init__(
+        self,
+        inner: BaseTTSService,
+        provider: str,
+        session_factory: Optional[async_sessionmaker] = None,
+    ):
+        """Initialize cache wrapper.
+
+        Args:
+            inner: 实际的 TTS 服务
+            provider: provider 名称（缓存键的一部分）
+            session_factory: 数据库会话工厂（默认使用主库）
+        """
+        self._inner = inner
+        self._provider = provider
+        self._session_factory = session_factory
+
+    def __getattr__(self, name: str) -> Any:
+        # model_name / get_voice_options 等 provider 特有属性直接转发
+        if name == "_inner":
+            raise AttributeError(name)
+        return getattr(self._inner, name)
+
+    @property
+    def inner(self) -> BaseTTSService:
+        return self._inner
+
+    @property
+    def model(self) -> str:
+        model = getattr(self._inner, "model_name", None) or getattr(self._inner, "_model", None)
+        return model if isinstance(model, str) else ""
+
+    @property
+    def session_factory(self) -> async_sessionmaker:
+        if self._session_factory is None:
+            from moana.database import async_session_factory
+
+            self._session_factory = async_session_factory
+        return self._session_factory
+
+    async def _lookup(self, key: str) -> Optional[TTSResult]:
+        async with self.session_factory() as db:
+            entry = await db.get(TTSCacheEntry, key)
+            if entry is None:
+                return None
+            await db.execute(
+                update(TTSCacheEntry)
+                .where(TTSCacheEntry.cache_key == key)
+                .values(hit_count=TTSCacheEntry.hit_count + 1, last_used_at=func.now())
+            )
+            await db.commit()
+            return TTSResult(
+                audio_url=entry.audio_url,
+                duration=entry.duration,
+                voice_id=entry.voice_id,
+                model=entry.model,
+            )
+
+    async def _store(self, key: str, text: str, speed: float, result: TTSResult) -> None:
+        async with self.session_factory() as db:
+            db.add(TTSCacheEntry(
+                cache_key=key,
+                provider=self._provider,
+                model=result.model or self.model,
+                voice_id=result.voice_id or "",
+                speed=speed,
+                text=normalize_text(text),
+                audio_url=result.audio_url,
+                duration=result.duration,
+            ))
+            try:
+                await db.commit()
+            except IntegrityError:
+                # 其他 worker 已写入相同键
+                await db.rollback()
+
+    async def _cached(
+        self,
+        text: str,
+        voice_id: str | None,
+        speed: float,
+        synthesize: Callable[[], Awaitable[TTSResult]],
+    ) -> tuple[TTSResult, bool]:
+        """Return (result, from_cache)."""
+        key = tts_cache_key(text, voice_id or "", speed, self._provider, self.model)
+
+        inflight = _inflight.get(key)
+        if inflight is not None:
+            _stats.coalesced += 1
+            return await asyncio.shield(inflight), True
+
+        # 先登记进行中的请求（包括数据库查询），相同键的并发请求等待同一结果
+        future = asyncio.get_running_loop().create_future()
+        _inflight[key] = future
+        try:
+            try:
+                cached = await self._lookup(key)
+            except Exception as e:
+                _stats.errors += 1
+                logger.warning(f"[TTSCache] lookup failed: {e}")
+                cached = None
+            if cached is not None:
+                _stats.hits += 1
+                future.set_result(cached)
+                return cached, True
+
+            _stats.misses += 1
+            result = await synthesize()
+            measured = result
+            if getattr(self._inner, "duration_is_estimate", False) is True:
+                measured = await self._measure(result)
+            future.set_result(measured or result)
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e if isinstance(e, Exception) else RuntimeError("TTS cancelled"))
+                future.exception()  # 无人等待时不报 "exception was never retrieved"
+            raise
+        finally:
+            _inflight.pop(key, None)
+
+        if measured is None:
+            # 没有可信的时长，不缓存估算值
+            return result, False
+        try:
+            await self._store(key, text, speed, measured)
+        except Exception as e:
+            _stats.errors += 1
+            logger.warning(f"[TTSCache] store failed: {e}")
+        return measured, False
+
+    async def _measure(self, result: TTSResult) -> Optional[TTSResult]:
+        """Replace an estimated duration with the measured one (None if it cannot be measured)."""
+        try:
+            duration = await AudioConverter.probe_duration(await fetch_audio(result.audio_url))
+        except Exception as e:
+            _stats.errors += 1
+            logger.warning(f"[TTSCache] duration probe failed: {e}")
+            return None
+        if duration <= 0:
+            return None
+        return dataclasses.replace(result, duration=round(duration, 3))
+
+    async def synthesize(
+        self,
+        text: str,
+        voice_id: str | None = None,
+        speed: float = 1.0,
+    ) -> TTSResult:
+        result, _ = await self._cached(
+            text, voice_id, speed,
+            lambda: self._inner.synthesize(text=text, voice_id=voice_id, speed=speed),
+        )
+        return result
+
+    async def synthesize_streaming(
+        self,
+        text: str,
+        voice_id: str | None = None,
+        speed: float = 1.0,
+        on_audio_url: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> TTSResult:
+        result, from_cache = await self._cached(
+            text, voice_id, speed,
+            lambda: self._inner.synthesize_streaming(
+                text=text, voice_id=voice_id, speed=speed, on_audio_url=on_audio_url,
+            ),
+        )
+        if from_cache and on_audio_url:
+            await on_audio_url(result.audio_url)
+        return result
+
+    async def list_voices(self, language: str = "zh") -> list[Voice]:
+        return await self._inner.list_voices(language)
+
+    async def clone_voice(self, audio_url: str, name: str) -> Voice:
+        return await self._inner.clone_voice(audio_url, name)
+
+
+async def evict_stale_entries(
+    max_idle_days: int,
+    dry_run: bool = True,
+    session_factory: Optional[async_sessionmaker] = None,
+) -> list[str]:
+    """Drop cache entries not used for max_idle_days; returns their audio URLs.
+
+    由存储清理调用：被淘汰条目的音频若不再被内容引用，会在同一次清理中删除。
+    """
+    if session_factory is None:
+        from moana.database import async_session_factory as session_factory
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_idle_days)
+    async with session_factory() as db:
+        urls = list((await db.execute(
+            select(TTSCacheEntry.audio_url).where(TTSCacheEntry.last_used_at < cutoff)
+        )).scalars())
+        if urls and not dry_run:
+            await db.execute(delete(TTSCacheEntry).where(TTSCacheEntry.last_used_at < cutoff))
+            await db.commit()
+    return urls
+
+
+async def cached_audio_urls(
+    max_idle_days: int,
+    session_factory: Optional[async_sessionmaker] = None,
+) -> list[str]:
+    """Audio URLs of entries still within max_idle_days (kept by storage cleanup)."""
+    if session_factory is None:
+        from moana.database import async_session_factory as session_factory
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_idle_days)
+    async with session_factory() as db:
+        return list((await db.execute(
+            select(TTSCacheEntry.audio_url).where(TTSCacheEntry.last_used_at >= cutoff)
+        )).scalars())
+
+
+async def tts_cache_stats(session_factory: Optional[async_sessionmaker] = None) -> dict[str, Any]:
+    """Process hit rate plus persisted entry / lifetime hit counts."""
+    stats = _stats.to_dict()
+    if session_factory is None:
+        from moana.database import async_session_factory as session_factory
+    try:
+        async with session_factory() as db:
+            entries, total_hits = (await db.execute(
+                select(func.count(), func.coalesce(func.sum(TTSCacheEntry.hit_count), 0))
+            )).one()
+        stats.update(entries=entries, lifetime_hits=int(total_hits))
+    except Exception as e:
+        logger.warning(f"[TTSCache] stats query failed: {e}")
+    return stats
+
+
+def reset_tts_cache_stats() -> None:
+    """Reset hit / miss counters (tests)."""
+    global _stats
+    _stats = TTSCacheStats()
@@ -1,8 +1,9 @@
-import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from moana.config import get_settings
 from moana.services.tts.base import BaseTTSService, TTSResult, Voice
+from moana.services.ratelimit import provider_limited
+from moana.services.http import http_client
 
 
 class FishSpeechService(BaseTTSService):
@@ -19,6 +20,7 @@ class FishSpeechService(BaseTTSService):
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
     )
+    @provider_limited("tts")
     async def synthesize(
         self,
         text: str,
@@ -28,7 +30,7 @@ class FishSpeechService(BaseTTSService):
         """Synthesize speech using Fish Speech API."""
         voice = voice_id or self.DEFAULT_VOICE
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with http_client("fish_speech", timeout=60.0) as client:
             response = await client.post(
                 f"{self._api_base}/v1/tts",
                 headers={
@@ -54,7 +56,7 @@ class FishSpeechService(BaseTTSService):
 
     async def list_voices(self, language: str = "zh") -> list[Voice]:
         """List available voices."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client("fish_speech", timeout=30.0) as client:
             response = await client.get(
                 f"{self._api_base}/v1/voices",
                 headers={"Authorization": f"Bearer {self._api_key}"},
@@ -80,7 +82,7 @@ class FishSpeechService(BaseTTSService):
         name: str,
     ) -> Voice:
         """Clone a voice from audio sample (15-30 seconds)."""
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with http_client("fish_speech", timeout=120.0) as client:
             response = await client.post(
                 f"{self._api_base}/v1/voices/clone",
                 headers={
@@ -3,7 +3,6 @@
 使用 Gemini 2.5 Flash TTS 模型生成语音。
 文档: https://ai.google.dev/gemini-api/docs/speech-generation
 """
-import asyncio
 import hashlib
 import io
 import logging
@@ -15,7 +14,9 @@ from google.genai import types
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from moana.config import get_settings
+from moana.services.executor import run_blocking
 from moana.services.tts.base import BaseTTSService, TTSResult, Voice
+from moana.services.ratelimit import provider_limited
 from moana.services.storage import get_storage_service
 from moana.services.audio import AudioConverter
 
@@ -107,6 +108,7 @@ class GeminiTTSService(BaseTTSService):
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
     )
+    @provider_limited("tts")
     async def synthesize(
         self,
         text: str,
@@ -136,9 +138,7 @@ class GeminiTTSService(BaseTTSService):
         # 使用明确的 TTS 指令格式，避免模型尝试生成文本回复
         tts_prompt = f"Read aloud the following text exactly as written, do not add any commentary: {text}"
 
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
+        response = await run_blocking(
             lambda: self._client.models.generate_content(
                 model=self._model,
                 contents=tts_prompt,
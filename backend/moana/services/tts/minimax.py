@@ -2,11 +2,12 @@
 """MiniMax TTS 语音合成服务."""
 import base64
 
-import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from moana.config import get_settings
 from moana.services.tts.base import BaseTTSService, TTSResult, Voice
+from moana.services.ratelimit import provider_limited
+from moana.services.http import http_client
 
 
 class MiniMaxTTSService(BaseTTSService):
@@ -39,6 +40,7 @@ class MiniMaxTTSService(BaseTTSService):
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
     )
+    @provider_limited("tts")
     async def synthesize(
         self,
         text: str,
@@ -57,7 +59,7 @@ class MiniMaxTTSService(BaseTTSService):
         """
         voice = voice_id or self.DEFAULT_VOICE
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with http_client("minimax", timeout=120.0) as client:
             response = await client.post(
                 f"{self._api_base}/v1/t2a_v2",
                 headers={
@@ -124,7 +126,7 @@ class MiniMaxTTSService(BaseTTSService):
 
         MiniMax 支持快速声音克隆，价格 9.9元/个。
         """
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with http_client("minimax", timeout=120.0) as client:
             response = await client.post(
                 f"{self._api_base}/v1/voice_clone",
                 headers={
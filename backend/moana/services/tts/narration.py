@@ -0,0 +1,170 @@
+# src/moana/services/tts/narration.py
+"""Whole-book narration: one TTS request, split locally into page clips.
+
+逐页合成时一本 8~12 页的绘本要发起 8~12 次 TTS 请求（每次都有请求延迟并占用 QPS），
+播放器还要分别下载每页音频。整本朗读模式：
+- 用页间分隔符把所有页面文字拼成一段，一次合成
+- ffmpeg silencedetect 找出静音段，按各页文字长度估计的边界挑选切点
+- 切分为每页 AAC 片段（兼容现有按页播放），同时保留整段音频与
+  页码 -> 起止时间的 cue 表，播放器只需下载一个文件
+静音段不足以切出所有页面时抛出 NarrationSplitError，由调用方退回逐页合成。
+"""
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from moana.services.audio import AudioConverter
+from moana.services.storage import get_storage_service
+from moana.services.tts.base import BaseTTSService, TTSResult
+
+logger = logging.getLogger(__name__)
+
+# 页间分隔符：空行 + 省略号，TTS 会读出明显长于句间停顿的静音
+PAGE_SEPARATOR = "\n\n……\n\n"
+
+
+class NarrationSplitError(Exception):
+    """The narration could not be split into one clip per page."""
+
+
+@dataclass
+class BookNarration:
+    """Concatenated narration plus its per-page clips."""
+    audio_url: str
+    duration: float
+    cues: list[dict[str, Any]] = field(default_factory=list)  # [{page_num, start, end}]
+    pages: list[TTSResult] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Narration stored in content_data["narration"]."""
+        return {"audio_url": self.audio_url, "duration": self.duration, "cues": self.cues}
+
+
+def page_cuts(
+    silences: list[tuple[float, float]],
+    text_lengths: list[int],
+    duration: float,
+) -> Optional[list[float]]:
+    """Pick one silence per page boundary; returns the cut offsets (seconds).
+
+    边界期望位置按文字长度比例估算；在所有递增的静音组合中选择离期望位置最近、
+    且静音尽量长的一组（分隔符的停顿比句间停顿长）。切点取静音中点，
+    相邻两页各保留一半停顿。静音数量不足时返回 None。
+    """
+    needed = len(text_lengths) - 1
+    if needed <= 0:
+        return []
+    candidates = [(start, end) for start, end in silences if 0 < start and end < duration]
+    if len(candidates) < needed or duration <= 0:
+        return None
+
+    total_chars = sum(text_lengths) or 1
+    expected, chars = [], 0
+    for length in text_lengths[:-1]:
+        chars += length
+        expected.append(duration * chars / total_chars)
+    longest = max(end - start for start, end in candidates)
+
+    def cost(boundary: int, candidate: int) -> float:
+        start, end = candidates[candidate]
+        distance = abs((start + end) / 2 - expected[boundary]) / duration
+        return distance - 0.5 * (end - start) / longest
+
+    # best[k][j]: 前 k+1 个边界、第 k 个边界落在 candidates[j] 的最小代价
+    inf = float("inf")
+    count = len(candidates)
+    best = [[inf] * count for _ in range(needed)]
+    previous = [[-1] * count for _ in range(needed)]
+    for j in range(count):
+        best[0][j] = cost(0, j)
+    for k in range(1, needed):
+        running, running_index = inf, -1
+        for j in range(count):
+            if j > 0 and best[k - 1][j - 1] < running:
+                running, running_index = best[k - 1][j - 1], j - 1
+            if running_index >= 0:
+                best[k][j] = running + cost(k, j)
+                previous[k][j] = running_index
+
+    j = min(range(count), key=lambda index: best[needed - 1][index])
+    chosen = []
+    for k in range(needed - 1, -1, -1):
+        chosen.append(j)
+        j = previous[k][j]
+    return [sum(candidates[index]) / 2 for index in reversed(chosen)]
+
+
+async def fetch_audio(url: str) -> bytes:
+    """Read synthesized audio back (local storage directly, otherwise over HTTP)."""
+    storage = get_storage_service()
+    base_url = getattr(storage, "base_url", None)
+    if base_url and url.startswith(base_url):
+        data = await storage.download_file(url[len(base_url):].lstrip("/"))
+        if data is not None:
+            return data
+
+    from moana.services.http import http_client
+
+    async with http_client("storage", timeout=60.0) as client:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.content
+
+
+async def narrate_book(
+    tts: BaseTTSService,
+    texts: list[str],
+    voice_id: str | None = None,
+    speed: float = 1.0,
+    noise_db: float = -35.0,
+    min_silence: float = 0.5,
+) -> BookNarration:
+    """Synthesize all pages in one request and split them into page clips.
+
+    Args:
+        tts: TTS 服务
+        texts: 每页文字
+        voice_id: 音色
+        speed: 语速
+        noise_db: 低于该音量视为静音
+        min_silence: 可作为页间切点的最短静音（秒）
+
+    Raises:
+        NarrationSplitError: 无法为每页找到切点
+    """
+    result = await tts.synthesize(text=PAGE_SEPARATOR.join(texts), voice_id=voice_id, speed=speed)
+    audio = await fetch_audio(result.audio_url)
+
+    silences, duration = await AudioConverter.detect_silences(audio, noise_db, min_silence)
+    cuts = page_cuts(silences, [len(t) for t in texts], duration)
+    if cuts is None:
+        raise NarrationSplitError(
+            f"found {len(silences)} silences for {len(texts)} pages in {duration:.1f}s narration"
+        )
+
+    clips = await AudioConverter.split(audio, cuts)
+    bounds = [0.0, *cuts, duration]
+    storage = get_storage_service()
+    digest = hashlib.md5(result.audio_url.encode()).hexdigest()[:12]
+
+    cues, pages = [], []
+    for index, clip in enumerate(clips):
+        upload = await storage.upload_bytes(
+            data=clip,
+            key=f"tts_{digest}_p{index + 1}.m4a",
+            content_type="audio/mp4",
+        )
+        if not upload.success:
+            raise RuntimeError(f"Failed to save page audio: {upload.error}")
+        start, end = bounds[index], bounds[index + 1]
+        cues.append({"page_num": index + 1, "start": round(start, 3), "end": round(end, 3)})
+        pages.append(TTSResult(
+            audio_url=upload.url,
+            duration=round(end - start, 3),
+            voice_id=result.voice_id,
+            model=result.model,
+        ))
+
+    logger.info(f"[Narration] {len(texts)} pages narrated in one request ({duration:.1f}s)")
+    return BookNarration(audio_url=result.audio_url, duration=round(duration, 3), cues=cues, pages=pages)
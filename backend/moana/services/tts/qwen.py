@@ -2,24 +2,65 @@
 """阿里云 Qwen TTS 语音合成服务.
 
 使用 WebSocket API (qwen3-tts-flash-realtime) 支持完整音色列表。
+已配置音色的会话放入连接池（见 session_pool），同一音色的后续页面直接复用，
+省去每页的建连与 session.update 握手。
 API 文档: https://help.aliyun.com/zh/model-studio/qwen-tts-realtime
 
-生成的音频会自动保存到本地存储（kids.jackverse.cn），
+生成的音频边合成边写入本地存储（kids.jackverse.cn），
 避免微信小程序的合法域名限制问题。
 """
 import asyncio
 import base64
 import hashlib
 import json
+import logging
 import uuid
+from typing import Awaitable, Callable, Optional
 
 import websockets
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from moana.config import get_settings
 from moana.services.tts.base import BaseTTSService, TTSResult, Voice
+from moana.services.ratelimit import provider_limited
+from moana.services.ratelimit.adaptive import get_provider_limiter
 from moana.services.storage import get_storage_service
+from moana.services.tts.session_pool import RealtimeSession, RealtimeSessionPool
 
+logger = logging.getLogger(__name__)
+
+# Process-wide pool of configured realtime sessions
+_session_pool: RealtimeSessionPool | None = None
+
+
+def get_qwen_session_pool() -> RealtimeSessionPool:
+    """Get the realtime session pool (idle size follows the Qwen TTS concurrency limit)."""
+    global _session_pool
+    if _session_pool is None:
+        settings = get_settings()
+        service = QwenTTSService()
+
+        def max_idle() -> int:
+            if not settings.qwen_tts_pool_enabled:
+                return 0
+            return get_provider_limiter("tts", QwenTTSService.__name__, service._model).limit
+
+        _session_pool = RealtimeSessionPool(
+            connect=service._open_session,
+            max_idle=max_idle,
+            max_age=settings.qwen_tts_session_max_age,
+            idle_timeout=settings.qwen_tts_session_idle_timeout,
+            max_uses=settings.qwen_tts_session_max_uses,
+        )
+    return _session_pool
+
+
+async def close_qwen_session_pool() -> None:
+    """Close idle realtime sessions (shutdown / tests)."""
+    global _session_pool
+    if _session_pool is not None:
+        await _session_pool.close()
+        _session_pool = None
 
 class QwenTTSService(BaseTTSService):
     """Qwen3-TTS-Flash-Realtime 语音合成服务.
@@ -27,6 +68,9 @@ class QwenTTSService(BaseTTSService):
     使用 WebSocket API 支持 40+ 音色。
     """
 
+    # 实时接口不返回时长，synthesize 按字数估算
+    duration_is_estimate = True
+
     # 预设音色列表 - 仅包含实际测试验证可用的音色
     # 注意：阿里云文档列出的音色与实际 API 支持的不一致，以下为 2024-12 验证可用的音色
     VOICES = {
@@ -67,26 +111,51 @@ class QwenTTSService(BaseTTSService):
         self._api_key = settings.dashscope_api_key
         self._model = "qwen3-tts-flash-realtime"
 
+    async def synthesize(
+        self,
+        text: str,
+        voice_id: str | None = None,
+        speed: float = 1.0,
+    ) -> TTSResult:
+        """合成语音.
+
+        Args:
+            text: 要合成的文本
+            voice_id: 音色 ID，默认使用 Cherry（适合儿童内容）
+            speed: 语速，0.5-2.0
+
+        Returns:
+            TTSResult 包含音频 URL 和元数据
+            音频会自动保存到本地存储，返回本地 URL
+        """
+        return await self.synthesize_streaming(text=text, voice_id=voice_id, speed=speed)
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
     )
-    async def synthesize(
+    @provider_limited("tts")
+    async def synthesize_streaming(
         self,
         text: str,
         voice_id: str | None = None,
         speed: float = 1.0,
+        on_audio_url: Optional[Callable[[str], Awaitable[None]]] = None,
     ) -> TTSResult:
-        """合成语音.
+        """合成语音，音频块到达即写入存储.
+
+        每个 response.audio.delta 解码后直接追加到存储（不在内存中累积整段音频），
+        第一块落盘后立即回调 on_audio_url，调用方可提前拿到可播放 URL。
+        失败时删除已写入的部分文件。
 
         Args:
             text: 要合成的文本
             voice_id: 音色 ID，默认使用 Cherry（适合儿童内容）
             speed: 语速，0.5-2.0
+            on_audio_url: 第一块音频落盘后的回调（参数为音频 URL）
 
         Returns:
             TTSResult 包含音频 URL 和元数据
-            音频会自动保存到本地存储，返回本地 URL
         """
         # 验证音色是否支持，不支持则 fallback 到默认音色
         voice = voice_id or self.DEFAULT_VOICE
@@ -96,145 +165,158 @@ class QwenTTSService(BaseTTSService):
 
         task_id = str(uuid.uuid4())
 
-        # 收集音频数据
-        audio_chunks = []
-
-        try:
-            async with websockets.connect(
-                self.WS_ENDPOINT,
-                additional_headers={"Authorization": f"Bearer {self._api_key}"},
-                ping_interval=20,
-                ping_timeout=60,
-                close_timeout=10,
-            ) as ws:
-                # 1. 等待 session.created
-                response = await asyncio.wait_for(ws.recv(), timeout=10)
-                msg = json.loads(response)
-                if msg.get("type") != "session.created":
-                    raise ValueError(f"Expected session.created, got: {msg}")
-
-                # 2. 发送 session.update 配置
-                session_update = {
-                    "type": "session.update",
-                    "session": {
-                        "mode": "server_commit",
-                        "voice": voice,
-                        "language_type": "Auto",
-                        "response_format": "mp3",
-                        "sample_rate": 24000,
-                    }
-                }
-                await ws.send(json.dumps(session_update))
-
-                # 3. 等待 session.updated 确认
-                response = await asyncio.wait_for(ws.recv(), timeout=10)
-                msg = json.loads(response)
-                if msg.get("type") == "error":
-                    raise ValueError(f"Session update failed: {msg.get('error', {}).get('message', 'Unknown error')}")
-
-                # 4. 发送文本
-                text_event = {
-                    "type": "input_text_buffer.append",
-                    "text": text,
-                }
-                await ws.send(json.dumps(text_event))
+        # 流式写入存储（文件名带任务 ID，避免同一文本的并发合成互相覆盖）
+        text_hash = hashlib.md5(text.encode()).hexdigest()[:12]
+        upload = await get_storage_service().open_stream(
+            key=f"tts_{text_hash}_{task_id[:8]}.mp3",
+            content_type="audio/mpeg",
+        )
 
-                # 5. 发送提交信号
-                commit_event = {
-                    "type": "input_text_buffer.commit",
-                }
-                await ws.send(json.dumps(commit_event))
+        async def write_chunk(chunk: bytes) -> None:
+            announced = upload.url is not None
+            await upload.write(chunk)
+            if on_audio_url and not announced and upload.url:
+                try:
+                    await on_audio_url(upload.url)
+                except Exception as e:
+                    logger.warning(f"[TTS] on_audio_url callback failed: {e}")
 
-                # 6. 接收音频数据
-                while True:
+        try:
+            for attempt in range(2):
+                async with get_qwen_session_pool().session(self._model, voice) as session:
+                    reused = session.uses > 0
                     try:
-                        response = await asyncio.wait_for(ws.recv(), timeout=60)
-                        msg = json.loads(response)
-                        msg_type = msg.get("type")
-
-                        if msg_type == "response.audio.delta":
-                            # 音频数据块
-                            audio_base64 = msg.get("delta", "")
-                            if audio_base64:
-                                audio_chunks.append(base64.b64decode(audio_base64))
-
-                        elif msg_type == "response.audio.done":
-                            # 音频生成完成
-                            pass
-
-                        elif msg_type == "response.done":
-                            # 响应完成，发送 session.finish
-                            finish_event = {"type": "session.finish"}
-                            await ws.send(json.dumps(finish_event))
-
-                        elif msg_type == "session.finished":
-                            # 会话结束
-                            break
-
-                        elif msg_type == "error":
-                            error_msg = msg.get("error", {}).get("message", "Unknown error")
-                            raise ValueError(f"TTS error: {error_msg}")
-
-                    except asyncio.TimeoutError:
-                        print(f"[TTS Warning] Timeout waiting for response, collected {len(audio_chunks)} chunks")
-                        break
+                        await self._run_response(session, text, write_chunk)
+                    except websockets.exceptions.ConnectionClosed:
+                        # 复用的会话可能已被服务端关闭：未收到音频时换新会话重试一次
+                        if reused and not upload.bytes_written and attempt == 0:
+                            session.reusable = False
+                            logger.info("[TTS] Pooled realtime session was closed, reconnecting")
+                            continue
+                        raise
+                break
+
+            if not upload.bytes_written:
+                raise ValueError("No audio data received")
+
+            result = await upload.complete()
+            if not result.success:
+                raise ValueError(f"Failed to save audio to local storage: {result.error}")
 
         except websockets.exceptions.WebSocketException as e:
+            await upload.abort()
             print(f"[TTS Error] WebSocket error: {e}")
             raise ValueError(f"WebSocket connection failed: {e}")
-
-        if not audio_chunks:
-            raise ValueError("No audio data received")
-
-        # 合并音频数据
-        audio_data = b"".join(audio_chunks)
-
-        # 保存到本地存储
-        local_audio_url = await self._save_to_local_storage(
-            audio_data=audio_data,
-            text=text,
-        )
+        except BaseException:
+            await upload.abort()
+            raise
 
         # 估算时长（基于文本长度，约每秒5个字）
         estimated_duration = len(text) / 5.0
 
         return TTSResult(
-            audio_url=local_audio_url,
+            audio_url=result.url,
             duration=estimated_duration,
             voice_id=voice,
             model=self._model,
         )
 
-    async def _save_to_local_storage(
+    async def _open_session(self, model: str, voice: str):
+        """建立 WebSocket 并完成会话配置（session.created -> session.update -> session.updated）."""
+        ws = await websockets.connect(
+            self.WS_ENDPOINT,
+            additional_headers={"Authorization": f"Bearer {self._api_key}"},
+            ping_interval=20,
+            ping_timeout=60,
+            close_timeout=10,
+        )
+        try:
+            # 1. 等待 session.created
+            response = await asyncio.wait_for(ws.recv(), timeout=10)
+            msg = json.loads(response)
+            if msg.get("type") != "session.created":
+                raise ValueError(f"Expected session.created, got: {msg}")
+
+            # 2. 发送 session.update 配置
+            session_update = {
+                "type": "session.update",
+                "session": {
+                    "mode": "server_commit",
+                    "voice": voice,
+                    "language_type": "Auto",
+                    "response_format": "mp3",
+                    "sample_rate": 24000,
+                }
+            }
+            await ws.send(json.dumps(session_update))
+
+            # 3. 等待 session.updated 确认
+            response = await asyncio.wait_for(ws.recv(), timeout=10)
+            msg = json.loads(response)
+            if msg.get("type") == "error":
+                raise ValueError(f"Session update failed: {msg.get('error', {}).get('message', 'Unknown error')}")
+        except BaseException:
+            await ws.close()
+            raise
+        return ws
+
+    async def _run_response(
         self,
-        audio_data: bytes,
+        session: RealtimeSession,
         text: str,
-    ) -> str:
-        """保存音频到本地存储.
-
-        Args:
-            audio_data: 音频二进制数据
-            text: 原始文本（用于生成唯一文件名）
+        on_chunk: Callable[[bytes], Awaitable[None]],
+    ) -> None:
+        """在已配置的会话上合成一段文本.
 
-        Returns:
-            本地存储 URL (https://kids.jackverse.cn/media/audio/...)
+        收到 response.done 即结束，会话保持打开以便复用（不发送 session.finish）。
         """
-        # 生成唯一的文件名（基于文本内容的哈希）
-        text_hash = hashlib.md5(text.encode()).hexdigest()[:12]
-        filename = f"tts_{text_hash}.mp3"
-
-        # 上传到本地存储
-        storage = get_storage_service()
-        result = await storage.upload_bytes(
-            data=audio_data,
-            key=filename,
-            content_type="audio/mpeg",
-        )
-
-        if not result.success:
-            raise ValueError(f"Failed to save audio to local storage: {result.error}")
-
-        return result.url
+        ws = session.ws
+
+        # 4. 发送文本
+        text_event = {
+            "type": "input_text_buffer.append",
+            "text": text,
+        }
+        await ws.send(json.dumps(text_event))
+
+        # 5. 发送提交信号
+        commit_event = {
+            "type": "input_text_buffer.commit",
+        }
+        await ws.send(json.dumps(commit_event))
+
+        # 6. 接收音频数据，逐块写入存储
+        chunks = 0
+        while True:
+            try:
+                response = await asyncio.wait_for(ws.recv(), timeout=60)
+            except asyncio.TimeoutError:
+                # 会话状态未知，不再复用
+                session.reusable = False
+                print(f"[TTS Warning] Timeout waiting for response, collected {chunks} chunks")
+                return
+
+            msg = json.loads(response)
+            msg_type = msg.get("type")
+
+            if msg_type == "response.audio.delta":
+                # 音频数据块
+                audio_base64 = msg.get("delta", "")
+                if audio_base64:
+                    await on_chunk(base64.b64decode(audio_base64))
+                    chunks += 1
+
+            elif msg_type == "response.done":
+                # 响应完成，会话归还连接池
+                return
+
+            elif msg_type == "session.finished":
+                session.reusable = False
+                return
+
+            elif msg_type == "error":
+                error_msg = msg.get("error", {}).get("message", "Unknown error")
+                raise ValueError(f"TTS error: {error_msg}")
 
     async def list_voices(self, language: str = "zh") -> list[Voice]:
         """列出可用音色."""
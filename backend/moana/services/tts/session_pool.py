@@ -0,0 +1,155 @@
+# src/moana/services/tts/session_pool.py
+"""Pool of warm realtime TTS WebSocket sessions.
+
+Qwen realtime TTS 每次合成都要建立 WebSocket、等待 session.created、发送
+session.update 再等待确认，一本绘本 10~12 页就要重复十几次握手。
+RealtimeSessionPool 按 (model, voice) 缓存已配置好的会话：
+- checkout：取一个健康的空闲会话，没有则新建（并发总量已由 provider 限流器控制）
+- 健康检查：连接未关闭、未超过最大存活时间 / 空闲时间 / 使用次数
+- checkin：合成成功后归还；出错的会话直接关闭，不再复用
+- 每个 key 的空闲会话数不超过 provider 当前并发上限，多余的关闭
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RealtimeSession:
+    """One configured realtime connection."""
+    ws: Any
+    model: str
+    voice: str
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    uses: int = 0
+    reusable: bool = True  # 调用方发现会话状态未知（如超时）时置为 False
+
+    @property
+    def is_open(self) -> bool:
+        return getattr(self.ws, "close_code", None) is None
+
+
+class RealtimeSessionPool:
+    """Checkout / checkin pool of realtime sessions keyed by (model, voice)."""
+
+    def __init__(
+        self,
+        connect: Callable[[str, str], Awaitable[Any]],
+        max_idle: Union[int, Callable[[], int]] = 2,
+        max_age: float = 600.0,
+        idle_timeout: float = 45.0,
+        max_uses: int = 100,
+    ):
+        """Initialize pool.
+
+        Args:
+            connect: (model, voice) -> 已完成 session.update 的 WebSocket
+            max_idle: 每个 key 的最大空闲会话数（可传入函数，按 provider 当前并发上限动态计算）
+            max_age: 会话最长存活时间（秒）
+            idle_timeout: 空闲超过该时间的会话不再复用（服务端可能已断开）
+            max_uses: 单个会话最多合成次数
+        """
+        self._connect = connect
+        self._max_idle = max_idle
+        self.max_age = max_age
+        self.idle_timeout = idle_timeout
+        self.max_uses = max_uses
+        self._idle: dict[tuple[str, str], list[RealtimeSession]] = {}
+        self._in_use = 0
+        self._closing: set[asyncio.Task] = set()
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    @property
+    def max_idle(self) -> int:
+        value = self._max_idle() if callable(self._max_idle) else self._max_idle
+        return max(0, value)
+
+    def healthy(self, session: RealtimeSession) -> bool:
+        now = time.monotonic()
+        return (
+            session.is_open
+            and now - session.created_at < self.max_age
+            and now - session.last_used < self.idle_timeout
+            and session.uses < self.max_uses
+        )
+
+    def _close(self, session: RealtimeSession) -> None:
+        """Close in the background (close handshake must not delay the caller)."""
+        self.discarded += 1
+
+        async def close() -> None:
+            try:
+                await session.ws.close()
+            except Exception:
+                pass
+
+        try:
+            task = asyncio.get_running_loop().create_task(close())
+        except RuntimeError:
+            return
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def checkout(self, model: str, voice: str) -> RealtimeSession:
+        idle = self._idle.get((model, voice), [])
+        while idle:
+            session = idle.pop()
+            if self.healthy(session):
+                self.reused += 1
+                self._in_use += 1
+                return session
+            self._close(session)
+
+        ws = await self._connect(model, voice)
+        self.created += 1
+        self._in_use += 1
+        return RealtimeSession(ws=ws, model=model, voice=voice)
+
+    def checkin(self, session: RealtimeSession, reusable: bool = True) -> None:
+        self._in_use -= 1
+        session.uses += 1
+        session.last_used = time.monotonic()
+        idle = self._idle.setdefault((session.model, session.voice), [])
+        if not (reusable and session.reusable) or not self.healthy(session) or len(idle) >= self.max_idle:
+            self._close(session)
+            return
+        idle.append(session)
+
+    @asynccontextmanager
+    async def session(self, model: str, voice: str) -> AsyncIterator[RealtimeSession]:
+        """Check out a session; it is returned on success and closed on error."""
+        session = await self.checkout(model, voice)
+        try:
+            yield session
+        except BaseException:
+            self.checkin(session, reusable=False)
+            raise
+        else:
+            self.checkin(session)
+
+    async def close(self) -> None:
+        """Close all idle sessions."""
+        for idle in self._idle.values():
+            for session in idle:
+                self._close(session)
+        self._idle.clear()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_idle": self.max_idle,
+            "idle": {f"{model}:{voice}": len(idle) for (model, voice), idle in self._idle.items()},
+            "in_use": self._in_use,
+            "created": self.created,
+            "reused": self.reused,
+            "discarded": self.discarded,
+        }
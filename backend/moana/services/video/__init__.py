@@ -1,14 +1,9 @@
 # src/moana/services/video/__init__.py
 from moana.config import get_settings
-
 from moana.services.video.base import BaseVideoService, VideoResult
 
 
-def get_video_service() -> BaseVideoService:
-    """Factory function to get video service based on config."""
-    settings = get_settings()
-    provider = settings.video_provider
-
+def _create_video_service(provider: str) -> BaseVideoService:
     match provider:
         case "veo":
             from moana.services.video.google_veo import GoogleVeoService
@@ -23,4 +18,26 @@ def get_video_service() -> BaseVideoService:
             raise ValueError(f"Unknown video provider: {provider}")
 
 
+def get_video_service() -> BaseVideoService:
+    """Factory function to get video service based on config.
+
+    Veo 受请求额度限制，配置了 VIDEO_FALLBACK_PROVIDERS 时额度用尽会改用备选 provider。
+    """
+    settings = get_settings()
+    provider = settings.video_provider
+    service = _create_video_service(provider)
+
+    if provider == "veo":
+        fallbacks = [
+            name.strip()
+            for name in settings.video_fallback_providers.split(",")
+            if name.strip() and name.strip() != provider
+        ]
+        if fallbacks:
+            from moana.services.video.fallback import QuotaFallbackVideoService
+            return QuotaFallbackVideoService(service, fallbacks, _create_video_service)
+
+    return service
+
+
 __all__ = ["get_video_service", "BaseVideoService", "VideoResult"]
@@ -0,0 +1,97 @@
+# src/moana/services/video/fallback.py
+"""Route video generation to fallback providers when the primary's quota is used up.
+
+Veo 每分钟 / 每日请求额度有限；额度用尽（QuotaExhaustedError）时依次改用
+VIDEO_FALLBACK_PROVIDERS 中的 provider（如 wanx、minimax），某个备选失败时继续尝试
+下一个，全部失败才抛出最后一个错误；主服务的其他错误照常抛出。
+"""
+import logging
+from typing import Callable
+
+from moana.services.ratelimit import QuotaExhaustedError
+from moana.services.video.base import BaseVideoService, VideoResult
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaFallbackVideoService(BaseVideoService):
+    """Wrap a quota-limited video service with fallback providers."""
+
+    def __init__(
+        self,
+        primary: BaseVideoService,
+        fallbacks: list[str],
+        factory: Callable[[str], BaseVideoService],
+    ):
+        """Initialize fallback wrapper.
+
+        Args:
+            primary: 主 provider 服务
+            fallbacks: 备选 provider 名称（按顺序尝试）
+            factory: provider 名称 -> 服务实例（首次使用时创建）
+        """
+        self._primary = primary
+        self._fallback_names = fallbacks
+        self._factory = factory
+        self._fallbacks: dict[str, BaseVideoService] = {}
+
+    @property
+    def provider_name(self) -> str:
+        return self._primary.provider_name
+
+    def __getattr__(self, name: str):
+        # 其他属性（如 reference_manager）透传给主服务
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._primary, name)
+
+    def _fallback(self, name: str) -> BaseVideoService:
+        if name not in self._fallbacks:
+            self._fallbacks[name] = self._factory(name)
+        return self._fallbacks[name]
+
+    async def generate(
+        self,
+        image_url: str,
+        prompt: str,
+        duration_seconds: int = 5,
+        last_frame_url: str | None = None,
+        scene_template: str | None = None,
+        character_ids: list[str] | None = None,
+        reference_images: list[str] | None = None,
+        auto_enhance_prompt: bool = True,
+        negative_prompt: str | None = None,
+    ) -> VideoResult:
+        kwargs = dict(
+            image_url=image_url,
+            prompt=prompt,
+            duration_seconds=duration_seconds,
+            last_frame_url=last_frame_url,
+            scene_template=scene_template,
+            character_ids=character_ids,
+            reference_images=reference_images,
+            auto_enhance_prompt=auto_enhance_prompt,
+            negative_prompt=negative_prompt,
+        )
+        try:
+            return await self._primary.generate(**kwargs)
+        except QuotaExhaustedError as quota_error:
+            last_error: Exception = quota_error
+            for name in self._fallback_names:
+                try:
+                    service = self._fallback(name)
+                except Exception as e:
+                    logger.warning(f"Fallback video provider {name} unavailable: {e}")
+                    continue
+                logger.warning(
+                    f"{last_error}; routing video generation to {service.provider_name}"
+                )
+                try:
+                    return await service.generate(**kwargs)
+                except Exception as e:
+                    # 该备选失败（额度用尽或调用出错）时继续尝试下一个
+                    logger.warning(f"Fallback video provider {name} failed: {e}")
+                    last_error = e
+            if last_error is quota_error:
+                raise
+            raise last_error
@@ -1,20 +1,27 @@
 """Google Veo 3.1 video generation service - Enhanced."""
-import asyncio
 import logging
 
-import httpx
 from google import genai
 from google.genai import types
 
 from moana.config import get_settings
+from moana.services.executor import run_blocking
 from moana.services.storage import get_storage_service
 from moana.services.video.base import BaseVideoService, VideoResult
+from moana.services.ratelimit import get_provider_limiter, get_provider_quota
 from moana.services.video.templates import get_template, get_default_template
 from moana.services.video.prompt_enhancer import VeoPromptEnhancer
 from moana.services.video.reference_manager import ReferenceImageManager
+from moana.services.http import http_client
+from moana.services.jobs import JobFailedError, JobKind, JobPoller, JobStatus, JobTimeoutError, get_job_poller
+from moana.services.scheduler import request_fingerprint
 
 logger = logging.getLogger(__name__)
 
+# 进行中的 operation（按名称），供共享轮询器刷新；查询函数只绑定第一个注册的
+# 服务实例，因此在所有实例间共享
+_operations: dict = {}
+
 
 class VeoServiceError(Exception):
     """Base error for Veo service."""
@@ -150,11 +157,35 @@ class GoogleVeoService(BaseVideoService):
         if ref_images:
             generate_kwargs["reference_images"] = ref_images
 
-        operation = self._client.models.generate_videos(**generate_kwargs)
-        logger.info(f"Veo task submitted: {operation.name}")
+        limiter = get_provider_limiter("video", self.provider_name, self._model)
+
+        async def submit() -> str:
+            # 提交前占用 Veo 请求额度（每分钟 / 每日），用尽时抛出 QuotaExhaustedError。
+            # 额度等待（最长 quota_max_wait_seconds）在占用 video 并发槽位之前完成，
+            # 槽位只覆盖提交请求本身；进行中的 operation 由共享轮询器跟踪
+            await get_provider_quota(self.provider_name).acquire(
+                max_wait=get_settings().quota_max_wait_seconds
+            )
+            async with limiter.slot():
+                submitted = await run_blocking(self._client.models.generate_videos, **generate_kwargs)
+            _operations[submitted.name] = submitted
+            logger.info(f"Veo task submitted: {submitted.name}")
+            return submitted.name
+
+        # 相同请求已有未完成的任务时复用（也避免重复消耗额度）
+        request_key = request_fingerprint("veo_video", {
+            "model": self._model,
+            "image_url": image_url,
+            "last_frame_url": last_frame_url,
+            "prompt": final_prompt,
+            "negative_prompt": final_negative,
+            "duration": duration,
+            "references": refs,
+        })
+        operation_name = await self._job_poller().submit_once("veo_video", request_key, submit)
 
-        # 9. Poll until complete
-        operation = await self._poll_until_complete(operation, timeout=600, interval=10)
+        # 9. Wait until complete (shared poller)
+        operation = await self._poll_until_complete(operation_name, timeout=600)
 
         # 10. Download and save
         if not operation.response or not operation.response.generated_videos:
@@ -196,28 +227,60 @@ class GoogleVeoService(BaseVideoService):
 
         # 回退到 HTTP 下载
         logger.info(f"Downloading image from URL: {image_url}")
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with http_client("google", timeout=120.0) as client:
             response = await client.get(image_url)
             response.raise_for_status()
             return response.content
 
-    async def _poll_until_complete(self, operation, timeout: int = 600, interval: int = 10):
-        """Poll Veo API until operation completes."""
-        elapsed = 0
-
-        while elapsed < timeout:
-            if operation.done:
-                logger.info("Veo operation completed")
-                return operation
-
-            logger.debug(f"Veo operation in progress, waiting {interval}s...")
-            await asyncio.sleep(interval)
-            elapsed += interval
-
-            # Refresh operation status
-            operation = self._client.operations.get(operation)
-
-        raise VeoServiceError(f"Veo operation timed out after {timeout}s")
+    def _job_poller(self) -> JobPoller:
+        """共享轮询器（注册 Veo operation 查询）."""
+        poller = get_job_poller()
+        poller.ensure_kind(JobKind(
+            name="veo_video",
+            query=self._query_operations,
+            expected_duration=90.0,
+            min_interval=5.0,
+            max_interval=20.0,
+        ))
+        return poller
+
+    async def _query_operations(self, names: list[str]) -> dict[str, JobStatus]:
+        """Refresh operations by name (worker 重启后按名称重建 operation)."""
+        statuses = {}
+        for name in names:
+            operation = _operations.get(name) or types.GenerateVideosOperation(name=name)
+            operation = await run_blocking(self._client.operations.get, operation)
+            _operations[name] = operation
+            if not operation.done:
+                statuses[name] = JobStatus("running")
+            elif operation.error:
+                statuses[name] = JobStatus("failed", error=f"Veo operation failed: {operation.error}")
+            else:
+                statuses[name] = JobStatus("succeeded", result=operation)
+        return statuses
+
+    async def _poll_until_complete(self, operation_name: str, timeout: int = 600):
+        """Wait for a Veo operation via the shared job poller."""
+        operation = _operations.pop(operation_name, None)
+        if operation is not None and operation.done:
+            # 提交时已完成：同样经轮询器记录终态，任务记录不会停留在 processing
+            error = VeoServiceError(f"Veo operation failed: {operation.error}") if operation.error else None
+            await self._job_poller().complete("veo_video", operation_name, result=operation, error=error)
+            if error is not None:
+                raise error
+        else:
+            try:
+                operation = await self._job_poller().wait("veo_video", operation_name, timeout=timeout)
+            except JobTimeoutError as e:
+                raise VeoServiceError(f"Veo operation timed out after {timeout}s") from e
+            except JobFailedError as e:
+                raise VeoServiceError(str(e)) from e
+            finally:
+                _operations.pop(operation_name, None)
+        if operation is None:
+            raise VeoServiceError(f"Veo operation {operation_name} result unavailable")
+        logger.info("Veo operation completed")
+        return operation
 
     async def _download_and_save_video(self, generated_video) -> str:
         """Download video and save to local storage."""
@@ -231,7 +294,7 @@ class GoogleVeoService(BaseVideoService):
             video_data = video.video_bytes
         elif video.uri:
             # Download from URI
-            self._client.files.download(file=video)
+            await run_blocking(self._client.files.download, file=video)
             video_data = video.video_bytes
         else:
             raise VeoServiceError("No video data available")
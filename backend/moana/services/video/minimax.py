@@ -1,14 +1,15 @@
 # src/moana/services/video/minimax.py
 """MiniMax (Hailuo) 视频生成服务."""
-import asyncio
 import logging
-import time
-import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_not_exception_type
 
 from moana.config import get_settings
 from moana.services.video.base import BaseVideoService, VideoResult
+from moana.services.ratelimit import provider_limited
 from moana.services.storage import get_storage_service
+from moana.services.http import http_client
+from moana.services.jobs import JobKind, JobPoller, JobStatus, get_job_poller
+from moana.services.scheduler import request_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +46,7 @@ class MiniMaxVideoService(BaseVideoService):
         wait=wait_exponential(multiplier=1, min=2, max=10),
         retry=retry_if_not_exception_type(InsufficientBalanceError),  # 余额不足不重试
     )
+    @provider_limited("video")
     async def generate(
         self,
         image_url: str,
@@ -80,17 +82,24 @@ class MiniMaxVideoService(BaseVideoService):
         # Log if Veo-specific features are requested
         if reference_images or character_ids:
             logger.warning("Reference images not supported by MiniMax, ignoring")
-        # Step 1: 创建视频生成任务
-        task_id = await self._create_task(image_url, prompt)
+        # Step 1: 创建视频生成任务（相同请求已有未完成任务时复用）
+        request_key = request_fingerprint("minimax_video", {
+            "model": self._model,
+            "image_url": image_url,
+            "prompt": prompt,
+        })
+        task_id = await self._job_poller().submit_once(
+            "minimax_video", request_key, lambda: self._create_task(image_url, prompt)
+        )
 
-        # Step 2: 轮询等待任务完成
+        # Step 2: 由共享轮询器等待任务完成
         result = await self._wait_for_completion(task_id)
 
         return result
 
     async def _create_task(self, image_url: str, prompt: str) -> str:
         """创建视频生成任务."""
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with http_client("minimax", timeout=60.0) as client:
             response = await client.post(
                 f"{self._api_base}/v1/video_generation",
                 headers={
@@ -122,50 +131,59 @@ class MiniMaxVideoService(BaseVideoService):
 
         return task_id
 
-    async def _wait_for_completion(
-        self,
-        task_id: str,
-        max_wait_seconds: int = 600,  # 最多等待 10 分钟
-        poll_interval: int = 10,  # 每 10 秒查询一次
-    ) -> VideoResult:
-        """轮询等待任务完成."""
-        start_time = time.time()
-
-        while True:
-            elapsed = time.time() - start_time
-            if elapsed > max_wait_seconds:
-                raise TimeoutError(f"Video generation timed out after {max_wait_seconds}s")
-
-            # 查询任务状态
+    def _job_poller(self) -> JobPoller:
+        """共享轮询器（注册 MiniMax 视频任务查询）."""
+        poller = get_job_poller()
+        poller.ensure_kind(JobKind(
+            name="minimax_video",
+            query=self._query_jobs,
+            expected_duration=120.0,
+            min_interval=5.0,
+            max_interval=30.0,
+        ))
+        return poller
+
+    async def _query_jobs(self, task_ids: list[str]) -> dict[str, JobStatus]:
+        """查询任务状态（MiniMax 不支持批量查询，逐个查询）."""
+        statuses = {}
+        for task_id in task_ids:
             status, result = await self._query_task(task_id)
-
             if status == "Success":
-                # 任务完成，解析结果
-                file_id = result.get("file_id")
-                remote_url = await self._get_video_url(file_id) if file_id else ""
-
-                # 下载视频并保存到本地存储
-                local_url = await self._download_and_save(remote_url)
-
-                return VideoResult(
-                    video_url=local_url,
-                    duration=6.0,  # MiniMax 默认 6 秒
-                    thumbnail_url="",  # MiniMax 不返回缩略图
-                    model=self._model,
-                    resolution="720P",
-                    has_audio=False,
-                )
+                statuses[task_id] = JobStatus("succeeded", result={"file_id": result.get("file_id")})
             elif status == "Fail":
-                raise RuntimeError(f"Video generation failed: {result}")
+                statuses[task_id] = JobStatus("failed", error=f"Video generation failed: {result}")
             elif status in ("Queueing", "Processing", "Preparing"):
-                # 继续等待
-                await asyncio.sleep(poll_interval)
+                statuses[task_id] = JobStatus("running")
             else:
-                raise RuntimeError(f"Unknown status: {status}")
+                statuses[task_id] = JobStatus("failed", error=f"Unknown status: {status}")
+        return statuses
+
+    async def _wait_for_completion(
+        self,
+        task_id: str,
+        max_wait_seconds: int = 600,  # 最多等待 10 分钟
+    ) -> VideoResult:
+        """等待任务完成（共享轮询器按历史耗时自适应查询）."""
+        result = await self._job_poller().wait("minimax_video", task_id, timeout=max_wait_seconds)
+
+        file_id = result.get("file_id")
+        remote_url = await self._get_video_url(file_id) if file_id else ""
+
+        # 下载视频并保存到本地存储
+        local_url = await self._download_and_save(remote_url)
+
+        return VideoResult(
+            video_url=local_url,
+            duration=6.0,  # MiniMax 默认 6 秒
+            thumbnail_url="",  # MiniMax 不返回缩略图
+            model=self._model,
+            resolution="720P",
+            has_audio=False,
+        )
 
     async def _query_task(self, task_id: str) -> tuple[str, dict]:
         """查询任务状态."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client("minimax", timeout=30.0) as client:
             response = await client.get(
                 f"{self._api_base}/v1/query/video_generation",
                 headers={
@@ -181,7 +199,7 @@ class MiniMaxVideoService(BaseVideoService):
 
     async def _get_video_url(self, file_id: str) -> str:
         """获取视频下载 URL."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_client("minimax", timeout=30.0) as client:
             response = await client.get(
                 f"{self._api_base}/v1/files/retrieve",
                 headers={
@@ -210,7 +228,7 @@ class MiniMaxVideoService(BaseVideoService):
         logger.info(f"Downloading video from MiniMax...")
 
         # 下载视频
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with http_client("minimax", timeout=120.0) as client:
             response = await client.get(remote_url)
             response.raise_for_status()
             video_data = response.content
@@ -192,19 +192,29 @@ Output as JSON:
             Dict with style, palette, mood
         """
         try:
+            from moana.services.llm import get_llm_memo
+
             llm = self._get_llm_service()
-            # Use vision capability
-            result = await llm.generate_with_image(
-                prompt=self.ANALYZE_STYLE_TEMPLATE,
-                image_url=image_url,
+            return await get_llm_memo("video_style").get_or_compute(
+                inputs={"image_url": image_url},
+                model=getattr(llm, "model_name", ""),
+                compute=lambda: self._analyze_style_with_llm(llm, image_url),
             )
-            # Parse JSON response
-            import json
-            return json.loads(result)
         except Exception as e:
             logger.warning(f"Style analysis failed: {e}, using default")
             return {"style": "cartoon", "palette": "warm", "mood": "cheerful"}
 
+    async def _analyze_style_with_llm(self, llm, image_url: str) -> dict:
+        """调用视觉模型识别风格（解析失败时抛出异常，不进入缓存）."""
+        # Use vision capability
+        result = await llm.generate_with_image(
+            prompt=self.ANALYZE_STYLE_TEMPLATE,
+            image_url=image_url,
+        )
+        # Parse JSON response
+        import json
+        return json.loads(result)
+
     async def enhance(
         self,
         prompt: str,
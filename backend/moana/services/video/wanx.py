@@ -13,14 +13,15 @@ import asyncio
 import base64
 import hashlib
 import time
-from io import BytesIO
-
-import httpx
-from PIL import Image
 
 from moana.config import get_settings
 from moana.services.video.base import BaseVideoService, VideoResult
+from moana.services.ratelimit import provider_limited
 from moana.services.storage import get_storage_service
+from moana.services.http import http_client
+from moana.services.image.optimizer import compress_image
+from moana.services.jobs import JobKind, JobPoller, JobStatus, get_job_poller
+from moana.services.scheduler import request_fingerprint
 
 
 class WanxVideoService(BaseVideoService):
@@ -95,7 +96,7 @@ class WanxVideoService(BaseVideoService):
 
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient(timeout=90.0) as client:
+                async with http_client("dashscope", timeout=90.0) as client:
                     response = await client.get(image_url)
                     response.raise_for_status()
                     image_data = response.content
@@ -119,23 +120,9 @@ class WanxVideoService(BaseVideoService):
         if image_data is None:
             raise RuntimeError(f"Failed to download image after {max_retries} attempts: {last_error}")
 
-        # 压缩图片
+        # 压缩图片（缩放到 1280 最大边并转换为 JPEG，在图片进程池中执行）
         try:
-            img = Image.open(BytesIO(image_data))
-            if img.mode in ("RGBA", "P"):
-                img = img.convert("RGB")
-
-            # 缩放到 1280 最大边
-            max_size = 1280
-            if max(img.size) > max_size:
-                ratio = max_size / max(img.size)
-                new_size = (int(img.size[0] * ratio), int(img.size[1] * ratio))
-                img = img.resize(new_size, Image.Resampling.LANCZOS)
-
-            # 转换为 JPEG
-            buffer = BytesIO()
-            img.save(buffer, format="JPEG", quality=85, optimize=True)
-            compressed_data = buffer.getvalue()
+            compressed_data = await compress_image(image_data, max_size=1280, quality=85)
 
             b64_data = base64.b64encode(compressed_data).decode("utf-8")
             return f"data:image/jpeg;base64,{b64_data}"
@@ -144,6 +131,7 @@ class WanxVideoService(BaseVideoService):
             print(f"[Wanx] 图片压缩失败: {e}")
             raise
 
+    @provider_limited("video")
     async def generate(
         self,
         image_url: str,
@@ -194,8 +182,18 @@ class WanxVideoService(BaseVideoService):
 
             # 提交任务
             print(f"[Wanx] 提交视频生成任务...")
-            task_id = await self._submit_task(
-                image_data, prompt, duration, res, enable_audio
+            request_key = request_fingerprint("wanx_video", {
+                "model": self._model,
+                "image_url": image_url,
+                "prompt": prompt,
+                "duration": duration,
+                "resolution": res,
+                "audio": enable_audio,
+            })
+            task_id = await self._job_poller().submit_once(
+                "wanx_video",
+                request_key,
+                lambda: self._submit_task(image_data, prompt, duration, res, enable_audio),
             )
             print(f"[Wanx] 任务已提交: {task_id}")
 
@@ -251,7 +249,7 @@ class WanxVideoService(BaseVideoService):
             "X-DashScope-Async": "enable",  # 异步模式
         }
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
+        async with http_client("dashscope", timeout=120.0) as client:
             response = await client.post(
                 self.SUBMIT_ENDPOINT,
                 json=request_body,
@@ -270,67 +268,56 @@ class WanxVideoService(BaseVideoService):
 
         return task_id
 
-    async def _wait_for_task(
-        self,
-        task_id: str,
-        max_wait_seconds: int = 600,
-        poll_interval: int = 10,
-    ) -> str:
-        """等待任务完成并返回视频 URL."""
+    def _job_poller(self) -> JobPoller:
+        """共享轮询器（注册万相视频任务查询）."""
+        poller = get_job_poller()
+        poller.ensure_kind(JobKind(
+            name="wanx_video",
+            query=self._query_jobs,
+            expected_duration=150.0,  # 通常 2-3 分钟
+            min_interval=5.0,
+            max_interval=30.0,
+        ))
+        return poller
+
+    async def _query_jobs(self, task_ids: list[str]) -> dict[str, JobStatus]:
+        """查询任务状态（逐个查询 /tasks/{task_id}）."""
         headers = {
             "Authorization": f"Bearer {self._api_key}",
         }
-
-        task_url = f"{self.TASK_ENDPOINT}/{task_id}"
-        start_time = time.time()
-        consecutive_errors = 0
-        max_consecutive_errors = 5
-
-        while True:
-            elapsed = time.time() - start_time
-            if elapsed > max_wait_seconds:
-                raise TimeoutError(f"Task {task_id} timed out after {max_wait_seconds}s")
-
-            try:
-                # 查询任务状态（每次创建新客户端避免连接复用问题）
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(task_url, headers=headers)
-                    response.raise_for_status()
-                    result = response.json()
-
-                # 重置连续错误计数
-                consecutive_errors = 0
+        statuses = {}
+        async with http_client("dashscope", timeout=30.0) as client:
+            for task_id in task_ids:
+                response = await client.get(f"{self.TASK_ENDPOINT}/{task_id}", headers=headers)
+                response.raise_for_status()
+                result = response.json()
 
                 output = result.get("output", {})
                 status = output.get("task_status")
 
                 if status == "SUCCEEDED":
                     video_url = output.get("video_url")
-                    if not video_url:
-                        raise RuntimeError(f"No video_url in completed task: {result}")
-                    return video_url
-
+                    if video_url:
+                        statuses[task_id] = JobStatus("succeeded", result=video_url)
+                    else:
+                        statuses[task_id] = JobStatus("failed", error=f"No video_url in completed task: {result}")
                 elif status == "FAILED":
                     error_code = output.get("code", "Unknown")
                     error_msg = output.get("message", "Unknown error")
-                    raise RuntimeError(f"Task failed: {error_code} - {error_msg}")
-
+                    statuses[task_id] = JobStatus("failed", error=f"Task failed: {error_code} - {error_msg}")
                 elif status in ("PENDING", "RUNNING"):
-                    print(f"[Wanx] 任务状态: {status}, 已等待 {int(elapsed)}s...")
-                    await asyncio.sleep(poll_interval)
-
+                    statuses[task_id] = JobStatus("running")
                 else:
-                    raise RuntimeError(f"Unknown task status: {status}")
-
-            except (httpx.ConnectError, httpx.ReadTimeout, httpx.ConnectTimeout) as e:
-                consecutive_errors += 1
-                print(f"[Wanx] 轮询失败 ({consecutive_errors}/{max_consecutive_errors}): {type(e).__name__}")
+                    statuses[task_id] = JobStatus("failed", error=f"Unknown task status: {status}")
+        return statuses
 
-                if consecutive_errors >= max_consecutive_errors:
-                    raise RuntimeError(f"Too many consecutive polling errors: {e}")
-
-                # 等待后重试
-                await asyncio.sleep(poll_interval)
+    async def _wait_for_task(
+        self,
+        task_id: str,
+        max_wait_seconds: int = 600,
+    ) -> str:
+        """等待任务完成并返回视频 URL（共享轮询器，连续 5 次查询失败则放弃）."""
+        return await self._job_poller().wait("wanx_video", task_id, timeout=max_wait_seconds)
 
     async def _save_to_local_storage(self, remote_url: str, prompt: str, max_retries: int = 3) -> str:
         """下载视频并保存到本地存储（带重试）."""
@@ -339,7 +326,7 @@ class WanxVideoService(BaseVideoService):
 
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient(timeout=180.0) as client:
+                async with http_client("dashscope", timeout=180.0) as client:
                     response = await client.get(remote_url)
                     response.raise_for_status()
                     video_data = response.content
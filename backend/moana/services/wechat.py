@@ -1,8 +1,8 @@
 # src/moana/services/wechat.py
 from typing import Optional
-import httpx
 
 from moana.config import get_settings
+from moana.services.http import http_client
 
 
 class WeChatError(Exception):
@@ -45,7 +45,7 @@ class WeChatService:
             "grant_type": "authorization_code",
         }
 
-        async with httpx.AsyncClient() as client:
+        async with http_client("wechat", timeout=10.0) as client:
             response = await client.get(self.MINIPROGRAM_URL, params=params)
             response.raise_for_status()
             data = response.json()
@@ -74,7 +74,7 @@ class WeChatService:
             "grant_type": "authorization_code",
         }
 
-        async with httpx.AsyncClient() as client:
+        async with http_client("wechat", timeout=10.0) as client:
             response = await client.get(self.OAUTH_URL, params=params)
             response.raise_for_status()
             data = response.json()
@@ -104,7 +104,7 @@ class WeChatService:
             "lang": "zh_CN",
         }
 
-        async with httpx.AsyncClient() as client:
+        async with http_client("wechat", timeout=10.0) as client:
             response = await client.get(self.USERINFO_URL, params=params)
             response.raise_for_status()
             data = response.json()
@@ -0,0 +1,131 @@
+"""Tests for the preset theme outline bank."""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+
+def _outline(name="〔宝贝〕", pages=6, interactions=1):
+    from moana.agents.schemas import PageInteraction, PictureBookOutline, PictureBookPage
+
+    return PictureBookOutline(
+        title=f"{name}学刷牙",
+        theme_topic="刷牙",
+        educational_goal="养成早晚刷牙的习惯",
+        pages=[
+            PictureBookPage(
+                page_num=i + 1,
+                text=f"{name}拿起小牙刷，刷刷刷！" if i == 0 else "上下左右刷一刷。",
+                image_prompt="Pixar-style 3D rendered, a cute white bunny brushing teeth, no text or letters in image",
+                interaction=PageInteraction(
+                    question_type="tap_count",
+                    question=f"{name}刷了几颗牙？",
+                    options=[1, 2, 3],
+                    correct_answer=2,
+                ) if i < interactions else None,
+            )
+            for i in range(pages)
+        ],
+        total_interactions=interactions,
+    )
+
+
+async def _bank(story_agent=None):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from moana.agents.outline_bank import OutlineBank
+    from moana.models.outline_bank import OutlineBankEntry
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(OutlineBankEntry.__table__.create)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    return OutlineBank(session_factory=factory, story_agent=story_agent), engine
+
+
+def test_validate_outline_rejects_bad_outlines():
+    """Test validation catches missing placeholders, bad page counts and interaction counts."""
+    from moana.agents.outline_bank import validate_outline
+
+    assert validate_outline(_outline()) == []
+    assert any("page count" in p for p in validate_outline(_outline(pages=3)))
+    assert any("title" in p for p in validate_outline(_outline(name="小明")))
+    bad = _outline()
+    bad.total_interactions = 3
+    assert any("total_interactions" in p for p in validate_outline(bad))
+
+
+@pytest.mark.asyncio
+async def test_build_and_draw_personalized_outline():
+    """Test the offline build stores validated outlines and draw substitutes the child's name."""
+    from moana.agents.outline_bank import PLACEHOLDER_NAME, age_bucket
+    from moana.agents.story import StyleConfig
+
+    agent = MagicMock()
+    agent._llm.model_name = "gemini-test"
+    # 第二份不合格（页数不足）被丢弃后重试
+    agent.generate_outline = AsyncMock(side_effect=[_outline(), _outline(pages=2), _outline()])
+    bank, engine = await _bank(agent)
+    try:
+        counts = await bank.build(
+            theme_ids=["brush_teeth"], art_styles=["pixar_3d"], age_buckets=["24-35"], per_key=2,
+        )
+        assert counts == {"generated": 2, "rejected": 1, "failed": 0}
+        assert agent.generate_outline.await_args_list[0].kwargs["child_name"] == PLACEHOLDER_NAME
+        assert age_bucket(agent.generate_outline.await_args_list[0].kwargs["age_months"]) == "24-35"
+
+        # 已满额时不再生成
+        assert (await bank.build(
+            theme_ids=["brush_teeth"], art_styles=["pixar_3d"], age_buckets=["24-35"], per_key=2,
+        ))["generated"] == 0
+
+        outline = await bank.draw("刷牙", 30, "小莫", StyleConfig())
+        assert outline is not None
+        assert outline.title == "小莫学刷牙"
+        assert outline.pages[0].text.startswith("小莫")
+        assert outline.pages[0].interaction.question.startswith("小莫")
+        assert PLACEHOLDER_NAME not in outline.model_dump_json()
+
+        # 不同风格 / 自定义配角 / 增强参数不使用大纲库
+        assert await bank.draw("刷牙", 30, "小莫", StyleConfig(art_style="watercolor")) is None
+        assert await bank.draw("刷牙", 30, "小莫", StyleConfig(), favorite_characters=["小熊"]) is None
+        assert await bank.draw("未知主题", 30, "小莫", StyleConfig()) is None
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_uses_banked_outline_for_presets():
+    """Test the picture book pipeline skips the outline LLM call on a bank hit."""
+    from moana.agents.story import StyleConfig
+    from moana.pipelines.picture_book import PictureBookPipeline
+    from moana.services.image.base import ImageResult
+    from moana.services.tts.base import TTSResult
+
+    story_agent = MagicMock()
+    story_agent.generate_outline = AsyncMock()
+    image_service = MagicMock()
+    image_service.generate = AsyncMock(return_value=ImageResult(url="https://example.com/i.webp", prompt="p"))
+    tts_service = MagicMock()
+    tts_service.synthesize = AsyncMock(return_value=TTSResult(
+        audio_url="https://example.com/a.mp3", duration=2.0, voice_id="v", model="m",
+    ))
+    bank = MagicMock()
+    bank.draw = AsyncMock(return_value=_outline(name="小莫"))
+
+    pipeline = PictureBookPipeline(
+        story_agent=story_agent,
+        image_service=image_service,
+        tts_service=tts_service,
+        outline_bank=bank,
+    )
+    result = await pipeline.generate(
+        child_name="小莫",
+        age_months=30,
+        theme_topic="刷牙",
+        theme_category="habit",
+        use_outline_bank=True,
+    )
+
+    assert result["title"] == "小莫学刷牙"
+    assert len(result["pages"]) == 6
+    story_agent.generate_outline.assert_not_awaited()
+    assert isinstance(bank.draw.await_args.kwargs["style_config"], StyleConfig)
@@ -46,3 +46,100 @@ async def test_story_agent_generate_outline():
 
         assert outline.title == "小莫学刷牙"
         assert len(outline.pages) >= 1
+
+
+@pytest.mark.asyncio
+async def test_story_agent_streams_pages_before_outline_completes():
+    """Test on_page fires for each page while the LLM is still streaming."""
+    import json
+
+    from unittest.mock import MagicMock
+
+    from moana.agents.story import StoryAgent
+
+    outline_json = json.dumps({
+        "title": "小莫学刷牙",
+        "theme_topic": "刷牙",
+        "educational_goal": "养成早晚刷牙的好习惯",
+        "pages": [
+            {"page_num": i, "text": f"第{i}页", "image_prompt": f"page {i}", "interaction": None}
+            for i in (1, 2)
+        ],
+        "total_interactions": 0,
+    }, ensure_ascii=False)
+
+    received = []
+    streamed = []
+
+    async def fake_stream(**kwargs):
+        # 分成小块流式返回，记录每页回调发生时已输出的长度
+        for start in range(0, len(outline_json), 10):
+            streamed.append(start)
+            yield outline_json[start:start + 10]
+
+    mock_llm = MagicMock()
+    mock_llm.generate_stream = fake_stream
+
+    with patch("moana.agents.story.get_llm_service", return_value=mock_llm):
+        agent = StoryAgent()
+        outline = await agent.generate_outline(
+            child_name="小莫",
+            age_months=22,
+            theme_topic="刷牙",
+            theme_category="habit",
+            on_page=lambda index, page: received.append((index, page.text, len(streamed))),
+        )
+
+    assert [(index, text) for index, text, _ in received] == [(0, "第1页"), (1, "第2页")]
+    # 第 1 页在流结束前就已回调
+    assert received[0][2] < len(streamed)
+    assert outline.pages[1].image_prompt == "page 2"
+
+
+@pytest.mark.asyncio
+async def test_story_agent_stream_falls_back_to_structured_output():
+    """Test a truncated stream falls back and re-dispatches only changed pages."""
+    import json
+
+    from unittest.mock import MagicMock
+
+    from moana.agents.schemas import PictureBookOutline
+    from moana.agents.story import StoryAgent
+
+    pages = [
+        {"page_num": i, "text": f"第{i}页", "image_prompt": f"page {i}", "interaction": None}
+        for i in (1, 2, 3)
+    ]
+    # 第 1 页完整、第 2 页格式错误，随后输出被截断
+    truncated = json.dumps({"title": "小莫学刷牙", "pages": [pages[0]]}, ensure_ascii=False)[:-2]
+    truncated += ', {"page_num": 2,}, {"page_num": 3, "te'
+
+    async def fake_stream(**kwargs):
+        for start in range(0, len(truncated), 16):
+            yield truncated[start:start + 16]
+
+    fallback = PictureBookOutline(
+        title="小莫学刷牙",
+        theme_topic="刷牙",
+        educational_goal="养成早晚刷牙的好习惯",
+        pages=[pages[0], {**pages[1], "text": "第2页（重写）"}, pages[2]],
+        total_interactions=0,
+    )
+    mock_llm = MagicMock()
+    mock_llm.generate_stream = fake_stream
+    mock_llm.generate_structured = AsyncMock(return_value=fallback)
+    received = []
+
+    with patch("moana.agents.story.get_llm_service", return_value=mock_llm):
+        outline = await StoryAgent().generate_outline(
+            child_name="小莫",
+            age_months=22,
+            theme_topic="刷牙",
+            theme_category="habit",
+            on_page=lambda index, page: received.append((index, page.text)),
+        )
+
+    assert outline is fallback
+    mock_llm.generate_structured.assert_awaited_once()
+    # 第 1 页流式分发后内容未变，不再重复回调
+    assert received == [(0, "第1页"), (1, "第2页（重写）"), (2, "第3页")]
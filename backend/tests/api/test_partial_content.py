@@ -0,0 +1,182 @@
+# tests/api/test_partial_content.py
+"""Tests for progressive (partial) picture book delivery."""
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+
+@pytest.fixture
+async def session_factory():
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from moana.models.content import Content
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Content.__table__.create)
+
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_partial_picture_book_pages_become_ready(session_factory):
+    """Test pages show as placeholders until ready, then the book turns ready."""
+    from moana.agents.schemas import PictureBookOutline, PictureBookPage
+    from moana.api.content import _PartialPictureBookWriter
+    from moana.database import get_db
+    from moana.main import app
+
+    outline = PictureBookOutline(
+        title="小莫学刷牙",
+        theme_topic="刷牙",
+        educational_goal="养成刷牙习惯",
+        pages=[
+            PictureBookPage(page_num=i, text=f"第{i}页", image_prompt=f"page {i}", interaction=None)
+            for i in (1, 2)
+        ],
+        total_interactions=0,
+    )
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with patch("moana.api.content.async_session_factory", session_factory):
+            writer = _PartialPictureBookWriter()
+            content_id = await writer.start(
+                outline,
+                theme_category="habit",
+                theme_topic="刷牙",
+                personalization={"child_name": "小莫"},
+                extra_data={},
+            )
+            await writer.page_ready(1, {
+                "page_num": 2,
+                "text": "第2页",
+                "image_url": "https://example.com/2.png",
+                "image_thumb_url": None,
+                "image_prompt": "page 2",
+                "audio_url": "https://example.com/2.mp3",
+                "audio_duration": 3.0,
+                "interaction": None,
+            })
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                body = (await client.get(f"/api/v1/content/{content_id}")).json()
+                assert body["status"] == "partial"
+                assert body["ready_pages"] == 1
+                assert [p["ready"] for p in body["pages"]] == [False, True]
+                assert body["pages"][0]["text"] == "第1页"
+                assert body["pages"][0]["image_url"] is None
+                assert body["pages"][1]["audio_url"] == "https://example.com/2.mp3"
+
+                # 未完成的内容不出现在列表中
+                listing = (await client.get("/api/v1/content/list")).json()
+                assert listing["total"] == 0
+
+                await writer.finish(
+                    title=outline.title,
+                    content_data={"pages": [
+                        {"page_num": i, "text": f"第{i}页", "image_url": f"https://example.com/{i}.png",
+                         "audio_url": f"https://example.com/{i}.mp3", "audio_duration": 3.0}
+                        for i in (1, 2)
+                    ]},
+                    duration=6,
+                )
+                body = (await client.get(f"/api/v1/content/{content_id}")).json()
+                assert body["status"] == "ready"
+                assert body["ready_pages"] == 2
+
+                # 重试时复用同一条 partial 内容
+                again = await _PartialPictureBookWriter().start(
+                    outline,
+                    theme_category="habit",
+                    theme_topic="刷牙",
+                    personalization={"child_name": "小莫"},
+                    extra_data={},
+                    content_id=content_id,
+                )
+                assert again == content_id
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.mark.asyncio
+async def test_background_picture_book_stores_narration(session_factory):
+    """Test the whole-book narration and its cue table are saved and returned."""
+    from unittest.mock import AsyncMock
+
+    from moana.agents.schemas import PictureBookOutline, PictureBookPage
+    from moana.api.content import _generate_picture_book_background
+    from moana.database import get_db
+    from moana.main import app
+
+    outline = PictureBookOutline(
+        title="小莫学刷牙",
+        theme_topic="刷牙",
+        educational_goal="养成刷牙习惯",
+        pages=[
+            PictureBookPage(page_num=i, text=f"第{i}页", image_prompt=f"page {i}", interaction=None)
+            for i in (1, 2)
+        ],
+        total_interactions=0,
+    )
+    narration = {
+        "audio_url": "https://example.com/book.m4a",
+        "duration": 6.0,
+        "cues": [{"page_num": 1, "start": 0.0, "end": 2.8}, {"page_num": 2, "start": 2.8, "end": 6.0}],
+    }
+
+    async def generate(on_outline, **kwargs):
+        await on_outline(outline)
+        return {
+            "title": outline.title,
+            "pages": [
+                {"page_num": i, "text": f"第{i}页", "image_url": f"https://example.com/{i}.png",
+                 "audio_url": f"https://example.com/p{i}.m4a", "audio_duration": 3.0}
+                for i in (1, 2)
+            ],
+            "total_duration": 6.0,
+            "narration": narration,
+        }
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with patch("moana.api.content.async_session_factory", session_factory), \
+             patch("moana.api.content.PictureBookPipeline") as MockPipeline, \
+             patch("moana.services.logging.GenerationLogger.update_content_id", AsyncMock()), \
+             patch("moana.services.moderation.schedule_content_review"):
+            MockPipeline.return_value.generate = AsyncMock(side_effect=generate)
+            await _generate_picture_book_background(
+                task_id="task-narration",
+                child_name="小莫",
+                age_months=24,
+                theme_topic="刷牙",
+                theme_category="habit",
+                favorite_characters=None,
+                voice_id=None,
+            )
+
+            from moana.api.content import _task_store
+
+            state = await _task_store().get("task-narration")
+            assert state["status"] == "completed"
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                body = (await client.get(f"/api/v1/content/{state['content_id']}")).json()
+
+        assert body["status"] == "ready"
+        assert body["narration"] == narration
+        assert [p["audio_url"] for p in body["pages"]] == ["https://example.com/p1.m4a", "https://example.com/p2.m4a"]
+    finally:
+        app.dependency_overrides.pop(get_db, None)
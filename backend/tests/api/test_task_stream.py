@@ -0,0 +1,67 @@
+"""Tests for task progress SSE / WebSocket stream."""
+import asyncio
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+
+@pytest.fixture
+def store():
+    from moana.services.task_state import get_task_state_store, reset_task_state_stores
+
+    reset_task_state_stores()
+    yield get_task_state_store("content")
+    reset_task_state_stores()
+
+
+@pytest.mark.asyncio
+async def test_event_stream_follows_progress_until_completed(store):
+    """Test the stream yields each progress change and ends on completion."""
+    from moana.api.content import _task_event_stream
+
+    await store.set("t1", {"status": "processing", "progress": 10, "stage": "story"})
+
+    async def drive():
+        await asyncio.sleep(0.05)
+        await store.update("t1", progress=30, stage="image_1")
+        await asyncio.sleep(0.05)
+        await store.set("t1", {"status": "completed", "progress": 100, "content_id": "c1"})
+
+    driver = asyncio.create_task(drive())
+    events = [item async for item in _task_event_stream("t1") if item is not None]
+    await driver
+
+    assert [name for _, name, _ in events] == ["progress", "progress", "completed"]
+    assert [payload["progress"] for _, _, payload in events] == [10, 30, 100]
+    assert events[-1][2]["content_id"] == "c1"
+    # 事件 ID 单调递增
+    ids = [event_id for event_id, _, _ in events]
+    assert ids == sorted(ids)
+
+
+@pytest.mark.asyncio
+async def test_sse_endpoint_and_resume(store):
+    """Test SSE framing, 404 and Last-Event-ID resume."""
+    from moana.main import app
+
+    await store.set("done", {"status": "completed", "progress": 100, "content_id": "c1"})
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/v1/content/tasks/missing/events")
+        assert response.status_code == 404
+
+        response = await client.get("/api/v1/content/tasks/done/events")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: completed" in response.text
+        event_id = next(
+            line.split(": ", 1)[1] for line in response.text.splitlines() if line.startswith("id: ")
+        )
+
+        # 已收到最新事件后重连，不再重复推送
+        response = await client.get(
+            "/api/v1/content/tasks/done/events",
+            headers={"Last-Event-ID": event_id},
+        )
+        assert "event:" not in response.text
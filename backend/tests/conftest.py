@@ -0,0 +1,20 @@
+# tests/conftest.py
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def no_provider_quotas(monkeypatch):
+    """Disable provider request quotas unless a test configures its own.
+
+    Veo 默认开启每分钟 / 每日额度且为进程级共享，否则测试之间会互相消耗额度并等待限速。
+    """
+    from moana.config import get_settings
+    from moana.services.ratelimit import reset_provider_quotas
+
+    settings = get_settings()
+    for name in type(settings).model_fields:
+        if name.startswith("quota_") and name.endswith(("_per_minute", "_per_day")):
+            monkeypatch.setattr(settings, name, 0)
+    reset_provider_quotas()
+    yield
+    reset_provider_quotas()
@@ -66,3 +66,357 @@ async def test_picture_book_pipeline_generate():
         assert result["title"] == "小莫学刷牙"
         assert len(result["pages"]) == 1
         assert result["pages"][0]["image_url"] == "https://example.com/image.png"
+
+
+@pytest.mark.asyncio
+async def test_picture_book_pipeline_resumes_from_checkpoint():
+    """Test a retry reuses the checkpointed outline and finished images."""
+    from moana.pipelines.picture_book import PictureBookPipeline
+    from moana.pipelines.checkpoint import PipelineCheckpoint
+    from moana.agents.schemas import PictureBookOutline, PictureBookPage
+    from moana.services.image.base import ImageResult
+    from moana.services.task_state import MemoryTaskStateStore
+    from moana.services.tts.base import TTSResult
+
+    outline = PictureBookOutline(
+        title="小莫学刷牙",
+        theme_topic="刷牙",
+        educational_goal="养成刷牙习惯",
+        pages=[
+            PictureBookPage(page_num=i, text=f"第{i}页", image_prompt=f"page {i}", interaction=None)
+            for i in (1, 2)
+        ],
+        total_interactions=0,
+    )
+
+    story_agent = MagicMock()
+    story_agent.generate_outline = AsyncMock(return_value=outline)
+    story_agent._llm.model_name = "test-llm"
+
+    async def flaky_image(prompt, style):
+        if prompt == "page 2":
+            raise RuntimeError("provider timeout")
+        return ImageResult(url=f"https://example.com/{prompt}.png", prompt=prompt)
+
+    image_service = MagicMock()
+    image_service.generate = AsyncMock(side_effect=flaky_image)
+    tts_service = MagicMock()
+    tts_service.synthesize = AsyncMock(return_value=TTSResult(
+        audio_url="https://example.com/a.mp3", duration=2.0, voice_id="v", model="tts",
+    ))
+
+    store = MemoryTaskStateStore("checkpoint")
+    params = {"child_name": "小莫", "theme_topic": "刷牙"}
+    pipeline = PictureBookPipeline(story_agent, image_service, tts_service)
+
+    checkpoint = PipelineCheckpoint("task-1", store=store)
+    await checkpoint.load(params)
+    with pytest.raises(RuntimeError):
+        await pipeline.generate(
+            child_name="小莫", age_months=24, theme_topic="刷牙", theme_category="habit",
+            checkpoint=checkpoint,
+        )
+
+    # 重试：大纲和第 1 页插图来自检查点
+    image_service.generate = AsyncMock(
+        return_value=ImageResult(url="https://example.com/retry.png", prompt="page 2")
+    )
+    checkpoint = PipelineCheckpoint("task-1", store=store)
+    saved = await checkpoint.load(params)
+    # 音频与插图并行，失败前已完成的音频同样保存在检查点中
+    assert {"outline", "image_0"} <= set(saved)
+    assert "image_1" not in saved
+    synthesized = tts_service.synthesize.await_count
+    saved_audio = len([key for key in saved if key.startswith("audio_")])
+
+    result = await pipeline.generate(
+        child_name="小莫", age_months=24, theme_topic="刷牙", theme_category="habit",
+        checkpoint=checkpoint,
+    )
+
+    assert story_agent.generate_outline.await_count == 1
+    assert image_service.generate.await_count == 1
+    assert [p["image_url"] for p in result["pages"]] == [
+        "https://example.com/page 1.png",
+        "https://example.com/retry.png",
+    ]
+    # 已保存的音频不再重复合成
+    assert tts_service.synthesize.await_count == synthesized + 2 - saved_audio
+
+    # 作废的单元在下次加载时被跳过
+    await checkpoint.discard("image_0")
+    assert "image_0" not in await PipelineCheckpoint("task-1", store=store).load(params)
+
+    # 参数变化时旧检查点作废
+    assert await PipelineCheckpoint("task-1", store=store).load({"child_name": "别人"}) == {}
+
+
+@pytest.mark.asyncio
+async def test_picture_book_pipeline_overlaps_images_and_audio():
+    """Test TTS starts before all images finish and progress counts completions."""
+    import asyncio
+
+    from moana.pipelines.picture_book import PictureBookPipeline
+    from moana.agents.schemas import PictureBookOutline, PictureBookPage
+    from moana.services.image.base import ImageResult
+    from moana.services.tts.base import TTSResult
+
+    outline = PictureBookOutline(
+        title="小莫学刷牙",
+        theme_topic="刷牙",
+        educational_goal="养成刷牙习惯",
+        pages=[
+            PictureBookPage(page_num=i, text=f"第{i}页", image_prompt=f"page {i}", interaction=None)
+            for i in (1, 2)
+        ],
+        total_interactions=0,
+    )
+
+    story_agent = MagicMock()
+    story_agent.generate_outline = AsyncMock(return_value=outline)
+    story_agent._llm.model_name = "test-llm"
+
+    images_release = asyncio.Event()
+    audio_started = asyncio.Event()
+
+    async def slow_image(prompt, style):
+        await images_release.wait()
+        return ImageResult(url=f"https://example.com/{prompt}.png", prompt=prompt)
+
+    async def tts(text, voice_id, speed):
+        audio_started.set()
+        return TTSResult(audio_url="https://example.com/a.mp3", duration=2.0, voice_id="v", model="tts")
+
+    image_service = MagicMock()
+    image_service.generate = AsyncMock(side_effect=slow_image)
+    tts_service = MagicMock()
+    tts_service.synthesize = AsyncMock(side_effect=tts)
+
+    events = []
+    pipeline = PictureBookPipeline(story_agent, image_service, tts_service)
+
+    async def release_images_after_audio():
+        await audio_started.wait()
+        images_release.set()
+
+    with patch("moana.pipelines.picture_book.asyncio.sleep", AsyncMock()):
+        releaser = asyncio.create_task(release_images_after_audio())
+        result = await asyncio.wait_for(pipeline.generate(
+            child_name="小莫", age_months=24, theme_topic="刷牙", theme_category="habit",
+            on_progress=events.append,
+        ), timeout=5)
+        await releaser
+
+    assert len(result["pages"]) == 2
+    for stage in ("images", "audio"):
+        counts = [e.current for e in events if e.stage == stage and e.current > 0]
+        assert counts == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_picture_book_pipeline_dispatches_streamed_pages_early():
+    """Test pages delivered via on_page start before the outline finishes."""
+    import asyncio
+
+    from moana.pipelines.picture_book import PictureBookPipeline
+    from moana.agents.schemas import PictureBookOutline, PictureBookPage
+    from moana.services.image.base import ImageResult
+    from moana.services.tts.base import TTSResult
+
+    pages = [
+        PictureBookPage(page_num=i, text=f"第{i}页", image_prompt=f"page {i}", interaction=None)
+        for i in (1, 2)
+    ]
+    outline = PictureBookOutline(
+        title="小莫学刷牙", theme_topic="刷牙", educational_goal="养成刷牙习惯",
+        pages=pages, total_interactions=0,
+    )
+    image_started = asyncio.Event()
+
+    async def streaming_outline(on_page, **kwargs):
+        on_page(0, pages[0])
+        # 第 1 页的插图在大纲完成前就已开始
+        await asyncio.wait_for(image_started.wait(), timeout=1)
+        on_page(1, pages[1])
+        return outline
+
+    async def image(prompt, style):
+        image_started.set()
+        return ImageResult(url=f"https://example.com/{prompt}.png", prompt=prompt)
+
+    story_agent = MagicMock()
+    story_agent.generate_outline = AsyncMock(side_effect=streaming_outline)
+    story_agent._llm.model_name = "test-llm"
+    image_service = MagicMock()
+    image_service.generate = AsyncMock(side_effect=image)
+    tts_service = MagicMock()
+    tts_service.synthesize = AsyncMock(return_value=TTSResult(
+        audio_url="https://example.com/a.mp3", duration=2.0, voice_id="v", model="tts",
+    ))
+
+    pipeline = PictureBookPipeline(story_agent, image_service, tts_service)
+    with patch("moana.pipelines.picture_book.asyncio.sleep", AsyncMock()):
+        result = await pipeline.generate(
+            child_name="小莫", age_months=24, theme_topic="刷牙", theme_category="habit",
+        )
+
+    assert [p["image_url"] for p in result["pages"]] == [
+        "https://example.com/page 1.png",
+        "https://example.com/page 2.png",
+    ]
+    assert image_service.generate.await_count == 2
+    assert tts_service.synthesize.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_picture_book_pipeline_redispatches_changed_pages():
+    """Test a page rewritten after early dispatch is regenerated from the final outline."""
+    from moana.pipelines.picture_book import PictureBookPipeline
+    from moana.agents.schemas import PictureBookOutline, PictureBookPage
+    from moana.services.image.base import ImageResult
+    from moana.services.tts.base import TTSResult
+
+    streamed = PictureBookPage(page_num=1, text="旧的第1页", image_prompt="old page", interaction=None)
+    pages = [
+        PictureBookPage(page_num=i, text=f"第{i}页", image_prompt=f"page {i}", interaction=None)
+        for i in (1, 2)
+    ]
+    outline = PictureBookOutline(
+        title="小莫学刷牙", theme_topic="刷牙", educational_goal="养成刷牙习惯",
+        pages=pages, total_interactions=0,
+    )
+
+    async def fallback_outline(on_page, **kwargs):
+        on_page(0, streamed)
+        on_page(2, streamed)  # 最终大纲只有 2 页
+        # 流式输出不可用，非流式结果中第 1 页内容不同
+        on_page(0, pages[0])
+        return outline
+
+    prompts = []
+
+    async def image(prompt, style):
+        prompts.append(prompt)
+        return ImageResult(url=f"https://example.com/{prompt}.png", prompt=prompt)
+
+    story_agent = MagicMock()
+    story_agent.generate_outline = AsyncMock(side_effect=fallback_outline)
+    story_agent._llm.model_name = "test-llm"
+    image_service = MagicMock()
+    image_service.generate = AsyncMock(side_effect=image)
+    tts_service = MagicMock()
+    tts_service.synthesize = AsyncMock(return_value=TTSResult(
+        audio_url="https://example.com/a.mp3", duration=2.0, voice_id="v", model="tts",
+    ))
+
+    pipeline = PictureBookPipeline(story_agent, image_service, tts_service)
+    with patch("moana.pipelines.picture_book.asyncio.sleep", AsyncMock()):
+        result = await pipeline.generate(
+            child_name="小莫", age_months=24, theme_topic="刷牙", theme_category="habit",
+        )
+
+    assert [p["image_url"] for p in result["pages"]] == [
+        "https://example.com/page 1.png",
+        "https://example.com/page 2.png",
+    ]
+    # 旧内容的任务在开始前就被取消
+    assert sorted(prompts) == ["page 1", "page 2"]
+
+
+def _two_page_pipeline():
+    from moana.pipelines.picture_book import PictureBookPipeline
+    from moana.agents.schemas import PictureBookOutline, PictureBookPage
+    from moana.services.image.base import ImageResult
+    from moana.services.tts.base import TTSResult
+
+    pages = [
+        PictureBookPage(page_num=i, text=f"第{i}页", image_prompt=f"page {i}", interaction=None)
+        for i in (1, 2)
+    ]
+    story_agent = MagicMock()
+    story_agent.generate_outline = AsyncMock(return_value=PictureBookOutline(
+        title="小莫学刷牙", theme_topic="刷牙", educational_goal="养成刷牙习惯",
+        pages=pages, total_interactions=0,
+    ))
+    story_agent._llm.model_name = "test-llm"
+    image_service = MagicMock()
+    image_service.generate = AsyncMock(return_value=ImageResult(url="https://example.com/i.png", prompt="p"))
+    tts_service = MagicMock()
+    tts_service.synthesize = AsyncMock(return_value=TTSResult(
+        audio_url="https://example.com/a.mp3", duration=2.0, voice_id="v", model="tts",
+    ))
+    return PictureBookPipeline(story_agent, image_service, tts_service), tts_service
+
+
+@pytest.mark.asyncio
+async def test_picture_book_pipeline_whole_book_narration():
+    """Test whole-book mode narrates once and stores clips plus a cue table."""
+    from moana.services.tts.base import TTSResult
+    from moana.services.tts.narration import BookNarration
+
+    pipeline, tts_service = _two_page_pipeline()
+    narration = BookNarration(
+        audio_url="https://example.com/book.m4a",
+        duration=5.0,
+        cues=[{"page_num": 1, "start": 0.0, "end": 2.4}, {"page_num": 2, "start": 2.4, "end": 5.0}],
+        pages=[
+            TTSResult(audio_url=f"https://example.com/p{i}.m4a", duration=d, voice_id="v", model="tts")
+            for i, d in ((1, 2.4), (2, 2.6))
+        ],
+    )
+    page_audio = []
+
+    async def on_page_audio(index, url):
+        page_audio.append((index, url))
+
+    with patch("moana.pipelines.picture_book.narrate_book", AsyncMock(return_value=narration)) as narrate:
+        result = await pipeline.generate(
+            child_name="小莫", age_months=24, theme_topic="刷牙", theme_category="habit",
+            whole_book_audio=True, on_page_audio=on_page_audio,
+        )
+
+    assert narrate.await_count == 1
+    assert narrate.await_args.args[1] == ["第1页", "第2页"]
+    tts_service.synthesize.assert_not_awaited()
+    assert [p["audio_url"] for p in result["pages"]] == ["https://example.com/p1.m4a", "https://example.com/p2.m4a"]
+    assert result["total_duration"] == 5.0
+    assert result["narration"]["audio_url"] == "https://example.com/book.m4a"
+    assert [c["page_num"] for c in result["narration"]["cues"]] == [1, 2]
+    assert sorted(page_audio) == [(0, "https://example.com/p1.m4a"), (1, "https://example.com/p2.m4a")]
+
+
+@pytest.mark.asyncio
+async def test_picture_book_pipeline_whole_book_falls_back_per_page():
+    """Test an unsplittable narration falls back to one request per page."""
+    from moana.services.tts.narration import NarrationSplitError
+
+    pipeline, tts_service = _two_page_pipeline()
+    with patch(
+        "moana.pipelines.picture_book.narrate_book",
+        AsyncMock(side_effect=NarrationSplitError("found 0 silences")),
+    ):
+        result = await pipeline.generate(
+            child_name="小莫", age_months=24, theme_topic="刷牙", theme_category="habit",
+            whole_book_audio=True,
+        )
+
+    assert tts_service.synthesize.await_count == 2
+    assert [p["audio_url"] for p in result["pages"]] == ["https://example.com/a.mp3"] * 2
+    assert "narration" not in result
+
+
+@pytest.mark.asyncio
+async def test_picture_book_pipeline_whole_book_falls_back_on_provider_errors():
+    """Test download / provider errors during narration also fall back per page."""
+    import httpx
+
+    pipeline, tts_service = _two_page_pipeline()
+    for error in (httpx.ConnectError("storage down"), ValueError("TTS error: quota")):
+        tts_service.synthesize.reset_mock()
+        with patch("moana.pipelines.picture_book.narrate_book", AsyncMock(side_effect=error)):
+            result = await pipeline.generate(
+                child_name="小莫", age_months=24, theme_topic="刷牙", theme_category="habit",
+                whole_book_audio=True,
+            )
+        assert tts_service.synthesize.await_count == 2
+        assert "narration" not in result
@@ -0,0 +1,168 @@
+# tests/services/test_audio_converter.py
+import asyncio
+import io
+import os
+import shutil
+import stat
+import sys
+import wave
+from unittest.mock import patch
+
+import pytest
+
+
+def _wav(seconds: float = 0.2, sample_rate: int = 24000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"\x00\x01" * int(seconds * sample_rate))
+    return buffer.getvalue()
+
+
+class FakeProcess:
+    """Echoes stdin back as "AAC" after a short delay."""
+
+    running = 0
+    peak = 0
+
+    def __init__(self, returncode: int = 0):
+        self.returncode = None
+        self._exit_code = returncode
+
+    async def communicate(self, data: bytes):
+        FakeProcess.running += 1
+        FakeProcess.peak = max(FakeProcess.peak, FakeProcess.running)
+        await asyncio.sleep(0.02)
+        FakeProcess.running -= 1
+        self.returncode = self._exit_code
+        if self._exit_code:
+            return b"", b"Invalid data found when processing input"
+        return b"aac:" + data[:4], b""
+
+
+@pytest.fixture
+def limiter():
+    from moana.services.audio import reset_ffmpeg_limiter
+    from moana.services.audio.converter import FFmpegLimiter
+
+    FakeProcess.running = FakeProcess.peak = 0
+    reset_ffmpeg_limiter()
+    with patch("moana.services.audio.converter._limiter", FFmpegLimiter(2)) as limiter:
+        yield limiter
+    reset_ffmpeg_limiter()
+
+
+@pytest.mark.asyncio
+async def test_wav_to_aac_streams_over_pipes(limiter):
+    """Test conversion passes audio via stdin/stdout with a fragmented MP4 muxer."""
+    from moana.services.audio import AudioConverter
+
+    calls = []
+
+    async def spawn(*args, **kwargs):
+        calls.append((args, kwargs))
+        return FakeProcess()
+
+    with patch("asyncio.create_subprocess_exec", side_effect=spawn):
+        result = await AudioConverter.wav_to_aac(b"RIFFdata")
+        await AudioConverter.wav_to_aac(b"RIFFdata", container="adts")
+
+    assert result == b"aac:RIFF"
+    mp4_args, kwargs = calls[0]
+    assert mp4_args[-1] == "pipe:1" and "pipe:0" in mp4_args
+    assert "frag_keyframe+empty_moov+default_base_moof" in mp4_args
+    assert kwargs["stdin"] == asyncio.subprocess.PIPE
+    adts_args, _ = calls[1]
+    assert adts_args[adts_args.index("-f", adts_args.index("-c:a")) + 1] == "adts"
+
+
+@pytest.mark.asyncio
+async def test_wav_to_aac_respects_concurrency_cap(limiter):
+    """Test a burst of conversions never runs more ffmpeg processes than the cap."""
+    from moana.services.audio import AudioConverter, ffmpeg_stats
+
+    async def spawn(*args, **kwargs):
+        return FakeProcess()
+
+    with patch("asyncio.create_subprocess_exec", side_effect=spawn):
+        results = await asyncio.gather(*(AudioConverter.wav_to_aac(b"RIFF%d" % i) for i in range(6)))
+
+    assert len(results) == 6
+    assert FakeProcess.peak == 2
+    stats = ffmpeg_stats()
+    assert stats["processes"] == 6
+    assert stats["running"] == 0 and stats["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_wav_to_aac_failure_raises(limiter):
+    """Test a non-zero ffmpeg exit raises and releases the slot."""
+    from moana.services.audio import AudioConverter, ffmpeg_stats
+
+    async def spawn(*args, **kwargs):
+        return FakeProcess(returncode=1)
+
+    with patch("asyncio.create_subprocess_exec", side_effect=spawn):
+        with pytest.raises(RuntimeError, match="ffmpeg conversion failed"):
+            await AudioConverter.wav_to_aac(b"bad")
+
+    stats = ffmpeg_stats()
+    assert stats["failures"] == 1
+    assert stats["running"] == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(os.name != "posix", reason="batch conversion uses inherited pipes")
+async def test_wav_to_aac_batch_wires_one_pipe_pair_per_clip(limiter, tmp_path, monkeypatch):
+    """Test batch conversion feeds each clip to its own pipe and keeps output order."""
+    from moana.services.audio import AudioConverter
+
+    # 按参数中的 pipe:<fd> 把每个输入原样（加前缀）写到对应输出的 ffmpeg 替身
+    script = tmp_path / "ffmpeg"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import os, sys\n"
+        "args = sys.argv[1:]\n"
+        "ins = [int(args[i + 1][5:]) for i, a in enumerate(args) if a == '-i']\n"
+        "outs = [int(a[5:]) for a in args if a.startswith('pipe:') and int(a[5:]) not in ins]\n"
+        "data = []\n"
+        "for fd in ins:\n"
+        "    with os.fdopen(fd, 'rb') as f:\n"
+        "        data.append(f.read())\n"
+        "for fd, clip in zip(outs, data):\n"
+        "    with os.fdopen(fd, 'wb') as f:\n"
+        "        f.write(b'aac:' + clip)\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+
+    clips = [b"clip-%d" % i * (i + 1) for i in range(5)]
+    results = await AudioConverter.wav_to_aac_batch(clips, max_clips_per_process=2)
+
+    assert results == [b"aac:" + clip for clip in clips]
+    assert limiter.processes == 3  # 5 个片段，每个进程 2 个
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+async def test_wav_to_aac_real_ffmpeg(limiter):
+    """Test real ffmpeg produces fragmented MP4 and ADTS output from pipes."""
+    from moana.services.audio import AudioConverter
+
+    m4a = await AudioConverter.wav_to_aac(_wav())
+    assert m4a[4:8] == b"ftyp"
+
+    adts = await AudioConverter.wav_to_aac_batch([_wav(), _wav(0.4)], container="adts")
+    assert len(adts) == 2
+    assert all(clip[:2] in (b"\xff\xf1", b"\xff\xf9") for clip in adts)
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+async def test_probe_duration_real_ffmpeg(limiter):
+    """Test the decoded duration is measured from the audio itself."""
+    from moana.services.audio import AudioConverter
+
+    assert await AudioConverter.probe_duration(_wav(1.5)) == pytest.approx(1.5, abs=0.05)
@@ -0,0 +1,147 @@
+# tests/services/test_dedup.py
+import time
+
+import pytest
+
+
+@pytest.fixture
+def stores():
+    from moana.services.scheduler import reset_generation_scheduler
+    from moana.services.task_state import get_task_state_store, reset_task_state_stores
+
+    reset_task_state_stores()
+    reset_generation_scheduler()
+    yield get_task_state_store("dedup"), get_task_state_store("content")
+    reset_task_state_stores()
+    reset_generation_scheduler()
+
+
+def test_fingerprint_normalizes_params():
+    """Test whitespace, empty values and list order don't change the fingerprint."""
+    from moana.services.scheduler import request_fingerprint
+
+    a = request_fingerprint("picture_book", {
+        "child_name": "小明 ",
+        "theme_topic": "刷牙",
+        "favorite_characters": ["小熊", "小兔"],
+        "voice_id": None,
+    })
+    b = request_fingerprint("picture_book", {
+        "child_name": "小明",
+        "theme_topic": "刷牙",
+        "favorite_characters": ["小兔", "小熊"],
+        "custom_prompt": "",
+    })
+    assert a == b
+    assert a != request_fingerprint("nursery_rhyme", {"child_name": "小明", "theme_topic": "刷牙"})
+    assert a != request_fingerprint("picture_book", {"child_name": "小红", "theme_topic": "刷牙"})
+
+
+@pytest.mark.asyncio
+async def test_claim_join_reuse_and_takeover(stores):
+    """Test in-flight join, reuse within window and takeover after failure."""
+    from unittest.mock import patch
+
+    from moana.services.scheduler import GenerationDeduplicator
+
+    dedup_store, task_store = stores
+    dedup = GenerationDeduplicator(reuse_window=60, store=dedup_store, task_store=task_store)
+
+    await task_store.set("t1", {"status": "pending"})
+    assert (await dedup.claim("fp", "t1")).action == "new"
+
+    await task_store.set("t2", {"status": "pending"})
+    decision = await dedup.claim("fp", "t2")
+    assert decision.action == "join" and decision.task_id == "t1"
+
+    await task_store.set("t1", {"status": "completed", "content_id": "c1"})
+    decision = await dedup.claim("fp", "t3")
+    assert decision.action == "reuse" and decision.content_id == "c1"
+
+    # 超出复用窗口
+    with patch("moana.services.scheduler.dedup.time.time", return_value=time.time() + 120):
+        assert (await dedup.claim("fp", "t4")).action == "new"
+
+    # 失败的任务不被合并
+    await task_store.set("t4", {"status": "failed", "error": "boom"})
+    assert (await dedup.claim("fp", "t5")).action == "new"
+
+    await dedup.release("fp", "t5")
+    assert await dedup_store.get("fp") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_takeover_starts_one_task(stores):
+    """Test identical retries after a failure take over once; the others join."""
+    import asyncio
+
+    from moana.services.scheduler import GenerationDeduplicator
+
+    dedup_store, task_store = stores
+    dedup = GenerationDeduplicator(reuse_window=60, store=dedup_store, task_store=task_store)
+
+    await task_store.set("t1", {"status": "pending"})
+    assert (await dedup.claim("fp", "t1")).action == "new"
+    await task_store.set("t1", {"status": "failed", "error": "boom"})
+
+    # 让所有重试都在任何一个接管之前读到失败状态
+    get_status = task_store.get
+
+    async def slow_get(task_id):
+        state = await get_status(task_id)
+        await asyncio.sleep(0.01)
+        return state
+
+    task_store.get = slow_get
+    retries = ["r1", "r2", "r3"]
+    for task_id in retries:
+        await task_store.set(task_id, {"status": "pending"})
+    decisions = await asyncio.gather(*(dedup.claim("fp", task_id) for task_id in retries))
+
+    assert sorted(d.action for d in decisions) == ["join", "join", "new"]
+    winner = next(d.task_id for d in decisions if d.action == "new")
+    assert {d.task_id for d in decisions} == {winner}
+    assert (await dedup_store.get("fp"))["task_id"] == winner
+
+
+@pytest.mark.asyncio
+async def test_async_endpoint_coalesces_identical_requests(stores):
+    """Test a duplicate request joins the in-flight task instead of starting another."""
+    import asyncio
+    from unittest.mock import patch
+
+    from httpx import ASGITransport, AsyncClient
+
+    from moana.main import app
+    from moana.services.scheduler import GenerationScheduler
+
+    scheduler = GenerationScheduler(limits={"picture_book": 1})
+    release = asyncio.Event()
+    started: list[str] = []
+
+    async def fake_generate(task_id, **kwargs):
+        started.append(task_id)
+        await release.wait()
+
+    payload = {
+        "child_name": "小明",
+        "age_months": 36,
+        "theme_topic": "刷牙",
+        "theme_category": "habit",
+    }
+    with patch("moana.api.content.get_generation_scheduler", return_value=scheduler), \
+            patch("moana.api.content._generate_picture_book_background", side_effect=fake_generate):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            first = (await client.post("/api/v1/content/picture-book/async", json=payload)).json()
+            second = (await client.post(
+                "/api/v1/content/picture-book/async",
+                json={**payload, "child_name": " 小明"},
+            )).json()
+
+        assert second["task_id"] == first["task_id"]
+        await asyncio.sleep(0)
+        assert started == [first["task_id"]]
+
+        release.set()
+        await scheduler.shutdown()
@@ -0,0 +1,134 @@
+# tests/services/test_executor.py
+import asyncio
+import contextvars
+import time
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_keeps_loop_responsive():
+    """Test blocking calls run in the executor while the loop keeps ticking."""
+    from moana.services.executor import run_blocking
+
+    request_id = contextvars.ContextVar("request_id")
+    request_id.set("req-1")
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    def blocking_call(delay):
+        time.sleep(delay)
+        # contextvars 随调用传递到线程
+        return request_id.get()
+
+    task = asyncio.create_task(heartbeat())
+    result = await run_blocking(blocking_call, 0.2)
+    task.cancel()
+
+    assert result == "req-1"
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_slow_callback_warnings_flag_blocking_steps(caplog):
+    """Test debug mode logs a coroutine step that holds the loop past the threshold."""
+    import logging
+
+    from moana.services.executor import enable_slow_callback_warnings
+
+    loop = asyncio.get_running_loop()
+    debug, threshold = loop.get_debug(), loop.slow_callback_duration
+
+    async def blocks_loop():
+        time.sleep(0.1)
+
+    try:
+        enable_slow_callback_warnings(20)
+        with caplog.at_level(logging.WARNING, logger="asyncio"):
+            await asyncio.create_task(blocks_loop())
+            await asyncio.sleep(0)
+        assert any("took" in record.getMessage() for record in caplog.records)
+    finally:
+        loop.set_debug(debug)
+        loop.slow_callback_duration = threshold
+
+
+@pytest.mark.asyncio
+async def test_run_image_task_uses_separate_process():
+    """Test image work runs in the process pool, not on the loop's process."""
+    import os
+
+    from moana.services.executor import run_image_task, shutdown_image_executor
+
+    try:
+        pid = await run_image_task(os.getpid)
+    finally:
+        shutdown_image_executor(wait=True)
+
+    assert pid != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_run_image_task_falls_back_when_pool_breaks():
+    """Test a broken process pool is dropped and the call runs in the thread pool."""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+    from unittest.mock import patch
+
+    from moana.services import executor
+
+    class BrokenPool(ThreadPoolExecutor):
+        def submit(self, fn, /, *args, **kwargs):
+            raise BrokenProcessPool("worker died")
+
+    pool = BrokenPool(max_workers=1)
+    with patch.object(executor, "_image_executor", pool):
+        name = await executor.run_image_task(lambda: threading.current_thread().name)
+        assert executor._image_executor is None
+
+    assert name.startswith("moana-blocking")
+
+
+@pytest.mark.asyncio
+async def test_run_image_task_propagates_task_errors():
+    """Test an OSError raised by the task itself (bad image) is not treated as a pool failure."""
+    import io
+    from concurrent.futures import ThreadPoolExecutor
+    from unittest.mock import patch
+
+    from PIL import Image, UnidentifiedImageError
+
+    from moana.services import executor
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        with patch.object(executor, "_image_executor", pool), \
+             patch.object(executor, "run_blocking") as run_blocking:
+            with pytest.raises(UnidentifiedImageError):
+                await executor.run_image_task(lambda: Image.open(io.BytesIO(b"not an image")))
+            assert executor._image_executor is pool
+            run_blocking.assert_not_called()
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_image_task_without_process_pool():
+    """Test the thread pool is used when the process pool cannot be created."""
+    import threading
+    from unittest.mock import patch
+
+    from moana.services import executor
+
+    executor.shutdown_image_executor()
+    with patch.object(executor, "ProcessPoolExecutor", side_effect=OSError("no semaphores")):
+        assert executor.get_image_executor() is None
+        name = await executor.run_image_task(lambda: threading.current_thread().name)
+
+    assert name.startswith("moana-blocking")
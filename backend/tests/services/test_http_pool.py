@@ -0,0 +1,55 @@
+# tests/services/test_http_pool.py
+import httpx
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_http_registry_reuses_client_per_upstream():
+    """Test one shared client per upstream/proxy variant with per-call timeouts."""
+    from moana.services.http import HTTPClientRegistry
+
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json={"ok": True})
+
+    registry = HTTPClientRegistry(http2=False)
+    first = registry.client("suno", timeout=30.0)
+    second = registry.client("suno", timeout=5.0)
+    assert first.client is second.client
+    assert registry.client("suno", direct=True).client is not first.client
+    assert registry.client("wanx").client is not first.client
+
+    # 使用 MockTransport 代替真实网络
+    first.client._transport = httpx.MockTransport(handler)
+    assert (await first.get("https://api.example.com/a")).json() == {"ok": True}
+    await second.post("https://api.example.com/b", json={})
+    assert seen == [30.0, 5.0]
+
+    stats = {(s["name"], s["variant"]): s for s in registry.stats()}
+    assert stats[("suno", "env")]["requests"] == 2
+    assert stats[("suno", "env")]["in_flight"] == 0
+    assert ("suno", "direct") in stats
+
+    await registry.aclose()
+    assert first.client.is_closed
+    # 关闭后重新获取会创建新客户端
+    assert not registry.client("suno").client.is_closed
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_http_client_context_does_not_close_shared_client():
+    """Test leaving the context manager keeps the pooled client open."""
+    from moana.services.http import close_http_clients, http_client, http_pool_stats
+
+    await close_http_clients()
+    async with http_client("wechat", timeout=10.0) as client:
+        shared = client.client
+    assert not shared.is_closed
+    assert [s["name"] for s in http_pool_stats()] == ["wechat"]
+
+    await close_http_clients()
+    assert shared.is_closed
+    assert http_pool_stats() == []
@@ -14,3 +14,31 @@ def test_flux_service_initialization():
 
     service = FluxService()
     assert service is not None
+
+
+@pytest.mark.asyncio
+async def test_optimize_image_in_process_pool():
+    """Test WebP conversion and thumbnail run off the event loop with PNG fallback."""
+    import io
+
+    from PIL import Image
+
+    from moana.services.executor import shutdown_image_executor
+    from moana.services.image import optimize_image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (512, 512), (200, 120, 40)).save(buffer, format="PNG")
+
+    try:
+        result = await optimize_image(buffer.getvalue())
+        broken = await optimize_image(b"not an image")
+    finally:
+        shutdown_image_executor(wait=True)
+
+    assert result.ext == "webp" and result.content_type == "image/webp"
+    assert result.data[:4] == b"RIFF"
+    assert Image.open(io.BytesIO(result.thumb)).size == (256, 256)
+
+    assert broken.ext == "png" and broken.data == b"not an image"
+    assert broken.thumb is None
+    assert len(broken.warnings) == 2
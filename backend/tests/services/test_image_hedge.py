@@ -0,0 +1,128 @@
+# tests/services/test_image_hedge.py
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock
+
+
+def _provider(name, delay=0.0, error=None):
+    from moana.services.image.base import ImageResult
+
+    service = MagicMock()
+    service.provider_name = name
+    state = {"cancelled": False}
+
+    async def generate(**kwargs):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        if error is not None:
+            raise error
+        return ImageResult(url=f"https://example.com/{name}.webp", prompt=kwargs["prompt"], model=name)
+
+    service.generate = generate
+    service.state = state
+    return service
+
+
+def _hedged(providers, **kwargs):
+    from moana.services.image.hedged import HedgedImageService, reset_image_hedge_stats
+
+    reset_image_hedge_stats()
+    services = {service.provider_name: service for service in providers}
+    return HedgedImageService(list(services), services.__getitem__, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_hedge_fires_after_slow_primary_and_cancels_loser():
+    """Test a slow primary triggers a hedged request and the loser is cancelled."""
+    from moana.services.image.hedged import image_hedge_stats
+
+    slow = _provider("gemini", delay=5)
+    fast = _provider("wanx", delay=0.01)
+    service = _hedged([slow, fast], default_hedge_delay=0.05)
+
+    result = await service.generate(prompt="a bunny")
+    await asyncio.sleep(0)
+
+    assert result.model == "wanx"
+    assert slow.state["cancelled"]
+    stats = image_hedge_stats()
+    assert stats["gemini"]["hedges"] == 1
+    assert stats["wanx"]["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_primary_within_budget_is_not_hedged():
+    """Test no hedge is sent when the primary answers before its hedge delay."""
+    primary = _provider("gemini", delay=0.01)
+    backup = _provider("wanx")
+    service = _hedged([primary, backup], default_hedge_delay=1)
+
+    result = await service.generate(prompt="a bunny")
+    assert result.model == "gemini"
+    assert service.hedge_delay("gemini") == 1  # 样本不足，仍用默认延迟
+
+
+@pytest.mark.asyncio
+async def test_failover_on_error_and_raise_when_all_fail():
+    """Test a failed provider fails over immediately; the last error surfaces if all fail."""
+    refused = _provider("gemini", error=RuntimeError("No image generated by Gemini"))
+    backup = _provider("flux", delay=0.01)
+    service = _hedged([refused, backup], default_hedge_delay=30)
+
+    result = await asyncio.wait_for(service.generate(prompt="a bunny"), timeout=1)
+    assert result.model == "flux"
+
+    service = _hedged([
+        _provider("gemini", error=RuntimeError("refused")),
+        _provider("flux", error=ValueError("bad request")),
+    ])
+    with pytest.raises(ValueError, match="bad request"):
+        await service.generate(prompt="a bunny")
+
+
+@pytest.mark.asyncio
+async def test_failover_skips_provider_retries_except_last():
+    """Test chained providers are tried once; the last one keeps its own retries."""
+    from tenacity import retry, stop_after_attempt
+
+    from moana.services.image.base import ImageResult
+
+    class RetryingProvider:
+        def __init__(self, name, failures):
+            self.provider_name = name
+            self.failures = failures
+            self.calls = 0
+
+        @retry(stop=stop_after_attempt(3), reraise=True)
+        async def generate(self, **kwargs):
+            self.calls += 1
+            if self.calls <= self.failures:
+                raise RuntimeError(f"{self.provider_name} refused")
+            return ImageResult(url="https://example.com/x.webp", prompt=kwargs["prompt"], model=self.provider_name)
+
+    primary = RetryingProvider("gemini", failures=1)
+    backup = RetryingProvider("flux", failures=2)
+    service = _hedged([primary, backup], default_hedge_delay=30)
+
+    result = await asyncio.wait_for(service.generate(prompt="a bunny"), timeout=1)
+
+    assert result.model == "flux"
+    # 第一次拒绝即切换，不再重试 primary；末位 provider 仍按自身策略重试
+    assert primary.calls == 1
+    assert backup.calls == 3
+
+
+def test_hedge_delay_uses_rolling_quantile():
+    """Test the hedge delay follows the provider's rolling p95 once enough samples exist."""
+    from moana.services.image.hedged import get_latency_tracker
+
+    service = _hedged([_provider("gemini"), _provider("wanx")], min_samples=20, default_hedge_delay=45)
+    tracker = get_latency_tracker("gemini")
+    for latency in range(1, 21):
+        tracker.record(float(latency))
+
+    assert service.hedge_delay("gemini") == 20.0
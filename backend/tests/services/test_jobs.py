@@ -0,0 +1,133 @@
+# tests/services/test_jobs.py
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+
+def _fast_kind(name, query, **kwargs):
+    from moana.services.jobs import JobKind
+
+    options = {"expected_duration": 0.05, "min_interval": 0.01, "max_interval": 0.05}
+    options.update(kwargs)
+    return JobKind(name=name, query=query, **options)
+
+
+@pytest.mark.asyncio
+async def test_poller_resolves_jobs_and_learns_duration():
+    """Test jobs are polled until done, batched per kind and durations are recorded."""
+    from moana.services.jobs import JobPoller, JobStatus
+    from moana.services.task_state import MemoryTaskStateStore
+
+    checks = {"a": 0, "b": 0}
+    batches = []
+
+    async def query(job_ids):
+        batches.append(list(job_ids))
+        statuses = {}
+        for job_id in job_ids:
+            checks[job_id] += 1
+            done = checks[job_id] >= 2
+            statuses[job_id] = JobStatus("succeeded", result=f"url-{job_id}") if done else JobStatus("running")
+        return statuses
+
+    poller = JobPoller(store=MemoryTaskStateStore("jobs"))
+    poller.register_kind(_fast_kind("video", query, max_batch=2, min_interval=0.03))
+    try:
+        results = await asyncio.gather(
+            poller.wait("video", "a", timeout=5),
+            poller.wait("video", "b", timeout=5),
+        )
+    finally:
+        await poller.close()
+
+    assert results == ["url-a", "url-b"]
+    assert any(len(batch) == 2 for batch in batches)
+    stats = poller.stats()
+    assert stats["outstanding"] == 0
+    assert stats["kinds"]["video"]["samples"] == 2
+
+    # 结果已持久化：再次等待直接返回，不再查询
+    query_count = len(batches)
+    assert await poller.wait("video", "a") == "url-a"
+    assert len(batches) == query_count
+
+
+@pytest.mark.asyncio
+async def test_poller_failures_and_timeouts():
+    """Test provider failures, repeated query errors and timeouts reach the waiter."""
+    from moana.services.jobs import JobFailedError, JobPoller, JobStatus, JobTimeoutError
+    from moana.services.task_state import MemoryTaskStateStore
+
+    store = MemoryTaskStateStore("jobs")
+    poller = JobPoller(store=store)
+    poller.register_kind(_fast_kind(
+        "failing", AsyncMock(return_value={"x": JobStatus("failed", error="content rejected")})
+    ))
+    poller.register_kind(_fast_kind(
+        "flaky", AsyncMock(side_effect=ConnectionError("reset")), max_query_errors=3
+    ))
+    slow_query = AsyncMock(return_value={})
+    poller.register_kind(_fast_kind("slow", slow_query))
+    try:
+        with pytest.raises(JobFailedError, match="content rejected"):
+            await poller.wait("failing", "x", timeout=5)
+        with pytest.raises(JobFailedError, match="polling errors"):
+            await poller.wait("flaky", "y", timeout=5)
+        with pytest.raises(JobTimeoutError):
+            await poller.wait("slow", "z", timeout=0.1)
+        await asyncio.sleep(0)
+    finally:
+        await poller.close()
+
+    assert (await store.get("failing:x"))["status"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_submit_once_reuses_outstanding_job_and_recovers():
+    """Test identical requests reuse the submitted job and a new worker resumes tracking it."""
+    from moana.services.jobs import JobPoller, JobStatus
+    from moana.services.task_state import MemoryTaskStateStore
+
+    store = MemoryTaskStateStore("jobs")
+    submit = AsyncMock(return_value="task-1")
+
+    first = JobPoller(store=store)
+    assert await first.submit_once("video", "fp", submit) == "task-1"
+    assert await first.submit_once("video", "fp", submit) == "task-1"
+    submit.assert_awaited_once()
+
+    # 新 worker：恢复未完成任务，注册类型后继续轮询
+    second = JobPoller(store=store)
+    assert await second.recover() == 1
+    assert second.stats()["pending_recovery"] == 1
+    query = AsyncMock(return_value={"task-1": JobStatus("succeeded", result="done")})
+    second.register_kind(_fast_kind("video", query))
+    try:
+        assert second.stats()["outstanding"] == 1
+        assert await second.wait("video", "task-1") == "done"
+    finally:
+        await second.close()
+    query.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_complete_records_jobs_finished_without_polling():
+    """Test a job already done at submit time is persisted as completed and kinds register once."""
+    from moana.services.jobs import JobPoller
+    from moana.services.task_state import MemoryTaskStateStore
+
+    store = MemoryTaskStateStore("jobs")
+    poller = JobPoller(store=store)
+    first_query, second_query = AsyncMock(), AsyncMock()
+    poller.ensure_kind(_fast_kind("video", first_query))
+    poller.ensure_kind(_fast_kind("video", second_query))
+    assert poller._kinds["video"].query is first_query
+
+    assert await poller.submit_once("video", "fp", AsyncMock(return_value="task-1")) == "task-1"
+    await poller.complete("video", "task-1", result="done")
+    assert (await store.get("video:task-1"))["status"] == "completed"
+
+    # 已完成的任务不会被新 worker 重新跟踪
+    assert await JobPoller(store=store).recover() == 0
+    first_query.assert_not_awaited()
@@ -60,3 +60,104 @@ def test_get_llm_service_claude():
 
     service = get_llm_service()
     assert isinstance(service, ClaudeService)
+
+
+def test_incremental_json_array_parser():
+    """Test array elements are emitted as soon as they close."""
+    import json
+
+    from moana.services.llm.json_stream import IncrementalJSONArrayParser
+
+    doc = "```json\n" + json.dumps({
+        "title": "带 \"引号\" 和 }[ 的标题",
+        "pages": [
+            {"page_num": 1, "text": "a}{", "interaction": {"options": [1, 2]}},
+            {"page_num": 2, "text": "b"},
+        ],
+        "total_interactions": 1,
+    }, ensure_ascii=False) + "\n```"
+
+    parser = IncrementalJSONArrayParser("pages")
+    emitted = []
+    for i, char in enumerate(doc):
+        for item in parser.feed(char):
+            emitted.append((item["page_num"], i))
+
+    assert [num for num, _ in emitted] == [1, 2]
+    # 第 1 页在文档结束前就已解析
+    assert emitted[0][1] < doc.index('"page_num": 2')
+    assert parser.result()["total_interactions"] == 1
+
+
+def test_incremental_json_array_parser_incomplete():
+    """Test result() rejects a truncated object."""
+    from moana.services.llm.json_stream import IncrementalJSONArrayParser
+
+    parser = IncrementalJSONArrayParser("pages")
+    assert parser.feed('{"pages": [{"page_num": 1}, {"page_') == [{"page_num": 1}]
+    with pytest.raises(ValueError):
+        parser.result()
+
+
+def test_incremental_json_array_parser_malformed_element():
+    """Test an undecodable element yields None without losing later elements."""
+    from moana.services.llm.json_stream import IncrementalJSONArrayParser
+
+    parser = IncrementalJSONArrayParser("pages")
+    emitted = parser.feed('{"pages": [{"page_num": 1,}, {"page_num": 2}], "total": 2}')
+    assert emitted == [None, {"page_num": 2}]
+    # 整体仍不是合法 JSON
+    with pytest.raises(ValueError):
+        parser.result()
+
+
+@pytest.mark.asyncio
+async def test_llm_memo_memory_and_persistent_tiers():
+    """Test normalized inputs hit the LRU tier, a fresh memo hits the persistent tier."""
+    from moana.services.llm.memo import LLMMemo
+    from moana.services.task_state import MemoryTaskStateStore
+
+    store = MemoryTaskStateStore("llm_memo")
+    compute = AsyncMock(return_value={"theme_topic": "刷牙"})
+
+    memo = LLMMemo("smart_analyze", store=store, max_entries=2)
+    first = await memo.get_or_compute({"prompt": "不爱刷牙", "age": 36}, "gemini-flash", compute)
+    second = await memo.get_or_compute({"age": 36, "prompt": "  不爱刷牙 "}, "gemini-flash", compute)
+    assert first == second == {"theme_topic": "刷牙"}
+    compute.assert_awaited_once()
+
+    # 换模型不复用
+    await memo.get_or_compute({"prompt": "不爱刷牙", "age": 36}, "gemini-pro", compute)
+    assert compute.await_count == 2
+
+    # 另一个 worker（新的内存层）从持久层命中
+    other = LLMMemo("smart_analyze", store=store)
+    assert await other.get_or_compute({"prompt": "不爱刷牙", "age": 36}, "gemini-flash", compute) == first
+    assert compute.await_count == 2
+
+    assert memo.stats()["memory_hits"] == 1
+    assert memo.stats()["misses"] == 2
+    assert other.stats()["store_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_llm_memo_skips_failures_and_disabled_sites():
+    """Test failed / None results are not cached and disabled memos always compute."""
+    from moana.services.llm.memo import LLMMemo
+    from moana.services.task_state import MemoryTaskStateStore
+
+    memo = LLMMemo("suno_prompt", store=MemoryTaskStateStore("llm_memo"))
+    failing = AsyncMock(side_effect=RuntimeError("API Error"))
+    with pytest.raises(RuntimeError):
+        await memo.get_or_compute({"template_prompt": "刷牙歌"}, "gemini", failing)
+    empty = AsyncMock(return_value=None)
+    assert await memo.get_or_compute({"template_prompt": "刷牙歌"}, "gemini", empty) is None
+    ok = AsyncMock(return_value="[Cheerful Children's Pop] ...")
+    assert await memo.get_or_compute({"template_prompt": "刷牙歌"}, "gemini", ok) == "[Cheerful Children's Pop] ..."
+    ok.assert_awaited_once()
+
+    disabled = LLMMemo("intent", store=MemoryTaskStateStore("llm_memo"), enabled=False)
+    compute = AsyncMock(return_value={"theme": "恐龙"})
+    await disabled.get_or_compute({"user_input": "喜欢恐龙"}, "gemini", compute)
+    await disabled.get_or_compute({"user_input": "喜欢恐龙"}, "gemini", compute)
+    assert compute.await_count == 2
@@ -0,0 +1,53 @@
+# tests/services/test_loop_monitor.py
+import asyncio
+import time
+
+import pytest
+
+
+def _blocking_work():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_records_lag_and_offender():
+    """Test lag percentiles are sampled and a blocking call site is captured."""
+    from moana.services.loop_monitor import LoopMonitor
+
+    monitor = LoopMonitor(interval=0.02, slow_threshold=0.05)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.1)
+        _blocking_work()
+        await asyncio.sleep(0.1)
+    finally:
+        await monitor.stop()
+
+    stats = monitor.stats()
+    assert not stats["running"]
+    assert stats["samples"] > 3
+    assert stats["lag_ms"]["max"] >= 200
+    assert stats["stalls"] >= 1
+    offender = stats["top_offenders"][0]
+    assert "_blocking_work" in offender["location"]
+    assert offender["max_ms"] >= 200
+    assert any("_blocking_work" in line for line in offender["stack"])
+
+
+@pytest.mark.asyncio
+async def test_admin_loop_endpoint():
+    """Test the admin endpoint reports the loop monitor stats."""
+    from httpx import ASGITransport, AsyncClient
+
+    from moana.main import app
+    from moana.services.loop_monitor import stop_loop_monitor
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/v1/admin/loop")
+    await stop_loop_monitor()
+
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data["lag_ms"]) == {"p50", "p99", "max"}
+    assert "top_offenders" in data
@@ -86,3 +86,135 @@ def test_review_agent_import():
     from moana.agents import ReviewAgent
 
     assert ReviewAgent is not None
+
+
+def _counting_service(unsafe_text=None):
+    from moana.services.moderation.base import (
+        ModerationCategory,
+        ModerationResult,
+        ModerationService,
+    )
+
+    class CountingService(ModerationService):
+        def __init__(self):
+            self.calls = {"texts": 0, "image": 0, "audio": 0}
+
+        async def moderate_text(self, text):
+            raise AssertionError("texts should be moderated in one batch")
+
+        async def moderate_texts(self, texts):
+            self.calls["texts"] += 1
+            return [
+                ModerationResult(is_safe=False, categories=[ModerationCategory.VIOLENCE])
+                if text == unsafe_text else ModerationResult(is_safe=True)
+                for text in texts
+            ]
+
+        async def moderate_image(self, image_url):
+            self.calls["image"] += 1
+            return ModerationResult(is_safe=True)
+
+        async def moderate_audio(self, audio_url):
+            self.calls["audio"] += 1
+            return ModerationResult(is_safe=True)
+
+    return CountingService()
+
+
+@pytest.mark.asyncio
+async def test_engine_batches_texts_and_caches_verdicts():
+    """Test a book's texts go out in one batch and re-reviews are served from the cache."""
+    from moana.models import ReviewStatus
+    from moana.services.moderation import ModerationEngine
+    from moana.services.task_state import MemoryTaskStateStore
+
+    service = _counting_service()
+    engine = ModerationEngine(service, store=MemoryTaskStateStore("moderation"))
+    texts = ["小兔子刷牙", "上下左右刷一刷", "小兔子刷牙"]
+    images = ["https://example.com/1.webp", "https://example.com/2.webp"]
+
+    result = await engine.moderate_book(texts, images, ["https://example.com/a.mp3"])
+    assert len(result.texts) == 3
+    assert result.review_status == ReviewStatus.APPROVED
+    assert service.calls == {"texts": 1, "image": 2, "audio": 1}
+
+    # 重审（如任务重试）全部命中缓存
+    again = await engine.moderate_book(texts, images, ["https://example.com/a.mp3"])
+    assert again.review_status == ReviewStatus.APPROVED
+    assert service.calls == {"texts": 1, "image": 2, "audio": 1}
+    assert engine.stats()["cache_hits"] == 5
+
+
+@pytest.mark.asyncio
+async def test_engine_review_status_gating():
+    """Test blocked content is rejected and LLM concerns or failures go to manual review."""
+    from moana.models import ReviewStatus
+    from moana.services.moderation import ModerationEngine
+    from moana.services.moderation.base import ModerationResult
+    from moana.services.task_state import MemoryTaskStateStore
+
+    engine = ModerationEngine(_counting_service(unsafe_text="坏内容"), store=MemoryTaskStateStore("moderation"))
+    result = await engine.moderate_book(["好内容", "坏内容"])
+    assert result.review_status == ReviewStatus.REJECTED
+    assert result.to_dict()["flagged"][0]["index"] == 1
+
+    class Reviewer:
+        async def review_texts(self, texts):
+            return [ModerationResult(is_safe=text != "吓人", reason="可能吓到幼儿") for text in texts]
+
+    engine = ModerationEngine(_counting_service(), reviewer=Reviewer(), store=MemoryTaskStateStore("moderation"))
+    assert (await engine.moderate_book(["好内容", "吓人"])).review_status == ReviewStatus.MANUAL_REVIEW
+
+    class Broken:
+        async def review_texts(self, texts):
+            raise RuntimeError("LLM unavailable")
+
+    service = _counting_service()
+
+    async def failing_image(url):
+        raise RuntimeError("provider down")
+
+    service.moderate_image = failing_image
+    engine = ModerationEngine(service, reviewer=Broken(), store=MemoryTaskStateStore("moderation"))
+    result = await engine.moderate_book(["好内容"], ["https://example.com/1.webp"])
+    # 自动审核或 LLM 复核未完成都转人工
+    assert result.review_status == ReviewStatus.MANUAL_REVIEW
+    assert sorted(error.split(":")[0] for error in result.errors) == ["image", "review"]
+
+    engine = ModerationEngine(_counting_service(), reviewer=Broken(), store=MemoryTaskStateStore("moderation"))
+    result = await engine.moderate_book(["好内容"])
+    assert result.review_status == ReviewStatus.MANUAL_REVIEW
+    assert result.errors == ["review: LLM unavailable"]
+
+
+@pytest.mark.asyncio
+async def test_engine_skipped_provider_checks_need_manual_review():
+    """Test content is not approved when the provider skipped its checks."""
+    from moana.models import ReviewStatus
+    from moana.services.moderation import ModerationEngine
+    from moana.services.moderation.aliyun import AliyunModerationService
+    from moana.services.moderation.base import ModerationResult
+    from moana.services.task_state import MemoryTaskStateStore
+
+    class Reviewer:
+        async def review_texts(self, texts):
+            return [ModerationResult(is_safe=True) for _ in texts]
+
+    service = AliyunModerationService()
+    service.access_key = service.secret_key = ""  # 未配置：所有检查都被跳过
+    engine = ModerationEngine(service, reviewer=Reviewer(), store=MemoryTaskStateStore("moderation"))
+    result = await engine.moderate_book(["好内容"], ["https://example.com/1.webp"], ["https://example.com/a.mp3"])
+
+    assert result.review_status == ReviewStatus.MANUAL_REVIEW
+    assert result.to_dict()["checked"]["skipped"] == 3
+
+    # 只有部分检查被跳过也不能自动通过
+    service = _counting_service()
+
+    async def skipped_audio(url):
+        return ModerationResult(is_safe=True, reason="Moderation check skipped (MVP)", skipped=True)
+
+    service.moderate_audio = skipped_audio
+    engine = ModerationEngine(service, store=MemoryTaskStateStore("moderation"))
+    result = await engine.moderate_book(["好内容"], ["https://example.com/1.webp"], ["https://example.com/a.mp3"])
+    assert result.review_status == ReviewStatus.MANUAL_REVIEW
@@ -107,3 +107,126 @@ def test_get_music_service_invalid_provider():
 
     with pytest.raises(ValueError, match="Unknown music provider"):
         get_music_service()
+
+
+@pytest.mark.asyncio
+async def test_suno_wait_is_woken_by_callback():
+    """Test the Suno callback wakes the waiting service without status polling."""
+    import asyncio
+    import time
+
+    from httpx import ASGITransport, AsyncClient
+
+    from moana.main import app
+    from moana.services.music.suno import SunoGenerationResult, SunoMusicService
+    from moana.services.task_state import reset_task_state_stores
+
+    reset_task_state_stores()
+    service = SunoMusicService()
+    done = SunoGenerationResult(task_id="suno-1", tracks=[], status="SUCCESS")
+    service._fetch_record = AsyncMock(return_value=done)
+
+    waiter = asyncio.create_task(service._wait_until_complete(
+        "suno-1", "content-1", timeout=30, submitted_at=time.time() - 1,
+    ))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/callback/suno?task_id=content-1",
+            json={"taskId": "suno-1", "status": "SUCCESS"},
+        )
+    assert response.status_code == 200
+
+    result = await asyncio.wait_for(waiter, timeout=1)
+    assert result is done
+    # 只在回调后查询一次完整结果
+    assert service._fetch_record.await_count == 1
+    reset_task_state_stores()
+
+
+@pytest.mark.asyncio
+async def test_suno_wait_falls_back_to_backoff_polling():
+    """Test polling with backoff still completes when no callback arrives."""
+    import time
+
+    from moana.services.music.suno import (
+        ContentModerationError,
+        SunoGenerationResult,
+        SunoMusicService,
+    )
+    from moana.services.task_state import get_task_state_store, reset_task_state_stores
+
+    reset_task_state_stores()
+    service = SunoMusicService()
+    service.FALLBACK_POLL_INITIAL = 0.02
+    service.FALLBACK_POLL_MAX = 0.05
+    done = SunoGenerationResult(task_id="suno-2", tracks=[], status="SUCCESS")
+    service._fetch_record = AsyncMock(side_effect=[None, None, done])
+
+    result = await service._wait_until_complete("suno-2", timeout=5, submitted_at=time.time())
+    assert result is done
+    assert service._fetch_record.await_count == 3
+
+    # 错误回调直接结束等待；提交前的旧回调状态被忽略
+    store = get_task_state_store("suno")
+    await store.set("content-3", {"task_id": "content-3", "status": "SENSITIVE_WORD_ERROR"})
+    service._fetch_record = AsyncMock(return_value=None)
+    with pytest.raises(ContentModerationError):
+        await service._wait_until_complete(
+            "suno-3", "content-3", timeout=5, submitted_at=time.time() - 1,
+        )
+    service.FALLBACK_POLL_INITIAL = 0.01
+    with pytest.raises(Exception, match="timed out"):
+        await service._wait_until_complete(
+            "suno-3", "content-3", timeout=0.1, submitted_at=time.time(),
+        )
+    reset_task_state_stores()
+
+
+@pytest.mark.asyncio
+async def test_suno_quota_once_and_slot_only_for_submit():
+    """Test retries reuse one quota reservation and waiting holds no music slot."""
+    from contextlib import asynccontextmanager
+    from unittest.mock import MagicMock, patch
+
+    from tenacity import wait_none
+
+    from moana.services.music.suno import SunoGenerationResult, SunoMusicService
+    from moana.services.ratelimit import get_provider_limiter, reset_provider_limiters
+
+    reset_provider_limiters()
+    service = SunoMusicService()
+    limiter = get_provider_limiter("music", service.provider_name, service._model)
+
+    client = MagicMock()
+    client.post = AsyncMock(return_value=MagicMock(
+        status_code=200, json=lambda: {"code": 200, "data": {"taskId": "suno-9"}},
+    ))
+
+    @asynccontextmanager
+    async def fake_http_client(name, timeout=None):
+        yield client
+
+    in_flight = []
+
+    async def wait(task_id, callback_task_id=None, timeout=300, submitted_at=None):
+        in_flight.append(limiter.in_flight)
+        if len(in_flight) == 1:
+            raise TimeoutError("callback lost")
+        return SunoGenerationResult(task_id=task_id, tracks=[], status="SUCCESS")
+
+    service._wait_until_complete = wait
+    with patch("moana.services.music.suno.http_client", fake_http_client), \
+         patch("moana.services.music.suno.get_provider_quota") as get_quota, \
+         patch.object(SunoMusicService._generate.retry, "wait", wait_none()):
+        get_quota.return_value.acquire = AsyncMock()
+        result = await service.generate(prompt="刷牙歌")
+
+    assert result.extra["task_id"] == "suno-9"
+    get_quota.return_value.acquire.assert_awaited_once()
+    assert client.post.await_count == 2
+    assert in_flight == [0, 0]
+    reset_provider_limiters()
@@ -0,0 +1,163 @@
+# tests/services/test_quota.py
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+
+def test_token_bucket_reserves_and_refunds():
+    """Test tokens are consumed, waits are reported and over-long waits rejected."""
+    from moana.services.ratelimit import TokenBucket
+
+    bucket = TokenBucket(rate_per_minute=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # 令牌用完：约 30 秒后恢复一个
+    assert bucket.reserve(max_wait=1) is None
+    wait = bucket.reserve(max_wait=60)
+    assert 25 < wait <= 30
+    # 退还预约后，下一个令牌仍约 30 秒后可用（而不是 60 秒）
+    bucket.refund()
+    assert bucket.wait_time() <= 30
+
+
+@pytest.mark.asyncio
+async def test_provider_quota_daily_limit_shared_ledger():
+    """Test the daily quota is enforced across guards sharing one ledger."""
+    from moana.services.ratelimit import ProviderQuota, QuotaExhaustedError, QuotaLedger
+    from moana.services.task_state import MemoryTaskStateStore
+
+    ledger = QuotaLedger(store=MemoryTaskStateStore("quota"))
+    worker_a = ProviderQuota("veo", per_day=3, ledger=ledger)
+    worker_b = ProviderQuota("veo", per_day=3, ledger=ledger)
+
+    await worker_a.acquire()
+    await worker_b.acquire()
+    await worker_a.acquire()
+    with pytest.raises(QuotaExhaustedError) as exc:
+        await worker_b.acquire()
+    assert exc.value.scope == "day"
+    assert exc.value.retry_after > 0
+
+    status = await worker_a.status()
+    assert status["day_used"] == 3
+    assert status["day_remaining"] == 0
+
+
+@pytest.mark.asyncio
+async def test_provider_quota_minute_limit():
+    """Test the per-minute bucket rejects when the wait exceeds max_wait."""
+    from moana.services.ratelimit import ProviderQuota, QuotaExhaustedError, is_rate_limit_error
+
+    quota = ProviderQuota("veo", per_minute=1)
+    await quota.acquire()
+    with pytest.raises(QuotaExhaustedError) as exc:
+        await quota.acquire(max_wait=0)
+    assert exc.value.scope == "minute"
+    # 本地额度错误不应触发自适应限流器降并发
+    assert not is_rate_limit_error(exc.value)
+
+
+@pytest.mark.asyncio
+async def test_video_fallback_on_quota_exhausted():
+    """Test video generation routes to the next provider when Veo's quota is used up."""
+    from moana.services.ratelimit import QuotaExhaustedError
+    from moana.services.video.base import VideoResult
+    from moana.services.video.fallback import QuotaFallbackVideoService
+
+    primary = MagicMock()
+    primary.provider_name = "veo"
+    primary.generate = AsyncMock(side_effect=QuotaExhaustedError("veo", 3600, "day"))
+    wanx = MagicMock()
+    wanx.provider_name = "wanx"
+    wanx.generate = AsyncMock(return_value=VideoResult(
+        video_url="https://example.com/v.mp4", duration=5, thumbnail_url="", model="wan",
+    ))
+    factory = MagicMock(return_value=wanx)
+
+    service = QuotaFallbackVideoService(primary, ["wanx"], factory)
+    result = await service.generate(image_url="https://example.com/i.png", prompt="play")
+
+    assert result.model == "wan"
+    factory.assert_called_once_with("wanx")
+    assert wanx.generate.await_args.kwargs["prompt"] == "play"
+
+    # 没有可用备选时抛出原始额度错误
+    service = QuotaFallbackVideoService(primary, [], factory)
+    with pytest.raises(QuotaExhaustedError):
+        await service.generate(image_url="https://example.com/i.png", prompt="play")
+
+
+@pytest.mark.asyncio
+async def test_video_fallback_tries_next_provider_when_fallback_fails():
+    """Test a failing fallback moves on to the next one; the last error surfaces at the end."""
+    from moana.services.ratelimit import QuotaExhaustedError
+    from moana.services.video.base import VideoResult
+    from moana.services.video.fallback import QuotaFallbackVideoService
+
+    primary = MagicMock()
+    primary.provider_name = "veo"
+    primary.generate = AsyncMock(side_effect=QuotaExhaustedError("veo", 3600, "day"))
+    wanx = MagicMock()
+    wanx.provider_name = "wanx"
+    wanx.generate = AsyncMock(side_effect=RuntimeError("wanx down"))
+    minimax = MagicMock()
+    minimax.provider_name = "minimax"
+    minimax.generate = AsyncMock(return_value=VideoResult(
+        video_url="https://example.com/v.mp4", duration=5, thumbnail_url="", model="hailuo",
+    ))
+    services = {"wanx": wanx, "minimax": minimax}
+
+    service = QuotaFallbackVideoService(primary, ["wanx", "minimax"], services.__getitem__)
+    result = await service.generate(image_url="https://example.com/i.png", prompt="play")
+
+    assert result.model == "hailuo"
+    wanx.generate.assert_awaited_once()
+    minimax.generate.assert_awaited_once()
+
+    # 所有备选都失败时抛出最后一个错误
+    minimax.generate = AsyncMock(side_effect=RuntimeError("minimax down"))
+    with pytest.raises(RuntimeError, match="minimax down"):
+        await service.generate(image_url="https://example.com/i.png", prompt="play")
+
+
+@pytest.mark.asyncio
+async def test_veo_quota_wait_does_not_hold_video_slot():
+    """Test Veo waits for its quota before taking a video limiter slot."""
+    from unittest.mock import patch
+
+    from moana.services.ratelimit import get_provider_limiter, reset_provider_limiters
+
+    reset_provider_limiters()
+    in_flight_during_wait = []
+
+    operation = MagicMock()
+    operation.name = "op-quota"
+    operation.done = True
+    operation.error = None
+    operation.response.generated_videos = [MagicMock(video=MagicMock(video_bytes=b"video"))]
+
+    with patch("moana.services.video.google_veo.genai") as genai, \
+         patch("moana.services.video.google_veo.get_storage_service") as storage, \
+         patch("moana.services.video.google_veo.get_provider_quota") as get_quota:
+        genai.Client.return_value.models.generate_videos.return_value = operation
+        storage.return_value.upload_bytes = AsyncMock(
+            return_value=MagicMock(success=True, url="https://example.com/v.mp4")
+        )
+
+        from moana.services.video.google_veo import GoogleVeoService
+
+        service = GoogleVeoService()
+        limiter = get_provider_limiter("video", "veo", service._model)
+
+        async def acquire(max_wait=0.0):
+            in_flight_during_wait.append(limiter.in_flight)
+
+        get_quota.return_value.acquire = AsyncMock(side_effect=acquire)
+        service._download_image = AsyncMock(return_value=b"image")
+        result = await service.generate(
+            image_url="https://example.com/quota.png", prompt="play", auto_enhance_prompt=False,
+        )
+
+    assert result.video_url == "https://example.com/v.mp4"
+    assert in_flight_during_wait == [0]
+    assert limiter.in_flight == 0
+    reset_provider_limiters()
@@ -0,0 +1,84 @@
+# tests/services/test_ratelimit.py
+import asyncio
+
+import pytest
+
+
+def test_is_rate_limit_error():
+    """Test 429 / QPS errors are recognized, including chained causes."""
+    import httpx
+
+    from moana.services.ratelimit import is_rate_limit_error
+
+    request = httpx.Request("POST", "https://example.com")
+    response = httpx.Response(429, request=request)
+    assert is_rate_limit_error(httpx.HTTPStatusError("slow down", request=request, response=response))
+    assert is_rate_limit_error(RuntimeError("Throttling.RateQuota: Requests rate limit exceeded"))
+
+    wrapped = RuntimeError("image failed")
+    wrapped.__cause__ = ValueError("RESOURCE_EXHAUSTED")
+    assert is_rate_limit_error(wrapped)
+    assert not is_rate_limit_error(ValueError("invalid prompt"))
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_caps_concurrency_and_adapts():
+    """Test the limit is enforced, grows on success and halves on throttling."""
+    from moana.services.ratelimit import AdaptiveLimiter
+
+    limiter = AdaptiveLimiter("image:test:m", initial_limit=2, min_limit=1, max_limit=4, cooldown=60)
+    active = 0
+    peak = 0
+
+    async def call():
+        nonlocal active, peak
+        async with limiter.slot():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*[call() for _ in range(6)])
+    assert peak == 2
+    # 6 次成功后加性增长到 4
+    assert limiter.limit == 4
+
+    async def throttled():
+        async with limiter.slot():
+            raise RuntimeError("429 Too Many Requests")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await throttled()
+    # 冷却期内只减半一次
+    assert limiter.limit == 2
+    assert limiter.stats()["throttled"] == 2
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_provider_limited_shares_limiter_across_instances():
+    """Test the decorator keys limiters by provider and model, shared process-wide."""
+    from moana.services.ratelimit import (
+        get_provider_limiter,
+        provider_limited,
+        provider_limiter_stats,
+        reset_provider_limiters,
+    )
+
+    reset_provider_limiters()
+
+    class FakeImageService:
+        provider_name = "fake"
+        model_name = "fake-v1"
+
+        @provider_limited("image")
+        async def generate(self, prompt):
+            return get_provider_limiter("image", "fake", "fake-v1").in_flight
+
+    assert await FakeImageService().generate("a") == 1
+    assert await FakeImageService().generate("b") == 1
+    stats = provider_limiter_stats()
+    assert [s["key"] for s in stats] == ["image:fake:fake-v1"]
+    assert stats[0]["successes"] == 2
+    reset_provider_limiters()
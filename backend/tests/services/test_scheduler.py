@@ -0,0 +1,125 @@
+# tests/services/test_scheduler.py
+import asyncio
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_scheduler_limits_concurrency_and_queues():
+    """Test per content type limits, queue position and dispatch."""
+    from moana.services.scheduler import GenerationScheduler
+
+    scheduler = GenerationScheduler(
+        limits={"picture_book": 1},
+        expected_durations={"picture_book": 100.0},
+    )
+    release = asyncio.Event()
+    started: list[str] = []
+
+    def job(name):
+        async def run():
+            started.append(name)
+            await release.wait()
+        return run
+
+    first = scheduler.submit("a", "picture_book", job("a"))
+    second = scheduler.submit("b", "picture_book", job("b"))
+    third = scheduler.submit("c", "picture_book", job("c"))
+    await asyncio.sleep(0)
+
+    assert first.position == 0 and first.estimated_wait_seconds == 0
+    assert second.position == 0 and second.estimated_wait_seconds == 100
+    assert third.position == 1 and third.estimated_wait_seconds == 200
+    assert started == ["a"]
+    assert scheduler.stats()["picture_book"]["queued"] == 2
+
+    release.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert started == ["a", "b", "c"]
+    assert scheduler.queue_info("c") is None
+
+
+@pytest.mark.asyncio
+async def test_scheduler_priority_order():
+    """Test higher priority jobs jump the queue."""
+    from moana.services.scheduler import GenerationScheduler, JobPriority
+
+    scheduler = GenerationScheduler(limits={"video": 1})
+    release = asyncio.Event()
+    order: list[str] = []
+
+    def job(name):
+        async def run():
+            order.append(name)
+            await release.wait()
+        return run
+
+    scheduler.submit("running", "video", job("running"))
+    scheduler.submit("normal", "video", job("normal"))
+    scheduler.submit("urgent", "video", job("urgent"), priority=JobPriority.HIGH)
+
+    assert scheduler.queue_info("urgent").position == 0
+    assert scheduler.queue_info("normal").position == 1
+
+    release.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert order == ["running", "urgent", "normal"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_queue_full():
+    """Test QueueFullError carries a retry-after hint."""
+    from moana.services.scheduler import GenerationScheduler, QueueFullError
+
+    scheduler = GenerationScheduler(
+        limits={"nursery_rhyme": 1},
+        max_queue=1,
+        expected_durations={"nursery_rhyme": 60.0},
+    )
+    release = asyncio.Event()
+
+    scheduler.submit("a", "nursery_rhyme", release.wait)
+    scheduler.submit("b", "nursery_rhyme", release.wait)
+
+    with pytest.raises(QueueFullError) as exc_info:
+        scheduler.submit("c", "nursery_rhyme", release.wait)
+    assert exc_info.value.retry_after == 60
+
+    # 其它内容类型不受影响
+    scheduler.submit("d", "video", release.wait)
+
+    release.set()
+    await scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_async_endpoint_returns_429_when_queue_full():
+    """Test async endpoints translate a full queue into 429 + Retry-After."""
+    from unittest.mock import patch
+
+    from httpx import ASGITransport, AsyncClient
+
+    from moana.main import app
+    from moana.services.scheduler import GenerationScheduler, QueueFullError
+
+    def full(content_type):
+        raise QueueFullError(content_type, retry_after=42)
+
+    scheduler = GenerationScheduler(limits={"video": 1})
+    with patch.object(scheduler, "check_capacity", side_effect=full), \
+            patch("moana.api.content.get_generation_scheduler", return_value=scheduler):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/v1/content/video/standalone/async",
+                json={
+                    "child_name": "小明",
+                    "age_months": 36,
+                    "custom_prompt": "小兔子在花园里开心地吃胡萝卜",
+                },
+            )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "42"
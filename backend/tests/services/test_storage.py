@@ -82,3 +82,61 @@ async def test_oss_get_url_not_configured():
     # Should return public URL format even when not configured
     assert url is not None
     assert "test/file.txt" in url
+
+
+@pytest.mark.asyncio
+async def test_oss_upload_runs_off_event_loop():
+    """Test the blocking oss2 upload runs in the executor, not on the loop thread."""
+    import threading
+    from unittest.mock import MagicMock
+
+    from moana.services.storage import OSSStorageService
+
+    loop_thread = threading.get_ident()
+    calls = []
+    bucket = MagicMock()
+    bucket.put_object.side_effect = lambda key, file, headers=None: calls.append(threading.get_ident())
+
+    service = OSSStorageService()
+    service._bucket = bucket
+    result = await service.upload_bytes(b"data", "a/b.png", "image/png")
+
+    assert result.success
+    assert calls and calls[0] != loop_thread
+
+
+@pytest.mark.asyncio
+async def test_local_stream_upload_and_abort(tmp_path):
+    """Test local streaming uploads are readable after the first chunk and removed on abort."""
+    from moana.services.storage import LocalStorageService
+
+    service = LocalStorageService(storage_path=str(tmp_path), base_url="https://media.test")
+
+    upload = await service.open_stream("tts_abc.mp3", "audio/mpeg")
+    assert upload.url is None
+    await upload.write(b"first")
+    assert upload.url is not None
+    assert (tmp_path / upload.key).read_bytes() == b"first"
+    await upload.write(b"-second")
+    result = await upload.complete()
+    assert result.success and result.url == upload.url
+    assert (tmp_path / result.key).read_bytes() == b"first-second"
+
+    failed = await service.open_stream("tts_abc.mp3", "audio/mpeg")
+    assert failed.key != upload.key
+    await failed.write(b"partial")
+    await failed.abort()
+    assert not (tmp_path / failed.key).exists()
+
+
+def test_cleanup_keeps_whole_book_narration(tmp_path):
+    """Test the concatenated narration file counts as referenced."""
+    from moana.services.storage.cleanup import OrphanFileCleanup
+
+    cleanup = OrphanFileCleanup(storage_path=str(tmp_path), base_url="https://media.example.com")
+    keys = cleanup._extract_urls_from_content_data({
+        "pages": [{"audio_url": "https://media.example.com/audio/p1.m4a"}],
+        "narration": {"audio_url": "https://media.example.com/audio/book.mp3", "cues": []},
+    })
+
+    assert keys == {"audio/p1.m4a", "audio/book.mp3"}
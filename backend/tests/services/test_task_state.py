@@ -0,0 +1,328 @@
+# tests/services/test_task_state.py
+import asyncio
+import time
+
+import pytest
+
+
+async def _exercise_store(store):
+    """Shared behaviour checks for all backends."""
+    assert await store.get("missing") is None
+    assert await store.update("missing", progress=10) is None
+
+    await store.set("t1", {"status": "processing", "progress": 5, "stage": "init"})
+    state = await store.update("t1", progress=30, stage="image_1")
+    assert state["progress"] == 30
+    assert state["stage"] == "image_1"
+    assert state["status"] == "processing"
+
+    # progress 不回退
+    state = await store.update("t1", progress=20, stage="image_2")
+    assert state["progress"] == 30
+    assert state["stage"] == "image_2"
+
+    await store.set("t1", {"status": "completed", "progress": 100, "content_id": "c1"})
+    # 终态后迟到的进度上报被忽略
+    state = await store.update("t1", progress=70, stage="audio_3")
+    assert state.get("stage") != "audio_3"
+    stored = await store.get("t1")
+    assert stored["content_id"] == "c1"
+    assert "result" not in stored
+
+    # add 仅在不存在时创建
+    assert await store.add("t1", {"status": "pending"}) is False
+    assert await store.add("t2", {"status": "pending", "progress": 0}) is True
+    assert await store.add("t2", {"status": "pending", "progress": 0}) is False
+    states = await store.list_states()
+    assert [s["status"] for s in states] == ["pending", "completed"]
+
+    assert await store.delete("t2") is True
+    assert await store.delete("t2") is False
+
+    # 计数器：带上限的原子自增，与状态互不影响
+    assert await store.counter("veo:day") == 0
+    assert [await store.incr("veo:day", limit=2, ttl=60) for _ in range(3)] == [1, 2, None]
+    assert await store.counter("veo:day") == 2
+    assert await store.incr("other", ttl=60) == 1
+    assert await store.get("veo:day") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_store():
+    """Test in-memory task state store."""
+    from moana.services.task_state import MemoryTaskStateStore
+
+    await _exercise_store(MemoryTaskStateStore("test"))
+
+
+@pytest.mark.asyncio
+async def test_memory_store_ttl_eviction():
+    """Test finished tasks expire after finished_ttl."""
+    from moana.services.task_state import MemoryTaskStateStore
+
+    store = MemoryTaskStateStore("test", finished_ttl=1, active_ttl=60)
+    await store.set("done", {"status": "completed", "progress": 100})
+    await store.set("running", {"status": "processing", "progress": 40})
+
+    store._entries["done"] = (store._entries["done"][0], time.time() - 1)
+    assert await store.evict_expired() == 1
+    assert await store.get("done") is None
+    assert (await store.get("running"))["progress"] == 40
+
+
+@pytest.mark.asyncio
+async def test_sql_store():
+    """Test SQL task state store against SQLite."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from moana.models.task_state import TaskState
+    from moana.services.task_state import SqlTaskStateStore
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(TaskState.__table__.create)
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    store = SqlTaskStateStore("test", session_factory=factory)
+    await _exercise_store(store)
+
+    # 不同 namespace 互不可见
+    other = SqlTaskStateStore("other", session_factory=factory)
+    assert await other.get("t1") is None
+
+    expired = SqlTaskStateStore("test", session_factory=factory, finished_ttl=-1)
+    await expired.set("t3", {"status": "failed", "progress": 0})
+    assert await expired.evict_expired() == 1
+
+    await engine.dispose()
+
+
+class _RespStandIn:
+    """Tiny RESP server implementing the commands used by the store."""
+
+    def __init__(self):
+        self.data: dict[str, tuple[str, float | None]] = {}
+        self.versions: dict[str, int] = {}
+
+    def _live(self, key):
+        value = self.data.get(key)
+        if value and value[1] is not None and value[1] <= time.time():
+            del self.data[key]
+            return None
+        return value[0] if value else None
+
+    def _write(self, key, value, ttl=None):
+        self.data[key] = (value, time.time() + ttl if ttl else None)
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    @staticmethod
+    def _encode(reply):
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, bool) or reply == "OK" or reply == "QUEUED":
+            return f"+{reply}\r\n".encode()
+        if isinstance(reply, int):
+            return f":{reply}\r\n".encode()
+        if isinstance(reply, list):
+            return f"*{len(reply)}\r\n".encode() + b"".join(
+                _RespStandIn._encode(r) for r in reply
+            )
+        data = str(reply).encode()
+        return f"${len(data)}\r\n".encode() + data + b"\r\n"
+
+    def _run(self, cmd, args):
+        if cmd == "GET":
+            return self._live(args[0])
+        if cmd == "SET":
+            ttl = int(args[3]) if len(args) > 3 and args[2].upper() == "EX" else None
+            if "NX" in args[2:] and self._live(args[0]) is not None:
+                return None
+            self._write(args[0], args[1], ttl)
+            return "OK"
+        if cmd == "DEL":
+            existed = self._live(args[0]) is not None
+            self.data.pop(args[0], None)
+            return int(existed)
+        if cmd in ("INCR", "DECR"):
+            value = int(self._live(args[0]) or 0) + (1 if cmd == "INCR" else -1)
+            expires_at = self.data[args[0]][1] if args[0] in self.data else None
+            self.data[args[0]] = (str(value), expires_at)
+            return value
+        if cmd == "EXPIRE":
+            if self._live(args[0]) is None:
+                return 0
+            self.data[args[0]] = (self.data[args[0]][0], time.time() + int(args[1]))
+            return 1
+        if cmd == "MGET":
+            return [self._live(k) for k in args]
+        if cmd == "SCAN":
+            prefix = args[2].rstrip("*")
+            return ["0", [k for k in list(self.data) if k.startswith(prefix) and self._live(k)]]
+        return "OK"
+
+    async def handle(self, reader, writer):
+        watched: dict[str, int] = {}
+        queued = None
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            args = []
+            for _ in range(int(line[1:-2])):
+                length = int((await reader.readline())[1:-2])
+                args.append((await reader.readexactly(length + 2))[:-2].decode())
+            cmd, rest = args[0].upper(), args[1:]
+
+            if cmd == "WATCH":
+                watched = {k: self.versions.get(k, 0) for k in rest}
+                reply = "OK"
+            elif cmd == "UNWATCH":
+                watched, reply = {}, "OK"
+            elif cmd == "MULTI":
+                queued, reply = [], "OK"
+            elif cmd == "EXEC":
+                if any(self.versions.get(k, 0) != v for k, v in watched.items()):
+                    reply = None
+                else:
+                    reply = [self._run(c, a) for c, a in queued]
+                watched, queued = {}, None
+            elif queued is not None:
+                queued.append((cmd, rest))
+                reply = "QUEUED"
+            else:
+                reply = self._run(cmd, rest)
+
+            writer.write(self._encode(reply))
+            await writer.drain()
+        writer.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_store_against_stand_in():
+    """Test Redis-protocol store against a local RESP stand-in."""
+    from moana.services.task_state import RedisTaskStateStore
+
+    stand_in = _RespStandIn()
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    try:
+        store = RedisTaskStateStore("test", url=f"redis://127.0.0.1:{port}/0")
+        await _exercise_store(store)
+        assert any(k.startswith("moana:task:test:") for k in stand_in.data)
+        # 计数器创建时即带过期时间
+        counters = {k: v for k, v in stand_in.data.items() if ":veo:day" in k or k.endswith(":other")}
+        assert counters and all(expires_at is not None for _, expires_at in counters.values())
+
+        # 另一个 "worker" 的连接能看到同一状态
+        other_worker = RedisTaskStateStore("test", url=f"redis://127.0.0.1:{port}/0")
+        assert (await other_worker.get("t1"))["content_id"] == "c1"
+
+        await store.close()
+        await other_worker.close()
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_progress_reporter_coalesces_in_order():
+    """Test sync progress callbacks are written in order."""
+    from moana.services.task_state import MemoryTaskStateStore, TaskProgressReporter
+
+    store = MemoryTaskStateStore("test")
+    await store.set("t1", {"status": "processing", "progress": 0})
+
+    reporter = TaskProgressReporter(store, "t1")
+    for i in range(1, 6):
+        reporter.report(progress=i * 10, stage=f"image_{i}")
+    await reporter.flush()
+
+    state = await store.get("t1")
+    assert state["progress"] == 50
+    assert state["stage"] == "image_5"
+
+
+def test_get_task_state_store_default_memory():
+    """Test factory returns cached memory store by default."""
+    from moana.services.task_state import (
+        MemoryTaskStateStore,
+        get_task_state_store,
+        reset_task_state_stores,
+    )
+
+    reset_task_state_stores()
+    store = get_task_state_store("content")
+    assert isinstance(store, MemoryTaskStateStore)
+    assert get_task_state_store("content") is store
+    assert get_task_state_store("suno") is not store
+    reset_task_state_stores()
+
+
+@pytest.mark.asyncio
+async def test_redis_client_pools_and_drops_broken_connections():
+    """Test concurrent commands use separate connections and cancelled ones are discarded."""
+    from moana.services.task_state import RedisProtocolClient
+
+    stand_in = _RespStandIn()
+    connections = []
+    stalled = asyncio.Event()
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            await stand_in.handle(reader, writer)
+        except ConnectionResetError:
+            writer.close()
+
+    original_run = stand_in._run
+
+    def run(cmd, args):
+        if cmd == "STALL":
+            stalled.set()
+            raise ConnectionResetError  # 不回复，结束该连接的处理
+        return original_run(cmd, args)
+
+    stand_in._run = run
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    try:
+        client = RedisProtocolClient(f"redis://127.0.0.1:{port}/0", max_connections=2)
+        await asyncio.gather(*(client.execute("SET", f"k{i}", i) for i in range(6)))
+        assert len(connections) == 2
+        assert len(client._idle) == 2
+
+        # 等待回复时被取消：连接不放回连接池
+        task = asyncio.create_task(client.execute("STALL"))
+        await stalled.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert len(client._idle) == 1
+
+        assert await client.execute("GET", "k3") == "3"
+        await client.close()
+        assert client._idle == []
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_task_event_timeout_does_not_drop_other_waiters():
+    """Test a waiter timing out leaves other waiters on the same task subscribed."""
+    from moana.services.task_state import notify_task_event, wait_task_event
+    from moana.services.task_state.events import _waiters
+
+    patient = asyncio.create_task(wait_task_event("test", "t1", timeout=5))
+    await asyncio.sleep(0)
+    assert await wait_task_event("test", "t1", timeout=0.01) is False
+
+    notify_task_event("test", "t1")
+    assert await asyncio.wait_for(patient, timeout=1) is True
+    assert ("test", "t1") not in _waiters
+
+    # 最后一个等待者超时离开后清理
+    assert await wait_task_event("test", "t2", timeout=0.01) is False
+    assert ("test", "t2") not in _waiters
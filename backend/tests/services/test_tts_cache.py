@@ -0,0 +1,155 @@
+# tests/services/test_tts_cache.py
+import asyncio
+
+import pytest
+
+
+class _CountingTTS:
+    model_name = "tts-test"
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def synthesize(self, text, voice_id=None, speed=1.0):
+        from moana.services.tts.base import TTSResult
+
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return TTSResult(
+            audio_url=f"https://media.test/audio/{self.calls}.mp3",
+            duration=2.4,
+            voice_id=voice_id or "Cherry",
+            model=self.model_name,
+        )
+
+
+async def _cached(inner):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from moana.models.tts_cache import TTSCacheEntry
+    from moana.services.tts.cache import CachedTTSService, reset_tts_cache_stats
+
+    reset_tts_cache_stats()
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(TTSCacheEntry.__table__.create)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    return CachedTTSService(inner, provider="qwen", session_factory=factory), factory, engine
+
+
+@pytest.mark.asyncio
+async def test_repeated_text_is_served_from_cache():
+    """Test identical (normalized) text + voice + speed reuses the stored audio and duration."""
+    from moana.services.tts.cache import tts_cache_stats
+
+    inner = _CountingTTS()
+    service, factory, engine = await _cached(inner)
+    try:
+        first = await service.synthesize("小莫，你好呀！", voice_id="Cherry", speed=0.9)
+        again = await service.synthesize("  小莫，你好呀！ ", voice_id="Cherry", speed=0.9)
+        assert inner.calls == 1
+        assert again.audio_url == first.audio_url
+        assert again.duration == 2.4
+
+        # 音色或语速不同则重新合成
+        await service.synthesize("小莫，你好呀！", voice_id="Ethan", speed=0.9)
+        await service.synthesize("小莫，你好呀！", voice_id="Cherry", speed=1.0)
+        assert inner.calls == 3
+
+        seen = []
+
+        async def on_audio_url(url):
+            seen.append(url)
+
+        await service.synthesize_streaming("小莫，你好呀！", voice_id="Cherry", speed=0.9, on_audio_url=on_audio_url)
+        assert seen == [first.audio_url]
+
+        stats = await tts_cache_stats(factory)
+        assert stats["hits"] == 2 and stats["misses"] == 3
+        assert stats["entries"] == 3 and stats["lifetime_hits"] == 2
+        assert service.model_name == "tts-test"
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_synthesize_once():
+    """Test concurrent requests for the same text share one synthesis."""
+    inner = _CountingTTS(delay=0.05)
+    service, _, engine = await _cached(inner)
+    try:
+        from moana.services.tts.cache import CachedTTSService
+
+        # get_cached_tts_service 每次返回新的包装实例，single-flight 仍然生效
+        other = CachedTTSService(inner, provider="qwen", session_factory=service.session_factory)
+        results = await asyncio.gather(
+            *[service.synthesize("一起数一数", voice_id="Cherry") for _ in range(2)],
+            other.synthesize("一起数一数", voice_id="Cherry"),
+        )
+        assert inner.calls == 1
+        assert len({r.audio_url for r in results}) == 1
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_estimated_duration_is_measured_before_caching():
+    """Test a provider's estimated duration is replaced by the measured one, or not cached."""
+    from unittest.mock import AsyncMock, patch
+
+    from moana.services.audio import AudioConverter
+
+    inner = _CountingTTS()
+    inner.duration_is_estimate = True
+    service, _, engine = await _cached(inner)
+    try:
+        with patch("moana.services.tts.cache.fetch_audio", AsyncMock(return_value=b"mp3")) as fetch, \
+             patch.object(AudioConverter, "probe_duration", AsyncMock(return_value=3.1234)):
+            first = await service.synthesize("晚安，小莫", voice_id="Cherry")
+            again = await service.synthesize("晚安，小莫", voice_id="Cherry")
+        assert first.duration == again.duration == 3.123
+        assert inner.calls == 1
+        fetch.assert_awaited_once_with(first.audio_url)
+
+        # 无法测量时返回估算值，但不写入缓存
+        with patch("moana.services.tts.cache.fetch_audio", AsyncMock(side_effect=RuntimeError("404"))):
+            result = await service.synthesize("起床啦", voice_id="Cherry")
+            assert result.duration == 2.4
+            await service.synthesize("起床啦", voice_id="Cherry")
+        assert inner.calls == 3
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_evicted():
+    """Test eviction returns stale entries' audio URLs and keeps recently used ones referenced."""
+    from datetime import datetime, timedelta, timezone
+
+    from sqlalchemy import update
+
+    from moana.models.tts_cache import TTSCacheEntry
+    from moana.services.tts.cache import cached_audio_urls, evict_stale_entries
+
+    inner = _CountingTTS()
+    service, factory, engine = await _cached(inner)
+    try:
+        old = await service.synthesize("很久以前的句子")
+        fresh = await service.synthesize("刚用过的句子")
+        async with factory() as db:
+            await db.execute(
+                update(TTSCacheEntry)
+                .where(TTSCacheEntry.audio_url == old.audio_url)
+                .values(last_used_at=datetime.now(timezone.utc) - timedelta(days=120))
+            )
+            await db.commit()
+
+        assert await evict_stale_entries(90, dry_run=True, session_factory=factory) == [old.audio_url]
+        assert await evict_stale_entries(90, dry_run=False, session_factory=factory) == [old.audio_url]
+        assert await cached_audio_urls(90, session_factory=factory) == [fresh.audio_url]
+
+        await service.synthesize("很久以前的句子")
+        assert inner.calls == 3
+    finally:
+        await engine.dispose()
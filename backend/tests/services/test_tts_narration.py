@@ -0,0 +1,136 @@
+# tests/services/test_tts_narration.py
+import io
+import math
+import shutil
+import struct
+import wave
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+def test_page_cuts_prefers_long_silences_near_expected_boundaries():
+    """Test cuts land on the separator pauses rather than short sentence pauses."""
+    from moana.services.tts.narration import page_cuts
+
+    silences = [
+        (1.0, 1.3),   # 第 1 页句间停顿
+        (2.9, 4.1),   # 页间分隔
+        (5.0, 5.3),
+        (6.8, 8.0),   # 页间分隔
+        (9.0, 9.2),
+    ]
+    cuts = page_cuts(silences, text_lengths=[15, 15, 15], duration=10.5)
+
+    assert cuts == pytest.approx([3.5, 7.4])
+
+
+def test_page_cuts_without_enough_silences():
+    """Test None is returned when pages cannot all be separated."""
+    from moana.services.tts.narration import page_cuts
+
+    assert page_cuts([(2.0, 3.0)], text_lengths=[5, 5, 5], duration=8.0) is None
+    # 首尾静音不是页间切点
+    assert page_cuts([(0.0, 0.4), (7.6, 8.0)], text_lengths=[5, 5], duration=8.0) is None
+    assert page_cuts([], text_lengths=[5], duration=3.0) == []
+
+
+@pytest.mark.asyncio
+async def test_narrate_book_synthesizes_once_and_builds_cues():
+    """Test one TTS request yields per-page clips and a cue table."""
+    from moana.services.audio import AudioConverter
+    from moana.services.storage.base import StorageResult
+    from moana.services.tts.base import TTSResult
+    from moana.services.tts.narration import PAGE_SEPARATOR, narrate_book
+
+    tts = MagicMock()
+    tts.synthesize = AsyncMock(return_value=TTSResult(
+        audio_url="https://media.example.com/audio/book.mp3", duration=9.0, voice_id="Cherry", model="qwen",
+    ))
+    storage = MagicMock()
+    storage.base_url = "https://media.example.com"
+    storage.download_file = AsyncMock(return_value=b"mp3-bytes")
+    uploaded = []
+
+    async def upload_bytes(data, key, content_type=None):
+        uploaded.append((data, key, content_type))
+        return StorageResult(success=True, url=f"https://media.example.com/{key}", key=key)
+
+    storage.upload_bytes = AsyncMock(side_effect=upload_bytes)
+
+    with patch("moana.services.tts.narration.get_storage_service", return_value=storage), \
+         patch.object(AudioConverter, "detect_silences", AsyncMock(return_value=([(3.0, 4.0)], 8.0))), \
+         patch.object(AudioConverter, "split", AsyncMock(return_value=[b"clip-1", b"clip-2"])) as split:
+        narration = await narrate_book(tts, ["小兔子起床了。", "它去刷牙。"], voice_id="Cherry", speed=0.9)
+
+    assert tts.synthesize.await_count == 1
+    assert tts.synthesize.await_args.kwargs["text"] == PAGE_SEPARATOR.join(["小兔子起床了。", "它去刷牙。"])
+    storage.download_file.assert_awaited_once_with("audio/book.mp3")
+    assert split.await_args.args == (b"mp3-bytes", [3.5])
+    assert [u[0] for u in uploaded] == [b"clip-1", b"clip-2"]
+    assert all(u[2] == "audio/mp4" for u in uploaded)
+
+    assert narration.to_dict() == {
+        "audio_url": "https://media.example.com/audio/book.mp3",
+        "duration": 8.0,
+        "cues": [
+            {"page_num": 1, "start": 0.0, "end": 3.5},
+            {"page_num": 2, "start": 3.5, "end": 8.0},
+        ],
+    }
+    assert [p.duration for p in narration.pages] == [3.5, 4.5]
+    assert narration.pages[0].audio_url.endswith("_p1.m4a")
+
+
+@pytest.mark.asyncio
+async def test_narrate_book_raises_when_unsplittable():
+    """Test a narration without page pauses raises NarrationSplitError."""
+    from moana.services.audio import AudioConverter
+    from moana.services.tts.base import TTSResult
+    from moana.services.tts.narration import NarrationSplitError, narrate_book
+
+    tts = MagicMock()
+    tts.synthesize = AsyncMock(return_value=TTSResult(
+        audio_url="https://cdn.example.com/book.mp3", duration=9.0, voice_id="v", model="m",
+    ))
+
+    with patch("moana.services.tts.narration.fetch_audio", AsyncMock(return_value=b"audio")), \
+         patch.object(AudioConverter, "detect_silences", AsyncMock(return_value=([], 6.0))):
+        with pytest.raises(NarrationSplitError):
+            await narrate_book(tts, ["第一页", "第二页"])
+
+
+def _tone_with_gap(sample_rate: int = 16000) -> bytes:
+    """1s tone, 1s silence, 1s tone."""
+    frames = bytearray()
+    for second in range(3):
+        for n in range(sample_rate):
+            value = 0 if second == 1 else int(8000 * math.sin(2 * math.pi * 440 * n / sample_rate))
+            frames += struct.pack("<h", value)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+async def test_detect_silences_and_split_real_ffmpeg():
+    """Test real ffmpeg finds the gap and cuts one clip per side."""
+    from moana.services.audio import AudioConverter, reset_ffmpeg_limiter
+
+    reset_ffmpeg_limiter()
+    audio = _tone_with_gap()
+    silences, duration = await AudioConverter.detect_silences(audio, min_duration=0.5)
+
+    assert duration == pytest.approx(3.0, abs=0.1)
+    assert len(silences) == 1
+    start, end = silences[0]
+    assert start == pytest.approx(1.0, abs=0.1) and end == pytest.approx(2.0, abs=0.1)
+
+    clips = await AudioConverter.split(audio, [(start + end) / 2])
+    assert len(clips) == 2
+    assert all(clip[4:8] == b"ftyp" for clip in clips)
@@ -78,3 +78,106 @@ def test_get_tts_service_fish_speech():
 
     service = get_tts_service()
     assert isinstance(service, FishSpeechService)
+
+
+class _FakeRealtimeSocket:
+    """Scripted DashScope realtime session (answers every commit with audio)."""
+
+    def __init__(self, chunks):
+        import asyncio
+
+        self.chunks = chunks
+        self.close_code = None
+        self.responses = 0
+        self._inbox = asyncio.Queue()
+        self._push({"type": "session.created"})
+
+    def _push(self, message):
+        import json
+
+        self._inbox.put_nowait(json.dumps(message))
+
+    async def recv(self):
+        return await self._inbox.get()
+
+    async def send(self, message):
+        import base64
+        import json
+
+        event = json.loads(message)
+        if event["type"] == "session.update":
+            self._push({"type": "session.updated"})
+        elif event["type"] == "input_text_buffer.commit":
+            self.responses += 1
+            for chunk in self.chunks:
+                self._push({"type": "response.audio.delta", "delta": base64.b64encode(chunk).decode()})
+            self._push({"type": "response.done"})
+
+    async def close(self):
+        self.close_code = 1000
+
+
+@pytest.mark.asyncio
+async def test_qwen_tts_streams_audio_to_storage(tmp_path):
+    """Test audio deltas are written as they arrive and the URL is reported after the first chunk."""
+    from moana.services.storage import LocalStorageService
+    from moana.services.tts.qwen import QwenTTSService, close_qwen_session_pool
+
+    await close_qwen_session_pool()
+    storage = LocalStorageService(storage_path=str(tmp_path), base_url="https://media.test")
+    seen = []
+
+    async def on_audio_url(url):
+        path = tmp_path / url.removeprefix("https://media.test/")
+        seen.append((url, path.read_bytes()))
+
+    connect = AsyncMock(return_value=_FakeRealtimeSocket([b"ID3a", b"bb", b"cc"]))
+    with patch("moana.services.tts.qwen.websockets.connect", connect), \
+            patch("moana.services.tts.qwen.get_storage_service", return_value=storage):
+        result = await QwenTTSService().synthesize_streaming(
+            text="小莫，今天我们来学习数颜色",
+            voice_id="Cherry",
+            on_audio_url=on_audio_url,
+        )
+    await close_qwen_session_pool()
+
+    assert seen == [(result.audio_url, b"ID3a")]
+    assert result.audio_url.startswith("https://media.test/audio/")
+    path = tmp_path / result.audio_url.removeprefix("https://media.test/")
+    assert path.read_bytes() == b"ID3abbcc"
+
+
+@pytest.mark.asyncio
+async def test_qwen_tts_reuses_pooled_sessions(tmp_path):
+    """Test pages with the same voice share one configured session; closed sessions are replaced."""
+    from moana.services.storage import LocalStorageService
+    from moana.services.tts.qwen import QwenTTSService, close_qwen_session_pool, get_qwen_session_pool
+
+    await close_qwen_session_pool()
+    storage = LocalStorageService(storage_path=str(tmp_path), base_url="https://media.test")
+    sockets = []
+
+    async def connect(*args, **kwargs):
+        sockets.append(_FakeRealtimeSocket([b"ID3", b"xx"]))
+        return sockets[-1]
+
+    with patch("moana.services.tts.qwen.websockets.connect", side_effect=connect), \
+            patch("moana.services.tts.qwen.get_storage_service", return_value=storage):
+        service = QwenTTSService()
+        for page in range(3):
+            await service.synthesize(text=f"第{page}页", voice_id="Cherry")
+        assert len(sockets) == 1
+        assert sockets[0].responses == 3
+
+        # 服务端已关闭的会话不再复用
+        sockets[0].close_code = 1006
+        await service.synthesize(text="第4页", voice_id="Cherry")
+        assert len(sockets) == 2
+
+        # 不同音色使用独立的会话
+        await service.synthesize(text="第5页", voice_id="Ethan")
+        assert len(sockets) == 3
+
+        stats = get_qwen_session_pool().stats()
+        assert stats["created"] == 3 and stats["reused"] == 2
+    await close_qwen_session_pool()
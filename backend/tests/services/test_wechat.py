@@ -29,10 +29,8 @@ async def test_code_to_session_success():
         "unionid": "wx_unionid_456",
     }
 
-    with patch("moana.services.wechat.httpx.AsyncClient") as mock_client:
-        mock_instance = AsyncMock()
-        mock_client.return_value.__aenter__.return_value = mock_instance
-        mock_instance.get.return_value = create_mock_response(mock_response)
+    with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = create_mock_response(mock_response)
 
         service = WeChatService()
         result = await service.code_to_session("auth_code_123")
@@ -51,10 +49,8 @@ async def test_code_to_session_error():
         "errmsg": "invalid code",
     }
 
-    with patch("moana.services.wechat.httpx.AsyncClient") as mock_client:
-        mock_instance = AsyncMock()
-        mock_client.return_value.__aenter__.return_value = mock_instance
-        mock_instance.get.return_value = create_mock_response(mock_response)
+    with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = create_mock_response(mock_response)
 
         service = WeChatService()
 
@@ -75,10 +71,8 @@ async def test_get_user_info():
         "headimgurl": "https://example.com/avatar.png",
     }
 
-    with patch("moana.services.wechat.httpx.AsyncClient") as mock_client:
-        mock_instance = AsyncMock()
-        mock_client.return_value.__aenter__.return_value = mock_instance
-        mock_instance.get.return_value = create_mock_response(mock_response)
+    with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = create_mock_response(mock_response)
 
         service = WeChatService()
         result = await service.get_user_info("access_token", "openid")
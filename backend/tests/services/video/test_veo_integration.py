@@ -18,6 +18,7 @@ class TestVeoOptimizationIntegration:
             mock_operation = MagicMock()
             mock_operation.name = "test-operation"
             mock_operation.done = True
+            mock_operation.error = None
             mock_operation.response.generated_videos = [
                 MagicMock(video=MagicMock(video_bytes=b"fake_video_data"))
             ]
@@ -203,6 +204,7 @@ class TestReferenceImageDistribution:
             mock_operation = MagicMock()
             mock_operation.name = "test-op"
             mock_operation.done = True
+            mock_operation.error = None
             mock_operation.response.generated_videos = [
                 MagicMock(video=MagicMock(video_bytes=b"data"))
             ]
@@ -276,6 +278,7 @@ class TestPromptEnhancementIntegration:
             mock_operation = MagicMock()
             mock_operation.name = "test-op"
             mock_operation.done = True
+            mock_operation.error = None
             mock_operation.response.generated_videos = [
                 MagicMock(video=MagicMock(video_bytes=b"data"))
             ]